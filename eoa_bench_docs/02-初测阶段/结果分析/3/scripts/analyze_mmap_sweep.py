@@ -51,7 +51,9 @@ class MmapSweepAnalyzer:
             SELECT
                 s.name as suite_name,
                 s.model_name,
-                cd.base_parameters,
+                CAST(json_extract(cd.base_parameters, '$.mmap') AS REAL) as mmap,
+                CAST(json_extract(cd.base_parameters, '$.n_prompt') AS REAL) as n_prompt,
+                CAST(json_extract(cd.base_parameters, '$.n_gen') AS REAL) as n_gen,
                 br.result_type,
                 br.result_parameter,
                 br.mean_value,
@@ -60,7 +62,7 @@ class MmapSweepAnalyzer:
             FROM benchmark_results br
             JOIN case_definitions cd ON br.case_id = cd.id
             JOIN suites s ON cd.suite_id = s.id
-            WHERE s.name = 'pn_sweep_step-p64-n32_mmp01'
+            WHERE s.name = 'pn_sweep_step-p64-n32_mmp01' AND json_valid(cd.base_parameters)
             ORDER BY s.model_name, br.result_type, br.result_parameter
             """
             df = pd.read_sql_query(query, self.conn)
@@ -69,37 +71,12 @@ class MmapSweepAnalyzer:
             print(f"获取mmap深度扫描数据失败: {e}")
             return None
 
-    def extract_mmap_from_params(self, params_str):
-        """从参数字符串中提取mmap值"""
-        try:
-            import json
-            params = json.loads(params_str)
-            return params.get('mmap')
-        except:
-            return None
-
-    def extract_n_from_params(self, params_str, param_name):
-        """从参数字符串中提取n_prompt或n_gen值"""
-        try:
-            import json
-            params = json.loads(params_str)
-            return params.get(param_name)
-        except:
-            return None
-
     def process_mmap_data(self, df):
-        """处理mmap扫描数据，提取mmap参数和n参数"""
+        """处理mmap扫描数据，转换数值类型并去除无效数据"""
         if df.empty:
             return None
 
-        # 提取mmap值
-        df['mmap'] = df['base_parameters'].apply(self.extract_mmap_from_params)
-
-        # 从base_parameters中提取n_prompt和n_gen
-        df['n_prompt'] = df['base_parameters'].apply(lambda x: self.extract_n_from_params(x, 'n_prompt'))
-        df['n_gen'] = df['base_parameters'].apply(lambda x: self.extract_n_from_params(x, 'n_gen'))
-
-        # 转换为数值类型
+        # mmap、n_prompt和n_gen已在SQL中由json_extract提取
         df['mmap'] = pd.to_numeric(df['mmap'], errors='coerce')
         df['n_prompt'] = pd.to_numeric(df['n_prompt'], errors='coerce')
         df['n_gen'] = pd.to_numeric(df['n_gen'], errors='coerce')
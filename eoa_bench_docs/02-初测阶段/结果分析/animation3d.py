@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+3D散点图旋转动画公共模块
+
+供各阶段的 *_3d_animation.py 脚本使用：多进程并行渲染帧到内存，
+按帧顺序直接写入GIF/MP4编码器，不生成中间帧文件，也不回读图片
+
+用法（脚本位于 <阶段>/scripts/ 下）:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from animation3d import create_3d_animation
+"""
+
+import os
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from mpl_toolkits.mplot3d import Axes3D  # noqa: F401  注册3d投影
+import numpy as np
+
+# 设置安全的中英文支持字体
+matplotlib.rcParams['font.sans-serif'] = ['DejaVu Sans', 'Arial', 'Liberation Sans', 'SimHei']
+matplotlib.rcParams['axes.unicode_minus'] = False
+matplotlib.rcParams['font.family'] = 'sans-serif'
+
+# 可配置参数 - 脚本可通过config参数覆盖
+CONFIG = {
+    'total_frames': 90,        # 总帧数(建议90-180, 越少越快但动画越短)
+    'angle_step': 2,           # 每帧旋转角度(建议1-4度, 角度越小旋转越平滑)
+    'frame_dpi': 120,          # 帧图片DPI(80-300, 越低越快但质量越差)
+    'gif_duration': 0.1,       # 每帧持续时间(秒, 0.05-0.2, 越小动画越快)
+    'workers': 0,              # 渲染进程数(0表示CPU核心数, 1表示在当前进程中渲染)
+    'format': 'gif'            # 输出格式: gif 或 mp4（mp4需要安装imageio-ffmpeg）
+}
+
+# 默认绘图样式 - 脚本可通过style参数覆盖
+STYLE = {
+    'figsize': (12, 9),        # 固定图形尺寸，保证所有帧尺寸一致
+    'marker_base': 50,         # 散点基础大小
+    'marker_scale': 10,        # 散点大小随标准差的缩放
+    'alpha': 0.8,
+    'elev': 20,                # 俯仰角
+    'title': '{performance_name} 3D Analysis - Frame {frame_num}'
+}
+
+# 工作进程共享的绘图数据（由进程池initializer设置，避免每帧重复传输DataFrame）
+_frame_context = {}
+
+
+def _init_frame_context(df, colors, performance_name, config, style):
+    """进程池初始化：保存绘图数据"""
+    _frame_context.update(df=df, colors=colors, performance_name=performance_name,
+                          config=config, style=style)
+
+
+def render_frame(frame):
+    """
+    渲染单个动画帧到内存
+
+    Args:
+        frame: (frame_num, angle)
+
+    Returns:
+        (frame_num, RGB图像数组)
+    """
+    frame_num, angle = frame
+    df = _frame_context['df']
+    colors = _frame_context['colors']
+    config = _frame_context['config']
+    style = _frame_context['style']
+    performance_name = _frame_context['performance_name']
+
+    fig = plt.figure(figsize=style['figsize'], dpi=config['frame_dpi'])
+    ax = fig.add_subplot(111, projection='3d')
+    ax.set_position([0.1, 0.1, 0.8, 0.8])  # 固定axes位置
+
+    for model in df['model_name'].unique():
+        model_data = df[df['model_name'] == model]
+        ax.scatter(
+            model_data['n_gen'],
+            model_data['n_prompt'],
+            model_data['performance'],
+            c=colors.get(model, 'gray'),
+            s=style['marker_base'] + model_data['std_value'] * style['marker_scale'],
+            alpha=style['alpha'],
+            label=model,
+            edgecolors='black',
+            linewidth=0.5
+        )
+
+    ax.set_xlabel('Generation Length (n_gen)', fontsize=10)
+    ax.set_ylabel('Prompt Length (n_prompt)', fontsize=10)
+    ax.set_zlabel(f'{performance_name} (tokens/sec)', fontsize=10)
+    ax.set_title(style['title'].format(performance_name=performance_name, frame_num=frame_num), fontsize=12)
+    ax.legend(loc='upper left', fontsize=8)
+    ax.view_init(elev=style['elev'], azim=float(angle))
+    ax.grid(True, alpha=0.3)
+
+    # 固定边距，不使用tight_layout/bbox_inches，确保帧尺寸一致
+    fig.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.1)
+    fig.canvas.draw()
+    image = np.asarray(fig.canvas.buffer_rgba())[:, :, :3].copy()
+    plt.close(fig)
+
+    return frame_num, image
+
+
+def _open_writer(filepath, cfg):
+    """打开动画编码器（GIF时长单位为毫秒，MP4按帧率编码）"""
+    import imageio.v2 as imageio
+
+    if cfg['format'] == 'mp4':
+        return imageio.get_writer(str(filepath), fps=1.0 / cfg['gif_duration'], macro_block_size=1)
+    return imageio.get_writer(str(filepath), mode='I', duration=cfg['gif_duration'] * 1000, loop=0)
+
+
+def create_3d_animation(df, result_type, output_dir, colors, config=None, style=None,
+                        file_prefix='', label=''):
+    """
+    创建3D散点图旋转动画
+
+    Args:
+        df: 性能数据DataFrame（model_name, n_gen, n_prompt, performance, std_value列）
+        result_type: 性能类型 ('pp' 或 'tg')
+        output_dir: 输出目录
+        colors: 模型名 -> 颜色
+        config: 配置参数字典，覆盖CONFIG
+        style: 绘图样式字典，覆盖STYLE
+        file_prefix: 输出文件名前缀（如 "fivemodel_"）
+        label: 进度提示中的名称前缀
+
+    Returns:
+        动画文件路径，没有数据时返回None
+    """
+    from tqdm import tqdm  # 延迟导入，脚本入口会先检查并安装
+
+    cfg = {**CONFIG, **(config or {})}
+    frame_style = {**STYLE, **(style or {})}
+
+    if df is None or df.empty:
+        print("没有数据可供绘制动画")
+        return None
+
+    total_frames = cfg['total_frames']
+    workers = min(cfg['workers'] or os.cpu_count() or 1, total_frames)
+    performance_name = 'PP Performance' if result_type == 'pp' else 'TG Performance'
+    frames = [(i, i * cfg['angle_step']) for i in range(total_frames)]
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    filepath = output_dir / f"{file_prefix}{result_type}_3d_animation.{cfg['format']}"
+
+    print(f"🎬 开始创建{label}{result_type.upper()} 3D动画...")
+    print(f"⚙️  配置参数: 帧数={total_frames}, DPI={cfg['frame_dpi']}, 进程数={workers}, 格式={cfg['format']}")
+
+    start_time = time.time()
+    context = (df, colors, performance_name, cfg, frame_style)
+    writer = _open_writer(filepath, cfg)
+    try:
+        with tqdm(total=total_frames, desc=f"🎨 {label}{result_type.upper()} 帧渲染进度", unit="frame") as pbar:
+            if workers > 1:
+                # imap按帧顺序返回结果，渲染与编码流水进行
+                with Pool(workers, initializer=_init_frame_context, initargs=context) as pool:
+                    for _, image in pool.imap(render_frame, frames):
+                        writer.append_data(image)
+                        pbar.update(1)
+            else:
+                _init_frame_context(*context)
+                for frame in frames:
+                    writer.append_data(render_frame(frame)[1])
+                    pbar.update(1)
+    finally:
+        writer.close()
+
+    print(f"✅ {label}{result_type.upper()} 动画已保存: {filepath}（用时 {time.time() - start_time:.1f}秒）")
+    return filepath
@@ -229,6 +229,22 @@ MNN LLM 数据分析工具
     --single-variable VAR 指定要分析的单变量名称（正式分析模式）
     --fixed-params JSON   其他变量的固定值，JSON格式
 
+批量回归选项:
+    --batch-regression ID 拟合任务中所有变量×结果类型×固定参数组合（结果缓存，数据不变时复用）
+    --refit               忽略缓存全部重新拟合
+
+回退检测选项:
+    --detect-regression ID 比较任务与基线运行中的同参数用例（Welch t检验 + BH校正），检出回退时退出码为2
+    --baseline IDS        基线任务ID，逗号分隔 (默认: 同名任务之前最近的若干次运行)
+    --baseline-runs N     滚动基线合并的运行次数 (默认见[regression]配置)
+    --history             在同名任务的全部历史运行上做变点检测，定位变化开始的运行
+    --output PATH         检测结果另存为JSON文件
+
+图表导出选项:
+    --export-charts DIR   按需以高分辨率重新导出报告目录中的图表（报告默认生成低分辨率预览图）
+    --dpi N               导出分辨率 (默认: 300)
+    --chart-format FMT    导出格式: png|svg (默认: png)
+
 分析管理:
     --delete-analysis ID  删除指定ID的分析报告（删除数据库记录和文件目录）
 
@@ -254,6 +270,16 @@ MNN LLM 数据分析工具
     # 单变量正式分析
     ./bench.sh analyze 4 --single-variable threads --result-types pp,tg
 
+    # 批量回归整个任务
+    ./bench.sh analyze --batch-regression 3 --result-types pp,tg
+
+    # 重新编译MNN后检测回退（CI中以退出码判定）
+    ./bench.sh analyze --detect-regression 12 --baseline 11 --output temp/regression_12.json
+    ./bench.sh analyze --detect-regression 12 --history
+
+    # 导出报告的高分辨率图表
+    ./bench.sh analyze --export-charts web_server/static/analysis/4/threads_20250101_120000 --dpi 300
+
     # 分析管理
     ./bench.sh analyze --list-analysis
     ./bench.sh --delete-analysis 1
@@ -394,6 +420,7 @@ MNN LLM Bench 主入口脚本
     delete           删除分析报告 (输入ID)
     list             列出分析报告历史
     process          数据处理和报告 (开发中)
+    export           导出Parquet分析数据集 (增量)
     web              启动Web服务器
     status           显示系统状态
     clean            清理临时文件和缓存
@@ -432,6 +459,7 @@ MNN LLM Bench 主入口脚本
     $0 batch --help                 # 查看批量测试详细参数
     $0 analyze --help               # 查看数据分析帮助
     $0 process --help               # 查看数据处理帮助
+    $0 export --help                # 查看数据集导出帮助
     $0 web --help                   # 查看Web服务帮助
 
 日志控制:
@@ -639,6 +667,28 @@ run_analysis() {
             python3 benchmark.py --list-analysis
             return 0
         fi
+        if [ "$arg" = "--export-charts" ]; then
+            log_info "导出高分辨率图表..."
+            activate_venv
+            cd "$FRAMEWORK_DIR"
+            python3 benchmark.py "$@"
+            return 0
+        fi
+        if [ "$arg" = "--batch-regression" ]; then
+            log_info "运行批量回归分析..."
+            activate_venv
+            cd "$FRAMEWORK_DIR"
+            python3 benchmark.py "$@"
+            return 0
+        fi
+        if [ "$arg" = "--detect-regression" ]; then
+            log_info "运行性能回退检测..."
+            activate_venv
+            cd "$FRAMEWORK_DIR"
+            # 检出回退时benchmark.py退出码为2，set -e下原样传给调用方
+            python3 benchmark.py "$@"
+            return 0
+        fi
     done
 
     log_info "运行数据分析..."
@@ -663,6 +713,35 @@ process_data() {
     log_info "请使用框架级功能: cd framework && python3 src/data_processor.py"
 }
 
+# 导出Parquet分析数据集
+run_export() {
+    for arg in "$@"; do
+        if [ "$arg" = "--help" ] || [ "$arg" = "-h" ]; then
+            cat << 'EOF'
+导出Parquet分析数据集
+
+用法:
+    ./bench.sh export [选项]
+
+选项:
+    --full                清空数据集后全量导出（默认只导出新增用例）
+    --db PATH             数据库路径 (默认: 系统配置)
+    --output DIR          数据集目录 (默认: data/parquet)
+
+加载示例:
+    from db.parquet_export import load_dataframe
+    df = load_dataframe(models=["qwen3_06b"])
+EOF
+            exit 0
+        fi
+    done
+
+    log_info "导出Parquet分析数据集..."
+    activate_venv
+    cd "$FRAMEWORK_DIR"
+    python3 db/parquet_export.py "$@"
+}
+
 # 启动Web服务器
 start_web() {
     # 检查stop命令
@@ -1025,6 +1104,10 @@ main() {
             check_environment
             process_data "$@"
             ;;
+        export)
+            check_environment
+            run_export "$@"
+            ;;
         web|serve|server)
             # 简化环境检查，仅检查必要的组件
             if ! command -v uv &> /dev/null; then
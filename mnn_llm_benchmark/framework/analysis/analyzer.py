@@ -7,12 +7,16 @@
 """
 
 import hashlib
+import json
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 import numpy as np
 
+from .batch_regression import BatchRegressionAnalyzer
 from .data_extractor import DataExtractor
 from .regression import RegressionAnalyzer
+from .regression_detector import RegressionDetector
 from .report_generator import ReportGenerator
 from utils.logger import LoggerManager
 from .utils import transform_variable_name
@@ -91,11 +95,13 @@ class DataAnalyzer:
             分析报告目录路径
         """
         try:
-            # 检查是否已存在相同分析
+            # 请求参数标识 + 数据版本：参数相同且数据未变化时直接复用已有报告
             analysis_key = self._generate_single_var_analysis_key(suite_id, target_variable, fixed_params, result_types)
-            existing_report = self._check_existing_analysis(analysis_key)
+            data_version = self.extractor.get_suite_data_version(suite_id)
+            cached_entry = self._load_analysis_history().get(analysis_key)
+            existing_report = self._check_existing_analysis(cached_entry, data_version)
             if existing_report:
-                self.logger.info(f"发现已有分析报告: {existing_report}")
+                self.logger.info(f"发现已有分析报告（数据版本 {data_version} 未变化）: {existing_report}")
                 return existing_report
 
             # 验证参数
@@ -117,21 +123,37 @@ class DataAnalyzer:
             if not analysis_data['data']:
                 raise ValueError("未找到符合条件的分析数据")
 
+            # 数据版本变化时，只重新计算数据有变化的结果类型
+            digests = self._compute_data_digests(analysis_data)
+            reusable = self._find_reusable_results(cached_entry, digests)
+            if reusable:
+                self.logger.info(f"数据未变化的结果类型复用已有拟合和图表: {sorted(reusable)}")
+
             # 执行回归分析
             self.logger.info("开始执行回归分析...")
             regression_results = self._perform_single_variable_regression(
-                analysis_data, target_variable
+                analysis_data, target_variable,
+                {rt: entry.get('regression') for rt, entry in reusable.items()}
             )
 
             # 生成报告
             self.logger.info("开始生成分析报告...")
             report_path = self.report_generator.generate_single_variable_report(
                 analysis_data, regression_results,
-                analysis_data['suite_info'], target_variable, fixed_params
+                analysis_data['suite_info'], target_variable, fixed_params,
+                reuse_dirs={rt: Path(cached_entry['report_path']) for rt in reusable}
             )
 
             # 记录分析历史
-            self._record_analysis_history(analysis_key, str(report_path))
+            result_cache = {
+                rt: {
+                    'digest': digest,
+                    'regression': (self.regression_analyzer.serialize_result(regression_results[rt])
+                                   if rt in regression_results else None)
+                }
+                for rt, digest in digests.items()
+            }
+            self._record_analysis_history(analysis_key, str(report_path), data_version, result_cache)
 
             self.logger.info(f"单变量分析完成，报告保存在: {report_path}")
             return str(report_path)
@@ -140,26 +162,93 @@ class DataAnalyzer:
             self.logger.error(f"单变量分析Suite {suite_id} 失败: {e}")
             raise
 
+    def analyze_batch(self, task_id: Optional[int] = None,
+                      suite_ids: Optional[List[int]] = None,
+                      result_types: Optional[List[str]] = None,
+                      force: bool = False) -> Dict[str, Any]:
+        """
+        批量回归分析 - 拟合任务（或指定suite）中所有变量 × 结果类型 × 固定参数切片组合
+
+        Args:
+            task_id: 任务ID，分析该任务下的全部suite
+            suite_ids: suite ID列表（与task_id二选一）
+            result_types: 要分析的结果类型列表
+            force: 忽略analysis_history中的缓存全部重新拟合
+
+        Returns:
+            {'results': 组合结果列表, 'stats': 统计信息}
+        """
+        if suite_ids is None:
+            if task_id is None:
+                raise ValueError("需要指定task_id或suite_ids")
+            suite_ids = self.extractor.get_task_suite_ids(task_id)
+            if not suite_ids:
+                raise ValueError(f"任务 {task_id} 没有suite数据")
+
+        batch_analyzer = BatchRegressionAnalyzer(self.extractor, self.report_generator.analysis_manager)
+        return batch_analyzer.analyze(suite_ids, result_types, force)
+
+    def detect_regressions(self, task_id: int,
+                           baseline_task_ids: Optional[List[int]] = None,
+                           baseline_runs: Optional[int] = None,
+                           history: bool = False,
+                           result_types: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        性能回退检测 - 比较同一任务的两次（或多次）运行
+
+        Args:
+            task_id: 候选任务ID
+            baseline_task_ids: 基线任务ID列表；未指定时使用同名任务之前最近的若干次运行（滚动基线）
+            baseline_runs: 滚动基线合并的运行次数
+            history: 在同名任务截至task_id的全部运行上做变点检测
+            result_types: 要比较的结果类型列表
+
+        Returns:
+            检测结果，见RegressionDetector.compare / detect_change_points
+        """
+        detector = RegressionDetector(self.extractor)
+        if history:
+            # 未完成的运行不参与，候选任务本身除外
+            task_ids = [task['id'] for task in self.extractor.get_task_runs(task_id)
+                        if task['id'] == task_id or (task['id'] < task_id and task['status'] != 'pending')]
+            return detector.detect_change_points(task_ids, result_types)
+
+        if not baseline_task_ids:
+            baseline_task_ids = detector.rolling_baseline(task_id, baseline_runs)
+        return detector.compare(task_id, baseline_task_ids, result_types)
+
     
     def _perform_single_variable_regression(self, analysis_data: Dict[str, Any],
-                                          target_variable: str) -> Dict[str, Dict[str, Any]]:
+                                          target_variable: str,
+                                          cached_results: Optional[Dict[str, Optional[Dict[str, Any]]]] = None
+                                          ) -> Dict[str, Dict[str, Any]]:
         """
         执行单变量回归分析
 
         Args:
             analysis_data: 分析数据
             target_variable: 目标变量
+            cached_results: 数据未变化的结果类型 -> 缓存的回归结果（None表示上次未拟合）
 
         Returns:
             回归分析结果字典
         """
         regression_results = {}
+        cached_results = cached_results or {}
 
         for result_type, data in analysis_data['data'].items():
             try:
                 if not data['mean_values']:
                     continue
 
+                # 复用缓存的拟合结果
+                if result_type in cached_results:
+                    if cached_results[result_type]:
+                        regression_results[result_type] = self.regression_analyzer.restore_result(
+                            cached_results[result_type]
+                        )
+                    continue
+
                 # 准备数据
                 x_data = []
                 y_data = []
@@ -228,67 +317,110 @@ class DataAnalyzer:
         return hashlib.md5(key_string.encode()).hexdigest()[:8]
 
     
-    def _check_existing_analysis(self, analysis_key: str) -> Optional[str]:
+    def _compute_data_digests(self, analysis_data: Dict[str, Any]) -> Dict[str, str]:
         """
-        检查是否已存在相同分析
+        计算每个结果类型参与分析的数据摘要
 
         Args:
-            analysis_key: 分析标识
+            analysis_data: 分析数据
 
         Returns:
-            已存在的报告路径或None
+            {result_type: 数据摘要}
         """
-        try:
-            analysis_dir = self.report_generator.output_dir
+        digests = {}
+        for result_type, data in analysis_data['data'].items():
+            content = [data.get(field, []) for field in
+                       ('case_ids', 'case_names', 'x_values', 'mean_values', 'std_values', 'units')]
+            digests[result_type] = hashlib.sha1(
+                json.dumps(content, sort_keys=True, default=str).encode()
+            ).hexdigest()
+        return digests
+
+    def _find_reusable_results(self, cached_entry: Optional[Dict[str, Any]],
+                               digests: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        找出数据摘要与上次分析一致、可直接复用的结果类型
+
+        Args:
+            cached_entry: 分析历史记录
+            digests: 本次数据摘要
+
+        Returns:
+            {result_type: 缓存记录}
+        """
+        if not cached_entry or not cached_entry.get('result_types'):
+            return {}
+        if not Path(cached_entry.get('report_path', '')).is_dir():
+            return {}
+
+        return {
+            rt: entry for rt, entry in cached_entry['result_types'].items()
+            if rt in digests and entry.get('digest') == digests[rt]
+        }
+
+    def _check_existing_analysis(self, cached_entry: Optional[Dict[str, Any]],
+                                 data_version: str) -> Optional[str]:
+        """
+        检查是否已存在数据版本相同的分析
 
-            # 搜索包含该标识的目录
-            for existing_dir in analysis_dir.iterdir():
-                if existing_dir.is_dir() and analysis_key in existing_dir.name:
-                    # 检查是否包含必要的文件
-                    html_file = existing_dir / "analysis_report.html"
-                    if html_file.exists():
-                        return str(existing_dir)
+        Args:
+            cached_entry: 分析历史记录
+            data_version: 当前suite数据版本
 
+        Returns:
+            已存在的报告路径或None
+        """
+        if not cached_entry or cached_entry.get('data_version') != data_version:
             return None
 
+        report_path = Path(cached_entry.get('report_path', ''))
+        if (report_path / "analysis_report.html").exists():
+            return str(report_path)
+        return None
+
+    def _load_analysis_history(self) -> Dict[str, Any]:
+        """
+        读取分析历史
+
+        Returns:
+            {analysis_key: 历史记录}
+        """
+        history_file = self.report_generator.output_dir / "analysis_history.json"
+        if not history_file.exists():
+            return {}
+
+        try:
+            with open(history_file, 'r', encoding='utf-8') as f:
+                history = json.load(f)
+            return history if isinstance(history, dict) else {}
         except Exception as e:
-            self.logger.warning(f"检查已有分析失败: {e}")
-            return None
+            self.logger.warning(f"读取分析历史失败: {e}")
+            return {}
 
-    def _record_analysis_history(self, analysis_key: str, report_path: str):
+    def _record_analysis_history(self, analysis_key: str, report_path: str,
+                                 data_version: Optional[str] = None,
+                                 result_cache: Optional[Dict[str, Any]] = None):
         """
         记录分析历史
 
         Args:
             analysis_key: 分析标识
             report_path: 报告路径
+            data_version: 分析时的suite数据版本
+            result_cache: 每个结果类型的数据摘要和回归结果
         """
         try:
-            history_file = self.report_generator.output_dir / "analysis_history.json"
-            history = {}
-
-            # 读取现有历史
-            if history_file.exists():
-                import json
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    try:
-                        history = json.load(f)
-                    except:
-                        history = {}
-
-            # 添加新记录
-            from datetime import datetime
+            history = self._load_analysis_history()
             history[analysis_key] = {
                 "report_path": report_path,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now().isoformat(),
+                "data_version": data_version,
+                "result_types": result_cache or {}
             }
 
-            # 保存历史
-            import json
+            history_file = self.report_generator.output_dir / "analysis_history.json"
             with open(history_file, 'w', encoding='utf-8') as f:
                 json.dump(history, f, indent=2, ensure_ascii=False)
 
         except Exception as e:
             self.logger.warning(f"记录分析历史失败: {e}")
-
-
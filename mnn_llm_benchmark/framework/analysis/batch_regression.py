@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量回归分析模块
+
+一次遍历任务中所有 (suite, 变量, 结果类型, 固定参数切片) 组合并拟合：
+- 线性、二次、对数模型对参数是线性的，各组合补齐为等长数组后用NumPy批量最小二乘一次求解，
+  结果与逐个调用curve_fit的最优解一致
+- 指数、幂函数需要非线性最小二乘，只对线性R²不足0.7的组合（与analyze_regression相同的判断），
+  以对数空间线性拟合为初值，在进程池中用curve_fit精调
+结果写入analysis_history（analysis_type='batch_regression'），数据未变化的组合再次运行时直接复用。
+"""
+
+import hashlib
+import json
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import stats
+from scipy.optimize import curve_fit
+
+from config.system import SystemConfig
+from utils.logger import LoggerManager
+from .regression import RegressionAnalyzer
+from .utils import transform_variable_name
+
+# 线性回归R²低于该值时尝试非线性模型（与RegressionAnalyzer.analyze_regression一致）
+LINEAR_R2_THRESHOLD = 0.7
+MIN_POINTS = 3
+# 需要精调的组合少于该数量时在当前进程执行，避免进程池启动开销
+POOL_MIN_JOBS = 16
+
+
+def _exponential_func(x, a, b):
+    """指数函数 y = a * exp(bx)"""
+    return a * np.exp(b * x)
+
+
+def _power_func(x, a, b):
+    """幂函数 y = a * x^b"""
+    return a * np.power(x, b)
+
+
+NONLINEAR_FUNCS = {'exponential': _exponential_func, 'power': _power_func}
+
+
+def _r2_score(y: np.ndarray, y_pred: np.ndarray) -> float:
+    """计算R²"""
+    ss_res = np.sum((y - y_pred) ** 2)
+    ss_tot = np.sum((y - np.mean(y)) ** 2)
+    return float(1 - ss_res / ss_tot) if ss_tot > 0 else 0.0
+
+
+def refine_nonlinear(job: Tuple[int, str, List[float], List[float], List[float]]) -> Tuple[int, str, Optional[List[float]], float]:
+    """
+    用curve_fit精调一个非线性模型（进程池任务，需为模块级函数）
+
+    Args:
+        job: (组合序号, 模型名, x, y, 初值)
+
+    Returns:
+        (组合序号, 模型名, 参数或None, R²)
+    """
+    index, method, x_values, y_values, p0 = job
+    func = NONLINEAR_FUNCS[method]
+    x_data, y_data = np.asarray(x_values), np.asarray(y_values)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            popt, _ = curve_fit(func, x_data, y_data, p0=p0, maxfev=10000)
+            y_pred = func(x_data, *popt)
+        if not np.all(np.isfinite(y_pred)):
+            return index, method, None, float('-inf')
+        return index, method, popt.tolist(), _r2_score(y_data, y_pred)
+    except Exception:
+        return index, method, None, float('-inf')
+
+
+def batch_least_squares(design: np.ndarray, y: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    批量加掩码最小二乘
+
+    Args:
+        design: 设计矩阵 (G, N, K)
+        y: 因变量 (G, N)
+        mask: 有效数据点掩码 (G, N)
+
+    Returns:
+        (系数 (G, K), R² (G,))
+    """
+    weight = mask.astype(float)
+    weighted = design * weight[..., None]
+    xtx = np.einsum('gnk,gnl->gkl', weighted, design)
+    xty = np.einsum('gnk,gn->gk', weighted, y)
+    coef = np.einsum('gkl,gl->gk', np.linalg.pinv(xtx), xty)
+
+    y_pred = np.einsum('gnk,gk->gn', design, coef)
+    n = weight.sum(axis=1)
+    y_mean = (weight * y).sum(axis=1) / n
+    ss_res = (weight * (y - y_pred) ** 2).sum(axis=1)
+    ss_tot = (weight * (y - y_mean[:, None]) ** 2).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r2 = np.where(ss_tot > 0, 1 - ss_res / ss_tot, 0.0)
+    return coef, r2
+
+
+class BatchRegressionAnalyzer:
+    """批量回归分析器"""
+
+    def __init__(self, extractor, analysis_manager, workers: Optional[int] = None):
+        """
+        初始化批量回归分析器
+
+        Args:
+            extractor: DataExtractor实例
+            analysis_manager: AnalysisManager实例（结果缓存）
+            workers: 非线性精调进程数，默认读取[analysis].batch_workers（0表示CPU核心数）
+        """
+        self.logger = LoggerManager.get_logger("BatchRegressionAnalyzer")
+        self.extractor = extractor
+        self.analysis_manager = analysis_manager
+        self.regression_analyzer = RegressionAnalyzer()
+        if workers is None:
+            workers = int(SystemConfig().get_config("analysis").get("batch_workers", 0))
+        self.workers = workers or os.cpu_count() or 1
+
+    def __repr__(self) -> str:
+        return f"BatchRegressionAnalyzer(workers={self.workers})"
+
+    def analyze(self, suite_ids: List[int], result_types: Optional[List[str]] = None,
+                force: bool = False) -> Dict[str, Any]:
+        """
+        对多个suite的所有组合执行回归分析
+
+        Args:
+            suite_ids: suite ID列表
+            result_types: 要分析的结果类型列表（可选，默认全部）
+            force: 忽略缓存全部重新拟合
+
+        Returns:
+            {'results': 组合结果列表, 'stats': 统计信息}
+        """
+        start = time.time()
+        batch_data = self.extractor.extract_batch_data(suite_ids, result_types)
+        groups = []
+        for suite_id, suite_data in batch_data.items():
+            groups.extend(self._build_groups(suite_id, suite_data))
+
+        cached = self.analysis_manager.get_batch_regressions(suite_ids)
+        results, pending, replace_ids = [], [], []
+        for group in groups:
+            entry = cached.get(self._cache_key(group))
+            if entry and not force and entry['summary'].get('data_digest') == group['digest']:
+                results.append(self._group_result(group, entry['summary'], cached=True))
+                continue
+            if entry:
+                replace_ids.append(entry['id'])
+            pending.append(group)
+
+        fits, refined = self._fit_groups(pending)
+        fit_ms = int((time.time() - start) * 1000)
+        records = []
+        for group, summary in zip(pending, fits):
+            results.append(self._group_result(group, summary, cached=False))
+            records.append({
+                'suite_id': group['suite_id'],
+                'target_variable': group['target_variable'],
+                'fixed_params': group['fixed_params'],
+                'result_type': group['result_type'],
+                'data_points': len(group['x']),
+                'summary': summary,
+                'duration_ms': fit_ms
+            })
+        if records or replace_ids:
+            self.analysis_manager.save_batch_regressions(records, replace_ids)
+
+        stats_info = {
+            'groups': len(groups),
+            'cached': len(groups) - len(pending),
+            'fitted': len(pending),
+            'refined': refined,
+            'seconds': time.time() - start
+        }
+        self.logger.info(f"批量回归分析完成: {stats_info}")
+        return {'results': results, 'stats': stats_info}
+
+    def _build_groups(self, suite_id: int, suite_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        构建suite内所有 (变量, 结果类型, 固定参数切片) 组合
+
+        目标变量为取值不少于3个的数值变量；其余在suite内变化的变量按取值切片作为固定参数。
+
+        Args:
+            suite_id: suite ID
+            suite_data: extract_batch_data返回的单个suite数据
+
+        Returns:
+            组合列表，每个组合包含清理后的x、y数组
+        """
+        case_variables = suite_data['variables']
+        distinct: Dict[str, set] = {}
+        for variables in case_variables.values():
+            for name, value in variables.items():
+                distinct.setdefault(name, set()).add(value)
+        varying = sorted(name for name, values in distinct.items() if len(values) > 1)
+        targets = [name for name in varying
+                   if len(distinct[name]) >= MIN_POINTS
+                   and all(isinstance(value, (int, float)) for value in distinct[name])]
+
+        groups = []
+        for target in targets:
+            slice_names = [name for name in varying if name != target]
+            points: Dict[Tuple, Tuple[List[float], List[float]]] = {}
+            for case_id, result_type, mean_value in suite_data['results']:
+                variables = case_variables.get(case_id, {})
+                if target not in variables or mean_value is None:
+                    continue
+                slice_key = tuple(variables.get(name) for name in slice_names)
+                x_values, y_values = points.setdefault((result_type, slice_key), ([], []))
+                x_values.append(float(variables[target]))
+                y_values.append(float(mean_value))
+
+            for (result_type, slice_key), (x_values, y_values) in sorted(points.items(), key=str):
+                x_clean, y_clean = self.regression_analyzer._clean_data(np.array(x_values), np.array(y_values))
+                if len(x_clean) < MIN_POINTS:
+                    continue
+                fixed_params = {name: value for name, value in zip(slice_names, slice_key) if value is not None}
+                digest = hashlib.sha1(np.concatenate([x_clean, y_clean]).round(6).tobytes()).hexdigest()[:16]
+                groups.append({
+                    'suite_id': suite_id,
+                    'target_variable': target,
+                    'fixed_params': fixed_params,
+                    'result_type': result_type,
+                    'x': x_clean,
+                    'y': y_clean,
+                    'digest': digest
+                })
+        return groups
+
+    def _fit_groups(self, groups: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        批量拟合所有组合
+
+        Args:
+            groups: 组合列表
+
+        Returns:
+            (每个组合的回归摘要, 进程池精调的模型数)
+        """
+        if not groups:
+            return [], 0
+
+        size = max(len(group['x']) for group in groups)
+        mask = np.zeros((len(groups), size), dtype=bool)
+        x = np.ones((len(groups), size))
+        y = np.zeros((len(groups), size))
+        for index, group in enumerate(groups):
+            n = len(group['x'])
+            mask[index, :n] = True
+            x[index, :n] = group['x']
+            y[index, :n] = group['y']
+
+        # x按组缩放到[-1, 1]附近，避免二次项的正规方程病态
+        scale = np.abs(np.where(mask, x, 0)).max(axis=1)
+        scale[scale == 0] = 1.0
+        xs = x / scale[:, None]
+        ones = np.ones_like(x)
+
+        linear_coef, linear_r2 = batch_least_squares(np.stack([xs, ones], axis=-1), y, mask)
+        slope = linear_coef[:, 0] / scale
+        intercept = linear_coef[:, 1]
+        linear_stats = self._linear_statistics(x, y, mask, slope, intercept)
+
+        candidates: List[Dict[str, Any]] = [{} for _ in groups]
+        needs_nonlinear = linear_r2 < LINEAR_R2_THRESHOLD
+        if needs_nonlinear.any():
+            quad_coef, quad_r2 = batch_least_squares(np.stack([xs ** 2, xs, ones], axis=-1), y, mask)
+            quad_params = np.stack([quad_coef[:, 0] / scale ** 2, quad_coef[:, 1] / scale, quad_coef[:, 2]], axis=1)
+            log_coef, log_r2 = batch_least_squares(np.stack([np.log(np.abs(x) + 1), ones], axis=-1), y, mask)
+            for index in np.flatnonzero(needs_nonlinear):
+                candidates[index]['quadratic'] = (quad_params[index].tolist(), float(quad_r2[index]))
+                candidates[index]['logarithmic'] = (log_coef[index].tolist(), float(log_r2[index]))
+
+        jobs = self._nonlinear_jobs(groups, np.flatnonzero(needs_nonlinear), x, y, mask)
+        for index, method, params, r2 in self._run_jobs(jobs):
+            if params is not None:
+                candidates[index][method] = (params, r2)
+
+        summaries = []
+        for index, group in enumerate(groups):
+            regression = {
+                'method': 'linear',
+                'type': 'linear',
+                'slope': float(slope[index]),
+                'intercept': float(intercept[index]),
+                'r2': float(linear_r2[index]),
+                **{key: values[index] for key, values in linear_stats.items()}
+            }
+            if candidates[index]:
+                method, (params, r2) = max(candidates[index].items(), key=lambda item: item[1][1])
+                if r2 > regression['r2']:
+                    regression = {'method': method, 'type': 'nonlinear', 'parameters': params, 'r2': r2}
+            summaries.append(self._summarize(group, regression, float(linear_r2[index])))
+        return summaries, len(jobs)
+
+    def _linear_statistics(self, x: np.ndarray, y: np.ndarray, mask: np.ndarray,
+                           slope: np.ndarray, intercept: np.ndarray) -> Dict[str, List[Any]]:
+        """
+        计算线性回归的标准误差、p值和斜率95%置信区间（与scipy.stats.linregress一致）
+
+        Returns:
+            {'std_error': [...], 'p_value': [...], 'slope_ci': [...]}
+        """
+        weight = mask.astype(float)
+        n = weight.sum(axis=1)
+        dof = n - 2
+        x_mean = (weight * x).sum(axis=1) / n
+        sxx = (weight * (x - x_mean[:, None]) ** 2).sum(axis=1)
+        residuals = y - (slope[:, None] * x + intercept[:, None])
+        ss_res = (weight * residuals ** 2).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std_error = np.sqrt(ss_res / dof / sxx)
+            t_stat = slope / std_error
+        p_value = np.where(std_error > 0, 2 * stats.t.sf(np.abs(t_stat), dof), 0.0)
+        half_width = stats.t.ppf(0.975, dof) * std_error
+        return {
+            'std_error': std_error.tolist(),
+            'p_value': p_value.tolist(),
+            'slope_ci': np.stack([slope - half_width, slope + half_width], axis=1).tolist()
+        }
+
+    def _nonlinear_jobs(self, groups: List[Dict[str, Any]], indices: np.ndarray,
+                        x: np.ndarray, y: np.ndarray, mask: np.ndarray) -> List[Tuple]:
+        """
+        生成指数/幂函数精调任务，初值来自对数空间的批量线性拟合
+
+        Returns:
+            refine_nonlinear任务列表
+        """
+        if len(indices) == 0:
+            return []
+        sub_x, sub_y, sub_mask = x[indices], y[indices], mask[indices]
+        positive_y = np.all(~sub_mask | (sub_y > 0), axis=1)
+        positive_x = np.all(~sub_mask | (sub_x > 0), axis=1)
+        log_y = np.log(np.where(sub_mask & (sub_y > 0), sub_y, 1.0))
+        ones = np.ones_like(sub_x)
+        exp_coef, _ = batch_least_squares(np.stack([sub_x, ones], axis=-1), log_y, sub_mask)
+        log_x = np.log(np.where(sub_mask & (sub_x > 0), sub_x, 1.0))
+        power_coef, _ = batch_least_squares(np.stack([log_x, ones], axis=-1), log_y, sub_mask)
+
+        jobs = []
+        for row, index in enumerate(indices):
+            group = groups[index]
+            x_values, y_values = group['x'].tolist(), group['y'].tolist()
+            exp_p0 = [float(np.exp(exp_coef[row, 1])), float(exp_coef[row, 0])] if positive_y[row] \
+                else [max(y_values), 0.1]
+            power_p0 = [float(np.exp(power_coef[row, 1])), float(power_coef[row, 0])] \
+                if positive_x[row] and positive_y[row] else [1, 1]
+            jobs.append((int(index), 'exponential', x_values, y_values, exp_p0))
+            jobs.append((int(index), 'power', x_values, y_values, power_p0))
+        return jobs
+
+    def _run_jobs(self, jobs: List[Tuple]) -> List[Tuple[int, str, Optional[List[float]], float]]:
+        """执行非线性精调任务，任务较多时使用进程池"""
+        if len(jobs) < POOL_MIN_JOBS or self.workers <= 1:
+            return [refine_nonlinear(job) for job in jobs]
+        chunksize = max(1, len(jobs) // (self.workers * 4))
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(refine_nonlinear, jobs, chunksize=chunksize))
+
+    def _summarize(self, group: Dict[str, Any], regression: Dict[str, Any], linear_r2: float) -> Dict[str, Any]:
+        """
+        生成可缓存的回归摘要（方程格式与单变量分析一致）
+
+        Returns:
+            回归摘要字典
+        """
+        x_name = transform_variable_name(group['target_variable'])
+        y_name = f"{group['result_type'].upper()} 性能"
+        quality = self.regression_analyzer._evaluate_regression_quality(regression, len(group['x']))
+        return {
+            'regression': regression,
+            'equation': self.regression_analyzer._format_equation(regression, x_name, y_name),
+            'quality': quality['quality'],
+            'linear_r2': linear_r2,
+            'data_points': len(group['x']),
+            'data_digest': group['digest']
+        }
+
+    def _cache_key(self, group: Dict[str, Any]) -> Tuple[int, str, str, str]:
+        """组合的缓存键，与AnalysisManager.get_batch_regressions一致"""
+        return (group['suite_id'], group['target_variable'],
+                json.dumps(group['fixed_params'], sort_keys=True), group['result_type'])
+
+    def _group_result(self, group: Dict[str, Any], summary: Dict[str, Any], cached: bool) -> Dict[str, Any]:
+        """组合的分析结果"""
+        return {
+            'suite_id': group['suite_id'],
+            'target_variable': group['target_variable'],
+            'fixed_params': group['fixed_params'],
+            'result_type': group['result_type'],
+            'cached': cached,
+            **summary
+        }
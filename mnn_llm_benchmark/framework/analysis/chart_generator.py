@@ -6,25 +6,64 @@
 负责协调各种图表的生成，使用组件化架构
 """
 
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from config.system import SystemConfig
 from utils.logger import LoggerManager
 
 from .charts import ScatterChartBuilder, RegressionChartBuilder
+from .charts.render import build_render_jobs, load_render_jobs, render_task, save_render_jobs
+
+# 图表数量少于该值时串行渲染（避免进程池调度开销）
+POOL_MIN_CHARTS = 3
+# 按需导出的默认分辨率
+EXPORT_DPI = 300
 
 
 class ChartGenerator:
     """图表生成器 - 使用组件化架构"""
 
-    def __init__(self):
-        """初始化图表生成器"""
+    def __init__(self, workers: Optional[int] = None, dpi: Optional[int] = None,
+                 image_format: Optional[str] = None, static_charts: Optional[bool] = None):
+        """
+        初始化图表生成器
+
+        Args:
+            workers: 渲染进程数，默认读取[analysis].chart_workers（0表示CPU核心数）
+            dpi: 报告预览图分辨率，默认读取[analysis].chart_dpi
+            image_format: 报告预览图格式（png或svg），默认读取[analysis].chart_format
+            static_charts: 是否为报告渲染静态图，默认读取[analysis].static_charts
+        """
         self.logger = LoggerManager.get_logger("ChartGenerator")
         self.system_config = SystemConfig()
 
+        analysis_config = self.system_config.get_config("analysis")
+        if workers is None:
+            workers = int(analysis_config.get("chart_workers", 0))
+        self.workers = workers or os.cpu_count() or 1
+        self.dpi = int(dpi or analysis_config.get("chart_dpi", 100))
+        self.image_format = image_format or analysis_config.get("chart_format", "png")
+        # 报告默认在浏览器中绘制交互式图表，关闭时不在服务端渲染静态图
+        if static_charts is None:
+            static_charts = analysis_config.get("static_charts", False)
+        self.static_charts = bool(static_charts)
+        self._executor = None
+
         # 初始化图表构建器
-        self.scatter_builder = ScatterChartBuilder()
-        self.regression_builder = RegressionChartBuilder()
+        self.scatter_builder = ScatterChartBuilder(self.dpi, self.image_format)
+        self.regression_builder = RegressionChartBuilder(self.dpi, self.image_format)
+
+    def __repr__(self) -> str:
+        return f"ChartGenerator(workers={self.workers}, dpi={self.dpi}, image_format={self.image_format!r})"
+
+    def close(self):
+        """关闭渲染进程池"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
 
     def generate_all_charts(self, report_dir: Path,
                            analysis_data: Dict[str, Any],
@@ -83,7 +122,8 @@ class ChartGenerator:
     def generate_single_variable_charts(self, report_dir: Path,
                                        analysis_data: Dict[str, Any],
                                        regression_results: Dict[str, Dict[str, Any]],
-                                       target_variable: str) -> Dict[str, str]:
+                                       target_variable: str,
+                                       reuse_dirs: Optional[Dict[str, Path]] = None) -> Dict[str, str]:
         """
         生成单变量分析图表
 
@@ -92,42 +132,116 @@ class ChartGenerator:
             analysis_data: 分析数据
             regression_results: 回归结果
             target_variable: 目标变量
+            reuse_dirs: 数据未变化的结果类型 -> 已有报告目录，直接复制其图表而不重新绘制
 
         Returns:
             图像信息字典 {image_key: filename}
         """
         images_info = {}
+        reuse_dirs = reuse_dirs or {}
 
         try:
-            # 为每个结果类型生成图表
-            for result_type, data in analysis_data['data'].items():
-                if not data.get('mean_values'):
-                    continue
-
-                # 生成带方差标注的散点图
-                try:
-                    scatter_path = self.scatter_builder.build_single_variable_scatter(
-                        data, result_type, target_variable, report_dir
-                    )
-                    images_info[f'{result_type}_scatter'] = scatter_path.name
-                except Exception as e:
-                    self.logger.warning(f"创建{result_type}单变量散点图失败: {e}")
-                    continue
-
-                # 生成带回归线的方差标注图
-                if result_type in regression_results:
-                    try:
-                        regression_path = self.regression_builder.build_single_variable_regression(
-                            regression_results[result_type], result_type, target_variable, report_dir
-                        )
-                        images_info[f'{result_type}_regression'] = regression_path.name
-                    except Exception as e:
-                        self.logger.warning(f"创建{result_type}单变量回归图失败: {e}")
-                        continue
-
-            self.logger.info(f"生成了 {len(images_info)} 个单变量分析图表")
+            # 渲染任务保存到报告目录，供之后按需高分辨率导出
+            jobs = build_render_jobs(analysis_data, regression_results, target_variable)
+            save_render_jobs(report_dir, jobs)
+            if not self.static_charts:
+                self.logger.info("未启用静态图表，报告使用交互式图表（可通过 --export-charts 按需导出）")
+                return images_info
+
+            # 复用已有报告中的图表，其余图表并行渲染
+            pending = []
+            reused_types = set()
+            for job in jobs:
+                result_type = job['result_type']
+                if result_type in reuse_dirs and result_type not in reused_types:
+                    reused = self._copy_existing_charts(reuse_dirs[result_type], report_dir, result_type,
+                                                        result_type in regression_results)
+                    if reused:
+                        images_info.update(reused)
+                        reused_types.add(result_type)
+                if result_type not in reused_types:
+                    pending.append(job)
+
+            images_info.update(self._render_jobs(pending, report_dir, self.dpi, self.image_format))
+
+            self.logger.info(f"生成了 {len(images_info)} 个单变量分析图表（复用 {len(reused_types)} 个结果类型）")
             return images_info
 
         except Exception as e:
             self.logger.error(f"生成单变量图表失败: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def export_charts(self, report_dir: Path, dpi: int = EXPORT_DPI,
+                      image_format: str = "png") -> Path:
+        """
+        按需以高分辨率重新导出报告图表（读取报告目录中保存的渲染任务）
+
+        Args:
+            report_dir: 报告目录
+            dpi: 导出分辨率
+            image_format: 导出格式（png或svg）
+
+        Returns:
+            导出目录路径
+        """
+        jobs = load_render_jobs(report_dir)
+        export_dir = Path(report_dir) / f"export_{image_format}_{dpi}dpi"
+        export_dir.mkdir(parents=True, exist_ok=True)
+
+        images_info = self._render_jobs(jobs, export_dir, dpi, image_format)
+        self.logger.info(f"导出了 {len(images_info)} 个图表到 {export_dir}")
+        return export_dir
+
+    def _render_jobs(self, jobs: List[Dict[str, Any]], output_dir: Path,
+                     dpi: int, image_format: str) -> Dict[str, str]:
+        """
+        渲染一组图表，图表较多时使用进程池并行渲染
+
+        Args:
+            jobs: 渲染任务列表
+            output_dir: 输出目录
+            dpi: 图像分辨率
+            image_format: 图像格式
+
+        Returns:
+            图像信息字典 {image_key: filename}
+        """
+        tasks = [(job, str(output_dir), dpi, image_format) for job in jobs]
+        if len(tasks) >= POOL_MIN_CHARTS and self.workers > 1:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            results = self._executor.map(render_task, tasks)
+        else:
+            results = map(render_task, tasks)
+
+        images_info = {}
+        for image_key, filename, error in results:
+            if error:
+                self.logger.warning(f"创建{image_key}图表失败: {error}")
+            else:
+                images_info[image_key] = filename
+        return images_info
+
+    def _copy_existing_charts(self, source_dir: Path, report_dir: Path, result_type: str,
+                              with_regression: bool) -> Optional[Dict[str, str]]:
+        """
+        从已有报告目录复制某结果类型的图表
+
+        Args:
+            source_dir: 已有报告目录
+            report_dir: 新报告目录
+            result_type: 结果类型
+            with_regression: 是否需要回归图
+
+        Returns:
+            图像信息字典，图表不完整时返回None（需重新绘制）
+        """
+        kinds = ['scatter', 'regression'] if with_regression else ['scatter']
+        names = {f'{result_type}_{kind}': f'{result_type}_{kind}.{self.image_format}' for kind in kinds}
+        if not all((Path(source_dir) / name).exists() for name in names.values()):
+            return None
+
+        for name in names.values():
+            if Path(source_dir).resolve() != Path(report_dir).resolve():
+                shutil.copy2(Path(source_dir) / name, Path(report_dir) / name)
+        return names
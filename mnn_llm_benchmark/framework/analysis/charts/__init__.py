@@ -4,7 +4,8 @@
 提供专门的图表生成组件
 """
 
-from .components import create_errorbar_plot, create_scatter_plot, create_regression_plot, save_figure
+from .components import (create_errorbar_plot, create_scatter_plot, create_regression_plot,
+                         create_series_plot, save_figure)
 from .scatter import ScatterChartBuilder
 from .regression import RegressionChartBuilder
 
@@ -12,6 +13,7 @@ __all__ = [
     'create_errorbar_plot',
     'create_scatter_plot',
     'create_regression_plot',
+    'create_series_plot',
     'save_figure',
     'ScatterChartBuilder',
     'RegressionChartBuilder'
@@ -11,43 +11,49 @@ import matplotlib
 import numpy as np
 import platform
 import matplotlib.font_manager as fm
-from typing import Dict, Any, Tuple, List
+from functools import lru_cache
+from typing import Dict, Any, Tuple, List, Optional
 
 # 设置matplotlib使用非交互式后端
 matplotlib.use('Agg')
 
 # 设置字体配置
-def setup_chinese_font():
-    """设置matplotlib的中文字体支持"""
+@lru_cache(maxsize=1)
+def find_chinese_font_family() -> Tuple[Tuple[str, ...], Optional[str]]:
+    """
+    查找可用的中文字体（每个进程只扫描一次字体列表）
+
+    Returns:
+        (font.sans-serif字体列表, 选中的中文字体名或None)
+    """
     system = platform.system()
 
     try:
         if system == 'Linux':
             # Linux系统，优先使用系统可用中文字体
-            available_fonts = [f.name for f in fm.fontManager.ttflist]
+            available_fonts = {f.name for f in fm.fontManager.ttflist}
             chinese_fonts = ['WenQuanYi Micro Hei', 'WenQuanYi Zen Hei',
                            'Noto Sans CJK SC', 'Source Han Sans SC', 'SimHei']
 
-            selected_font = None
             for font in chinese_fonts:
                 if font in available_fonts:
-                    selected_font = font
-                    break
-
-            if selected_font:
-                plt.rcParams['font.sans-serif'] = [selected_font, 'DejaVu Sans']
-                return selected_font
-            else:
-                plt.rcParams['font.sans-serif'] = ['DejaVu Sans']
-                return None
+                    return (font, 'DejaVu Sans'), font
+            return ('DejaVu Sans',), None
         elif system == 'Darwin':  # macOS
-            plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'PingFang SC', 'STHeiti', 'SimHei']
+            return ('Arial Unicode MS', 'PingFang SC', 'STHeiti', 'SimHei'), None
         elif system == 'Windows':
-            plt.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei', 'Arial']
+            return ('Microsoft YaHei', 'SimHei', 'Arial'), None
     except Exception:
-        plt.rcParams['font.sans-serif'] = ['DejaVu Sans']
+        pass
+
+    return ('DejaVu Sans',), None
+
 
-    return None
+def setup_chinese_font():
+    """设置matplotlib的中文字体支持"""
+    families, selected_font = find_chinese_font_family()
+    plt.rcParams['font.sans-serif'] = list(families)
+    return selected_font
 
 # 初始化字体设置
 _chinese_font_available = setup_chinese_font()
@@ -204,6 +210,42 @@ def create_regression_plot(x_data: np.ndarray, y_data: np.ndarray,
     return fig
 
 
+def create_series_plot(series: Dict[str, Tuple[List[float], List[float]]],
+                       title: str, x_label: str, y_label: str,
+                       figsize: Tuple[int, int] = (10, 8)) -> plt.Figure:
+    """
+    创建多序列折线图（如同一变量下不同分位数的对比）
+
+    Args:
+        series: {序列名称: (X数据, Y数据)}
+        title: 图表标题
+        x_label: X轴标签
+        y_label: Y轴标签
+        figsize: 图表尺寸
+
+    Returns:
+        matplotlib图表对象
+    """
+    fig = plt.figure(figsize=figsize)
+
+    for label, (x_data, y_data) in series.items():
+        # 按X排序后连线，同一X的多个用例依次连接
+        points = sorted(zip(x_data, y_data))
+        plt.plot([p[0] for p in points], [p[1] for p in points], marker='o', markersize=6,
+                 linewidth=1.5, alpha=0.85, label=label)
+
+    plt.xlabel(x_label, fontsize=12)
+    plt.ylabel(y_label, fontsize=12)
+    plt.title(title, fontsize=14, fontweight='bold')
+
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+
+    return fig
+
+
 def _predict_smooth_curve(regression_result: Dict[str, Any], x_smooth: np.ndarray) -> np.ndarray:
     """预测平滑曲线值（内部函数）"""
     if regression_result['regression']['method'] == 'linear':
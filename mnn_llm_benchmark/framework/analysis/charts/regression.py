@@ -17,9 +17,19 @@ from ..utils import transform_english_name, format_analysis_title
 class RegressionChartBuilder:
     """回归图构建器"""
 
-    def __init__(self):
-        """初始化回归图构建器"""
-        pass
+    def __init__(self, dpi: int = 300, image_format: str = "png"):
+        """
+        初始化回归图构建器
+
+        Args:
+            dpi: 图像分辨率（位图格式）
+            image_format: 图像格式（png或svg）
+        """
+        self.dpi = dpi
+        self.image_format = image_format
+
+    def __repr__(self) -> str:
+        return f"RegressionChartBuilder(dpi={self.dpi}, image_format={self.image_format!r})"
 
     def build_general_regression(self, regression_result: Dict[str, Any], result_type: str,
                                x_variable: Optional[str] = None,
@@ -51,11 +61,11 @@ class RegressionChartBuilder:
 
         # 保存图表
         if report_dir:
-            image_path = report_dir / f"{result_type}_regression.png"
+            image_path = report_dir / f"{result_type}_regression.{self.image_format}"
         else:
-            image_path = Path(f"{result_type}_regression.png")
+            image_path = Path(f"{result_type}_regression.{self.image_format}")
 
-        save_figure(fig, str(image_path))
+        save_figure(fig, str(image_path), dpi=self.dpi)
         return image_path
 
     def build_single_variable_regression(self, regression_result: Dict[str, Any],
@@ -99,11 +109,11 @@ class RegressionChartBuilder:
 
         # 保存图表
         if report_dir:
-            image_path = report_dir / f"{result_type}_regression.png"
+            image_path = report_dir / f"{result_type}_regression.{self.image_format}"
         else:
-            image_path = Path(f"{result_type}_regression.png")
+            image_path = Path(f"{result_type}_regression.{self.image_format}")
 
-        save_figure(fig, str(image_path))
+        save_figure(fig, str(image_path), dpi=self.dpi)
         return image_path
 
     def _create_composite_regression_plot(self, x_data: List[float], y_data: List[float],
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+图表渲染任务模块
+
+将每张图表描述为可JSON序列化的渲染任务，供进程池并行渲染，
+并保存到报告目录，之后可按需以高分辨率重新导出
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from .scatter import ScatterChartBuilder
+from .regression import RegressionChartBuilder
+from ..regression import RegressionAnalyzer
+from ..utils import tail_latency_types
+
+# 报告目录中保存渲染任务的文件名
+CHART_SPEC_FILE = "charts.json"
+
+
+def build_render_jobs(analysis_data: Dict[str, Any],
+                      regression_results: Dict[str, Dict[str, Any]],
+                      target_variable: str) -> List[Dict[str, Any]]:
+    """
+    生成单变量分析的渲染任务列表
+
+    Args:
+        analysis_data: 分析数据
+        regression_results: 回归结果
+        target_variable: 目标变量
+
+    Returns:
+        渲染任务列表，每个任务包含kind（scatter/regression/tail_latency）、result_type、target_variable和绘图数据
+    """
+    regression_analyzer = RegressionAnalyzer()
+    jobs = []
+
+    for result_type, data in analysis_data['data'].items():
+        if not data.get('mean_values'):
+            continue
+
+        jobs.append({
+            'kind': 'scatter',
+            'result_type': result_type,
+            'target_variable': target_variable,
+            'data': {field: data.get(field, []) for field in ('x_values', 'mean_values', 'std_values')}
+        })
+        if result_type in regression_results:
+            jobs.append({
+                'kind': 'regression',
+                'result_type': result_type,
+                'target_variable': target_variable,
+                'data': regression_analyzer.serialize_result(regression_results[result_type])
+            })
+
+    # 逐token延迟的各分位数合并为一张尾延迟图
+    tail_types = tail_latency_types(analysis_data)
+    if tail_types:
+        jobs.append({
+            'kind': 'tail_latency',
+            'result_type': 'itl',
+            'target_variable': target_variable,
+            'data': {t: {field: analysis_data['data'][t].get(field, []) for field in ('x_values', 'mean_values')}
+                     for t in tail_types}
+        })
+
+    return jobs
+
+
+def render_chart(job: Dict[str, Any], output_dir: Path, dpi: int,
+                 image_format: str) -> Tuple[str, str]:
+    """
+    渲染单张图表
+
+    Args:
+        job: 渲染任务
+        output_dir: 输出目录
+        dpi: 图像分辨率
+        image_format: 图像格式（png或svg）
+
+    Returns:
+        (图像标识, 文件名)
+    """
+    image_key = f"{job['result_type']}_{job['kind']}"
+    if job['kind'] == 'tail_latency':
+        # result_type为itl，图像标识即TAIL_LATENCY_IMAGE_KEY
+        builder = ScatterChartBuilder(dpi, image_format)
+        image_path = builder.build_tail_latency_chart(job['data'], job['target_variable'], Path(output_dir))
+    elif job['kind'] == 'scatter':
+        builder = ScatterChartBuilder(dpi, image_format)
+        image_path = builder.build_single_variable_scatter(
+            job['data'], job['result_type'], job['target_variable'], Path(output_dir)
+        )
+    else:
+        builder = RegressionChartBuilder(dpi, image_format)
+        regression_result = RegressionAnalyzer().restore_result(job['data'])
+        image_path = builder.build_single_variable_regression(
+            regression_result, job['result_type'], job['target_variable'], Path(output_dir)
+        )
+    return image_key, image_path.name
+
+
+def render_task(task: Tuple[Dict[str, Any], str, int, str]) -> Tuple[str, Optional[str], Optional[str]]:
+    """
+    进程池入口：渲染单张图表并捕获异常，单张失败不影响其他图表
+
+    Args:
+        task: (渲染任务, 输出目录, 分辨率, 图像格式)
+
+    Returns:
+        (图像标识, 文件名或None, 错误信息或None)
+    """
+    job, output_dir, dpi, image_format = task
+    try:
+        image_key, filename = render_chart(job, Path(output_dir), dpi, image_format)
+        return image_key, filename, None
+    except Exception as e:
+        return f"{job['result_type']}_{job['kind']}", None, str(e)
+
+
+def save_render_jobs(report_dir: Path, jobs: List[Dict[str, Any]]) -> Path:
+    """
+    保存渲染任务到报告目录
+
+    Args:
+        report_dir: 报告目录
+        jobs: 渲染任务列表
+
+    Returns:
+        任务文件路径
+    """
+    spec_path = Path(report_dir) / CHART_SPEC_FILE
+    with open(spec_path, 'w', encoding='utf-8') as f:
+        json.dump(jobs, f, ensure_ascii=False)
+    return spec_path
+
+
+def load_render_jobs(report_dir: Path) -> List[Dict[str, Any]]:
+    """
+    读取报告目录中保存的渲染任务
+
+    Args:
+        report_dir: 报告目录
+
+    Returns:
+        渲染任务列表
+    """
+    spec_path = Path(report_dir) / CHART_SPEC_FILE
+    if not spec_path.exists():
+        raise FileNotFoundError(f"报告目录中没有图表任务文件: {spec_path}")
+    with open(spec_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
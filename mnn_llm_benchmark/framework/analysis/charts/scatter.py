@@ -9,16 +9,27 @@
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
 
-from .components import create_errorbar_plot, create_scatter_plot, save_figure
-from ..utils import transform_english_name, format_analysis_title, format_analysis_axis_label
+from .components import create_errorbar_plot, create_scatter_plot, create_series_plot, save_figure
+from ..utils import (transform_english_name, format_analysis_title, format_analysis_axis_label,
+                     TAIL_LATENCY_IMAGE_KEY)
 
 
 class ScatterChartBuilder:
     """散点图构建器"""
 
-    def __init__(self):
-        """初始化散点图构建器"""
-        pass
+    def __init__(self, dpi: int = 300, image_format: str = "png"):
+        """
+        初始化散点图构建器
+
+        Args:
+            dpi: 图像分辨率（位图格式）
+            image_format: 图像格式（png或svg）
+        """
+        self.dpi = dpi
+        self.image_format = image_format
+
+    def __repr__(self) -> str:
+        return f"ScatterChartBuilder(dpi={self.dpi}, image_format={self.image_format!r})"
 
     def build_general_scatter(self, data: Dict[str, Any], result_type: str,
                              x_variable: Optional[str] = None,
@@ -47,11 +58,11 @@ class ScatterChartBuilder:
 
         # 保存图表
         if report_dir:
-            image_path = report_dir / f"{result_type}_scatter.png"
+            image_path = report_dir / f"{result_type}_scatter.{self.image_format}"
         else:
-            image_path = Path(f"{result_type}_scatter.png")
+            image_path = Path(f"{result_type}_scatter.{self.image_format}")
 
-        save_figure(fig, str(image_path))
+        save_figure(fig, str(image_path), dpi=self.dpi)
         return image_path
 
     def build_single_variable_scatter(self, data: Dict[str, Any], result_type: str,
@@ -84,11 +95,43 @@ class ScatterChartBuilder:
 
         # 保存图表
         if report_dir:
-            image_path = report_dir / f"{result_type}_scatter.png"
+            image_path = report_dir / f"{result_type}_scatter.{self.image_format}"
         else:
-            image_path = Path(f"{result_type}_scatter.png")
+            image_path = Path(f"{result_type}_scatter.{self.image_format}")
+
+        save_figure(fig, str(image_path), dpi=self.dpi)
+        return image_path
+
+    def build_tail_latency_chart(self, series_data: Dict[str, Dict[str, Any]],
+                                 target_variable: str,
+                                 report_dir: Optional[Path] = None) -> Path:
+        """
+        构建尾延迟图：同一目标变量下各token间隔分位数（P50/P95/P99）的对比
+
+        Args:
+            series_data: {结果类型: 数据字典（x_values、mean_values）}
+            target_variable: 目标变量名
+            report_dir: 报告目录
+
+        Returns:
+            图像文件路径
+        """
+        series = {}
+        for result_type, data in series_data.items():
+            x_data, y_data, _ = self._prepare_single_variable_data(data, target_variable)
+            if x_data:
+                series[result_type.replace('itl_', 'ITL ').upper()] = (x_data, y_data)
+
+        if not series:
+            raise ValueError("没有有效的数据点绘制尾延迟图")
+
+        x_label = transform_english_name(target_variable)
+        fig = create_series_plot(series, f"Inter-Token Latency Percentiles vs {x_label}",
+                                 x_label, "Inter-Token Latency (ms)")
 
-        save_figure(fig, str(image_path))
+        filename = f"{TAIL_LATENCY_IMAGE_KEY}.{self.image_format}"
+        image_path = report_dir / filename if report_dir else Path(filename)
+        save_figure(fig, str(image_path), dpi=self.dpi)
         return image_path
 
     def _prepare_scatter_data(self, data: Dict[str, Any],
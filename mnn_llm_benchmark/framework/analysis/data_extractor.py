@@ -9,23 +9,33 @@
 import sqlite3
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
+from benchmark.core.environment import DEFAULT_ENVIRONMENT_GUARD
 from config.system import SystemConfig
+from utils.db_manager import DatabaseManager
 from utils.logger import LoggerManager
 
 
 class DataExtractor:
     """数据库数据提取器"""
 
-    def __init__(self):
-        """初始化数据提取器"""
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        初始化数据提取器
+
+        Args:
+            db_path: 数据库文件路径，默认读取系统配置
+        """
         self.logger = LoggerManager.get_logger("DataExtractor")
         self.system_config = SystemConfig()
 
         # 数据库路径
-        database_config = self.system_config.get_config("database")
-        db_dir = database_config.get("db_dir", "data")
-        db_file = database_config.get("db_file", "benchmark_results.db")
-        self.db_path = Path(db_dir) / db_file
+        if db_path:
+            self.db_path = Path(db_path)
+        else:
+            database_config = self.system_config.get_config("database")
+            db_dir = database_config.get("db_dir", "data")
+            db_file = database_config.get("db_file", "benchmark_results.db")
+            self.db_path = Path(db_dir) / db_file
 
         # 如果是相对路径，需要相对于项目根目录
         if not self.db_path.is_absolute():
@@ -36,6 +46,13 @@ class DataExtractor:
         if not self.db_path.exists():
             raise FileNotFoundError(f"数据库文件不存在: {self.db_path}")
 
+        # 确保数据库已迁移到最新模式（变量数值列value_num等）
+        DatabaseManager(str(self.db_path))
+
+        # 是否排除执行期间受环境干扰的用例（[environment_guard].exclude_from_analysis）
+        guard_config = {**DEFAULT_ENVIRONMENT_GUARD, **self.system_config.get_config("environment_guard")}
+        self.case_filter = " AND cd.interference IS NULL" if guard_config["exclude_from_analysis"] else ""
+
     def get_suite_list(self) -> List[Dict[str, Any]]:
         """
         获取所有可用的suite列表
@@ -86,11 +103,10 @@ class DataExtractor:
                 cursor = conn.cursor()
 
                 cursor.execute("""
-                    SELECT DISTINCT cvv.variable_name
-                    FROM case_variable_values cvv
-                    JOIN case_definitions cd ON cvv.case_id = cd.id
-                    WHERE cd.suite_id = ?
-                    ORDER BY cvv.variable_name
+                    SELECT DISTINCT variable_name
+                    FROM case_variable_values
+                    WHERE suite_id = ?
+                    ORDER BY variable_name
                 """, (suite_id,))
 
                 variables = [row[0] for row in cursor.fetchall()]
@@ -129,6 +145,198 @@ class DataExtractor:
             self.logger.error(f"获取结果类型失败: {e}")
             raise
 
+    def get_suite_data_version(self, suite_id: int) -> str:
+        """
+        计算suite数据版本：用例与结果的行数和最大ID组成的内容标识
+
+        新增或删除用例、追加结果都会改变该值，用于分析缓存失效判断
+
+        Args:
+            suite_id: suite ID
+
+        Returns:
+            数据版本字符串
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"""
+                    SELECT COUNT(*), COALESCE(MAX(id), 0)
+                    FROM case_definitions cd WHERE suite_id = ?{self.case_filter}
+                """, (suite_id,))
+                case_count, max_case_id = cursor.fetchone()
+                cursor.execute(f"""
+                    SELECT COUNT(br.id), COALESCE(MAX(br.id), 0)
+                    FROM benchmark_results br
+                    JOIN case_definitions cd ON br.case_id = cd.id
+                    WHERE cd.suite_id = ?{self.case_filter}
+                """, (suite_id,))
+                result_count, max_result_id = cursor.fetchone()
+
+            return f"c{case_count}.{max_case_id}-r{result_count}.{max_result_id}"
+
+        except Exception as e:
+            self.logger.error(f"获取suite数据版本失败: {e}")
+            raise
+
+    def get_task_suite_ids(self, task_id: int) -> List[int]:
+        """
+        获取任务下的suite ID列表
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            suite ID列表
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT id FROM suites WHERE task_id = ? ORDER BY id", (task_id,))
+                return [row[0] for row in cursor.fetchall()]
+
+        except Exception as e:
+            self.logger.error(f"获取任务suite列表失败: {e}")
+            raise
+
+    def extract_batch_data(self, suite_ids: List[int],
+                           result_types: Optional[List[str]] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        一次查询提取多个suite的变量和结果数据，供批量回归分析使用
+
+        Args:
+            suite_ids: suite ID列表
+            result_types: 要分析的结果类型列表（可选，默认全部）
+
+        Returns:
+            {suite_id: {'variables': {case_id: {变量名: 值}}, 'results': [(case_id, 结果类型, 均值)]}}
+        """
+        if not suite_ids:
+            return {}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                placeholders = ','.join(['?' for _ in suite_ids])
+                batch_data = {suite_id: {'variables': {}, 'results': []} for suite_id in suite_ids}
+
+                cursor.execute(f"""
+                    SELECT suite_id, case_id, variable_name, variable_value, value_num
+                    FROM case_variable_values
+                    WHERE suite_id IN ({placeholders})
+                """, suite_ids)
+                for suite_id, case_id, var_name, var_value, value_num in cursor.fetchall():
+                    batch_data[suite_id]['variables'].setdefault(case_id, {})[var_name] = (
+                        var_value if value_num is None else self._typed_value(value_num))
+
+                query = f"""
+                    SELECT cd.suite_id, br.case_id, br.result_type, br.mean_value
+                    FROM benchmark_results br
+                    JOIN case_definitions cd ON br.case_id = cd.id
+                    WHERE cd.suite_id IN ({placeholders}){self.case_filter}
+                """
+                params = list(suite_ids)
+                if result_types:
+                    query += f" AND br.result_type IN ({','.join(['?' for _ in result_types])})"
+                    params.extend(result_types)
+                cursor.execute(query + " ORDER BY br.case_id", params)
+                for suite_id, case_id, result_type, mean_value in cursor.fetchall():
+                    batch_data[suite_id]['results'].append((case_id, result_type, mean_value))
+
+                return batch_data
+
+        except Exception as e:
+            self.logger.error(f"提取批量分析数据失败: {e}")
+            raise
+
+    def get_task_runs(self, task_id: int) -> List[Dict[str, Any]]:
+        """
+        获取与指定任务同名（original_name相同）的全部运行，按任务ID升序
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            任务信息列表 [{'id', 'name', 'original_name', 'run_number', 'status', 'created_at'}]，
+            任务不存在时返回空列表
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT t.id, t.name, t.original_name, t.run_number, t.status, t.created_at
+                    FROM tasks t
+                    JOIN tasks target ON COALESCE(t.original_name, t.name) = COALESCE(target.original_name, target.name)
+                    WHERE target.id = ?
+                    ORDER BY t.id
+                """, (task_id,))
+                columns = ['id', 'name', 'original_name', 'run_number', 'status', 'created_at']
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+        except Exception as e:
+            self.logger.error(f"获取任务运行列表失败: {e}")
+            raise
+
+    def extract_task_results(self, task_id: int,
+                             result_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        提取任务中所有成功用例的结果，附带用例参数指纹，供跨任务匹配
+
+        旧数据没有case_hash时由case_variable_values重新计算（只读，不回填）。
+
+        Args:
+            task_id: 任务ID
+            result_types: 要提取的结果类型列表（可选，默认全部）
+
+        Returns:
+            结果列表，每项包含suite_name、model_name、case_id、case_name、case_hash、params、
+            result_type、result_parameter、mean、std、sample_count、unit
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                query = f"""
+                    SELECT s.name, s.model_name, cd.id, cd.name, cd.case_hash,
+                           br.result_type, br.result_parameter, br.mean_value, br.std_value,
+                           br.sample_count, br.unit
+                    FROM benchmark_results br
+                    JOIN case_definitions cd ON br.case_id = cd.id
+                    JOIN suites s ON cd.suite_id = s.id
+                    WHERE s.task_id = ? AND cd.status = 'success'{self.case_filter}
+                """
+                params = [task_id]
+                if result_types:
+                    query += f" AND br.result_type IN ({','.join(['?' for _ in result_types])})"
+                    params.extend(result_types)
+                cursor.execute(query + " ORDER BY cd.id, br.result_type", params)
+                rows = cursor.fetchall()
+
+                case_ids = sorted({row[2] for row in rows})
+                variables = self._extract_variables_data(cursor, case_ids) if case_ids else {}
+
+                results = []
+                for (suite_name, model_name, case_id, case_name, case_hash, result_type, result_parameter,
+                     mean_value, std_value, sample_count, unit) in rows:
+                    case_params = variables.get(case_id, {})
+                    results.append({
+                        'suite_name': suite_name,
+                        'model_name': model_name,
+                        'case_id': case_id,
+                        'case_name': case_name,
+                        'case_hash': case_hash or DatabaseManager.compute_case_hash(model_name, case_params),
+                        'params': case_params,
+                        'result_type': result_type,
+                        'result_parameter': result_parameter,
+                        'mean': mean_value,
+                        'std': std_value,
+                        'sample_count': sample_count,
+                        'unit': unit
+                    })
+                return results
+
+        except Exception as e:
+            self.logger.error(f"提取任务结果失败: {e}")
+            raise
+
     def get_variable_median_values(self, suite_id: int) -> Dict[str, Any]:
         """
         获取套件中各变量的中位数值
@@ -143,37 +351,22 @@ class DataExtractor:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
 
-                # 获取所有变量及其取值
+                # 数值变量按value_num排序取出，非数值变量的value_num为NULL
                 cursor.execute("""
-                    SELECT cvv.variable_name, cvv.variable_value
-                    FROM case_variable_values cvv
-                    JOIN case_definitions cd ON cvv.case_id = cd.id
-                    WHERE cd.suite_id = ?
-                    ORDER BY cvv.variable_name, cvv.variable_value
+                    SELECT variable_name, value_num
+                    FROM case_variable_values
+                    WHERE suite_id = ? AND value_num IS NOT NULL
+                    ORDER BY variable_name, value_num
                 """, (suite_id,))
 
                 variable_values = {}
-                for row in cursor.fetchall():
-                    var_name, var_value = row
-                    if var_name not in variable_values:
-                        variable_values[var_name] = []
-
-                    try:
-                        # 尝试转换为数值
-                        if '.' in var_value:
-                            num_value = float(var_value)
-                        else:
-                            num_value = int(var_value)
-                        variable_values[var_name].append(num_value)
-                    except ValueError:
-                        # 如果不是数值，跳过
-                        continue
+                for var_name, value_num in cursor.fetchall():
+                    variable_values.setdefault(var_name, []).append(self._typed_value(value_num))
 
                 # 计算每个变量的中位数
                 median_values = {}
                 for var_name, values in variable_values.items():
                     if len(values) > 1:  # 至少有两个不同的值才有意义
-                        values.sort()
                         n = len(values)
                         if n % 2 == 0:
                             median_values[var_name] = (values[n//2 - 1] + values[n//2]) / 2
@@ -203,27 +396,16 @@ class DataExtractor:
         try:
             placeholders = ','.join(['?' for _ in case_ids])
             cursor.execute(f"""
-                SELECT case_id, variable_name, variable_value
+                SELECT case_id, variable_name, variable_value, value_num
                 FROM case_variable_values
                 WHERE case_id IN ({placeholders})
                 ORDER BY case_id, variable_name
             """, case_ids)
 
             variables_data = {}
-            for row in cursor.fetchall():
-                case_id, var_name, var_value = row
-
-                if case_id not in variables_data:
-                    variables_data[case_id] = {}
-
-                # 尝试转换为数值
-                try:
-                    if '.' in var_value:
-                        variables_data[case_id][var_name] = float(var_value)
-                    else:
-                        variables_data[case_id][var_name] = int(var_value)
-                except ValueError:
-                    variables_data[case_id][var_name] = var_value
+            for case_id, var_name, var_value, value_num in cursor.fetchall():
+                variables_data.setdefault(case_id, {})[var_name] = (
+                    var_value if value_num is None else self._typed_value(value_num))
 
             return variables_data
 
@@ -231,6 +413,62 @@ class DataExtractor:
             self.logger.error(f"提取变量数据失败: {e}")
             raise
 
+    @staticmethod
+    def _typed_value(value_num: float) -> Any:
+        """
+        数值列取值转换为Python数值，整数值返回int
+
+        Args:
+            value_num: case_variable_values.value_num
+
+        Returns:
+            int或float
+        """
+        return int(value_num) if float(value_num).is_integer() else value_num
+
+    def _filter_cases_by_params(self, cursor, case_ids: List[int], target_variable: str,
+                                fixed_params: Dict[str, Any]) -> List[int]:
+        """
+        在SQL中按固定参数筛选案例
+
+        数值参数通过(suite_id, variable_name, value_num)索引比较（允许1e-6误差），
+        其他参数按字符串精确匹配。
+
+        Args:
+            cursor: 数据库游标
+            case_ids: 候选案例ID列表
+            target_variable: 目标分析变量（不参与筛选）
+            fixed_params: 固定参数字典
+
+        Returns:
+            符合条件的案例ID列表
+        """
+        placeholders = ','.join(['?' for _ in case_ids])
+        query = f"SELECT cd.id FROM case_definitions cd WHERE cd.id IN ({placeholders})"
+        params: List[Any] = list(case_ids)
+
+        for param_name, param_value in fixed_params.items():
+            if param_name == target_variable:
+                continue  # 跳过目标变量
+
+            query += """
+                AND EXISTS (
+                    SELECT 1 FROM case_variable_values cvv
+                    WHERE cvv.suite_id = cd.suite_id AND cvv.case_id = cd.id AND cvv.variable_name = ?
+            """
+            params.append(param_name)
+            try:
+                fixed_numeric = float(param_value)
+                query += " AND cvv.value_num BETWEEN ? AND ?)"
+                params.extend([fixed_numeric - 1e-6, fixed_numeric + 1e-6])
+            except (TypeError, ValueError):
+                # 字符串类型需要精确匹配
+                query += " AND cvv.variable_value = ?)"
+                params.append(str(param_value))
+
+        cursor.execute(query + " ORDER BY cd.id", params)
+        return [row[0] for row in cursor.fetchall()]
+
     def validate_analysis_parameters(self, suite_id: int,
                                    x_variable: Optional[str] = None,
                                    y_variable: Optional[str] = None) -> Tuple[bool, str]:
@@ -305,7 +543,7 @@ class DataExtractor:
                     result_types = self.get_suite_result_types(suite_id)
 
                 # 构建基本查询
-                base_query = """
+                base_query = f"""
                     SELECT
                         cd.id as case_id,
                         cd.name as case_name,
@@ -316,7 +554,7 @@ class DataExtractor:
                         br.unit
                     FROM case_definitions cd
                     JOIN benchmark_results br ON cd.id = br.case_id
-                    WHERE cd.suite_id = ?
+                    WHERE cd.suite_id = ?{self.case_filter}
                 """
                 params = [suite_id]
 
@@ -352,38 +590,8 @@ class DataExtractor:
                 variables_data = self._extract_variables_data(cursor, case_ids)
 
                 # 单变量分析: 筛选符合条件的案例
-                filtered_case_ids = []
                 if fixed_params:
-                    for case_id in case_ids:
-                        should_include = True
-
-                        # 检查固定参数是否匹配
-                        for param_name, param_value in fixed_params.items():
-                            if param_name == target_variable:
-                                continue  # 跳过目标变量
-
-                            case_var_value = variables_data.get(case_id, {}).get(param_name)
-                            if case_var_value is None:
-                                should_include = False
-                                break
-
-                            # 比较变量值是否匹配固定值
-                            try:
-                                case_numeric = float(case_var_value) if isinstance(case_var_value, str) else case_var_value
-                                fixed_numeric = float(param_value) if isinstance(param_value, str) else param_value
-
-                                # 允许小数精度误差
-                                if abs(case_numeric - fixed_numeric) > 1e-6:
-                                    should_include = False
-                                    break
-                            except (ValueError, TypeError):
-                                # 字符串类型需要精确匹配
-                                if str(case_var_value) != str(param_value):
-                                    should_include = False
-                                    break
-
-                        if should_include:
-                            filtered_case_ids.append(case_id)
+                    filtered_case_ids = self._filter_cases_by_params(cursor, case_ids, target_variable, fixed_params)
 
                     if not filtered_case_ids:
                         self.logger.warning("没有找到符合条件的案例进行单变量分析")
@@ -391,6 +599,7 @@ class DataExtractor:
                         filtered_case_ids = case_ids
                 else:
                     filtered_case_ids = case_ids
+                filtered_set = set(filtered_case_ids)
 
                 self.logger.info(f"单变量分析筛选: 从{len(case_ids)}个案例中选择了{len(filtered_case_ids)}个案例")
 
@@ -414,7 +623,7 @@ class DataExtractor:
                 # 只处理筛选后的案例的数据
                 for row in rows:
                     case_id, case_name, result_type, result_param, mean_val, std_val, unit = row
-                    if case_id not in filtered_case_ids:
+                    if case_id not in filtered_set:
                         continue
 
                     # 按结果类型组织数据
@@ -201,6 +201,50 @@ class RegressionAnalyzer:
         """幂函数 y = a * x^b"""
         return a * np.power(x, b)
 
+    def predict(self, analysis_result: Dict[str, Any], x_data: np.ndarray) -> np.ndarray:
+        """
+        使用analyze_regression的结果预测新的X值
+
+        Args:
+            analysis_result: analyze_regression返回的结果
+            x_data: X轴数据
+
+        Returns:
+            预测的Y值
+        """
+        return self._predict_values(analysis_result['regression'], np.asarray(x_data, dtype=float))
+
+    def serialize_result(self, analysis_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        转换为可JSON保存的结果（去掉不可序列化的拟合函数，按method名恢复）
+
+        Args:
+            analysis_result: analyze_regression返回的结果
+
+        Returns:
+            可序列化的结果副本
+        """
+        result = dict(analysis_result)
+        result['regression'] = {k: v for k, v in analysis_result['regression'].items() if k != 'function'}
+        return result
+
+    def restore_result(self, cached_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        从serialize_result的结果恢复，重新绑定非线性拟合函数
+
+        Args:
+            cached_result: 缓存的回归结果
+
+        Returns:
+            可直接用于预测和绘图的回归结果
+        """
+        result = dict(cached_result)
+        regression = dict(cached_result['regression'])
+        if regression['method'] != 'linear':
+            regression['function'] = getattr(self, f"_{regression['method']}_func")
+        result['regression'] = regression
+        return result
+
     def _predict_values(self, regression_result: Dict[str, Any], x_data: np.ndarray) -> np.ndarray:
         """
         使用回归结果预测Y值
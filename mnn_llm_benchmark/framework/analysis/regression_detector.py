@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能回退检测模块
+
+在同一YAML任务的多次运行之间（如每次重新编译MNN之后）检测性能变化：
+- 按 (套件名, 用例参数指纹, 结果类型, 结果参数) 匹配两次运行中的用例
+- 用存储的均值、标准差和样本数做Welch t检验，Benjamini-Hochberg控制多重比较的错误发现率
+- 基线可以是指定任务，也可以是同名任务最近若干次运行的合并统计（滚动基线）
+- 较长的历史上逐项做单变点检测，定位变化发生在哪一次运行
+吞吐量（tokens/sec）越高越好，其余结果类型（内存、缺页、耗时）越低越好。
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+from scipy import stats
+
+from benchmark.core.adaptive import combine_samples
+from config.system import SystemConfig
+from utils.logger import LoggerManager
+
+# 默认检测配置（system.toml的[regression]节可覆盖）
+DEFAULT_REGRESSION_CONFIG = {
+    "alpha": 0.05,          # 错误发现率（BH校正后的q值阈值）
+    "min_change": 0.02,     # 最小相对变化，小于该值的显著差异不报告
+    "baseline_runs": 3,     # 滚动基线合并的最近运行次数
+    "default_repeat": 5,    # 结果没有记录样本数且用例未指定n_repeat时的样本数（llm_bench_prompt默认值）
+    "min_segment": 1        # 变点检测时变点两侧至少包含的运行次数（每次运行自带重复样本，可为1）
+}
+
+# 越高越好的结果单位，其余单位越低越好
+HIGHER_IS_BETTER_UNITS = ("tokens/sec",)
+
+# 结果匹配键：(套件名, 用例参数指纹, 结果类型, 结果参数)
+ResultKey = Tuple[str, str, str, str]
+
+
+def welch_test(mean_a: float, std_a: float, n_a: int,
+               mean_b: float, std_b: float, n_b: int) -> Optional[float]:
+    """
+    由汇总统计量做双侧Welch t检验
+
+    Args:
+        mean_a, std_a, n_a: 第一组均值、样本标准差、样本数
+        mean_b, std_b, n_b: 第二组均值、样本标准差、样本数
+
+    Returns:
+        p值；任一组样本数不足2时返回None。两组标准差都为0时，均值不同返回0，否则返回1
+    """
+    if n_a < 2 or n_b < 2:
+        return None
+    if (std_a or 0.0) == 0.0 and (std_b or 0.0) == 0.0:
+        return 0.0 if mean_a != mean_b else 1.0
+    _, p_value = stats.ttest_ind_from_stats(mean_a, std_a or 0.0, n_a, mean_b, std_b or 0.0, n_b, equal_var=False)
+    return float(p_value) if math.isfinite(p_value) else None
+
+
+def benjamini_hochberg(p_values: List[Optional[float]]) -> List[Optional[float]]:
+    """
+    Benjamini-Hochberg校正，返回与输入顺序一致的q值（None保持为None）
+
+    Args:
+        p_values: p值列表
+
+    Returns:
+        q值列表
+    """
+    indexed = sorted((p, i) for i, p in enumerate(p_values) if p is not None)
+    q_values: List[Optional[float]] = [None] * len(p_values)
+    total = len(indexed)
+    running_min = 1.0
+    for rank in range(total, 0, -1):
+        p_value, index = indexed[rank - 1]
+        running_min = min(running_min, p_value * total / rank)
+        q_values[index] = running_min
+    return q_values
+
+
+class RegressionDetector:
+    """跨任务性能回退检测器"""
+
+    def __init__(self, extractor, config: Optional[Dict[str, Any]] = None):
+        """
+        初始化检测器
+
+        Args:
+            extractor: DataExtractor实例
+            config: 检测配置，缺省项依次取system.toml的[regression]节和DEFAULT_REGRESSION_CONFIG
+        """
+        self.logger = LoggerManager.get_logger("RegressionDetector")
+        self.extractor = extractor
+        self.config = {
+            **DEFAULT_REGRESSION_CONFIG,
+            **SystemConfig().get_config('regression'),
+            **{k: v for k, v in (config or {}).items() if v is not None}
+        }
+
+    def __repr__(self) -> str:
+        return f"RegressionDetector(alpha={self.config['alpha']}, min_change={self.config['min_change']})"
+
+    def rolling_baseline(self, candidate_task_id: int, runs: Optional[int] = None) -> List[int]:
+        """
+        选取滚动基线：候选任务之前同名任务最近的若干次已完成运行
+
+        Args:
+            candidate_task_id: 候选任务ID
+            runs: 合并的运行次数，默认取配置baseline_runs
+
+        Returns:
+            基线任务ID列表（升序）
+        """
+        runs = runs or self.config['baseline_runs']
+        previous = [task['id'] for task in self.extractor.get_task_runs(candidate_task_id)
+                    if task['id'] < candidate_task_id and task['status'] != 'pending']
+        return previous[-runs:]
+
+    def compare(self, candidate_task_id: int, baseline_task_ids: List[int],
+                result_types: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        比较候选任务与基线任务
+
+        Args:
+            candidate_task_id: 候选任务ID（如重新编译后的运行）
+            baseline_task_ids: 基线任务ID列表，多个任务时合并为一组样本
+            result_types: 要比较的结果类型列表（可选，默认全部）
+
+        Returns:
+            {'candidate', 'baseline', 'findings': 按严重程度排序的变化列表,
+             'stats': {'matched', 'regressions', 'improvements', 'unchanged', 'untestable',
+                       'candidate_only', 'baseline_only'}}
+        """
+        if not baseline_task_ids:
+            raise ValueError(f"任务 {candidate_task_id} 没有可用的基线运行")
+
+        candidate = self._task_samples(candidate_task_id, result_types)
+        if not candidate:
+            raise ValueError(f"任务 {candidate_task_id} 没有可比较的结果")
+        baseline_runs = [self._task_samples(task_id, result_types) for task_id in baseline_task_ids]
+        baseline = {}
+        for key in set().union(*baseline_runs):
+            samples = [run[key] for run in baseline_runs if key in run]
+            baseline[key] = self._pool(samples)
+
+        matched = sorted(set(candidate) & set(baseline))
+        comparisons = [self._compare_samples(key, baseline[key], candidate[key]) for key in matched]
+        self._classify(comparisons)
+
+        result = {
+            'candidate': candidate_task_id,
+            'baseline': list(baseline_task_ids),
+            'findings': self._rank(comparisons),
+            'stats': {
+                **self._count(comparisons),
+                'matched': len(matched),
+                'candidate_only': len(set(candidate) - set(baseline)),
+                'baseline_only': len(set(baseline) - set(candidate))
+            }
+        }
+        self.logger.info(f"回退检测完成: 任务 {candidate_task_id} vs {baseline_task_ids}, {result['stats']}")
+        return result
+
+    def detect_change_points(self, task_ids: List[int],
+                             result_types: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        在多次运行的历史上逐项做单变点检测
+
+        对每个结果项，依次尝试把运行序列切分为前后两段，取Welch检验p值最小的切分点，
+        再对所有结果项的最小p值做BH校正。
+
+        Args:
+            task_ids: 按时间顺序排列的任务ID列表
+            result_types: 要检测的结果类型列表（可选，默认全部）
+
+        Returns:
+            {'tasks', 'findings': 变点列表（change_task为变化后的第一次运行）, 'stats'}
+        """
+        min_segment = max(1, int(self.config['min_segment']))
+        if len(task_ids) < 2 * min_segment:
+            raise ValueError(f"变点检测至少需要 {2 * min_segment} 次运行，当前 {len(task_ids)} 次")
+
+        runs = [self._task_samples(task_id, result_types) for task_id in task_ids]
+        keys = sorted(set().union(*runs))
+
+        comparisons = []
+        for key in keys:
+            series = [(task_id, run[key]) for task_id, run in zip(task_ids, runs) if key in run]
+            best = None
+            for split in range(min_segment, len(series) - min_segment + 1):
+                before = self._pool([sample for _, sample in series[:split]])
+                after = self._pool([sample for _, sample in series[split:]])
+                comparison = self._compare_samples(key, before, after)
+                if comparison['p_value'] is None:
+                    continue
+                if best is None or comparison['p_value'] < best['p_value']:
+                    best = {**comparison, 'change_task': series[split][0],
+                            'history': [round(sample['mean'], 4) for _, sample in series]}
+            if best is not None:
+                comparisons.append(best)
+
+        self._classify(comparisons)
+        return {
+            'tasks': list(task_ids),
+            'findings': self._rank(comparisons),
+            'stats': {**self._count(comparisons), 'matched': len(keys)}
+        }
+
+    def _task_samples(self, task_id: int, result_types: Optional[List[str]]) -> Dict[ResultKey, Dict[str, Any]]:
+        """提取任务结果并按匹配键索引，样本数依次取sample_count、用例n_repeat、默认值"""
+        samples = {}
+        for row in self.extractor.extract_task_results(task_id, result_types):
+            key = (row['suite_name'], row['case_hash'], row['result_type'], str(row['result_parameter']))
+            n_repeat = row['params'].get('n_repeat')
+            try:
+                count = int(row['sample_count'] or n_repeat or self.config['default_repeat'])
+            except (TypeError, ValueError):
+                count = int(self.config['default_repeat'])
+            samples[key] = {
+                'mean': float(row['mean']),
+                'std': float(row['std'] or 0.0),
+                'n': count,
+                'unit': row['unit'] or '',
+                'model_name': row['model_name'],
+                'case_name': row['case_name'],
+                'params': row['params']
+            }
+        return samples
+
+    @staticmethod
+    def _pool(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """合并多次运行的同一结果项为一组样本"""
+        if len(samples) == 1:
+            return samples[0]
+        mean, std, count = combine_samples([(s['mean'], s['std'], s['n']) for s in samples])
+        return {**samples[-1], 'mean': mean, 'std': std, 'n': count}
+
+    def _compare_samples(self, key: ResultKey, before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+        """比较同一结果项的前后两组样本"""
+        suite_name, case_hash, result_type, result_parameter = key
+        change = (after['mean'] - before['mean']) / abs(before['mean']) if before['mean'] else None
+        return {
+            'suite_name': suite_name,
+            'model_name': after['model_name'],
+            'case_name': after['case_name'],
+            'case_hash': case_hash,
+            'params': after['params'],
+            'result_type': result_type,
+            'result_parameter': result_parameter,
+            'unit': after['unit'],
+            'baseline_mean': round(before['mean'], 4),
+            'baseline_std': round(before['std'], 4),
+            'baseline_n': before['n'],
+            'candidate_mean': round(after['mean'], 4),
+            'candidate_std': round(after['std'], 4),
+            'candidate_n': after['n'],
+            'relative_change': round(change, 6) if change is not None else None,
+            'p_value': welch_test(before['mean'], before['std'], before['n'],
+                                  after['mean'], after['std'], after['n'])
+        }
+
+    def _classify(self, comparisons: List[Dict[str, Any]]) -> None:
+        """BH校正后按显著性、变化幅度和结果类型的优劣方向标记状态"""
+        q_values = benjamini_hochberg([c['p_value'] for c in comparisons])
+        for comparison, q_value in zip(comparisons, q_values):
+            comparison['q_value'] = q_value
+            change = comparison['relative_change']
+            if q_value is None or change is None:
+                comparison['status'] = 'untestable'
+            elif q_value >= self.config['alpha'] or abs(change) < self.config['min_change']:
+                comparison['status'] = 'unchanged'
+            else:
+                higher_is_better = comparison['unit'] in HIGHER_IS_BETTER_UNITS
+                worse = change < 0 if higher_is_better else change > 0
+                comparison['status'] = 'regression' if worse else 'improvement'
+            # 统一为"变差幅度"，正值表示变差，便于排序
+            if change is not None:
+                comparison['slowdown'] = round(-change if comparison['unit'] in HIGHER_IS_BETTER_UNITS else change, 6)
+
+    @staticmethod
+    def _rank(comparisons: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """显著的变化按变差幅度排序：回退在前（最严重的最先），改进在后"""
+        findings = [c for c in comparisons if c['status'] in ('regression', 'improvement')]
+        return sorted(findings, key=lambda c: (c['status'] != 'regression', -abs(c['slowdown'])))
+
+    @staticmethod
+    def _count(comparisons: List[Dict[str, Any]]) -> Dict[str, int]:
+        """统计各状态数量"""
+        counts = {'regressions': 0, 'improvements': 0, 'unchanged': 0, 'untestable': 0}
+        names = {'regression': 'regressions', 'improvement': 'improvements',
+                 'unchanged': 'unchanged', 'untestable': 'untestable'}
+        for comparison in comparisons:
+            counts[names[comparison['status']]] += 1
+        return counts
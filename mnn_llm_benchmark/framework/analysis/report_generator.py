@@ -6,6 +6,7 @@
 负责协调图表生成、格式化和打包
 """
 
+import json
 import zipfile
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -25,6 +26,9 @@ except ImportError:
     sys.path.insert(0, str(framework_dir))
     from db.analysis_manager import AnalysisManager
 
+# 交互式图表数据文件名
+REPORT_DATA_FILE = "report_data.json"
+
 
 class ReportGenerator:
     """分析报告生成器"""
@@ -49,7 +53,8 @@ class ReportGenerator:
                                        suite_info: Dict[str, Any],
                                        target_variable: str,
                                        fixed_params: Optional[Dict[str, Any]] = None,
-                                       start_time: Optional[datetime] = None) -> str:
+                                       start_time: Optional[datetime] = None,
+                                       reuse_dirs: Optional[Dict[str, Path]] = None) -> str:
         """
         生成单变量分析报告
 
@@ -60,6 +65,7 @@ class ReportGenerator:
             target_variable: 目标变量名
             fixed_params: 固定参数字典
             start_time: 开始时间（用于统一时间戳）
+            reuse_dirs: 数据未变化的结果类型 -> 已有报告目录（复用图表）
 
         Returns:
             报告目录路径
@@ -72,13 +78,20 @@ class ReportGenerator:
 
             # 生成单变量分析图表
             images_info = self.chart_generator.generate_single_variable_charts(
-                report_dir, analysis_data, regression_results, target_variable
+                report_dir, analysis_data, regression_results, target_variable, reuse_dirs
+            )
+
+            # 交互式图表数据块（内嵌到HTML，同时保存为report_data.json供其他报告叠加对比）
+            chart_data = HTMLFormatter.build_chart_data(
+                analysis_data, regression_results, suite_info, target_variable
             )
+            with open(report_dir / REPORT_DATA_FILE, 'w', encoding='utf-8') as f:
+                json.dump(chart_data, f, ensure_ascii=False, separators=(',', ':'))
 
             # 生成HTML报告
             html_path = self._generate_single_variable_html_report(
                 report_dir, analysis_data, regression_results, suite_info,
-                target_variable, fixed_params, images_info
+                target_variable, fixed_params, images_info, chart_data
             )
 
             # 生成Markdown报告
@@ -205,11 +218,17 @@ class ReportGenerator:
             # 添加Markdown文件
             zf.write(md_path, "analysis_report.md")
 
-            # 添加图像文件
+            # 添加交互式图表数据
+            data_path = report_dir / REPORT_DATA_FILE
+            if data_path.exists():
+                zf.write(data_path, REPORT_DATA_FILE)
+
+            # 添加图像文件（PNG本身已压缩，直接存储避免重复压缩）
             for image_info in images_info.values():
                 image_path = report_dir / image_info
                 if image_path.exists():
-                    zf.write(image_path, image_path.name)
+                    compress_type = zipfile.ZIP_STORED if image_path.suffix == '.png' else zipfile.ZIP_DEFLATED
+                    zf.write(image_path, image_path.name, compress_type=compress_type)
 
         return archive_path
 
@@ -219,7 +238,8 @@ class ReportGenerator:
                                              suite_info: Dict[str, Any],
                                              target_variable: str,
                                              fixed_params: Optional[Dict[str, Any]],
-                                             images_info: Dict[str, str]) -> Path:
+                                             images_info: Dict[str, str],
+                                             chart_data: Optional[Dict[str, Any]] = None) -> Path:
         """
         生成单变量分析HTML报告
 
@@ -231,16 +251,15 @@ class ReportGenerator:
             target_variable: 目标变量
             fixed_params: 固定参数
             images_info: 图像信息
+            chart_data: 交互式图表数据块
 
         Returns:
             HTML文件路径
         """
-        from .reports.html_formatter import HTMLFormatter
-
         formatter = HTMLFormatter()
         html_content = formatter.build_single_variable_html(
             analysis_data, regression_results, suite_info,
-            target_variable, fixed_params, images_info
+            target_variable, fixed_params, images_info, chart_data
         )
 
         html_path = report_dir / "analysis_report.html"
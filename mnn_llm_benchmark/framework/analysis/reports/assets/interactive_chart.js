@@ -0,0 +1,254 @@
+// 分析报告交互式图表：读取内嵌的reportData数据块，在浏览器中绘制SVG
+// 支持框选缩放（双击还原）、X范围/用例名称筛选，以及叠加其他模型的同变量分析
+// data-result-types指定多个结果类型时在同一图中对比（如尾延迟图的ITL各分位数）
+(function () {
+    const SVG_NS = 'http://www.w3.org/2000/svg';
+    const HEIGHT = 420;
+    const MARGIN = {top: 20, right: 20, bottom: 50, left: 70};
+    const COLORS = ['#2c7fb8', '#e6550d', '#31a354', '#756bb1', '#d62728', '#8c564b'];
+    const OVERLAY_API = '/api/analysis/overlays';
+
+    // 与RegressionAnalyzer中的拟合函数保持一致
+    const FIT_FUNCTIONS = {
+        linear: (x, fit) => fit.slope * x + fit.intercept,
+        quadratic: (x, fit) => fit.params[0] * x * x + fit.params[1] * x + fit.params[2],
+        exponential: (x, fit) => fit.params[0] * Math.exp(fit.params[1] * x),
+        logarithmic: (x, fit) => fit.params[0] * Math.log(x + 1) + fit.params[1],
+        power: (x, fit) => fit.params[0] * Math.pow(x, fit.params[1])
+    };
+
+    function el(name, attrs, parent) {
+        const node = document.createElementNS(SVG_NS, name);
+        Object.entries(attrs || {}).forEach(([key, value]) => node.setAttribute(key, value));
+        if (parent) parent.appendChild(node);
+        return node;
+    }
+
+    function niceTicks(min, max, count) {
+        const span = max - min || Math.abs(max) || 1;
+        const step0 = Math.pow(10, Math.floor(Math.log10(span / count)));
+        const step = [1, 2, 5, 10].map(m => m * step0).find(s => span / s <= count) || step0 * 10;
+        const ticks = [];
+        for (let v = Math.ceil(min / step) * step; v <= max + step * 1e-9; v += step) {
+            ticks.push(Number(v.toPrecision(12)));
+        }
+        return ticks;
+    }
+
+    function formatTick(value) {
+        return Math.abs(value) >= 1e4 || (value !== 0 && Math.abs(value) < 1e-2)
+            ? value.toExponential(1) : String(Number(value.toPrecision(6)));
+    }
+
+    function seriesPoints(series, filter) {
+        return series.x.map((x, i) => ({x: x, y: series.y[i], std: series.std[i] || 0, name: series.case[i]}))
+            .filter(p => p.x !== null && p.y !== null)
+            .filter(p => (filter.xmin === null || p.x >= filter.xmin) && (filter.xmax === null || p.x <= filter.xmax))
+            .filter(p => !filter.text || String(p.name).includes(filter.text));
+    }
+
+    function dataDomain(layers, filter) {
+        const xs = [], ys = [];
+        layers.forEach(layer => seriesPoints(layer.series, filter).forEach(p => {
+            xs.push(p.x);
+            ys.push(p.y - p.std, p.y + p.std);
+        }));
+        if (!xs.length) return null;
+        const pad = (lo, hi) => (hi - lo || Math.abs(hi) || 1) * 0.05;
+        const [x0, x1] = [Math.min(...xs), Math.max(...xs)];
+        const [y0, y1] = [Math.min(...ys), Math.max(...ys)];
+        return {x: [x0 - pad(x0, x1), x1 + pad(x0, x1)], y: [y0 - pad(y0, y1), y1 + pad(y0, y1)]};
+    }
+
+    function createChart(container, report, resultTypes) {
+        const resultType = resultTypes[0];
+        const compare = resultTypes.length > 1;
+        const baseLayers = compare
+            ? resultTypes.map(type => ({label: type.toUpperCase(), series: report.series[type]}))
+            : [{label: `${report.suite.model} / ${report.suite.name}`, series: report.series[resultType]}];
+        const yLabel = container.dataset.yLabel || `${resultType.toUpperCase()} (${report.series[resultType].unit || ''})`;
+        const state = {
+            layers: baseLayers.slice(),
+            filter: {xmin: null, xmax: null, text: ''},
+            zoom: null,
+            showStd: true,
+            showFit: true
+        };
+
+        container.innerHTML = `
+            <div class="chart-controls">
+                <label>X ≥ <input type="number" step="any" data-filter="xmin"></label>
+                <label>X ≤ <input type="number" step="any" data-filter="xmax"></label>
+                <label>用例 <input type="text" placeholder="名称包含" data-filter="text"></label>
+                <label><input type="checkbox" data-toggle="showStd" checked> 误差条</label>
+                <label><input type="checkbox" data-toggle="showFit" checked> 回归曲线</label>
+                <select class="chart-overlay" hidden><option value="">叠加其他模型...</option></select>
+                <button type="button" data-action="reset">重置视图</button>
+            </div>
+            <div class="chart-legend"></div>
+            <div class="chart-area"></div>`;
+        const area = container.querySelector('.chart-area');
+        const legend = container.querySelector('.chart-legend');
+
+        function draw() {
+            const width = Math.max(area.clientWidth, 320);
+            const plotW = width - MARGIN.left - MARGIN.right;
+            const plotH = HEIGHT - MARGIN.top - MARGIN.bottom;
+            const domain = state.zoom || dataDomain(state.layers, state.filter);
+            area.innerHTML = '';
+            if (!domain) {
+                area.textContent = '没有符合筛选条件的数据点';
+                return;
+            }
+
+            const sx = x => MARGIN.left + (x - domain.x[0]) / (domain.x[1] - domain.x[0]) * plotW;
+            const sy = y => MARGIN.top + (1 - (y - domain.y[0]) / (domain.y[1] - domain.y[0])) * plotH;
+            const svg = el('svg', {width: width, height: HEIGHT, class: 'chart-svg'}, area);
+            el('rect', {x: MARGIN.left, y: MARGIN.top, width: plotW, height: plotH, fill: '#fff', stroke: '#ccc'}, svg);
+            const clipId = `clip-${resultType}-${Math.random().toString(36).slice(2)}`;
+            el('rect', {x: MARGIN.left, y: MARGIN.top, width: plotW, height: plotH}, el('clipPath', {id: clipId}, svg));
+
+            // 坐标轴与网格
+            niceTicks(domain.x[0], domain.x[1], 8).forEach(t => {
+                el('line', {x1: sx(t), x2: sx(t), y1: MARGIN.top, y2: MARGIN.top + plotH, stroke: '#eee'}, svg);
+                el('text', {x: sx(t), y: MARGIN.top + plotH + 18, 'text-anchor': 'middle', 'font-size': 11}, svg).textContent = formatTick(t);
+            });
+            niceTicks(domain.y[0], domain.y[1], 6).forEach(t => {
+                el('line', {x1: MARGIN.left, x2: MARGIN.left + plotW, y1: sy(t), y2: sy(t), stroke: '#eee'}, svg);
+                el('text', {x: MARGIN.left - 8, y: sy(t) + 4, 'text-anchor': 'end', 'font-size': 11}, svg).textContent = formatTick(t);
+            });
+            el('text', {x: MARGIN.left + plotW / 2, y: HEIGHT - 10, 'text-anchor': 'middle', 'font-size': 12}, svg).textContent = report.x_label;
+            el('text', {x: 16, y: MARGIN.top + plotH / 2, 'text-anchor': 'middle', 'font-size': 12,
+                        transform: `rotate(-90 16 ${MARGIN.top + plotH / 2})`}, svg).textContent = yLabel;
+
+            const plot = el('g', {'clip-path': `url(#${clipId})`}, svg);
+            state.layers.forEach((layer, index) => {
+                const color = COLORS[index % COLORS.length];
+                const points = seriesPoints(layer.series, state.filter);
+                const fit = layer.series.fit;
+
+                if (state.showFit && fit && FIT_FUNCTIONS[fit.method]) {
+                    const steps = 120;
+                    const path = [];
+                    for (let i = 0; i <= steps; i++) {
+                        const x = domain.x[0] + (domain.x[1] - domain.x[0]) * i / steps;
+                        const y = FIT_FUNCTIONS[fit.method](x, fit);
+                        if (Number.isFinite(y)) path.push(`${path.length ? 'L' : 'M'}${sx(x).toFixed(1)},${sy(y).toFixed(1)}`);
+                    }
+                    el('path', {d: path.join(''), fill: 'none', stroke: color, 'stroke-width': 2, opacity: 0.8}, plot);
+                }
+                points.forEach(p => {
+                    if (state.showStd && p.std) {
+                        el('line', {x1: sx(p.x), x2: sx(p.x), y1: sy(p.y - p.std), y2: sy(p.y + p.std), stroke: color, opacity: 0.6}, plot);
+                    }
+                    const dot = el('circle', {cx: sx(p.x), cy: sy(p.y), r: 4, fill: color}, plot);
+                    el('title', {}, dot).textContent = `${p.name}\n${report.x_label}=${p.x}\n${p.y} ± ${p.std}`;
+                });
+            });
+
+            legend.innerHTML = state.layers.map((layer, index) => {
+                const fit = layer.series.fit;
+                const r2 = fit ? ` · ${fit.method} R²=${Number(fit.r2).toFixed(4)}` : '';
+                return `<span style="color:${COLORS[index % COLORS.length]}">● ${layer.label}${r2}</span>`;
+            }).join(' ');
+
+            // 框选缩放
+            let start = null, box = null;
+            const toData = event => {
+                const rect = svg.getBoundingClientRect();
+                const px = Math.min(Math.max(event.clientX - rect.left, MARGIN.left), MARGIN.left + plotW);
+                const py = Math.min(Math.max(event.clientY - rect.top, MARGIN.top), MARGIN.top + plotH);
+                return {px: px, py: py,
+                        x: domain.x[0] + (px - MARGIN.left) / plotW * (domain.x[1] - domain.x[0]),
+                        y: domain.y[0] + (1 - (py - MARGIN.top) / plotH) * (domain.y[1] - domain.y[0])};
+            };
+            svg.addEventListener('mousedown', event => {
+                start = toData(event);
+                box = el('rect', {fill: 'rgba(52,152,219,0.15)', stroke: '#3498db'}, svg);
+            });
+            svg.addEventListener('mousemove', event => {
+                if (!start) return;
+                const cur = toData(event);
+                box.setAttribute('x', Math.min(start.px, cur.px));
+                box.setAttribute('y', Math.min(start.py, cur.py));
+                box.setAttribute('width', Math.abs(cur.px - start.px));
+                box.setAttribute('height', Math.abs(cur.py - start.py));
+            });
+            svg.addEventListener('mouseup', event => {
+                if (!start) return;
+                const end = toData(event);
+                if (Math.abs(end.px - start.px) > 5 && Math.abs(end.py - start.py) > 5) {
+                    state.zoom = {x: [Math.min(start.x, end.x), Math.max(start.x, end.x)],
+                                  y: [Math.min(start.y, end.y), Math.max(start.y, end.y)]};
+                }
+                start = null;
+                draw();
+            });
+            svg.addEventListener('dblclick', () => { state.zoom = null; draw(); });
+        }
+
+        container.querySelectorAll('[data-filter]').forEach(input => input.addEventListener('input', () => {
+            const key = input.dataset.filter;
+            state.filter[key] = key === 'text' ? input.value.trim() : (input.value === '' ? null : Number(input.value));
+            state.zoom = null;
+            draw();
+        }));
+        container.querySelectorAll('[data-toggle]').forEach(input => input.addEventListener('change', () => {
+            state[input.dataset.toggle] = input.checked;
+            draw();
+        }));
+        container.querySelector('[data-action="reset"]').addEventListener('click', () => {
+            state.zoom = null;
+            state.layers = baseLayers.slice();
+            draw();
+        });
+
+        // 通过Web服务器时可叠加其他模型/套件对同一变量的分析（多结果类型对比图不支持叠加）
+        const overlay = container.querySelector('.chart-overlay');
+        if (compare) {
+            window.addEventListener('resize', draw);
+            draw();
+            return;
+        }
+        fetch(`${OVERLAY_API}?target_variable=${encodeURIComponent(report.target_variable)}&result_type=${encodeURIComponent(resultType)}`)
+            .then(response => response.ok ? response.json() : [])
+            .then(items => {
+                items.filter(item => item.suite_id !== report.suite.id).forEach(item => {
+                    const option = document.createElement('option');
+                    option.value = item.data_url;
+                    option.textContent = `${item.model_name} / ${item.suite_name} (${item.completed_at || ''})`;
+                    overlay.appendChild(option);
+                });
+                overlay.hidden = overlay.options.length <= 1;
+            })
+            .catch(() => {});
+        overlay.addEventListener('change', () => {
+            if (!overlay.value) return;
+            const label = overlay.options[overlay.selectedIndex].textContent;
+            fetch(overlay.value)
+                .then(response => response.json())
+                .then(other => {
+                    if (other.series && other.series[resultType]) {
+                        state.layers.push({label: label, series: other.series[resultType]});
+                        state.zoom = null;
+                        draw();
+                    }
+                })
+                .finally(() => { overlay.value = ''; });
+        });
+
+        window.addEventListener('resize', draw);
+        draw();
+    }
+
+    document.addEventListener('DOMContentLoaded', () => {
+        const dataNode = document.getElementById('reportData');
+        if (!dataNode) return;
+        const report = JSON.parse(dataNode.textContent);
+        document.querySelectorAll('.interactive-chart').forEach(container => {
+            const resultTypes = (container.dataset.resultTypes || container.dataset.resultType || '').split(',')
+                .filter(type => report.series[type]);
+            if (resultTypes.length) createChart(container, report, resultTypes);
+        });
+    });
+})();
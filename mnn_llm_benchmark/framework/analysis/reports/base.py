@@ -200,11 +200,12 @@ class VarianceExplainer:
         """
         table_content = []
         for result_type, data in analysis_data.get('data', {}).items():
-            if not data.get('std_values'):
+            # 分位数类结果（如itl_p95）没有标准差
+            std_values = [v for v in data.get('std_values', []) if v is not None]
+            if not std_values:
                 continue
 
-            std_values = [v for v in data.get('std_values', []) if v is not None]
-            mean_std = sum(std_values) / len(std_values) if std_values else 0
+            mean_std = sum(std_values) / len(std_values)
 
             table_content.append(f"| {result_type} | {len(std_values)} | {mean_std:.4f} | {max(std_values):.4f} | {min(std_values):.4f} |")
 
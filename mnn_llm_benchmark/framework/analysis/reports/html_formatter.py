@@ -6,14 +6,86 @@ HTML报告格式化器
 提供HTML格式的分析报告生成功能
 """
 
-from typing import Dict, Any, Optional
+import json
+import math
+from pathlib import Path
+from typing import Dict, Any, Optional, List
 from .base import BaseFormatter, MetadataBuilder, VarianceExplainer
-from ..utils import transform_variable_name, transform_english_name, format_analysis_title, extract_result_units
+from ..utils import (transform_variable_name, transform_english_name, format_analysis_title, extract_result_units,
+                     tail_latency_types, TAIL_LATENCY_IMAGE_KEY)
+
+
+# 交互式图表脚本（内联到报告中，报告离线打开也可用）
+CHART_SCRIPT_PATH = Path(__file__).parent / "assets" / "interactive_chart.js"
+# 图表数据块版本
+CHART_DATA_VERSION = 1
+
+
+def _finite(value: Any) -> Any:
+    """NaN/inf转为None，避免json.dumps输出浏览器无法解析的NaN/Infinity"""
+    return None if isinstance(value, float) and not math.isfinite(value) else value
+
+
+def _compact(values: List[Any]) -> List[Any]:
+    """数值保留6位有效数字以压缩数据块，非有限值转为None"""
+    return [_finite(float(f"{v:.6g}")) if isinstance(v, float) else v for v in values]
 
 
 class HTMLFormatter(BaseFormatter):
     """HTML报告格式化器"""
 
+    @staticmethod
+    def build_chart_data(analysis_data: Dict[str, Any],
+                         regression_results: Dict[str, Dict[str, Any]],
+                         suite_info: Dict[str, Any],
+                         target_variable: str) -> Dict[str, Any]:
+        """
+        构建交互式图表使用的紧凑数据块（同时保存为report_data.json供叠加对比）
+
+        Args:
+            analysis_data: 分析数据
+            regression_results: 回归结果
+            suite_info: Suite信息
+            target_variable: 目标变量名
+
+        Returns:
+            {'v', 'suite', 'target_variable', 'x_label', 'series': {result_type: 列式数据和拟合参数}}
+        """
+        series = {}
+        for result_type, data in analysis_data.get('data', {}).items():
+            if not data.get('mean_values'):
+                continue
+
+            units = [u for u in data.get('units', []) if u]
+            item = {
+                'unit': units[0] if units else '',
+                'case': data.get('case_names', []),
+                'x': _compact(data.get('x_values', [])),
+                'y': _compact(data.get('mean_values', [])),
+                'std': _compact([v if v else 0.0 for v in data.get('std_values', [])]),
+                'fit': None
+            }
+
+            regression = regression_results.get(result_type, {}).get('regression')
+            if regression:
+                fit = {'method': regression['method'], 'r2': _compact([float(regression['r2'])])[0]}
+                if regression['method'] == 'linear':
+                    fit['slope'] = _finite(float(regression['slope']))
+                    fit['intercept'] = _finite(float(regression['intercept']))
+                else:
+                    fit['params'] = [_finite(float(p)) for p in regression['parameters']]
+                item['fit'] = fit
+            series[result_type] = item
+
+        return {
+            'v': CHART_DATA_VERSION,
+            'suite': {'id': suite_info.get('id'), 'name': suite_info.get('name'),
+                      'model': suite_info.get('model_name')},
+            'target_variable': target_variable,
+            'x_label': transform_english_name(target_variable),
+            'series': series
+        }
+
     def build_report(self, analysis_data: Dict[str, Any],
                     regression_results: Dict[str, Dict[str, Any]],
                     suite_info: Dict[str, Any],
@@ -103,7 +175,8 @@ class HTMLFormatter(BaseFormatter):
                                   regression_results: Dict[str, Dict[str, Any]],
                                   suite_info: Dict[str, Any],
                                   target_variable: str, fixed_params: Optional[Dict[str, Any]],
-                                  images_info: Dict[str, str]) -> str:
+                                  images_info: Dict[str, str],
+                                  chart_data: Optional[Dict[str, Any]] = None) -> str:
         """
         构建单变量分析HTML报告
 
@@ -113,11 +186,15 @@ class HTMLFormatter(BaseFormatter):
             suite_info: Suite信息
             target_variable: 目标变量名
             fixed_params: 固定参数
-            images_info: 图像信息
+            images_info: 图像信息（静态图表，可为空）
+            chart_data: 交互式图表数据块，默认由分析数据构建
 
         Returns:
             单变量分析的HTML报告内容
         """
+        if chart_data is None:
+            chart_data = self.build_chart_data(analysis_data, regression_results, suite_info, target_variable)
+
         # 构建HTML各部分
         html_parts = []
 
@@ -138,7 +215,7 @@ class HTMLFormatter(BaseFormatter):
 
         # 结果表格和图表
         html_parts.append(self._build_html_single_variable_results_section(
-            analysis_data, regression_results, images_info, target_variable
+            analysis_data, regression_results, images_info, target_variable, chart_data
         ))
 
         # 回归分析详情
@@ -224,6 +301,31 @@ class HTMLFormatter(BaseFormatter):
             border: 1px solid #bdc3c7;
             border-radius: 3px;
         }
+        .interactive-chart {
+            margin: 20px 0;
+            padding: 15px;
+            border: 1px solid #ecf0f1;
+            border-radius: 5px;
+            background-color: #fafafa;
+        }
+        .chart-controls {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 12px;
+            align-items: center;
+            font-size: 13px;
+        }
+        .chart-controls input[type=number] {
+            width: 90px;
+        }
+        .chart-legend {
+            margin: 8px 0;
+            font-size: 13px;
+        }
+        .chart-svg {
+            cursor: crosshair;
+            user-select: none;
+        }
         .variance-box {
             background-color: #fff3cd;
             border: 1px solid #ffeaa7;
@@ -342,14 +444,16 @@ class HTMLFormatter(BaseFormatter):
     def _build_html_single_variable_results_section(self, analysis_data: Dict[str, Any],
                                                   regression_results: Dict[str, Dict[str, Any]],
                                                   images_info: Dict[str, str],
-                                                  target_variable: str) -> str:
+                                                  target_variable: str,
+                                                  chart_data: Optional[Dict[str, Any]] = None) -> str:
         """构建单变量结果部分"""
-        return self._build_html_results_common(analysis_data, regression_results, images_info)
+        return self._build_html_results_common(analysis_data, regression_results, images_info, chart_data)
 
     def _build_html_results_common(self, analysis_data: Dict[str, Any],
                                   regression_results: Dict[str, Dict[str, Any]],
-                                  images_info: Dict[str, str]) -> str:
-        """构建通用结果部分"""
+                                  images_info: Dict[str, str],
+                                  chart_data: Optional[Dict[str, Any]] = None) -> str:
+        """构建通用结果部分（提供chart_data时在浏览器中绘制交互式图表）"""
         result_html = ["<h2>分析结果</h2>"]
 
         # 构建结果表格
@@ -359,6 +463,11 @@ class HTMLFormatter(BaseFormatter):
         for result_type in analysis_data.get('data', {}):
             result_html.append(f"<h3>{result_type.upper()} 结果</h3>")
 
+            # 交互式图表
+            if chart_data and result_type in chart_data['series']:
+                result_html.append(f"""
+            <div class="interactive-chart" data-result-type="{result_type}"></div>""")
+
             # 散点图
             if f'{result_type}_scatter' in images_info:
                 result_html.append(f"""
@@ -375,8 +484,35 @@ class HTMLFormatter(BaseFormatter):
                 <img src="{images_info[f'{result_type}_regression']}" alt="{result_type} Regression Plot">
             </div>""")
 
+        # 尾延迟图：token间隔各分位数对比
+        tail_types = tail_latency_types(analysis_data)
+        if tail_types:
+            result_html.append("<h3>尾延迟（token间隔分位数）</h3>")
+            if chart_data and all(t in chart_data['series'] for t in tail_types):
+                result_html.append(f"""
+            <div class="interactive-chart" data-result-types="{','.join(tail_types)}" data-y-label="ITL (ms)"></div>""")
+            if TAIL_LATENCY_IMAGE_KEY in images_info:
+                result_html.append(f"""
+            <div class="image-container">
+                <h4>尾延迟图</h4>
+                <img src="{images_info[TAIL_LATENCY_IMAGE_KEY]}" alt="Inter-Token Latency Percentiles">
+            </div>""")
+
+        if chart_data:
+            result_html.append(self._build_html_chart_script(chart_data))
+
         return "\n".join(result_html)
 
+    def _build_html_chart_script(self, chart_data: Dict[str, Any]) -> str:
+        """内嵌图表数据块和绘图脚本"""
+        data_json = json.dumps(chart_data, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+        script = CHART_SCRIPT_PATH.read_text(encoding='utf-8')
+        return f"""
+        <script type="application/json" id="reportData">{data_json}</script>
+        <script>
+{script}
+        </script>"""
+
     def _build_html_results_table(self, analysis_data: Dict[str, Any]) -> str:
         """构建结果表格"""
         html = """
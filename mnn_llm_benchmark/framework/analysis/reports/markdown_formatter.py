@@ -8,7 +8,8 @@ Markdown报告格式化器
 
 from typing import Dict, Any, Optional
 from .base import BaseFormatter, MetadataBuilder, VarianceExplainer
-from ..utils import transform_variable_name, transform_english_name, format_analysis_title
+from ..utils import (transform_variable_name, transform_english_name, format_analysis_title,
+                     tail_latency_types, TAIL_LATENCY_IMAGE_KEY)
 
 
 class MarkdownFormatter(BaseFormatter):
@@ -249,6 +250,18 @@ class MarkdownFormatter(BaseFormatter):
                 result_md.append(f"""
 ![{result_type}回归分析图]({images_info[f'{result_type}_regression']})""")
 
+            if f'{result_type}_scatter' not in images_info:
+                result_md.append("\n交互式图表见 analysis_report.html，静态图可通过 `--export-charts` 导出。")
+
+        # 尾延迟图：token间隔各分位数对比
+        if tail_latency_types(analysis_data):
+            result_md.append("\n### 尾延迟（token间隔分位数）")
+            if TAIL_LATENCY_IMAGE_KEY in images_info:
+                result_md.append(f"""
+![尾延迟图]({images_info[TAIL_LATENCY_IMAGE_KEY]})""")
+            else:
+                result_md.append("\n交互式图表见 analysis_report.html，静态图可通过 `--export-charts` 导出。")
+
         return "\n".join(result_md)
 
     def _build_md_results_table(self, analysis_data: Dict[str, Any]) -> str:
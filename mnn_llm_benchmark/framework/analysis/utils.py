@@ -187,4 +187,24 @@ def generate_analysis_key(result_type: str, *args) -> str:
     if args:
         suffix = "_".join(str(arg) for arg in args)
         return f"{result_type}_{suffix}"
-    return result_type
\ No newline at end of file
+    return result_type
+
+# 尾延迟图中对比的token间隔分位数结果类型（任务开启token_latency时写入）
+TAIL_LATENCY_RESULT_TYPES = ('itl_p50', 'itl_p95', 'itl_p99')
+# 尾延迟图的图像标识
+TAIL_LATENCY_IMAGE_KEY = 'itl_tail_latency'
+
+
+def tail_latency_types(analysis_data: Dict[str, Any]) -> list:
+    """
+    取得分析数据中可绘制尾延迟图的分位数结果类型
+
+    Args:
+        analysis_data: 分析数据字典
+
+    Returns:
+        有数据的分位数结果类型列表，少于两个时返回空列表（无需对比）
+    """
+    data = analysis_data.get('data', {})
+    types = [t for t in TAIL_LATENCY_RESULT_TYPES if data.get(t, {}).get('mean_values')]
+    return types if len(types) >= 2 else []
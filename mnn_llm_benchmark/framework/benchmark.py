@@ -83,6 +83,7 @@ def main():
     parser.add_argument("-b", "--batch", type=str, help="批量测试：指定YAML编排文件路径")
     parser.add_argument("--preview", action="store_true", help="预览批量测试任务（仅显示计划，不执行）")
     parser.add_argument("--create-sample", action="store_true", help="创建示例YAML编排文件到tasks/目录，包含批量测试配置示例")
+    parser.add_argument("--resume", type=int, metavar="TASK_ID", help="断点续跑：跳过指定任务中已成功的用例，其余用例写入同一任务（可配合-b指定任务文件）")
 
     # 数据分析模式参数
     parser.add_argument("-a", "--analyze", type=int, help="数据分析：指定Suite ID进行分析")
@@ -90,6 +91,16 @@ def main():
     parser.add_argument("--x-variable", type=str, help="分析的自变量（如: n_prompt, threads等）")
     parser.add_argument("--y-variable", type=str, help="分析的第二个自变量（可选）")
     parser.add_argument("--result-types", type=str, help="要分析的结果类型，逗号分隔（如: pp,tg,pp+tg）")
+    parser.add_argument("--batch-regression", type=int, metavar="TASK_ID", help="批量回归：拟合任务中所有变量×结果类型×固定参数组合，结果缓存到analysis_history")
+    parser.add_argument("--refit", action="store_true", help="批量回归时忽略缓存全部重新拟合")
+    parser.add_argument("--detect-regression", type=int, metavar="TASK_ID", help="回退检测：比较任务与基线运行中的同参数用例，检出显著回退时退出码为2")
+    parser.add_argument("--baseline", type=str, metavar="TASK_IDS", help="回退检测的基线任务ID，逗号分隔（默认取同名任务之前最近的若干次运行）")
+    parser.add_argument("--baseline-runs", type=int, metavar="N", help="滚动基线合并的运行次数（默认见[regression]配置）")
+    parser.add_argument("--history", action="store_true", help="回退检测时在同名任务的全部历史运行上做变点检测")
+    parser.add_argument("--output", type=str, metavar="PATH", help="回退检测结果另存为JSON文件")
+    parser.add_argument("--export-charts", type=str, metavar="REPORT_DIR", help="按需以高分辨率重新导出分析报告目录中的图表")
+    parser.add_argument("--dpi", type=int, default=300, help="导出图表分辨率（默认300）")
+    parser.add_argument("--chart-format", type=str, choices=["png", "svg"], default="png", help="导出图表格式")
 
     # 删除分析报告参数
     parser.add_argument("--delete-analysis", type=int, help="删除指定ID的分析报告（删除数据库记录和文件目录）")
@@ -217,6 +228,120 @@ def main():
         print()
         return 0
 
+    # 如果是图表导出模式
+    if args.export_charts:
+        from analysis.chart_generator import ChartGenerator
+        report_dir = Path(args.export_charts)
+        if not report_dir.is_absolute() and not report_dir.exists():
+            # bench.sh在framework目录下运行，相对路径按项目根目录解析
+            report_dir = Path(__file__).parent.parent / report_dir
+        generator = ChartGenerator()
+        try:
+            export_dir = generator.export_charts(report_dir, dpi=args.dpi,
+                                                 image_format=args.chart_format)
+        except Exception as e:
+            print(f"\n{ColorOutput.red('✗ 图表导出失败')}")
+            print(f"错误: {e}")
+            return 1
+        finally:
+            generator.close()
+
+        print(f"\n{ColorOutput.green('✓ 图表导出完成')}: {export_dir}")
+        return 0
+
+    # 如果是批量回归模式
+    if args.batch_regression:
+        from analysis.analyzer import DataAnalyzer
+        analyzer = DataAnalyzer()
+        result_types = [t.strip() for t in args.result_types.split(',')] if args.result_types else None
+
+        print(f"\n{ColorOutput.blue('🔬 批量回归分析')}")
+        print(f"任务 ID: {args.batch_regression}")
+        try:
+            batch = analyzer.analyze_batch(task_id=args.batch_regression, result_types=result_types,
+                                           force=args.refit)
+        except Exception as e:
+            print(f"\n{ColorOutput.red('✗ 批量回归失败')}")
+            print(f"错误: {e}")
+            return 1
+
+        # 按 (suite, 变量, 结果类型) 汇总各固定参数切片
+        summary = {}
+        for item in batch['results']:
+            key = (item['suite_id'], item['target_variable'], item['result_type'])
+            summary.setdefault(key, []).append(item)
+        print(f"{'Suite':<6} {'变量':<16} {'类型':<8} {'切片':<6} {'R²中位数':<10} {'最佳方法'}")
+        print("-" * 70)
+        for (suite_id, variable, result_type), items in sorted(summary.items()):
+            r2_values = sorted(item['regression']['r2'] for item in items)
+            methods = {}
+            for item in items:
+                methods[item['regression']['method']] = methods.get(item['regression']['method'], 0) + 1
+            method_desc = ", ".join(f"{name}×{count}" for name, count in sorted(methods.items()))
+            print(f"{suite_id:<6} {variable:<16} {result_type:<8} {len(items):<6} "
+                  f"{r2_values[len(r2_values) // 2]:<10.4f} {method_desc}")
+
+        stats_info = batch['stats']
+        print(f"\n{ColorOutput.green('✓ 批量回归完成')}: {stats_info['groups']}个组合"
+              f"（新拟合 {stats_info['fitted']}，复用缓存 {stats_info['cached']}，"
+              f"非线性精调 {stats_info['refined']}），耗时 {stats_info['seconds']:.2f}s")
+        return 0
+
+    # 如果是回退检测模式
+    if args.detect_regression:
+        from analysis.analyzer import DataAnalyzer
+        analyzer = DataAnalyzer()
+        result_types = [t.strip() for t in args.result_types.split(',')] if args.result_types else None
+
+        print(f"\n{ColorOutput.blue('🔎 性能回退检测')}")
+        print(f"任务 ID: {args.detect_regression}")
+        try:
+            baseline = [int(t) for t in args.baseline.split(',')] if args.baseline else None
+            report = analyzer.detect_regressions(args.detect_regression, baseline_task_ids=baseline,
+                                                 baseline_runs=args.baseline_runs, history=args.history,
+                                                 result_types=result_types)
+        except Exception as e:
+            print(f"\n{ColorOutput.red('✗ 回退检测失败')}")
+            print(f"错误: {e}")
+            return 1
+
+        if args.history:
+            print(f"历史运行: {', '.join(str(t) for t in report['tasks'])}")
+        else:
+            print(f"基线任务: {', '.join(str(t) for t in report['baseline'])}")
+        if report['findings']:
+            print(f"{'状态':<6} {'模型':<20} {'类型':<12} {'参数':<28} {'基线':>10} {'当前':>10} {'变化':>8} {'q值':>9}"
+                  + ("  变点任务" if args.history else ""))
+            print("-" * (110 if args.history else 100))
+            for item in report['findings']:
+                status = ColorOutput.red('回退  ') if item['status'] == 'regression' else ColorOutput.green('改进  ')
+                params = ",".join(f"{k}={v}" for k, v in sorted(item['params'].items())
+                                  if k not in ('model', 'timeout'))
+                label = item['result_type'] if item['result_parameter'] in ('', 'None') else \
+                    f"{item['result_type']}({item['result_parameter']})"
+                line = (f"{status} {item['model_name']:<20} {label:<12} {params[:28]:<28} "
+                        f"{item['baseline_mean']:>10.2f} {item['candidate_mean']:>10.2f} "
+                        f"{item['relative_change']:>+8.1%} {item['q_value']:>9.2e}")
+                print(line + (f"  {item['change_task']}" if args.history else ""))
+
+        if args.output:
+            import json
+            output_path = Path(args.output)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+            print(f"结果文件: {output_path}")
+
+        stats_info = report['stats']
+        summary_text = (f"{stats_info['matched']}项比较：回退 {stats_info['regressions']}，"
+                        f"改进 {stats_info['improvements']}，无显著变化 {stats_info['unchanged']}，"
+                        f"样本不足 {stats_info['untestable']}")
+        if stats_info['regressions']:
+            print(f"\n{ColorOutput.red('✗ 检出性能回退')}: {summary_text}")
+            return 2
+        print(f"\n{ColorOutput.green('✓ 未检出性能回退')}: {summary_text}")
+        return 0
+
     # 如果是数据分析模式
     if args.analyze or args.list_suites:
         from analysis.analyzer import DataAnalyzer
@@ -344,7 +469,7 @@ def main():
         return 0
 
     # 如果是批量模式
-    if args.batch or args.preview or args.create_sample:
+    if args.batch or args.preview or args.create_sample or args.resume is not None:
         if args.create_sample:
             batch = BatchBenchmark()
             sample_file = batch.create_sample_yaml()
@@ -352,13 +477,13 @@ def main():
             print(f"使用示例配置: python3 benchmark.py -b {sample_file}")
             return 0
 
-        if args.batch:
+        if args.batch or args.resume is not None:
             # 执行批量测试
             preview = args.preview
 
             # 处理批量测试文件路径
             batch_file = args.batch
-            if not Path(batch_file).is_absolute():
+            if batch_file and not Path(batch_file).is_absolute():
                 # 相对路径：相对于项目根目录处理
                 batch_file = str(project_root / batch_file)
                 # 如果还找不到，尝试相对于tasks目录
@@ -368,10 +493,12 @@ def main():
 
             # 显示执行信息和模式
             mode_text = "预览模式" if preview else "实际执行"
-            print(f"{ColorOutput.cyan(f'正在批量基准测试: {args.batch} ({mode_text})')}")
+            if args.resume is not None:
+                mode_text += f", 续跑任务 {args.resume}"
+            print(f"{ColorOutput.cyan(f'正在批量基准测试: {args.batch or args.resume} ({mode_text})')}")
 
             batch = BatchBenchmark()
-            result = batch.run_task(batch_file, preview=preview)
+            result = batch.run_task(batch_file, preview=preview, resume_task_id=args.resume)
             success = result.get('success', False)
 
             if not success:
@@ -12,6 +12,10 @@
 子模块：
 - tasks: 任务文件加载和处理
 - cases: 测试用例生成
+- coalescer: 用例合并执行规划
+- planner: 基于历史耗时的用例耗时预测、超时设置和执行顺序规划
+- refiner: adaptive变量的自适应网格细化
+- scheduler: 并行用例调度和CPU核心划分
 - runner: 任务执行管理
 - results: 结果管理和报告
 """
@@ -19,6 +23,10 @@
 from benchmark.batch.orchestrator import BatchBenchmark
 from benchmark.batch.tasks import TaskLoader
 from benchmark.batch.cases import CaseGenerator
+from benchmark.batch.coalescer import CaseCoalescer
+from benchmark.batch.planner import SweepPlanner, RuntimeCostModel
+from benchmark.batch.refiner import AdaptiveRefiner
+from benchmark.batch.scheduler import CoreAllocator, ParallelScheduler
 from benchmark.batch.runner import TaskRunner
 from benchmark.batch.results import ResultManager
 
@@ -26,6 +34,12 @@ __all__ = [
     "BatchBenchmark",
     "TaskLoader",
     "CaseGenerator",
+    "CaseCoalescer",
+    "SweepPlanner",
+    "RuntimeCostModel",
+    "AdaptiveRefiner",
+    "CoreAllocator",
+    "ParallelScheduler",
     "TaskRunner",
     "ResultManager"
 ]
\ No newline at end of file
@@ -7,10 +7,11 @@
 - 变量范围定义和验证
 - 测试用例参数组合生成
 - 基准套件用例规划
+- 自适应细化变量（mode: adaptive）的初始粗网格
 """
 
 import itertools
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from pathlib import Path
 from utils.logger import LoggerManager
 from config.system import SystemConfig
@@ -28,9 +29,17 @@ class VariableRange:
             kwargs: 变量范围定义，可以是:
                    - start, end, step: 范围定义
                    - values: 离散值列表
+                   可选 mode: grid（默认，完整网格）或 adaptive（自适应细化），adaptive模式下：
+                   - initial: 初始粗网格点数（默认5，包含两端）
+                   - budget: 每条曲线最多测量的点数（默认为网格点数的一半）
+                   - batch: 每轮每条曲线追加的点数（默认2）
+                   - metric: 拟合使用的吞吐量指标 prefill/decode（默认n_gen为decode，其余为prefill）
         """
         self.name = name
         self.values = []
+        self.mode = kwargs.get('mode', 'grid')
+        if self.mode not in ('grid', 'adaptive'):
+            raise ValueError(f"变量 {name} 的mode无效: {self.mode}")
 
         if 'values' in kwargs:
             # 离散值列表
@@ -53,8 +62,46 @@ class VariableRange:
         else:
             raise ValueError(f"变量 {name} 的范围定义无效")
 
+        if self.mode == 'adaptive':
+            self.initial = min(len(self.values), max(2, int(kwargs.get('initial', 5))))
+            self.budget = min(len(self.values), max(self.initial, int(kwargs.get('budget', len(self.values) // 2))))
+            self.batch = max(1, int(kwargs.get('batch', 2)))
+            self.metric = kwargs.get('metric', 'decode' if name == 'n_gen' else 'prefill')
+            if self.metric not in ('prefill', 'decode'):
+                raise ValueError(f"变量 {name} 的metric无效: {self.metric}")
+
+    def initial_values(self) -> List[Any]:
+        """
+        获取初始取值：grid模式为全部取值，adaptive模式为包含两端的均匀粗网格
+
+        Returns:
+            初始取值列表
+        """
+        if self.mode != 'adaptive':
+            return self.values
+        count = len(self.values)
+        indices = sorted({round(k * (count - 1) / (self.initial - 1)) for k in range(self.initial)}) if count > 1 else [0]
+        return [self.values[i] for i in indices]
+
+    def adaptive_spec(self) -> Optional[Dict[str, Any]]:
+        """
+        获取自适应细化配置
+
+        Returns:
+            {"variable", "grid", "budget", "batch", "metric"}，grid模式返回None
+        """
+        if self.mode != 'adaptive':
+            return None
+        return {
+            "variable": self.name,
+            "grid": list(self.values),
+            "budget": self.budget,
+            "batch": self.batch,
+            "metric": self.metric
+        }
+
     def __repr__(self):
-        return f"VariableRange(name='{self.name}', values={self.values})"
+        return f"VariableRange(name='{self.name}', values={self.values}, mode='{self.mode}')"
 
 
 class BenchSuit:
@@ -86,6 +133,11 @@ class BenchSuit:
                 var_range = VariableRange(var_def['name'], **kwargs)
                 self.variable_ranges.append(var_range)
 
+        adaptive_ranges = [vr for vr in self.variable_ranges if vr.mode == 'adaptive']
+        if len(adaptive_ranges) > 1:
+            raise ValueError(f"套件 {suit_name} 只能有一个adaptive变量")
+        self.adaptive = adaptive_ranges[0].adaptive_spec() if adaptive_ranges else None
+
     def generate_bench_cases(self) -> List[Dict[str, Any]]:
         """
         生成所有基准测试用例的组合
@@ -99,7 +151,7 @@ class BenchSuit:
 
         # 生成所有变量值的组合
         var_names = [vr.name for vr in self.variable_ranges]
-        var_values = [vr.values for vr in self.variable_ranges]
+        var_values = [vr.initial_values() for vr in self.variable_ranges]
 
         bench_cases = []
         for combination in itertools.product(*var_values):
@@ -190,6 +242,9 @@ class CaseGenerator:
                             'global_config': global_config,
                             'model': model  # 添加模型信息
                         }
+                        if suit.adaptive:
+                            # 自适应细化配置，由AdaptiveRefiner在各轮执行后追加用例
+                            case_data['adaptive'] = suit.adaptive
                         all_cases.append(case_data)
 
             self.logger.info(f"总共生成 {len(all_cases)} 个测试用例")
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试用例合并规划器
+
+专门负责：
+- 将共享模型/kv/mmap/提示词文件等参数的用例合并为一次llm_bench_prompt调用
+- 生成逗号分隔的列表参数（-t 1,2,4 / -p 64,128 ...）
+- 将合并调用输出的Markdown表格按行拆分回各个用例
+
+llm_bench_prompt 内部按 precision -> threads(降序) -> dynamicOption 嵌套循环，
+kv=false 时每组依次输出 pp(-p列表)、tg(-n列表)、pp+tg(-pg) 行，
+kv=true 时输出 -p 与 -n 的笛卡尔积行。拆分依据即为该输出顺序。
+"""
+
+import itertools
+import json
+from typing import Dict, List, Any, Optional, Tuple
+from utils.logger import LoggerManager
+
+
+class CaseCoalescer:
+    """基准测试用例合并规划器"""
+
+    # 支持逗号分隔列表的参数，顺序与llm_bench_prompt内部循环嵌套顺序一致
+    LIST_PARAMS = ("precision", "threads", "dynamicOption", "n_prompt", "n_gen")
+
+    # 与build_command保持一致：这些参数为None时才省略，其余参数为假值时省略
+    NONE_CHECKED_PARAMS = ("precision", "dynamicOption")
+
+    # 调度参数，不传递给llm_bench_prompt
+    SCHEDULE_PARAMS = ("timeout", "model")
+
+    def __init__(self):
+        """初始化用例合并规划器"""
+        self.logger = LoggerManager.get_logger("CaseCoalescer")
+
+    def plan(self, all_cases: List[Dict[str, Any]]) -> List[List[int]]:
+        """
+        规划执行单元
+
+        同一模型、同一套件下，除列表参数外其余参数完全一致的用例归为一组；
+        只有组内用例恰好构成列表参数的完整组合时才合并，否则逐个执行。
+
+        Args:
+            all_cases: CaseGenerator生成的全部用例
+
+        Returns:
+            执行单元列表，每个单元为用例下标列表（按首次出现顺序）
+        """
+        groups: Dict[Tuple, List[int]] = {}
+        for index, case in enumerate(all_cases):
+            groups.setdefault(self._group_key(case), []).append(index)
+
+        units = []
+        for indices in groups.values():
+            cases = [all_cases[i] for i in indices]
+            if len(indices) > 1 and self._is_full_product(cases):
+                units.append(indices)
+            else:
+                units.extend([i] for i in indices)
+
+        units.sort(key=lambda unit: unit[0])
+        merged = sum(1 for unit in units if len(unit) > 1)
+        self.logger.info(f"用例合并规划完成: {len(all_cases)} 个用例 -> {len(units)} 次调用 (合并组: {merged})")
+        return units
+
+    def build_group_params(self, cases: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        构建合并调用的参数，列表参数转换为逗号分隔字符串
+
+        Args:
+            cases: 同一执行单元内的用例
+
+        Returns:
+            可直接传给BenchExecutor.build_command的参数字典
+        """
+        group_params = self._exec_params(cases[0])
+        for name, values in self._group_values(cases).items():
+            if values == [None]:
+                group_params.pop(name, None)
+            else:
+                group_params[name] = ",".join(str(v) for v in values)
+        return group_params
+
+    def split_rows(self, cases: List[Dict[str, Any]],
+                   rows: List[Dict[str, str]]) -> Optional[List[List[int]]]:
+        """
+        将合并调用的表格行拆分给各个用例
+
+        Args:
+            cases: 同一执行单元内的用例
+            rows: 合并调用输出的表格行（表头 -> 值）
+
+        Returns:
+            与cases一一对应的行下标列表；输出与预期不符时返回None
+        """
+        group_values = self._group_values(cases)
+        kv_true = self._is_kv_true(cases[0])
+        pg_rows = 1 if self._has_prompt_gen(cases[0]) else 0
+
+        prompts = group_values["n_prompt"]
+        gens = group_values["n_gen"]
+        # threads在llm_bench_prompt中按降序排列
+        threads = sorted(group_values["threads"], key=lambda v: -1 if v is None else int(v), reverse=True)
+
+        # 预期输出：(precision, threads, dynamicOption) -> 本组行的起始下标
+        outer = list(itertools.product(group_values["precision"], threads, group_values["dynamicOption"]))
+        rows_per_outer = len(prompts) * len(gens) if kv_true else len(prompts) + len(gens) + pg_rows
+
+        if len(rows) != len(outer) * rows_per_outer:
+            self.logger.warning(f"合并输出行数不符: 期望 {len(outer) * rows_per_outer}，实际 {len(rows)}")
+            return None
+
+        for block, (precision, thread, dynamic_option) in enumerate(outer):
+            expected = {
+                "threads": None if thread is None else str(thread),
+                "precision": None if precision is None else self.precision_label(precision),
+                "dynamicOption": None if dynamic_option is None else str(dynamic_option)
+            }
+            for row in rows[block * rows_per_outer:(block + 1) * rows_per_outer]:
+                for column, value in expected.items():
+                    # precision/dynamicOption列仅在表格输出时核对
+                    if value is None or (column != "threads" and column not in row):
+                        continue
+                    if row.get(column, "").strip() != value:
+                        self.logger.warning(f"合并输出{column}不符: 期望 {value}，实际 {row.get(column)}")
+                        return None
+                if kv_true != bool(row.get("llm_demo", "").strip()):
+                    self.logger.warning(f"合并输出格式不符: {row}")
+                    return None
+
+        assignments = []
+        for case in cases:
+            values = self._case_values(case)
+            block = outer.index((values["precision"], values["threads"], values["dynamicOption"]))
+            base = block * rows_per_outer
+            p_index = prompts.index(values["n_prompt"])
+            n_index = gens.index(values["n_gen"])
+
+            if kv_true:
+                indices = [base + p_index * len(gens) + n_index]
+            else:
+                indices = [base + p_index, base + len(prompts) + n_index]
+                if pg_rows:
+                    indices.append(base + len(prompts) + len(gens))
+            assignments.append(indices)
+
+        return assignments
+
+    @staticmethod
+    def precision_label(precision: Any) -> str:
+        """llm_bench_prompt表格中precision列的显示值：0为Normal，2为Low，其余为High"""
+        try:
+            value = int(precision)
+        except (TypeError, ValueError):
+            return str(precision)
+        return {0: "Normal", 2: "Low"}.get(value, "High")
+
+    def _exec_params(self, case: Dict[str, Any]) -> Dict[str, Any]:
+        """提取用例的执行参数（去除调度参数）"""
+        return {k: v for k, v in case['params'].items() if k not in self.SCHEDULE_PARAMS}
+
+    def _case_values(self, case: Dict[str, Any]) -> Dict[str, Any]:
+        """提取用例的列表参数取值，未传递给命令行的参数记为None"""
+        params = case['params']
+        values = {}
+        for name in self.LIST_PARAMS:
+            value = params.get(name)
+            if name in self.NONE_CHECKED_PARAMS:
+                values[name] = value
+            else:
+                values[name] = value if value else None
+        return values
+
+    def _group_values(self, cases: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+        """按首次出现顺序收集组内各列表参数的取值（去重）"""
+        group_values = {name: [] for name in self.LIST_PARAMS}
+        for case in cases:
+            for name, value in self._case_values(case).items():
+                if value not in group_values[name]:
+                    group_values[name].append(value)
+        return group_values
+
+    def _group_key(self, case: Dict[str, Any]) -> Tuple:
+        """计算合并分组键：模型、套件、非列表参数以及列表参数是否缺省"""
+        exec_params = self._exec_params(case)
+        fixed = {k: v for k, v in exec_params.items() if k not in self.LIST_PARAMS}
+        presence = tuple(value is None for value in self._case_values(case).values())
+        return (
+            case.get('model', 'default'),
+            case['suit_name'],
+            json.dumps(fixed, sort_keys=True, default=str),
+            presence
+        )
+
+    def _is_full_product(self, cases: List[Dict[str, Any]]) -> bool:
+        """检查组内用例是否恰好构成列表参数的完整组合（无重复、无缺失）"""
+        combos = [tuple(self._case_values(case).values()) for case in cases]
+        if len(set(combos)) != len(combos):
+            return False
+
+        group_values = self._group_values(cases)
+        expected = 1
+        for values in group_values.values():
+            expected *= len(values)
+        return expected == len(combos)
+
+    def _is_kv_true(self, case: Dict[str, Any]) -> bool:
+        """llm_bench_prompt仅在-kv参数严格等于"true"时使用llm_demo模式"""
+        kv_cache = case['params'].get("kv_cache")
+        return bool(kv_cache) and str(kv_cache) == "true"
+
+    def _has_prompt_gen(self, case: Dict[str, Any]) -> bool:
+        """判断kv=false模式下是否会输出pp+tg行"""
+        prompt_gen = case['params'].get("prompt_gen")
+        if not prompt_gen:
+            return False
+        try:
+            return any(int(v) != 0 for v in str(prompt_gen).split(","))
+        except ValueError:
+            return True
+
+    def __repr__(self):
+        return f"CaseCoalescer(list_params={list(self.LIST_PARAMS)})"
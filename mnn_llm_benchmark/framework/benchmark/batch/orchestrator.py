@@ -16,11 +16,13 @@
 
 from pathlib import Path
 from typing import Dict, Any, Optional, List
+import json
 import time
 import yaml
 
 from benchmark.batch.tasks import TaskLoader
 from benchmark.batch.cases import CaseGenerator
+from benchmark.batch.planner import SweepPlanner
 from benchmark.batch.runner import TaskRunner
 from benchmark.batch.results import ResultManager
 from utils.logger import LoggerManager
@@ -313,13 +315,15 @@ class BatchBenchmark:
 
     
     
-    def run_task(self, yaml_file: str, preview: bool = True) -> Dict[str, Any]:
+    def run_task(self, yaml_file: Optional[str], preview: bool = True,
+                 resume_task_id: Optional[int] = None) -> Dict[str, Any]:
         """
         运行批量基准测试任务
 
         Args:
-            yaml_file: YAML任务文件路径
+            yaml_file: YAML任务文件路径（续跑时可为None，使用任务记录中保存的配置）
             preview: 是否为预览模式（仅显示计划，不实际执行）
+            resume_task_id: 续跑的任务ID，仅执行该任务中缺失或失败的用例
 
         Returns:
             执行结果摘要
@@ -329,7 +333,10 @@ class BatchBenchmark:
 
             # 1. 加载任务配置
             self.logger.info("开始批量基准测试任务")
-            task_config = self.task_loader.load_task_file(yaml_file)
+            if resume_task_id is not None:
+                task_config = self._load_resume_config(resume_task_id, yaml_file)
+            else:
+                task_config = self.task_loader.load_task_file(yaml_file)
 
             # 2. 生成所有测试用例
             all_cases = self.case_generator.generate_all_cases(task_config)
@@ -337,6 +344,11 @@ class BatchBenchmark:
             if not all_cases:
                 raise ValueError("没有生成任何测试用例")
 
+            # 按历史耗时预测用例耗时，按planner选项设置超时和执行顺序
+            db_manager = self.task_runner.db_manager
+            planner = SweepPlanner(db_manager.db_path if db_manager else None)
+            all_cases = planner.plan(all_cases, task_config)
+
             # 3. 创建结果目录
             task_dir = self.result_manager.create_result_directory(task_config)
 
@@ -350,7 +362,8 @@ class BatchBenchmark:
             self.result_manager.generate_task_readme(task_dir, task_config, execution_plan_for_readme)
 
             # 6. 执行任务（预览标志传递给执行器，由执行器决定是否实际执行benchmark）
-            results = self.task_runner.execute_batch_task(all_cases, preview, task_dir, task_config)
+            results = self.task_runner.execute_batch_task(all_cases, preview, task_dir, task_config,
+                                                          resume_task_id=resume_task_id)
 
             # 7. 保存任务摘要并更新任务状态
             end_time = time.time()
@@ -375,7 +388,7 @@ class BatchBenchmark:
                     actual_task_name = f"{task_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
                 self.task_runner.db_manager.complete_task_with_summary(
-                    task_name, execution_time_seconds, results
+                    task_name, execution_time_seconds, results, task_id=self.task_runner.current_task_id
                 )
 
             # 8. 生成返回摘要
@@ -400,7 +413,7 @@ class BatchBenchmark:
             mode_text = "预览完成" if preview else "执行完成"
             print(f"\n{ColorOutput.green(f'✓ 批量基准测试{mode_text}')}")
             print(f"成功率: {success_count}/{total_count} ({success_rate:.1f}%) | 耗时: {execution_time:.1f}秒")
-            print(f"任务文件: {yaml_file}")
+            print(f"任务文件: {yaml_file if yaml_file else f'任务记录 {resume_task_id}'}")
 
             self.logger.info(f"批量基准测试任务完成: {success_count}/{total_count} 成功")
             return summary
@@ -414,6 +427,41 @@ class BatchBenchmark:
                 'execution_time': time.time() - start_time if 'start_time' in locals() else 0
             }
 
+    def _load_resume_config(self, task_id: int, yaml_file: Optional[str] = None) -> Dict[str, Any]:
+        """
+        加载续跑任务的配置：未指定YAML文件时使用任务记录中保存的配置
+
+        Args:
+            task_id: 续跑的任务ID
+            yaml_file: 可选的YAML任务文件路径
+
+        Returns:
+            任务配置
+
+        Raises:
+            ValueError: 任务不存在或没有保存配置
+        """
+        if not self.db_manager:
+            raise ValueError("续跑需要数据库支持")
+
+        task = self.db_manager.get_task(task_id)
+        if not task:
+            raise ValueError(f"任务不存在: task_id={task_id}")
+
+        stored_config = json.loads(task['original_yaml']) if task.get('original_yaml') else None
+        if not yaml_file:
+            if not stored_config:
+                raise ValueError(f"任务 {task_id} 没有保存配置，请使用 -b 指定任务文件")
+            self.logger.info(f"使用任务记录中保存的配置续跑: {task['name']}")
+            return stored_config
+
+        task_config = self.task_loader.load_task_file(yaml_file)
+        if stored_config and stored_config != task_config:
+            # 配置变化时仍按参数指纹跳过相同用例，只是用例编号可能与原任务不一致
+            self.logger.warning(f"任务文件与任务 {task_id} 保存的配置不一致，将按用例参数指纹续跑")
+            print(f"{ColorOutput.yellow('警告')}: 任务文件与原任务配置不一致，仅跳过参数完全相同的已完成用例")
+        return task_config
+
     def get_task_status(self, yaml_file: str) -> Dict[str, Any]:
         """
         获取任务状态（简化版本）
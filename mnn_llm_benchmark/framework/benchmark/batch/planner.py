@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+基于耗时模型的测试计划器
+
+专门负责：
+- 从历史用例的execution_time_seconds拟合每个模型的耗时模型
+- 预测每个用例的耗时，汇总任务的预计总耗时
+- 按预测耗时为用例设置独立的超时时间（写入case['timeout']，不作为用例参数存储）
+- 按由粗到细的顺序重排网格用例，尽早覆盖整个参数空间
+"""
+
+import json
+import math
+import sqlite3
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+from scipy.optimize import nnls
+from benchmark.batch.scheduler import DEFAULT_BENCH_THREADS
+from utils.logger import LoggerManager
+
+
+# llm_bench_prompt 未指定参数时的默认值
+DEFAULT_BENCH_PARAMS = {
+    "n_prompt": 512,
+    "n_gen": 128,
+    "n_repeat": 5
+}
+
+# 默认计划器配置（任务中设置planner: true时使用）
+DEFAULT_PLANNER_CONFIG = {
+    "order": "coarse_first",  # 用例顺序：coarse_first（由粗到细）或declared（声明顺序）
+    "timeout_factor": 3.0,    # 超时时间 = 预测耗时 × timeout_factor
+    "min_timeout": 60         # 超时时间下限（秒）
+}
+
+
+def case_features(params: Dict[str, Any]) -> List[float]:
+    """
+    计算用例的耗时特征
+
+    每次调用包含1轮预热和n_repeat轮测试，每轮的prefill/decode耗时分别与
+    token数成正比，并部分随线程数线性加速。
+
+    Args:
+        params: 用例参数
+
+    Returns:
+        [常数项, R*P, R*G, R*P/T, R*G/T]，R为总轮数，P/G为prefill/decode token数，T为线程数
+    """
+    def value(name: str, default: int) -> float:
+        raw = params.get(name)
+        try:
+            return float(raw) if raw not in (None, '') else float(default)
+        except (TypeError, ValueError):
+            return float(default)
+
+    rounds = value("n_repeat", DEFAULT_BENCH_PARAMS["n_repeat"]) + 1
+    prompt_tokens = value("n_prompt", DEFAULT_BENCH_PARAMS["n_prompt"])
+    gen_tokens = value("n_gen", DEFAULT_BENCH_PARAMS["n_gen"])
+    threads = max(1.0, value("threads", DEFAULT_BENCH_THREADS))
+
+    # -pg "p,g" 额外执行一次pp+tg组合测试
+    prompt_gen = params.get("prompt_gen")
+    if prompt_gen:
+        try:
+            pg_prompt, pg_gen = (float(v) for v in str(prompt_gen).split(",")[:2])
+            prompt_tokens += pg_prompt
+            gen_tokens += pg_gen
+        except ValueError:
+            pass
+
+    return [
+        1.0,
+        rounds * prompt_tokens,
+        rounds * gen_tokens,
+        rounds * prompt_tokens / threads,
+        rounds * gen_tokens / threads
+    ]
+
+
+def invocation_features(cases_params: List[Dict[str, Any]]) -> List[float]:
+    """
+    计算一次llm_bench_prompt调用的耗时特征
+
+    合并执行时一次调用覆盖多个用例：各用例的token工作量相加，常数项为模型加载次数
+    （llm_bench_prompt对每个precision/threads/dynamicOption/mmap组合加载一次模型）。
+
+    Args:
+        cases_params: 本次调用包含的各用例参数
+
+    Returns:
+        与case_features相同维度的特征
+    """
+    features = [0.0] * len(case_features({}))
+    for params in cases_params:
+        for i, value in enumerate(case_features(params)[1:], 1):
+            features[i] += value
+    features[0] = float(len({
+        tuple(str(params.get(name)) for name in ("precision", "threads", "dynamicOption", "mmap"))
+        for params in cases_params
+    }))
+    return features
+
+
+def coarse_levels(count: int) -> List[int]:
+    """
+    计算网格各下标的细化层级：两端为0层，之后每层在已有点之间插入中点
+
+    Args:
+        count: 网格点数
+
+    Returns:
+        每个下标的层级
+    """
+    levels = [None] * count
+    if count == 0:
+        return []
+    levels[0] = 0
+    levels[count - 1] = 0
+    level = 0
+    while any(lv is None for lv in levels):
+        level += 1
+        segments = 2 ** level
+        for j in range(segments + 1):
+            index = round(j * (count - 1) / segments)
+            if levels[index] is None:
+                levels[index] = level
+    return levels
+
+
+class RuntimeCostModel:
+    """按模型拟合的用例耗时模型（非负最小二乘）"""
+
+    def __init__(self, min_samples: int = 5):
+        """
+        初始化耗时模型
+
+        Args:
+            min_samples: 拟合单个模型所需的最少历史用例数，不足时使用所有模型合并拟合的结果
+        """
+        self.logger = LoggerManager.get_logger("RuntimeCostModel")
+        self.min_samples = min_samples
+        self.coefficients: Dict[str, np.ndarray] = {}
+        self.pooled: Optional[np.ndarray] = None
+        self.sample_counts: Dict[str, int] = {}
+
+    def fit(self, samples: List[Tuple[str, Dict[str, Any], float]]) -> "RuntimeCostModel":
+        """
+        拟合耗时模型
+
+        Args:
+            samples: [(模型名, 用例参数, 实测耗时秒数), ...]，每个样本为单个用例的一次调用
+
+        Returns:
+            自身，便于链式调用
+        """
+        return self.fit_invocations([(model_name, [params], seconds) for model_name, params, seconds in samples])
+
+    def fit_invocations(self, invocations: List[Tuple[str, List[Dict[str, Any]], float]]) -> "RuntimeCostModel":
+        """
+        按llm_bench_prompt调用拟合耗时模型
+
+        Args:
+            invocations: [(模型名, 本次调用包含的各用例参数, 调用的原始耗时秒数), ...]
+
+        Returns:
+            自身，便于链式调用
+        """
+        by_model: Dict[str, List[Tuple[List[float], float]]] = {}
+        for model_name, cases_params, seconds in invocations:
+            if seconds is None or not math.isfinite(seconds) or seconds <= 0:
+                continue
+            by_model.setdefault(model_name, []).append((invocation_features(cases_params), seconds))
+
+        for model_name, rows in by_model.items():
+            self.sample_counts[model_name] = len(rows)
+            if len(rows) >= self.min_samples:
+                self.coefficients[model_name] = self._solve(rows)
+
+        all_rows = [row for rows in by_model.values() for row in rows]
+        if len(all_rows) >= self.min_samples:
+            self.pooled = self._solve(all_rows)
+
+        self.logger.info(f"耗时模型拟合完成: 历史用例 {self.sample_counts}, 独立拟合模型 {sorted(self.coefficients)}")
+        return self
+
+    def fit_from_database(self, db_path: str) -> "RuntimeCostModel":
+        """
+        从数据库历史用例拟合（排除复用的缓存结果和失败用例）
+
+        execution_time_seconds不是一次调用的原始耗时：合并执行时为整组耗时按用例数均摊的值，
+        常驻工作进程执行时不含模型加载。因此按调用还原样本：合并执行的用例按group_id归为一次调用，
+        耗时取group_runtime_seconds；其余用例为单独一次调用，耗时加回model_load_seconds。
+
+        Args:
+            db_path: 数据库路径
+
+        Returns:
+            自身，便于链式调用
+        """
+        try:
+            with sqlite3.connect(db_path) as conn:
+                rows = conn.execute('''
+                    SELECT s.model_name, cd.suite_id, cd.base_parameters, cd.execution_time_seconds,
+                           cd.model_load_seconds, cd.group_id, cd.group_runtime_seconds
+                    FROM case_definitions cd
+                    JOIN suites s ON cd.suite_id = s.id
+                    WHERE cd.status = 'success' AND cd.execution_time_seconds > 0
+                      AND cd.reused_from_case_id IS NULL
+                ''').fetchall()
+        except sqlite3.Error as e:
+            self.logger.warning(f"读取历史耗时失败: {e}")
+            return self
+
+        invocations: Dict[Any, Tuple[str, List[Dict[str, Any]], float]] = {}
+        for index, (model_name, suite_id, base_parameters, seconds, load_seconds,
+                    group_id, group_seconds) in enumerate(rows):
+            try:
+                params = json.loads(base_parameters) if base_parameters else {}
+            except json.JSONDecodeError:
+                continue
+            if group_id and group_seconds:
+                invocation = invocations.setdefault((suite_id, group_id), (model_name, [], group_seconds))
+                invocation[1].append(params)
+            else:
+                invocations[index] = (model_name, [params], seconds + (load_seconds or 0.0))
+        return self.fit_invocations(list(invocations.values()))
+
+    def predict(self, model_name: str, params: Dict[str, Any]) -> Optional[float]:
+        """
+        预测用例耗时
+
+        Args:
+            model_name: 模型名
+            params: 用例参数
+
+        Returns:
+            预测耗时（秒），没有可用的历史数据时返回None
+        """
+        coefficients = self.coefficients.get(model_name, self.pooled)
+        if coefficients is None:
+            return None
+        return float(np.dot(coefficients, case_features(params)))
+
+    def _solve(self, rows: List[Tuple[List[float], float]]) -> np.ndarray:
+        """非负最小二乘求解，各特征按列缩放以改善数值条件"""
+        features = np.array([f for f, _ in rows], dtype=float)
+        targets = np.array([t for _, t in rows], dtype=float)
+        scale = features.max(axis=0)
+        scale[scale == 0] = 1.0
+        solution, _ = nnls(features / scale, targets)
+        return solution / scale
+
+    def __repr__(self):
+        return f"RuntimeCostModel(models={sorted(self.coefficients)}, pooled={self.pooled is not None})"
+
+
+class SweepPlanner:
+    """测试计划器：预测耗时、设置超时并重排用例"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        初始化计划器
+
+        Args:
+            db_path: 历史结果数据库路径，为None时不进行耗时预测
+        """
+        self.logger = LoggerManager.get_logger("SweepPlanner")
+        self.db_path = db_path
+        self._cost_model: Optional[RuntimeCostModel] = None
+
+    def plan(self, all_cases: List[Dict[str, Any]], task_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        规划测试用例：写入predicted_seconds，按planner配置设置超时和执行顺序
+
+        Args:
+            all_cases: CaseGenerator生成的用例
+            task_config: 任务配置（planner选项可写在顶层或global_config中）
+
+        Returns:
+            规划后的用例列表
+        """
+        config = self.parse_config(task_config)
+        self._predict(all_cases)
+
+        if config is None:
+            return all_cases
+
+        if config["timeout_factor"]:
+            self._apply_timeouts(all_cases, config)
+        if config["order"] == "coarse_first":
+            all_cases = self.order_coarse_first(all_cases)
+        return all_cases
+
+    def plan_added(self, new_cases: List[Dict[str, Any]], task_config: Dict[str, Any]) -> None:
+        """
+        为执行过程中追加的用例（自适应细化）写入predicted_seconds并设置超时，不重排顺序
+
+        Args:
+            new_cases: 追加的用例
+            task_config: 任务配置
+        """
+        config = self.parse_config(task_config)
+        self._predict(new_cases)
+        if config is not None and config["timeout_factor"]:
+            self._apply_timeouts(new_cases, config)
+
+    def _predict(self, all_cases: List[Dict[str, Any]]) -> None:
+        """按历史耗时模型写入各用例的predicted_seconds（模型只拟合一次）"""
+        if self._cost_model is None:
+            if not self.db_path:
+                return
+            self._cost_model = RuntimeCostModel().fit_from_database(self.db_path)
+        for case in all_cases:
+            case['predicted_seconds'] = self._cost_model.predict(case.get('model', 'default'), case['params'])
+
+    def parse_config(self, task_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        解析planner任务选项
+
+        Args:
+            task_config: 任务配置
+
+        Returns:
+            计划器配置，未开启时返回None
+        """
+        global_config = task_config.get('global_config', {})
+        option = task_config.get('planner', global_config.get('planner'))
+        if not option:
+            return None
+
+        config = dict(DEFAULT_PLANNER_CONFIG)
+        if isinstance(option, dict):
+            config.update(option)
+        if config["order"] not in ("coarse_first", "declared"):
+            raise ValueError(f"planner.order 无效: {config['order']}")
+        return config
+
+    def order_coarse_first(self, all_cases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        由粗到细重排用例：保持模型顺序，同一模型内先执行各变量的端点组合，再逐层插入中点
+
+        Args:
+            all_cases: 用例列表
+
+        Returns:
+            重排后的用例列表
+        """
+        # 每个(模型, 套件)的各变量取值，按出现顺序（timeout为调度参数，不视为网格变量）
+        grid_values: Dict[Tuple[str, str], Dict[str, List[Any]]] = {}
+        for case in all_cases:
+            values = grid_values.setdefault((case.get('model', 'default'), case['suit_name']), {})
+            for name, value in case['params'].items():
+                if name != 'timeout' and value not in values.setdefault(name, []):
+                    values[name].append(value)
+
+        level_lists = {
+            key: {name: coarse_levels(len(values)) for name, values in variables.items()}
+            for key, variables in grid_values.items()
+        }
+
+        model_order = {}
+        for case in all_cases:
+            model_order.setdefault(case.get('model', 'default'), len(model_order))
+
+        def sort_key(item: Tuple[int, Dict[str, Any]]) -> Tuple[int, int, int]:
+            index, case = item
+            model = case.get('model', 'default')
+            values = grid_values[(model, case['suit_name'])]
+            levels = level_lists[(model, case['suit_name'])]
+            level = max((levels[name][values[name].index(value)]
+                         for name, value in case['params'].items() if name != 'timeout'), default=0)
+            return model_order[model], level, index
+
+        ordered = [case for _, case in sorted(enumerate(all_cases), key=sort_key)]
+        self.logger.info("用例已按由粗到细的顺序重排")
+        return ordered
+
+    def _apply_timeouts(self, all_cases: List[Dict[str, Any]], config: Dict[str, Any]) -> None:
+        """
+        为未显式指定timeout的用例按预测耗时设置超时
+
+        预测超时写入case['timeout']而非params：params会作为用例变量存入数据库，
+        逐用例不同的timeout会被分析当作扫描变量。
+        """
+        updated = 0
+        for case in all_cases:
+            predicted = case.get('predicted_seconds')
+            if predicted is None or 'timeout' in case['params']:
+                continue
+            case['timeout'] = int(math.ceil(max(config["min_timeout"], predicted * config["timeout_factor"])))
+            updated += 1
+        self.logger.info(f"按预测耗时设置超时: {updated}/{len(all_cases)} 个用例")
+
+    def __repr__(self):
+        return f"SweepPlanner(db_path={self.db_path})"
+
+
+def format_duration(seconds: float) -> str:
+    """将秒数格式化为 "1小时2分" 形式"""
+    seconds = int(round(seconds))
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours}小时{minutes}分"
+    if minutes:
+        return f"{minutes}分{secs}秒"
+    return f"{secs}秒"
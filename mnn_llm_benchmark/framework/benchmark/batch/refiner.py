@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+自适应网格细化器
+
+专门负责：
+- 按(模型, 套件, 其余参数)将adaptive变量的用例划分为一维吞吐量曲线
+- 每轮执行后用RegressionAnalyzer拟合曲线
+- 在回归预测与相邻测量点线性插值差异最大（曲率或拟合误差最大）的区间追加测量点
+- 每条曲线的测量点数不超过budget
+- 续跑跳过或复用缓存的用例没有json_result，从数据库读取已存储的结果
+"""
+
+import copy
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+from analysis.regression import RegressionAnalyzer
+from utils.logger import LoggerManager
+
+
+class AdaptiveRefiner:
+    """自适应网格细化器"""
+
+    # adaptive指标对应的数据库结果类型
+    METRIC_RESULT_TYPES = {"prefill": "pp", "decode": "tg"}
+
+    def __init__(self, db_manager=None):
+        """
+        初始化细化器
+
+        Args:
+            db_manager: 可选的DatabaseManager，用于读取续跑跳过或缓存复用用例的已存储结果
+        """
+        self.logger = LoggerManager.get_logger("AdaptiveRefiner")
+        self.regression = RegressionAnalyzer()
+        self.db_manager = db_manager
+
+    def initial_budget(self, all_cases: List[Dict[str, Any]]) -> int:
+        """
+        计算各曲线最多还能追加的用例数（用于预览显示）
+
+        Args:
+            all_cases: 初始用例
+
+        Returns:
+            追加用例数上限
+        """
+        total = 0
+        for cases in self._group_curves(all_cases, {}).values():
+            spec = cases[0][1]['adaptive']
+            total += max(0, spec['budget'] - len(cases))
+        return total
+
+    def refine(self, all_cases: List[Dict[str, Any]], results: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        根据已有结果生成下一轮用例
+
+        Args:
+            all_cases: 当前全部用例（含之前各轮追加的用例）
+            results: {用例下标: 执行结果}
+
+        Returns:
+            新增用例列表，为空时表示细化结束
+        """
+        new_cases = []
+        for key, cases in self._group_curves(all_cases, results).items():
+            spec = cases[0][1]['adaptive']
+            remaining = spec['budget'] - len(cases)
+            if remaining <= 0:
+                continue
+
+            measured = {case['params'][spec['variable']] for _, case, _ in cases}
+            points = [(case['params'][spec['variable']], value) for _, case, value in cases if value is not None]
+            candidates = self._rank_candidates(spec, measured, points)
+
+            template = cases[0][1]
+            for value in candidates[:min(remaining, spec['batch'])]:
+                case = copy.deepcopy(template)
+                case['params'][spec['variable']] = value
+                # 耗时预测与计划器超时随参数变化，由调用方为新用例重新规划
+                case.pop('predicted_seconds', None)
+                case.pop('timeout', None)
+                new_cases.append(case)
+
+        if new_cases:
+            self.logger.info(f"自适应细化: 追加 {len(new_cases)} 个用例")
+        return new_cases
+
+    def _group_curves(self, all_cases: List[Dict[str, Any]],
+                      results: Dict[int, Dict[str, Any]]) -> Dict[Tuple, List[Tuple[int, Dict[str, Any], Optional[float]]]]:
+        """将adaptive用例按曲线分组，附带已测得的吞吐量"""
+        curves: Dict[Tuple, List[Tuple[int, Dict[str, Any], Optional[float]]]] = {}
+        for index, case in enumerate(all_cases):
+            spec = case.get('adaptive')
+            if not spec:
+                continue
+            other_params = tuple(sorted(
+                (name, str(value)) for name, value in case['params'].items()
+                if name not in (spec['variable'], 'timeout')
+            ))
+            key = (case.get('model', 'default'), case['suit_name'], other_params)
+            curves.setdefault(key, []).append((index, case, self._metric_value(results.get(index), spec['metric'])))
+        return curves
+
+    def _metric_value(self, result: Optional[Dict[str, Any]], metric: str) -> Optional[float]:
+        """从执行结果中提取吞吐量均值，没有json_result时读取数据库中已存储的均值"""
+        if not result or not result.get('success'):
+            return None
+        json_result = result.get('json_result')
+        if not json_result:
+            case_id = result.get('resumed_case_id') or result.get('cache_source_case_id')
+            if case_id is None or self.db_manager is None:
+                return None
+            return self.db_manager.get_case_result_mean(case_id, self.METRIC_RESULT_TYPES[metric])
+        entry = (json_result.get('results') or {}).get(metric)
+        if not entry:
+            return None
+        return entry.get('tokens_per_sec', {}).get('mean')
+
+    def _rank_candidates(self, spec: Dict[str, Any], measured: set,
+                         points: List[Tuple[float, float]]) -> List[Any]:
+        """
+        对未测量的网格点排序
+
+        每个相邻测量点之间的区间取最靠近中点的网格点作为候选，得分为该点处
+        回归预测与线性插值之差，加上两端点的回归残差均值；无法回归时按区间宽度排序。
+        每个区间每轮只取一个候选，保证追加点分散在不同区间。
+        """
+        grid = spec['grid']
+        measured_positions = sorted(i for i, value in enumerate(grid) if value in measured)
+        points = sorted(points)
+        xs = np.array([float(x) for x, _ in points])
+        ys = np.array([float(y) for _, y in points])
+
+        analysis = None
+        if len(points) >= 3:
+            try:
+                analysis = self.regression.analyze_regression(xs, ys, spec['variable'], spec['metric'])
+            except Exception as e:
+                self.logger.warning(f"自适应细化回归失败，按区间宽度细化: {e}")
+
+        scored = []
+        for left, right in zip(measured_positions, measured_positions[1:]):
+            if right - left < 2:
+                continue
+            candidate = (left + right) // 2
+            x_left, x_right, x_mid = float(grid[left]), float(grid[right]), float(grid[candidate])
+            score = 0.0
+            if analysis is not None:
+                y_left, y_right, y_mid = self.regression.predict(analysis, np.array([x_left, x_right, x_mid]))
+                residuals = [abs(y - self.regression.predict(analysis, np.array([x]))[0])
+                             for x, y in points if x in (x_left, x_right)]
+                interpolated = y_left + (y_right - y_left) * (x_mid - x_left) / (x_right - x_left)
+                score = abs(y_mid - interpolated) + (float(np.mean(residuals)) if residuals else 0.0)
+            scored.append((score, right - left, candidate))
+
+        scored.sort(key=lambda item: (-item[0], -item[1], item[2]))
+        return [grid[candidate] for _, _, candidate in scored]
+
+    def __repr__(self):
+        return "AdaptiveRefiner()"
@@ -15,11 +15,19 @@ import json
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from benchmark.core.executor import BenchExecutor
+from benchmark.core.adaptive import DEFAULT_ADAPTIVE_REPEAT
+from benchmark.core.environment import EnvironmentGuard, INTERFERENCE_REASONS
+from benchmark.core.warm import WarmWorkerBackend
+from benchmark.batch.coalescer import CaseCoalescer
+from benchmark.batch.planner import SweepPlanner, format_duration
+from benchmark.batch.refiner import AdaptiveRefiner
+from benchmark.batch.scheduler import CoreAllocator, ParallelScheduler, format_cpu_list
 from config.system import SystemConfig
 from config.models import ModelsConfig
 from utils.logger import LoggerManager
 from utils.output import ColorOutput
 from utils.db_manager import DatabaseManager
+from utils.db_writer import BatchResultWriter
 import yaml
 
 
@@ -42,11 +50,26 @@ class TaskRunner:
             self.logger.error(f"数据库管理器初始化失败: {e}")
             self.db_manager = None
 
+        # 用例合并规划器
+        self.coalescer = CaseCoalescer()
+
+        # 自适应网格细化器
+        self.refiner = AdaptiveRefiner(self.db_manager)
+
+        # 流式执行选项（由execute_batch_task根据任务配置设置）
+        self._stream_output = False
+        self._keep_raw_output = True
+        self._adaptive_repeat = None
+        self._profile = False
+        self._token_latency = False
+
         # 任务执行状态管理
         self._current_task_config = None
         self._current_task_id = None
         self._current_suite_ids = {}  # {model_name: suite_id}
         self._current_case_counter = 0
+        self._result_writer: Optional[BatchResultWriter] = None
+        self._warm_backend: Optional[WarmWorkerBackend] = None
 
     def create_executor(self) -> BenchExecutor:
         """
@@ -87,7 +110,8 @@ class TaskRunner:
 
             # 从case_data获取模型（确保每个模型独立运行）
             model = case_data.get('model', 'default')
-            timeout = params.get("timeout", global_config.get("timeout", 300))
+            # 超时优先级：显式参数 > 计划器预测 > 全局配置
+            timeout = params.get("timeout", case_data.get("timeout", global_config.get("timeout", 300)))
 
             # 从params中移除timeout和model，避免重复传递
             exec_params = {k: v for k, v in params.items() if k not in ['timeout', 'model']}
@@ -96,7 +120,13 @@ class TaskRunner:
             self.logger.debug(f"执行用例 - 套件: {case_data['suit_name']}")
 
             # 执行基准测试
-            result = executor.execute_bench(model, timeout, taskset_cmd=taskset_cmd, **exec_params)
+            if self._adaptive_repeat is not None:
+                # 自适应重复：按批次执行直到置信区间达到目标宽度
+                result = executor.execute_bench_adaptive(model, timeout, self._adaptive_repeat, taskset_cmd=taskset_cmd,
+                                                         **self._stream_kwargs(case_data['suit_name']), **exec_params)
+            else:
+                result = executor.execute_bench(model, timeout, taskset_cmd=taskset_cmd,
+                                                **self._stream_kwargs(case_data['suit_name']), **exec_params)
 
             # 添加用例信息到结果
             result.update({
@@ -121,8 +151,14 @@ class TaskRunner:
             self.logger.error(f"用例执行失败 - 套件: {case_data['suit_name']}, 错误: {e}")
             return error_result
 
+    @property
+    def current_task_id(self) -> Optional[int]:
+        """当前任务在数据库中的ID（预览模式或无数据库时为None）"""
+        return self._current_task_id
+
     def execute_batch_task(self, all_cases: List[Dict[str, Any]], preview: bool = False,
-                          task_dir: Optional[Path] = None, task_config: Optional[Dict] = None) -> List[Dict[str, Any]]:
+                          task_dir: Optional[Path] = None, task_config: Optional[Dict] = None,
+                          resume_task_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         执行批量基准测试任务
 
@@ -131,19 +167,57 @@ class TaskRunner:
             preview: 是否为预览模式（仅显示计划，不实际执行）
             task_dir: 任务结果目录（预览模式时可为None）
             task_config: 任务配置信息
+            resume_task_id: 续跑的任务ID，已成功的用例将被跳过，其余用例写入同一任务
 
         Returns:
             所有用例的执行结果列表
         """
         results = []
         taskset_cmd = None
+        coalesce = False
+        parallel = False
+        result_cache = None
+        backend = 'subprocess'
+        guard_option = None
         if task_config:
-            taskset_cmd = task_config.get('taskset') or task_config.get('global_config', {}).get('taskset')
+            global_config = task_config.get('global_config', {})
+            taskset_cmd = task_config.get('taskset') or global_config.get('taskset')
+            coalesce = bool(task_config.get('coalesce') or global_config.get('coalesce'))
+            parallel = bool(task_config.get('parallel') or global_config.get('parallel'))
+            self._stream_output = bool(task_config.get('stream') or global_config.get('stream'))
+            keep_raw = task_config.get('keep_raw', global_config.get('keep_raw', True))
+            self._keep_raw_output = bool(keep_raw)
+            self._adaptive_repeat = self._parse_adaptive_repeat(
+                task_config.get('adaptive_repeat', global_config.get('adaptive_repeat'))
+            )
+            result_cache = task_config.get('result_cache', global_config.get('result_cache'))
+            self._profile = bool(task_config.get('profile') or global_config.get('profile'))
+            self._token_latency = bool(task_config.get('token_latency') or global_config.get('token_latency'))
+            backend = task_config.get('backend', global_config.get('backend', 'subprocess'))
+            guard_option = task_config.get('environment_guard', global_config.get('environment_guard'))
+            if backend not in ('subprocess', 'warm'):
+                raise ValueError(f"backend 无效: {backend}，可选 subprocess 或 warm")
+            if backend == 'warm' and self._stream_output:
+                self.logger.warning("常驻工作进程不输出流式结果，流式执行的用例仍使用llm_bench_prompt")
+            if backend == 'warm' and self._token_latency:
+                self.logger.warning("常驻工作进程不记录逐token延迟，全部用例使用llm_bench_prompt执行")
+            if self._adaptive_repeat is not None and coalesce:
+                self.logger.warning("自适应重复需要逐个用例统计，已关闭合并执行")
+                coalesce = False
 
         # 创建执行器
         try:
             # 创建执行器
             executor = self.create_executor()
+            executor.profile = self._profile
+            executor.token_latency = self._token_latency
+            if backend == 'warm' and not preview:
+                warm_config = self.config_manager.get_config('warm_worker')
+                self._warm_backend = WarmWorkerBackend(
+                    python=warm_config.get('python') or None,
+                    max_workers=warm_config.get('max_workers', 1)
+                )
+                executor.backend = self._warm_backend
             total_cases = len(all_cases)
 
             # 初始化任务状态（立即写入任务条目）
@@ -151,83 +225,481 @@ class TaskRunner:
             self._current_suite_ids = {}
             self._current_case_counter = 0
 
-            # 如果不是预览模式且有数据库管理器，立即创建任务记录
+            # 续跑模式：查询已成功的用例（预览模式同样显示跳过情况）
+            completed_cases = {}
+            if resume_task_id is not None:
+                if not self.db_manager:
+                    raise RuntimeError("续跑需要数据库支持")
+                completed_cases = self.db_manager.get_completed_cases(resume_task_id)
+
+            # 如果不是预览模式且有数据库管理器，立即创建任务记录（续跑时沿用原任务）
             if not preview and self.db_manager:
-                self._current_task_id = self.db_manager.create_or_update_task(task_config, 'pending')
+                if resume_task_id is not None:
+                    self.db_manager.resume_task(resume_task_id)
+                    self._current_task_id = resume_task_id
+                else:
+                    self._current_task_id = self.db_manager.create_or_update_task(task_config, 'pending')
                 self.logger.info(f"开始执行批量任务，共 {total_cases} 个测试用例 (task_id={self._current_task_id})")
             else:
                 self._current_task_id = None
                 self.logger.info(f"开始执行批量任务，共 {total_cases} 个测试用例")
 
-            start_time = time.time()
-
-            for i, case in enumerate(all_cases):
-                suit_name = case['suit_name']
-                case_num = i + 1
-
-                # 模型切换显示
-                if i == 0 or (i > 0 and case.get('model') != all_cases[i-1].get('model')):
-                    model = case.get('model', 'default')
-                    # 计算该模型的用例数量，方便显示
-                    model_case_count = sum(1 for c in all_cases if c.get('model') == model)
-                    print(f"\n{ColorOutput.blue('模型')}: {model} ({model_case_count}个用例)")
-                    print(f"{'-' * 40}")
-
-                # 套件切换显示
-                if i == 0 or case['suit_name'] != all_cases[i-1]['suit_name']:
-                    suit_name = case['suit_name']
-                    suit_desc = case.get('suit_description', '')
-                    if suit_desc:
-                        print(f"\n{ColorOutput.cyan('套件')}: {suit_name} ({suit_desc})")
+            def skip_completed(indices: List[int]) -> List[int]:
+                """跳过续跑任务中已成功的用例，返回待执行的用例下标"""
+                remaining = []
+                for i in indices:
+                    case = all_cases[i]
+                    case_hash = DatabaseManager.compute_case_hash(case.get('model', 'default'), case['params'])
+                    completed_name = completed_cases.get((case['suit_name'], case_hash))
+                    if completed_name:
+                        result = {
+                            'success': True,
+                            'skipped': True,
+                            'resumed_from': completed_name,
+                            'case_number': i + 1,
+                            'suit_name': case['suit_name'],
+                            'model': case.get('model', 'default'),
+                            'execution_params': case['params']
+                        }
+                        if case.get('adaptive'):
+                            # 跳过的用例没有json_result，自适应细化从数据库读取已存储的结果
+                            result['resumed_case_id'] = self.db_manager.get_case_id(
+                                resume_task_id, case['suit_name'], case.get('model', 'default'), completed_name)
+                        results.append(result)
                     else:
-                        print(f"\n{ColorOutput.cyan('套件')}: {suit_name}")
-                    print("-" * 30)
-
-                # 用例详情
-                params_str = []
-                for key, value in case['params'].items():
-                    if value is not None:
-                        params_str.append(f"{key}={value}")
-                print(f"  测试 {case_num}/{total_cases}: {', '.join(params_str)}")
+                        remaining.append(i)
+                return remaining
+
+            pending_indices = skip_completed(range(total_cases))
+            if resume_task_id is not None:
+                print(f"{ColorOutput.cyan('断点续跑')}: 任务 {resume_task_id} 已完成 {total_cases - len(pending_indices)} 个用例，"
+                      f"待执行 {len(pending_indices)} 个")
+
+            # 跨任务结果缓存：计算缓存键（执行成功后写入数据库），开启result_cache时复用TTL内的实测结果
+            cache_keys = self._compute_cache_keys(executor, all_cases, pending_indices) if self.db_manager else {}
+            cache_ttl = self._parse_result_cache(result_cache)
+            if cache_ttl is not None and cache_keys:
+                still_pending = []
+                for i in pending_indices:
+                    source_case = self.db_manager.find_cached_case(cache_keys[i], cache_ttl) if i in cache_keys else None
+                    if not source_case:
+                        still_pending.append(i)
+                        continue
+                    case = all_cases[i]
+                    if not preview:
+                        self.db_manager.reuse_cached_case(self._current_task_id, self._get_suite_id(case), i + 1,
+                                                          case, source_case, cache_keys[i])
+                    results.append({
+                        'success': True,
+                        'cached': True,
+                        'cache_source_case_id': source_case['id'],
+                        'case_number': i + 1,
+                        'suit_name': case['suit_name'],
+                        'model': case.get('model', 'default'),
+                        'execution_params': case['params']
+                    })
+                print(f"{ColorOutput.cyan('结果缓存')}: 复用 {len(pending_indices) - len(still_pending)} 个用例 "
+                      f"(有效期 {cache_ttl:g} 小时)，待执行 {len(still_pending)} 个")
+                pending_indices = still_pending
+
+            self._display_eta([all_cases[i] for i in pending_indices], parallel and not preview)
+
+            # 环境噪声防护：开始前等待系统空闲，串行执行时每个用例前再次检查
+            guard = None
+            if not preview and pending_indices:
+                guard = EnvironmentGuard.from_config(self.config_manager.get_config('environment_guard'), guard_option)
+            if guard is not None:
+                preflight = guard.preflight(on_wait=self._display_environment_wait)
+                if preflight['governor_warning']:
+                    print(f"{ColorOutput.yellow('环境检查')}: {preflight['governor_warning']}")
+                if preflight['quiet']:
+                    print(f"{ColorOutput.cyan('环境检查')}: 系统空闲" +
+                          (f" (等待 {preflight['waited_s']:.0f}s)" if preflight['waited_s'] >= 1 else ""))
+                else:
+                    print(f"{ColorOutput.yellow('环境检查')}: 等待超时，继续执行 ({'; '.join(preflight['issues'])})")
 
-                # 简化日志信息
-                self.logger.info(f"进度: {case_num}/{total_cases}")
+            # 自适应细化变量：先执行粗网格，之后每轮按拟合结果追加用例
+            adaptive = any(case.get('adaptive') for case in all_cases)
+            if adaptive:
+                print(f"{ColorOutput.cyan('自适应细化')}: 初始 {total_cases} 个用例，"
+                      f"最多追加 {self.refiner.initial_budget(all_cases)} 个")
+                # 追加用例按自身参数预测耗时和超时，不沿用相邻用例的规划结果
+                planner = SweepPlanner(self.db_manager.db_path if self.db_manager else None)
 
+            start_time = time.time()
+            display_state = {'previous_case': None}
+
+            # 结果由后台线程批量写入，执行线程不等待数据库
+            if not preview and task_dir and self.db_manager:
+                batch_size = self.config_manager.get_config('database').get('write_batch_size', 20)
+                self._result_writer = BatchResultWriter(self.db_manager, batch_size)
+
+            def display_unit(unit: List[int]) -> None:
+                for i in unit:
+                    self._display_case_header(all_cases[i], display_state['previous_case'], all_cases, i + 1, len(all_cases))
+                    display_state['previous_case'] = all_cases[i]
+                if len(unit) > 1:
+                    print(f"  {ColorOutput.gray(f'└─ 以上{len(unit)}个用例合并为一次调用')}")
+
+            def run_unit(unit: List[int], unit_taskset_cmd: Optional[str]) -> List[Dict[str, Any]]:
+                unit_cases = [all_cases[i] for i in unit]
                 # 根据预览模式决定是否执行
                 if preview:
                     # 预览模式：返回模拟结果
-                    result = {
+                    return [{
                         'success': True,
                         'preview': True,
                         'model': case.get('model', 'default'),
                         'execution_time': 0,
                         'execution_result': None,
                         'json_result': None
-                    }
+                    } for case in unit_cases]
+                if len(unit) > 1:
+                    # 合并执行：一次调用覆盖整个单元
+                    return self.execute_coalesced_cases(executor, unit_cases, taskset_cmd=unit_taskset_cmd)
+                # 实际执行：调用执行器
+                return [self.execute_single_case(executor, unit_cases[0], taskset_cmd=unit_taskset_cmd)]
+
+            def run_guarded_unit(unit: List[int]) -> List[Dict[str, Any]]:
+                # 串行执行：开始前等待环境空闲，受干扰时在环境恢复后重跑
+                if guard is None:
+                    return run_unit(unit, taskset_cmd)
+                attempts = int(guard.config['rerun_interfered']) + 1
+                for attempt in range(1, attempts + 1):
+                    start_state = guard.wait_until_quiet(on_wait=self._display_environment_wait)
+                    unit_results = run_unit(unit, taskset_cmd)
+                    reasons = guard.annotate(unit_results, start_state)
+                    if not reasons:
+                        break
+                    labels = ', '.join(INTERFERENCE_REASONS[r] for r in reasons)
+                    if attempt < attempts:
+                        print(f"  {ColorOutput.yellow(f'└─ 受环境干扰 ({labels})，环境恢复后重跑')}")
+                    else:
+                        print(f"  {ColorOutput.yellow(f'└─ 受环境干扰 ({labels})，已标记')}")
+                for result in unit_results:
+                    environment = (result.get('json_result') or {}).get('environment')
+                    if environment is not None:
+                        environment['attempts'] = attempt
+                return unit_results
+
+            def record_unit(unit: List[int], unit_results: List[Dict[str, Any]],
+                            cpu_cores: Optional[List[int]] = None) -> None:
+                for i, result in zip(unit, unit_results):
+                    case_num = i + 1
+                    case = all_cases[i]
+                    result['case_number'] = case_num
+                    if i in cache_keys:
+                        result['cache_key'] = cache_keys[i]
+                    if cpu_cores is not None:
+                        result['cpu_cores'] = format_cpu_list(cpu_cores)
+                    results.append(result)
+
+                    # 保存单个用例结果（仅限实际执行）
+                    if not preview and task_dir:
+                        self._save_case_result_if_needed(task_dir, case_num, case, result)
+                        # 直接写入数据库（实时写入）
+                        self._write_case_result_directly(case_num, case, result)
+
+            if parallel and not preview:
+                # 并行模式：按threads划分互不重叠的核心槽位并发执行
+                scheduler = ParallelScheduler(CoreAllocator.from_taskset(taskset_cmd))
+                print(f"{ColorOutput.cyan('并行调度')}: 核心池 {format_cpu_list(scheduler.allocator.cores)}")
+
+                def on_start(unit: List[int], cores: List[int]) -> None:
+                    display_unit(unit)
+                    print(f"  {ColorOutput.gray(f'└─ 核心: {format_cpu_list(cores)}')}")
+
+                def on_complete(unit: List[int], cores: List[int], unit_results: List[Dict[str, Any]]) -> None:
+                    if guard is not None:
+                        # 并行执行时其他用例的进程计入其他占用，只判断温度
+                        guard.annotate(unit_results, parallel=True)
+                    record_unit(unit, unit_results, cores)
+                    for i, result in zip(unit, unit_results):
+                        status = ColorOutput.green('完成') if result.get('success') else ColorOutput.red('失败')
+                        print(f"  测试 {i + 1}/{len(all_cases)} {status} (核心: {format_cpu_list(cores)})")
+
+            round_indices = pending_indices
+            while round_indices:
+                # 规划执行单元：合并模式下同一单元的用例共用一次llm_bench_prompt调用
+                if coalesce:
+                    round_cases = [all_cases[i] for i in round_indices]
+                    execution_units = [[round_indices[j] for j in unit] for unit in self.coalescer.plan(round_cases)]
+                    print(f"{ColorOutput.cyan('合并执行')}: {len(round_indices)}个用例 -> {len(execution_units)}次调用")
                 else:
-                    # 实际执行：调用执行器
-                    result = self.execute_single_case(executor, case, taskset_cmd=taskset_cmd)
-
-                result['case_number'] = case_num
-                results.append(result)
+                    execution_units = [[i] for i in round_indices]
 
-                # 保存单个用例结果（仅限实际执行）
-                if not preview and task_dir:
-                    self._save_case_result_if_needed(task_dir, case_num, case, result)
-                    # 直接写入数据库（实时写入）
-                    self._write_case_result_directly(case_num, case, result)
+                if parallel and not preview:
+                    scheduler.run(execution_units, all_cases, run_unit, on_start, on_complete)
+                else:
+                    for unit in execution_units:
+                        display_unit(unit)
+                        record_unit(unit, run_guarded_unit(unit))
+
+                if not adaptive or preview:
+                    break
+                new_cases = self.refiner.refine(all_cases, {r['case_number'] - 1: r for r in results})
+                planner.plan_added(new_cases, task_config)
+                new_indices = range(len(all_cases), len(all_cases) + len(new_cases))
+                all_cases.extend(new_cases)
+                round_indices = skip_completed(new_indices)
+                if self.db_manager:
+                    cache_keys.update(self._compute_cache_keys(executor, all_cases, round_indices))
+                if new_cases:
+                    print(f"{ColorOutput.cyan('自适应细化')}: 追加 {len(new_cases)} 个用例")
+
+            self._close_result_writer()
+            self._close_warm_backend()
+
+            # 并行完成顺序和续跑跳过的用例会打乱顺序，按用例编号恢复
+            results.sort(key=lambda r: r['case_number'])
 
             end_time = time.time()
             execution_time = end_time - start_time
 
             self.logger.info(f"批量任务执行完成，耗时: {execution_time:.2f}秒，"
-                           f"成功: {sum(1 for r in results if r.get('success', False))}/{total_cases}")
+                           f"成功: {sum(1 for r in results if r.get('success', False))}/{len(all_cases)}")
+            interfered = sum(1 for r in results if r.get('interference'))
+            if interfered:
+                print(f"{ColorOutput.yellow('环境干扰')}: {interfered} 个用例执行期间受到干扰，已标记"
+                      f"（分析时按[environment_guard].exclude_from_analysis排除，--resume 可重新执行）")
 
             return results
 
         except Exception as e:
             self.logger.error(f"批量任务执行失败: {e}")
             raise
+        finally:
+            # 异常退出时也写入已完成的用例
+            self._close_result_writer()
+            self._close_warm_backend()
+
+    def _close_result_writer(self) -> None:
+        """写入队列中剩余的用例并关闭后台写入器"""
+        if self._result_writer is not None:
+            self._result_writer.close()
+            self._result_writer = None
+
+    def _close_warm_backend(self) -> None:
+        """结束常驻工作进程，释放已加载的模型"""
+        if self._warm_backend is not None:
+            self._warm_backend.close()
+            self._warm_backend = None
+
+    def execute_coalesced_cases(self, executor: BenchExecutor, cases: List[Dict[str, Any]],
+                                taskset_cmd: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        合并执行一组测试用例，失败时回退到逐个执行
+
+        Args:
+            executor: 执行器实例
+            cases: 同一执行单元内的用例（同模型、同套件）
+            taskset_cmd: 可选的taskset命令前缀
+
+        Returns:
+            与cases一一对应的执行结果
+        """
+        model = cases[0].get('model', 'default')
+        group_params = self.coalescer.build_group_params(cases)
+        cases_params = [
+            {k: v for k, v in case['params'].items() if k not in ['timeout', 'model']}
+            for case in cases
+        ]
+        # 整组超时取各用例超时之和，与逐个执行的上限一致
+        timeout = sum(case['params'].get("timeout", case.get("timeout", case['global_config'].get("timeout", 300)))
+                      for case in cases)
+
+        group_results = executor.execute_bench_group(
+            model, timeout, cases_params, group_params,
+            lambda rows: self.coalescer.split_rows(cases, rows),
+            taskset_cmd=taskset_cmd,
+            **self._stream_kwargs(cases[0]['suit_name'])
+        )
+
+        if group_results is None:
+            self.logger.warning(f"合并执行失败，回退到逐个执行 - 套件: {cases[0]['suit_name']}, 用例数: {len(cases)}")
+            return [self.execute_single_case(executor, case, taskset_cmd=taskset_cmd) for case in cases]
+
+        for case, exec_params, result in zip(cases, cases_params, group_results):
+            result.update({
+                'suit_name': case['suit_name'],
+                'suit_description': case['suit_description'],
+                'execution_params': exec_params,
+                'model': model
+            })
+
+        self.logger.info(f"合并用例执行完成 - 套件: {cases[0]['suit_name']}, 用例数: {len(cases)}")
+        return group_results
+
+    def _parse_adaptive_repeat(self, option: Any) -> Optional[Dict[str, Any]]:
+        """
+        解析adaptive_repeat任务选项
+
+        Args:
+            option: true/false或配置字典（ci_width/confidence/min_repeat/max_repeat/chunk）
+
+        Returns:
+            自适应配置字典，未开启时返回None
+        """
+        if not option:
+            return None
+        if isinstance(option, dict):
+            unknown = set(option) - set(DEFAULT_ADAPTIVE_REPEAT)
+            if unknown:
+                self.logger.warning(f"忽略未知的adaptive_repeat配置项: {sorted(unknown)}")
+            return {k: v for k, v in option.items() if k in DEFAULT_ADAPTIVE_REPEAT}
+        return {}
+
+    def _display_eta(self, pending_cases: List[Dict[str, Any]], parallel: bool) -> None:
+        """
+        显示待执行用例的预计耗时（由SweepPlanner写入的predicted_seconds汇总）
+
+        Args:
+            pending_cases: 待执行的用例
+            parallel: 是否并行执行（预计耗时按串行累加，为上限）
+        """
+        predictions = [case.get('predicted_seconds') for case in pending_cases]
+        known = [p for p in predictions if p is not None]
+        if not known:
+            return
+
+        message = f"{ColorOutput.cyan('预计耗时')}: {format_duration(sum(known))}"
+        if len(known) < len(predictions):
+            message += f" ({len(predictions) - len(known)}个用例无历史数据，未计入)"
+        if parallel:
+            message += " (按串行累加，并行执行时为上限)"
+        print(message)
+
+    def _display_environment_wait(self, state: Dict[str, Any]) -> None:
+        """显示等待系统空闲的原因"""
+        message = "├─ 等待系统空闲: " + "; ".join(state['issues'])
+        print(f"  {ColorOutput.gray(message)}")
+
+    def _parse_result_cache(self, option: Any) -> Optional[float]:
+        """
+        解析result_cache任务选项
+
+        Args:
+            option: true/false或{"ttl_hours": N}
+
+        Returns:
+            缓存有效期（小时），未开启时返回None
+        """
+        if not option:
+            return None
+        default_ttl = self.config_manager.get_config('database').get('result_cache_ttl_hours', 168)
+        if isinstance(option, dict):
+            return float(option.get('ttl_hours', default_ttl))
+        return float(default_ttl)
+
+    def _compute_cache_keys(self, executor: BenchExecutor, all_cases: List[Dict[str, Any]],
+                            indices: List[int]) -> Dict[int, str]:
+        """
+        计算用例的跨任务缓存键，无法计算（如模型配置缺失）的用例不参与缓存
+
+        Args:
+            executor: 执行器实例（提供可执行文件和模型配置路径）
+            all_cases: 所有测试用例
+            indices: 需要计算的用例下标
+
+        Returns:
+            {用例下标: 缓存键}
+        """
+        cache_keys = {}
+        for i in indices:
+            case = all_cases[i]
+            model = case.get('model', 'default')
+            params = dict(case['params'])
+            if self._adaptive_repeat is not None:
+                # 自适应重复的停止条件影响结果统计，纳入缓存键
+                params['adaptive_repeat'] = json.dumps(self._adaptive_repeat, sort_keys=True)
+            if self._profile:
+                # 剖析模式额外写入内存/缺页结果类型，只复用同样开启剖析的结果
+                params['profile'] = True
+            if self._token_latency:
+                # 逐token延迟额外写入TTFT/ITL结果类型，只复用同样开启的结果
+                params['token_latency'] = True
+            try:
+                cache_keys[i] = DatabaseManager.compute_cache_key(
+                    executor.mnn_bench_path, executor.models_config[model], model, params
+                )
+            except (KeyError, OSError) as e:
+                self.logger.warning(f"无法计算用例 {i + 1} 的缓存键: {e}")
+        return cache_keys
+
+    def _stream_kwargs(self, suit_name: str) -> Dict[str, Any]:
+        """构建流式执行参数，未开启流式模式时返回空字典"""
+        if not self._stream_output:
+            return {}
+        return {
+            'stream': True,
+            'on_event': lambda event: self._display_stream_event(suit_name, event),
+            'persist_raw': self._keep_raw_output
+        }
+
+    def _display_stream_event(self, suit_name: str, event: Dict[str, Any]) -> None:
+        """
+        显示流式执行的进度事件
+
+        Args:
+            suit_name: 套件名称
+            event: OutputStreamParser事件
+        """
+        if event['type'] == 'row':
+            row = event['row']
+            if row.get('llm_demo'):
+                label, speed = row['llm_demo'].replace('<br>', ' '), row.get('speed(tok/s)', '').replace('<br>', ' / ')
+            else:
+                label, speed = row.get('test', ''), row.get('t/s', '')
+            message = f"├─ [{suit_name}] t={row.get('threads', '')} {label}: {speed} tok/s"
+            print(f"  {ColorOutput.gray(message)}")
+        elif event['type'] == 'round':
+            phases = []
+            if event.get('prefill_ms') is not None:
+                phases.append(f"prefill {event['prefill_ms']:.2f} ms")
+            if event.get('decode_ms') is not None:
+                phases.append(f"decode {event['decode_ms']:.2f} ms")
+            message = f"├─ [{suit_name}] 第{event.get('round')}轮: " + ", ".join(phases)
+            print(f"  {ColorOutput.gray(message)}")
+
+    def _display_case_header(self, case: Dict[str, Any], previous_case: Optional[Dict[str, Any]],
+                             all_cases: List[Dict[str, Any]], case_num: int, total_cases: int) -> None:
+        """
+        显示用例信息（模型/套件切换时显示分组标题）
+
+        Args:
+            case: 当前用例
+            previous_case: 上一个显示的用例
+            all_cases: 所有测试用例列表
+            case_num: 用例编号
+            total_cases: 用例总数
+        """
+        # 模型切换显示
+        if previous_case is None or case.get('model') != previous_case.get('model'):
+            model = case.get('model', 'default')
+            # 计算该模型的用例数量，方便显示
+            model_case_count = sum(1 for c in all_cases if c.get('model') == model)
+            print(f"\n{ColorOutput.blue('模型')}: {model} ({model_case_count}个用例)")
+            print(f"{'-' * 40}")
+
+        # 套件切换显示
+        if previous_case is None or case['suit_name'] != previous_case['suit_name']:
+            suit_name = case['suit_name']
+            suit_desc = case.get('suit_description', '')
+            if suit_desc:
+                print(f"\n{ColorOutput.cyan('套件')}: {suit_name} ({suit_desc})")
+            else:
+                print(f"\n{ColorOutput.cyan('套件')}: {suit_name}")
+            print("-" * 30)
+
+        # 用例详情
+        params_str = []
+        for key, value in case['params'].items():
+            if value is not None:
+                params_str.append(f"{key}={value}")
+        print(f"  测试 {case_num}/{total_cases}: {', '.join(params_str)}")
+
+        # 简化日志信息
+        self.logger.info(f"进度: {case_num}/{total_cases}")
 
     def _save_case_result_if_needed(self, task_dir: Path, case_num: int,
                                    case_data: Dict, result: Dict) -> None:
@@ -299,6 +771,28 @@ class TaskRunner:
         except Exception as e:
             self.logger.warning(f"保存用例结果失败 (用例 {case_num}): {e}", exc_info=True)
 
+    def _get_suite_id(self, case_data: Dict) -> int:
+        """
+        获取当前任务中用例所属套件的ID，不存在时创建
+
+        Args:
+            case_data: 用例数据
+
+        Returns:
+            套件ID
+        """
+        model_name = case_data.get('model', 'default')
+
+        # 检查套件是否已在当前任务中创建 - 使用suite_name+model_name作为缓存键
+        suite_name = case_data['suit_name']
+        cache_key = f'{suite_name}_{model_name}'
+        if cache_key not in self._current_suite_ids:
+            # 使用db_manager的高级方法创建或获取套件
+            self._current_suite_ids[cache_key] = self.db_manager.create_or_update_suite(
+                self._current_task_id, case_data, self._current_task_config
+            )
+        return self._current_suite_ids[cache_key]
+
     def _write_case_result_directly(self, case_num: int, case_data: Dict, result: Dict):
         """
         实时写入单个case结果到数据库，使用db_manager高级方法
@@ -313,20 +807,12 @@ class TaskRunner:
 
         try:
             # 确保套件记录存在
-            model_name = case_data.get('model', 'default')
+            suite_id = self._get_suite_id(case_data)
 
-            # 检查套件是否已在当前任务中创建 - 使用suite_name+model_name作为缓存键
-            suite_name = case_data['suit_name']
-            cache_key = f'{suite_name}_{model_name}'
-            if cache_key in self._current_suite_ids:
-                suite_id = self._current_suite_ids[cache_key]
-            else:
-                # 使用db_manager的高级方法创建或获取套件
-                suite_id = self.db_manager.create_or_update_suite(
-                    self._current_task_id, case_data, self._current_task_config
-                )
-                # 缓存套件ID - 使用suite_name+model_name作为键
-                self._current_suite_ids[cache_key] = suite_id
+            if self._result_writer is not None:
+                # 交给后台写入器，按批次提交
+                self._result_writer.submit(self._current_task_id, suite_id, case_num, case_data, result)
+                return
 
             # 使用db_manager的高级方法创建用例并写入结果
             case_id = self.db_manager.create_or_update_case_with_results(
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+并行用例调度器
+
+专门负责：
+- 读取可用CPU核心及其拓扑（sched_getaffinity + sysfs）
+- 按用例threads值划分互不重叠的核心槽位
+- 并发执行互不重叠的用例，每个用例使用独立的taskset掩码
+"""
+
+import os
+import shlex
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from utils.logger import LoggerManager
+
+
+# llm_bench_prompt 未指定 -t 时的默认线程数
+DEFAULT_BENCH_THREADS = 4
+
+
+class CoreAllocator:
+    """CPU核心槽位分配器"""
+
+    SYSFS_CPU_DIR = Path("/sys/devices/system/cpu")
+
+    def __init__(self, cores: Optional[List[int]] = None):
+        """
+        初始化核心分配器
+
+        Args:
+            cores: 可用核心列表，默认使用当前进程的CPU亲和性集合
+        """
+        self.logger = LoggerManager.get_logger("CoreAllocator")
+        available = os.sched_getaffinity(0)
+        if cores and not set(cores) <= available:
+            self.logger.warning(f"核心 {sorted(set(cores) - available)} 不在进程可用集合中，已忽略")
+            cores = [cpu for cpu in cores if cpu in available]
+        self.cores = sorted(cores if cores else available)
+        self.topology = {cpu: self._read_topology(cpu) for cpu in self.cores}
+        self._free = set(self.cores)
+        self._lock = threading.Lock()
+
+        domains = sorted(set(self.topology.values()))
+        self.logger.info(f"核心分配器初始化: {len(self.cores)}个核心 {self.cores}, 拓扑域: {domains}")
+
+    @classmethod
+    def from_taskset(cls, taskset_cmd: Optional[str]) -> "CoreAllocator":
+        """
+        从全局taskset命令（如"taskset -c 2-7"）解析核心池
+
+        Args:
+            taskset_cmd: taskset命令字符串，无法解析时使用进程亲和性集合
+
+        Returns:
+            核心分配器实例
+        """
+        cores = None
+        if taskset_cmd:
+            parts = shlex.split(taskset_cmd)
+            for flag in ("-c", "--cpu-list"):
+                if flag in parts and parts.index(flag) + 1 < len(parts):
+                    cores = parse_cpu_list(parts[parts.index(flag) + 1])
+        return cls(cores)
+
+    @property
+    def size(self) -> int:
+        """核心池大小"""
+        return len(self.cores)
+
+    def acquire(self, count: int) -> Optional[List[int]]:
+        """
+        申请count个空闲核心，优先分配同一拓扑域（package/cluster）内的核心
+
+        Args:
+            count: 需要的核心数
+
+        Returns:
+            分配到的核心列表，空闲核心不足时返回None
+        """
+        with self._lock:
+            if count > len(self._free):
+                return None
+
+            # 优先选择能容纳整个槽位的拓扑域，避免跨簇（如big.LITTLE）分配
+            by_domain: Dict[Tuple, List[int]] = {}
+            for cpu in sorted(self._free):
+                by_domain.setdefault(self.topology[cpu], []).append(cpu)
+            for domain in sorted(by_domain):
+                if len(by_domain[domain]) >= count:
+                    allocated = by_domain[domain][:count]
+                    break
+            else:
+                allocated = sorted(self._free)[:count]
+
+            self._free.difference_update(allocated)
+            return allocated
+
+    def release(self, cores: List[int]) -> None:
+        """释放核心"""
+        with self._lock:
+            self._free.update(cores)
+
+    def _read_topology(self, cpu: int) -> Tuple[int, int]:
+        """读取核心所属的(package, cluster)，sysfs不可用时视为同一拓扑域"""
+        topology_dir = self.SYSFS_CPU_DIR / f"cpu{cpu}" / "topology"
+        domain = []
+        for name in ("physical_package_id", "cluster_id"):
+            try:
+                domain.append(int((topology_dir / name).read_text().strip()))
+            except (OSError, ValueError):
+                domain.append(0)
+        return tuple(domain)
+
+    def __repr__(self):
+        return f"CoreAllocator(cores={self.cores}, free={sorted(self._free)})"
+
+
+def parse_cpu_list(cpu_list: str) -> List[int]:
+    """
+    解析CPU列表字符串，如 "0-3,6,8-9"
+
+    Args:
+        cpu_list: taskset/sysfs格式的CPU列表
+
+    Returns:
+        CPU编号列表
+    """
+    cores = []
+    for part in cpu_list.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            cores.extend(range(int(start), int(end) + 1))
+        else:
+            cores.append(int(part))
+    return sorted(set(cores))
+
+
+def format_cpu_list(cores: List[int]) -> str:
+    """将核心列表格式化为taskset -c 可接受的字符串"""
+    return ",".join(str(c) for c in sorted(cores))
+
+
+class ParallelScheduler:
+    """按核心槽位并发执行用例的调度器"""
+
+    def __init__(self, allocator: CoreAllocator):
+        """
+        初始化并行调度器
+
+        Args:
+            allocator: 核心分配器
+        """
+        self.logger = LoggerManager.get_logger("ParallelScheduler")
+        self.allocator = allocator
+
+    def required_cores(self, cases: List[Dict[str, Any]]) -> int:
+        """
+        计算执行单元需要的核心数（单元内最大threads值，不超过核心池大小）
+
+        Args:
+            cases: 执行单元内的用例
+
+        Returns:
+            核心数
+        """
+        required = max(int(case['params'].get('threads') or DEFAULT_BENCH_THREADS) for case in cases)
+        if required > self.allocator.size:
+            self.logger.warning(f"用例线程数 {required} 超过核心池大小 {self.allocator.size}，独占全部核心执行")
+            return self.allocator.size
+        return required
+
+    def run(self, units: List[List[int]], all_cases: List[Dict[str, Any]],
+            run_unit: Callable[[List[int], str], List[Dict[str, Any]]],
+            on_start: Callable[[List[int], List[int]], None],
+            on_complete: Callable[[List[int], List[int], List[Dict[str, Any]]], None]) -> None:
+        """
+        按顺序调度执行单元，核心足够时立即并发启动
+
+        调度保持先进先出：队首单元核心不足时等待，不跳过队首（避免大线程用例饿死）。
+        on_start/on_complete 均在调用线程中执行，便于安全地输出和写入数据库。
+
+        Args:
+            units: 执行单元列表（用例下标）
+            all_cases: 所有用例
+            run_unit: 执行函数 (单元, taskset命令) -> 结果列表，在工作线程中运行
+            on_start: 单元启动回调 (单元, 核心列表)
+            on_complete: 单元完成回调 (单元, 核心列表, 结果列表)
+        """
+        pending = list(units)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.allocator.size) as pool:
+            while pending or running:
+                # 尽可能多地启动队首单元
+                while pending:
+                    unit = pending[0]
+                    cores = self.allocator.acquire(self.required_cores([all_cases[i] for i in unit]))
+                    if cores is None:
+                        break
+                    pending.pop(0)
+                    on_start(unit, cores)
+                    taskset_cmd = f"taskset -c {format_cpu_list(cores)}"
+                    running[pool.submit(run_unit, unit, taskset_cmd)] = (unit, cores)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    unit, cores = running.pop(future)
+                    self.allocator.release(cores)
+                    on_complete(unit, cores, future.result())
+
+    def __repr__(self):
+        return f"ParallelScheduler(allocator={self.allocator})"
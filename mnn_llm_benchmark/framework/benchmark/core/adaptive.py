@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+自适应重复次数控制模块
+
+专门负责：
+- 按小批次（chunk）重复执行同一用例
+- 合并各批次 "均值 ± 标准差" 得到累计样本统计
+- 当所有指标的相对置信区间半宽达到目标值时停止，并受最小/最大重复次数约束
+"""
+
+import math
+from typing import Dict, List, Any, Optional, Tuple
+from scipy import stats
+from utils.logger import LoggerManager
+
+
+# 默认自适应重复配置
+DEFAULT_ADAPTIVE_REPEAT = {
+    "ci_width": 0.01,      # 目标相对置信区间半宽（半宽/均值）
+    "confidence": 0.95,    # 置信水平
+    "min_repeat": 3,       # 最少重复次数
+    "max_repeat": 30,      # 最多重复次数
+    "chunk": 3             # 每批次重复次数
+}
+
+
+def combine_samples(chunks: List[Tuple[float, float, int]]) -> Tuple[float, float, int]:
+    """
+    合并多个批次的样本统计量
+
+    Args:
+        chunks: [(均值, 样本标准差, 样本数), ...]
+
+    Returns:
+        (合并均值, 合并样本标准差, 总样本数)
+    """
+    total = sum(count for _, _, count in chunks)
+    if total == 0:
+        return 0.0, 0.0, 0
+
+    mean = sum(m * count for m, _, count in chunks) / total
+    if total < 2:
+        return mean, 0.0, total
+
+    # 组内平方和 + 组间平方和
+    sum_squares = sum((count - 1) * s * s + count * (m - mean) ** 2 for m, s, count in chunks)
+    return mean, math.sqrt(sum_squares / (total - 1)), total
+
+
+def relative_ci_width(mean: float, std: float, count: int, confidence: float) -> float:
+    """
+    计算相对置信区间半宽 t * s / sqrt(n) / mean
+
+    Args:
+        mean: 样本均值
+        std: 样本标准差
+        count: 样本数
+        confidence: 置信水平
+
+    Returns:
+        相对半宽，样本不足或均值非正时返回inf
+    """
+    if count < 2 or mean <= 0:
+        return math.inf
+    t_value = stats.t.ppf((1 + confidence) / 2, count - 1)
+    return t_value * std / math.sqrt(count) / mean
+
+
+class AdaptiveRepeatController:
+    """自适应重复次数控制器"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, default_max_repeat: Optional[int] = None):
+        """
+        初始化控制器
+
+        Args:
+            config: 自适应配置，缺省项使用DEFAULT_ADAPTIVE_REPEAT
+            default_max_repeat: 配置未指定max_repeat时使用的上限（通常为用例的n_repeat）
+        """
+        self.logger = LoggerManager.get_logger("AdaptiveRepeatController")
+
+        self.config = dict(DEFAULT_ADAPTIVE_REPEAT)
+        if default_max_repeat:
+            self.config["max_repeat"] = int(default_max_repeat)
+        self.config.update(config or {})
+
+        self.config["min_repeat"] = max(1, int(self.config["min_repeat"]))
+        self.config["max_repeat"] = max(self.config["min_repeat"], int(self.config["max_repeat"]))
+        self.config["chunk"] = max(1, int(self.config["chunk"]))
+
+        self.repeats = 0
+        self.chunk_sizes: List[int] = []
+        self.samples: Dict[str, List[Tuple[float, float, int]]] = {}
+
+    def next_chunk(self) -> int:
+        """
+        计算下一批次的重复次数
+
+        Returns:
+            重复次数，返回0表示应停止
+        """
+        if self.repeats >= self.config["max_repeat"]:
+            return 0
+        if self.repeats >= self.config["min_repeat"] and self.converged():
+            return 0
+
+        remaining = self.config["max_repeat"] - self.repeats
+        # 首批次至少覆盖最小重复次数
+        chunk = max(self.config["chunk"], self.config["min_repeat"] - self.repeats)
+        return min(chunk, remaining)
+
+    def add_chunk(self, results: Dict[str, Dict[str, Any]], repeat: int) -> None:
+        """
+        记录一个批次的结果
+
+        Args:
+            results: json_result["results"]，{指标: {"tokens_per_sec": {"mean", "std"}}}
+            repeat: 本批次重复次数
+        """
+        self.repeats += repeat
+        self.chunk_sizes.append(repeat)
+        for metric, entry in results.items():
+            perf = entry.get("tokens_per_sec", {})
+            self.samples.setdefault(metric, []).append((perf.get("mean", 0.0), perf.get("std", 0.0), repeat))
+
+        widths = {metric: round(s["ci_relative_width"], 5) for metric, s in self.statistics().items()}
+        self.logger.info(f"自适应重复: 累计 {self.repeats} 次，相对置信区间半宽 {widths}")
+
+    def statistics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        计算各指标的累计统计
+
+        Returns:
+            {指标: {"mean", "std", "samples", "ci_relative_width"}}
+        """
+        result = {}
+        for metric, chunks in self.samples.items():
+            mean, std, count = combine_samples(chunks)
+            result[metric] = {
+                "mean": mean,
+                "std": std,
+                "samples": count,
+                "ci_relative_width": relative_ci_width(mean, std, count, self.config["confidence"])
+            }
+        return result
+
+    def converged(self) -> bool:
+        """所有指标是否均已达到目标置信区间宽度"""
+        statistics = self.statistics()
+        return bool(statistics) and all(
+            s["ci_relative_width"] <= self.config["ci_width"] for s in statistics.values()
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        """生成停止统计摘要"""
+        return {
+            **self.config,
+            "repeats": self.repeats,
+            "chunks": self.chunk_sizes,
+            "converged": self.converged()
+        }
+
+    def __repr__(self):
+        return f"AdaptiveRepeatController(repeats={self.repeats}, config={self.config})"
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试环境噪声防护模块
+
+专门负责：
+- 任务开始前检查系统是否空闲：负载均值、CPU调频策略、占用CPU的其他进程、温度
+- 用例之间等待竞争进程退出、设备降温，超过最长等待时间后继续执行并标记
+- 根据用例执行期间的遥测判断是否受到干扰（其他进程占用CPU、温度过高），
+  标记到结果中供重跑、续跑和分析时排除
+"""
+
+import glob
+import os
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+from utils.logger import LoggerManager
+
+
+# 默认环境防护配置
+DEFAULT_ENVIRONMENT_GUARD = {
+    "enabled": False,               # 是否在任务开始前和用例之间检查环境（默认关闭，按任务或全局开启）
+    "max_load_per_cpu": 0.3,        # 任务开始前允许的1分钟负载均值（按CPU数归一化）
+    "max_other_cpu_pct": 10.0,      # 其他进程合计允许的CPU占用（全部CPU的百分比）
+    "hog_cpu_pct": 50.0,            # 单个其他进程超过该占用（单核百分比）视为竞争进程
+    "start_temp_c": 65.0,           # 开始用例前需降到该温度以下（℃）
+    "max_temp_c": 80.0,             # 执行期间达到该温度视为受干扰（接近降频温度，℃）
+    "sample_ms": 500,               # 检查时统计进程CPU占用的时间窗口（毫秒）
+    "poll_s": 5,                    # 环境未空闲时的重新检查间隔（秒）
+    "max_wait_s": 300,              # 最长等待时间（秒），超过后继续执行并标记用例
+    "rerun_interfered": 1,          # 受干扰用例在环境恢复后的重跑次数（仅串行执行）
+    "exclude_from_analysis": True,  # 数据分析时排除受干扰的用例
+    "warn_governors": ["powersave"]  # 出现这些CPU调频策略时告警
+}
+
+# 干扰标记及说明
+INTERFERENCE_REASONS = {
+    "cpu_contention": "其他进程占用CPU",
+    "thermal": "温度过高",
+    "busy_start": "等待超时，开始时环境未空闲"
+}
+
+
+def read_proc_stat_total(text: Optional[str]) -> Tuple[Optional[int], int]:
+    """
+    解析 /proc/stat 的全部CPU累计节拍数和CPU数量
+
+    Args:
+        text: /proc/stat 内容
+
+    Returns:
+        (累计节拍数, CPU数量)，内容无效时节拍数为None
+    """
+    if not text or not text.startswith("cpu "):
+        return None, 0
+    lines = text.splitlines()
+    total = sum(int(v) for v in lines[0].split()[1:9])
+    cpus = sum(1 for line in lines[1:] if line.startswith("cpu"))
+    return total, max(cpus, 1)
+
+
+class EnvironmentGuard:
+    """测试环境噪声防护"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, root: str = "/"):
+        """
+        初始化环境防护
+
+        Args:
+            config: 防护配置，缺省项使用DEFAULT_ENVIRONMENT_GUARD
+            root: 文件系统根目录（测试时指向模拟的/proc和/sys）
+        """
+        self.logger = LoggerManager.get_logger("EnvironmentGuard")
+        self.config = {**DEFAULT_ENVIRONMENT_GUARD, **(config or {})}
+        self.root = root
+        self._own_pid = os.getpid()
+        self._governor_warned = False
+
+    @classmethod
+    def from_config(cls, system_config: Optional[Dict[str, Any]] = None,
+                    task_option: Any = None) -> Optional["EnvironmentGuard"]:
+        """
+        按[environment_guard]配置和任务选项创建环境防护
+
+        Args:
+            system_config: [environment_guard]配置节
+            task_option: 任务的environment_guard选项：未设置时沿用配置，false关闭，true开启，
+                         字典开启并覆盖配置项
+
+        Returns:
+            环境防护，关闭时返回None
+        """
+        settings = {**DEFAULT_ENVIRONMENT_GUARD, **(system_config or {})}
+        if isinstance(task_option, dict):
+            settings.update(task_option)
+            settings["enabled"] = task_option.get("enabled", True)
+        elif task_option is not None:
+            settings["enabled"] = bool(task_option)
+        if not settings["enabled"]:
+            return None
+        return cls(settings)
+
+    def _path(self, *parts: str) -> str:
+        """拼接根目录下的路径"""
+        return os.path.join(self.root, *parts)
+
+    def _read(self, path: str) -> Optional[str]:
+        """读取文件，不可读时返回None"""
+        try:
+            with open(path, "r") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def read_governors(self) -> Dict[str, int]:
+        """
+        读取各CPU的调频策略
+
+        Returns:
+            {调频策略: CPU数量}
+        """
+        governors: Dict[str, int] = {}
+        for path in glob.glob(self._path("sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_governor")):
+            governor = (self._read(path) or "").strip()
+            if governor:
+                governors[governor] = governors.get(governor, 0) + 1
+        return governors
+
+    def read_max_temp(self) -> Optional[float]:
+        """读取各温区的最高温度（℃），无温度传感器时返回None"""
+        temps = []
+        for path in glob.glob(self._path("sys/class/thermal/thermal_zone*/temp")):
+            text = self._read(path)
+            try:
+                temps.append(int(text.strip()) / 1000)
+            except (AttributeError, ValueError):
+                continue
+        return max(temps) if temps else None
+
+    def read_load_per_cpu(self) -> Optional[float]:
+        """读取按CPU数归一化的1分钟负载均值"""
+        text = self._read(self._path("proc/loadavg"))
+        _, cpus = read_proc_stat_total(self._read(self._path("proc/stat")))
+        try:
+            return float(text.split()[0]) / cpus if cpus else None
+        except (AttributeError, IndexError, ValueError):
+            return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        记录全部进程的CPU节拍数
+
+        Returns:
+            {"total": 全部CPU累计节拍数, "cpus": CPU数量, "processes": {pid: (父进程ID, 进程名, 节拍数)}}
+        """
+        total, cpus = read_proc_stat_total(self._read(self._path("proc/stat")))
+        processes = {}
+        for path in glob.glob(self._path("proc/[0-9]*/stat")):
+            text = self._read(path)
+            if not text:
+                continue
+            name = text[text.find("(") + 1:text.rfind(")")]
+            fields = text.rpartition(")")[2].split()
+            try:
+                processes[int(os.path.basename(os.path.dirname(path)))] = (
+                    int(fields[1]), name, int(fields[11]) + int(fields[12]))
+            except (IndexError, ValueError):
+                continue
+        return {"total": total, "cpus": cpus, "processes": processes}
+
+    def _own_processes(self, processes: Dict[int, Tuple[int, str, int]]) -> set:
+        """框架进程及其全部子进程（基准测试进程、常驻工作进程）"""
+        own = {self._own_pid}
+        changed = True
+        while changed:
+            changed = False
+            for pid, (ppid, _, _) in processes.items():
+                if ppid in own and pid not in own:
+                    own.add(pid)
+                    changed = True
+        return own
+
+    def measure(self, before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        比较两次快照，计算其他进程的CPU占用
+
+        Args:
+            before: 窗口开始时的快照
+            after: 窗口结束时的快照
+
+        Returns:
+            {"other_cpu_pct": 其他进程合计占用（全部CPU的百分比）,
+             "hogs": [(pid, 进程名, 单核百分比)]，按占用降序}
+        """
+        if before["total"] is None or after["total"] is None or after["total"] <= before["total"]:
+            return {"other_cpu_pct": None, "hogs": []}
+        elapsed = after["total"] - before["total"]
+        own = self._own_processes(after["processes"])
+
+        other_ticks = 0
+        hogs = []
+        for pid, (_, name, ticks) in after["processes"].items():
+            if pid in own or pid not in before["processes"]:
+                continue
+            delta = ticks - before["processes"][pid][2]
+            if delta <= 0:
+                continue
+            other_ticks += delta
+            core_pct = 100.0 * delta * after["cpus"] / elapsed
+            if core_pct >= self.config["hog_cpu_pct"]:
+                hogs.append((pid, name, round(core_pct, 1)))
+        return {
+            "other_cpu_pct": round(100.0 * other_ticks / elapsed, 1),
+            "hogs": sorted(hogs, key=lambda hog: -hog[2])
+        }
+
+    def check(self, include_load: bool = False) -> Dict[str, Any]:
+        """
+        检查一次系统是否空闲
+
+        Args:
+            include_load: 是否检查负载均值（只在任务开始前检查：用例刚结束时负载均值仍包含基准测试本身）
+
+        Returns:
+            {"quiet": 是否空闲, "issues": [问题说明], "other_cpu_pct", "hogs", "max_temp_c", "load_per_cpu"}
+        """
+        before = self.snapshot()
+        time.sleep(self.config["sample_ms"] / 1000)
+        state = self.measure(before, self.snapshot())
+        state["max_temp_c"] = self.read_max_temp()
+        state["load_per_cpu"] = self.read_load_per_cpu() if include_load else None
+
+        issues = []
+        if state["hogs"]:
+            issues.append("竞争进程: " + ", ".join(f"{name}({pid}) {pct:.0f}%" for pid, name, pct in state["hogs"][:3]))
+        elif state["other_cpu_pct"] is not None and state["other_cpu_pct"] > self.config["max_other_cpu_pct"]:
+            issues.append(f"其他进程CPU占用 {state['other_cpu_pct']:.1f}%")
+        if state["max_temp_c"] is not None and state["max_temp_c"] >= self.config["start_temp_c"]:
+            issues.append(f"温度 {state['max_temp_c']:.1f}℃")
+        if state["load_per_cpu"] is not None and state["load_per_cpu"] > self.config["max_load_per_cpu"]:
+            issues.append(f"负载均值 {state['load_per_cpu']:.2f}/CPU")
+        state["issues"] = issues
+        state["quiet"] = not issues
+        return state
+
+    def wait_until_quiet(self, include_load: bool = False, on_wait=None) -> Dict[str, Any]:
+        """
+        等待系统空闲，超过最长等待时间后返回
+
+        Args:
+            include_load: 是否检查负载均值
+            on_wait: 每次等待前的回调，参数为check()的结果（用于显示等待原因）
+
+        Returns:
+            最后一次check()的结果，附加waited_s（等待秒数）
+        """
+        start = time.monotonic()
+        while True:
+            state = self.check(include_load)
+            waited = time.monotonic() - start
+            if state["quiet"] or waited >= self.config["max_wait_s"]:
+                break
+            if on_wait:
+                on_wait(state)
+            time.sleep(min(self.config["poll_s"], max(self.config["max_wait_s"] - waited, 0)))
+        state["waited_s"] = round(time.monotonic() - start, 1)
+        if not state["quiet"]:
+            self.logger.warning(f"等待 {state['waited_s']}s 后环境仍未空闲: {'; '.join(state['issues'])}")
+        return state
+
+    def preflight(self, on_wait=None) -> Dict[str, Any]:
+        """
+        任务开始前的检查：调频策略告警，并等待负载、竞争进程和温度恢复
+
+        Args:
+            on_wait: 等待回调
+
+        Returns:
+            检查结果，附加governors（调频策略统计）和governor_warning（告警说明，无告警时为None）
+        """
+        governors = self.read_governors()
+        flagged = sorted(g for g in governors if g in self.config["warn_governors"])
+        warning = None
+        if flagged and not self._governor_warned:
+            warning = (f"CPU调频策略为 {', '.join(flagged)}，频率会随负载变化，"
+                       f"建议切换为performance后测试")
+            self.logger.warning(warning)
+            self._governor_warned = True
+        state = self.wait_until_quiet(include_load=True, on_wait=on_wait)
+        state["governors"] = governors
+        state["governor_warning"] = warning
+        return state
+
+    def assess(self, telemetry: Optional[Dict[str, Any]], parallel: bool = False) -> List[str]:
+        """
+        根据用例执行期间的遥测判断是否受到干扰
+
+        Args:
+            telemetry: 遥测结果（summary中的mean_other_cpu_pct、max_temp_c）
+            parallel: 是否并行执行（并行时其他用例的进程计入其他占用，不判断CPU竞争）
+
+        Returns:
+            干扰标记列表（见INTERFERENCE_REASONS），未受干扰时为空
+        """
+        summary = (telemetry or {}).get("summary", {})
+        reasons = []
+        other_cpu = summary.get("mean_other_cpu_pct")
+        if not parallel and other_cpu is not None and other_cpu > self.config["max_other_cpu_pct"]:
+            reasons.append("cpu_contention")
+        max_temp = summary.get("max_temp_c")
+        if max_temp is not None and max_temp >= self.config["max_temp_c"]:
+            reasons.append("thermal")
+        return reasons
+
+    def annotate(self, results: List[Dict[str, Any]], start_state: Optional[Dict[str, Any]] = None,
+                 parallel: bool = False) -> List[str]:
+        """
+        为一个执行单元的结果写入干扰标记和环境检查信息
+
+        Args:
+            results: 执行单元的结果列表
+            start_state: 开始前wait_until_quiet()的结果
+            parallel: 是否并行执行
+
+        Returns:
+            执行单元内全部干扰标记（去重）
+        """
+        unit_reasons: List[str] = []
+        for result in results:
+            if not result.get("success"):
+                continue
+            json_result = result.get("json_result") or {}
+            reasons = self.assess(json_result.get("telemetry"), parallel)
+            if start_state is not None and not start_state["quiet"]:
+                reasons.append("busy_start")
+            result["interference"] = reasons
+            json_result["environment"] = {
+                "interference": reasons,
+                "start_issues": start_state["issues"] if start_state else [],
+                "waited_s": start_state.get("waited_s") if start_state else None
+            }
+            unit_reasons.extend(r for r in reasons if r not in unit_reasons)
+        return unit_reasons
+
+    def __repr__(self):
+        return (f"EnvironmentGuard(max_other_cpu_pct={self.config['max_other_cpu_pct']}, "
+                f"start_temp_c={self.config['start_temp_c']}, max_wait_s={self.config['max_wait_s']})")
@@ -5,21 +5,33 @@
 负责执行单次MNN基准测试，包含模型验证、性能评估执行和结果收集
 """
 
+import itertools
 import json
+import math
+import shutil
 import socket
 import subprocess
 import time
 import shlex
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from queue import Queue, Empty
+from typing import Callable, Dict, List, Any, Optional
 
 from config.system import SystemConfig
 from utils.logger import LoggerManager
+from benchmark.core.stream import OutputStreamParser, start_pipe_readers
+from benchmark.core.adaptive import AdaptiveRepeatController
+from benchmark.core.telemetry import TelemetrySampler, merge_telemetry
+from benchmark.core.profiling import wait_and_profile, build_profile, merge_profiles
+from benchmark.core.token_latency import attach_token_latency, build_token_latency, merge_token_latency
 
 
 class BenchExecutor:
     """单次基准测试执行器"""
 
+    # 临时文件序号，保证并行执行时同一秒内的文件名不冲突
+    _temp_sequence = itertools.count(1)
+
     def __init__(self, mnn_bench_path: Path, models_config: Dict[str, str]):
         """
         初始化基准测试执行器
@@ -40,6 +52,17 @@ class BenchExecutor:
         # 保存模型配置，延迟验证（使用时再验证）
         self.models_config = models_config
         self.system_config = SystemConfig()
+        # 执行期间的系统遥测采样配置（[telemetry]节）
+        self.telemetry_config = self.system_config.get_config('telemetry')
+
+        # 可选的执行后端（如WarmWorkerBackend），支持的用例优先交由后端执行
+        self.backend = None
+
+        # 剖析模式：记录峰值内存、缺页次数、读盘量和加载耗时，作为额外的结果类型写入
+        self.profile = False
+
+        # 逐token延迟：llm_bench_prompt以-tl 1输出各轮首token延迟和token间隔，写入TTFT与ITL分位数结果类型
+        self.token_latency = False
 
         self.logger.debug(f"初始化BenchExecutor: mnn_bench_path={mnn_bench_path}")
         self.logger.debug(f"BenchExecutor初始化完成，已配置 {len(models_config)} 个模型别名")
@@ -75,19 +98,21 @@ class BenchExecutor:
 
         return config_path, model_name
 
-    def build_command(self, config_path: Path, output_path: Path, **params) -> List[str]:
+    def build_command(self, config_path: Path, output_path: Optional[Path], **params) -> List[str]:
         """
         构建MNN LLM benchmark命令
 
         Args:
             config_path: 模型配置文件路径
-            output_path: 输出文件路径（临时文件）
+            output_path: 输出文件路径（临时文件），流式执行时为None（不传-fp，结果表格默认输出到标准输出）
             **params: 基准测试参数
 
         Returns:
             完整的命令行参数列表
         """
-        cmd = [str(self.mnn_bench_path), "-m", str(config_path), "-fp", str(output_path)]
+        cmd = [str(self.mnn_bench_path), "-m", str(config_path)]
+        if output_path is not None:
+            cmd.extend(["-fp", str(output_path)])
         self.logger.debug(f"构建命令: {cmd}")
 
         # 添加参数 - 使用与官方一致的参数名称
@@ -118,6 +143,13 @@ class BenchExecutor:
             # 直接使用传入的路径，在benchmark.py中已处理过路径转换
             cmd.extend(["-pf", params["prompt_file"]])
 
+        # verbose模式输出逐轮Performance行，流式执行时用于报告逐轮耗时
+        if params.get("verbose"):
+            cmd.extend(["-v", str(params["verbose"])])
+
+        if self.token_latency:
+            cmd.extend(["-tl", "1"])
+
         return cmd
 
     def run_command(self, cmd: List[str], timeout: int, taskset_cmd: Optional[str] = None) -> Dict[str, Any]:
@@ -139,6 +171,220 @@ class BenchExecutor:
             self.logger.error(f"无效的超时时间: {timeout}，必须为正数")
             raise ValueError(f"无效的超时时间: {timeout}，必须为正数")
 
+        full_cmd, cmd_str = self._prepare_command(cmd, taskset_cmd)
+        self.logger.info(f"准备执行基准测试: {cmd_str} (超时: {timeout}秒)")
+
+        start_time = time.time()
+        self.logger.info(f"正在启动进程...")
+        process = subprocess.Popen(full_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        sampler = self._start_telemetry(process.pid)
+        process_stats = None
+        try:
+            if self.profile:
+                # 剖析模式由读取线程收集输出，进程退出后自行回收以取得该进程的rusage
+                lines = Queue()
+                readers = start_pipe_readers(process, lines)
+                timed_out, process_stats = wait_and_profile(process, timeout)
+                for reader in readers:
+                    reader.join(timeout=1)
+                stdout, stderr = self._drain_output(lines)
+            else:
+                try:
+                    stdout, stderr = process.communicate(timeout=timeout)
+                    timed_out = False
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.communicate()
+                    timed_out = True
+        finally:
+            telemetry = sampler.stop() if sampler else None
+        end_time = time.time()
+
+        if timed_out:
+            self.logger.error(f"基准测试超时 (>{timeout}秒)")
+            return {
+                "command": cmd_str,
+                "return_code": -1,
+                "stdout": "",
+                "stderr": f"基准测试超时 (>{timeout}秒)",
+                "runtime": end_time - start_time,
+                "telemetry": telemetry,
+                "profile": process_stats
+            }
+
+        if process.returncode == 0:
+            self.logger.info(f"基准测试成功完成 - 耗时: {end_time - start_time:.2f}秒")
+            self.logger.debug(f"stdout: {stdout[:200]}...")
+        else:
+            self.logger.error(f"基准测试失败 - 返回码: {process.returncode}")
+            self.logger.error(f"错误输出: {stderr}")
+
+            # 记录基本错误信息
+            self.logger.error(f"基准测试返回码: {process.returncode}")
+
+        return {
+            "command": cmd_str,
+            "return_code": process.returncode,
+            "stdout": stdout,
+            "stderr": stderr,
+            "runtime": end_time - start_time,
+            "telemetry": telemetry,
+            "profile": process_stats
+        }
+
+    @staticmethod
+    def _drain_output(lines: Queue) -> tuple[str, str]:
+        """取出读取线程放入队列的全部输出，返回 (stdout, stderr)"""
+        output = {"stdout": [], "stderr": []}
+        while True:
+            try:
+                stream_name, line = lines.get_nowait()
+            except Empty:
+                break
+            if line is not None:
+                output[stream_name].append(line)
+        return "".join(output["stdout"]), "".join(output["stderr"])
+
+    def run_command_streaming(self, cmd: List[str], timeout: int, taskset_cmd: Optional[str] = None,
+                              on_event: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None) -> Dict[str, Any]:
+        """
+        以管道方式执行MNN LLM benchmark命令，逐行解析输出
+
+        命令需使用 "-fp stdout" 将结果表格输出到标准输出。系统存在stdbuf时以行缓冲方式
+        启动子进程，使表格行在输出时即可读取。
+
+        Args:
+            cmd: 命令行参数列表
+            timeout: 超时时间（秒），必须由调用者提供
+            taskset_cmd: 可选的taskset命令字符串
+            on_event: 事件回调，参数为OutputStreamParser事件；返回非空字符串时以该原因终止进程
+
+        Returns:
+            执行结果字典，在run_command结果基础上增加:
+            - header_lines: 表头两行
+            - table_rows: [(原始行, 表头->值字典), ...]
+            - aborted: 是否提前终止
+            - abort_reason: 提前终止原因
+
+        Raises:
+            ValueError: 超时时间无效
+        """
+        if timeout <= 0:
+            self.logger.error(f"无效的超时时间: {timeout}，必须为正数")
+            raise ValueError(f"无效的超时时间: {timeout}，必须为正数")
+
+        # 管道输出默认全缓冲，使用stdbuf改为行缓冲
+        if shutil.which("stdbuf"):
+            cmd = ["stdbuf", "-oL", "-eL"] + cmd
+        full_cmd, cmd_str = self._prepare_command(cmd, taskset_cmd)
+        self.logger.info(f"准备流式执行基准测试: {cmd_str} (超时: {timeout}秒)")
+
+        parser = OutputStreamParser()
+        stdout_lines, stderr_lines = [], []
+        abort_reason = None
+        timed_out = False
+
+        start_time = time.time()
+        process = subprocess.Popen(full_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   text=True, bufsize=1)
+        sampler = self._start_telemetry(process.pid)
+        lines = Queue()
+        readers = start_pipe_readers(process, lines)
+        open_streams = len(readers)
+
+        try:
+            while open_streams:
+                remaining = start_time + timeout - time.time()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+                try:
+                    stream_name, line = lines.get(timeout=min(remaining, 0.5))
+                except Empty:
+                    continue
+
+                if line is None:
+                    open_streams -= 1
+                    continue
+                if stream_name == "stderr":
+                    stderr_lines.append(line)
+                    continue
+
+                stdout_lines.append(line)
+                event = parser.feed(line)
+                if event is None:
+                    continue
+
+                abort_reason = parser.abort_reason(event)
+                if not abort_reason and on_event:
+                    abort_reason = on_event(event)
+                if abort_reason:
+                    self.logger.error(f"基准测试提前终止: {abort_reason}")
+                    break
+        finally:
+            process_stats = None
+            if self.profile:
+                # 输出未结束即退出循环（超时、提前终止或异常）时先终止进程，再回收并取得rusage
+                if open_streams:
+                    process.kill()
+                _, process_stats = wait_and_profile(process, max(start_time + timeout - time.time(), 1))
+            else:
+                if process.poll() is None:
+                    process.kill()
+                process.wait()
+            for reader in readers:
+                reader.join(timeout=1)
+        end_time = time.time()
+        telemetry = sampler.stop() if sampler else None
+
+        if timed_out:
+            self.logger.error(f"基准测试超时 (>{timeout}秒)，已输出 {len(parser.table_rows)} 行结果")
+            return_code = -1
+            stderr_lines.append(f"基准测试超时 (>{timeout}秒)")
+        elif abort_reason:
+            return_code = -2
+            stderr_lines.append(f"基准测试提前终止: {abort_reason}")
+        else:
+            return_code = process.returncode
+            if return_code == 0:
+                self.logger.info(f"基准测试成功完成 - 耗时: {end_time - start_time:.2f}秒")
+            else:
+                self.logger.error(f"基准测试失败 - 返回码: {return_code}")
+                self.logger.error(f"错误输出: {''.join(stderr_lines)}")
+
+        return {
+            "command": cmd_str,
+            "return_code": return_code,
+            "stdout": "".join(stdout_lines),
+            "stderr": "".join(stderr_lines),
+            "runtime": end_time - start_time,
+            "header_lines": parser.header_lines,
+            "table_rows": parser.table_rows,
+            "aborted": bool(abort_reason),
+            "abort_reason": abort_reason,
+            "telemetry": telemetry,
+            "profile": process_stats
+        }
+
+    def _start_telemetry(self, pid: int) -> Optional[TelemetrySampler]:
+        """
+        为基准测试进程启动遥测采样
+
+        Args:
+            pid: 子进程ID
+
+        Returns:
+            已启动的采样器，配置禁用或启动失败时返回None
+        """
+        try:
+            sampler = TelemetrySampler.from_config(pid, self.telemetry_config)
+            return sampler.start() if sampler else None
+        except Exception as e:
+            self.logger.warning(f"遥测采样启动失败，继续执行: {e}")
+            return None
+
+    def _prepare_command(self, cmd: List[str], taskset_cmd: Optional[str] = None) -> tuple[List[str], str]:
+        """添加taskset前缀，返回 (完整命令, 日志用命令字符串)"""
         full_cmd = cmd
         if taskset_cmd:
             try:
@@ -149,42 +395,45 @@ class BenchExecutor:
             if prefix_parts:
                 full_cmd = prefix_parts + cmd
         cmd_str = " ".join([str(c) if c != " " else "←" for c in full_cmd])
-        self.logger.info(f"准备执行基准测试: {cmd_str} (超时: {timeout}秒)")
+        return full_cmd, cmd_str
 
-        start_time = time.time()
-        try:
-            self.logger.info(f"正在启动进程...")
-            result = subprocess.run(full_cmd, capture_output=True, text=True, timeout=timeout)
-            end_time = time.time()
-
-            if result.returncode == 0:
-                self.logger.info(f"基准测试成功完成 - 耗时: {end_time - start_time:.2f}秒")
-                self.logger.debug(f"stdout: {result.stdout[:200]}...")
-            else:
-                self.logger.error(f"基准测试失败 - 返回码: {result.returncode}")
-                self.logger.error(f"错误输出: {result.stderr}")
+    def _run_and_read_table(self, config_path: Path, output_path: Path, bench_params: Dict[str, Any],
+                            timeout: int, taskset_cmd: Optional[str] = None, stream: bool = False,
+                            on_event: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+                            persist_raw: bool = True) -> tuple[Dict[str, Any], List[str], List[tuple[str, Dict[str, str]]]]:
+        """
+        执行命令并取得结果表格
 
-                # 记录基本错误信息
-                self.logger.error(f"基准测试返回码: {result.returncode}")
+        非流式模式由llm_bench_prompt写入output_path后再读取；流式模式从标准输出解析表格，
+        仅在persist_raw为True时将表格写入output_path。设置了backend且用例受支持时由后端执行，
+        后端不可用或需要记录逐token延迟时使用llm_bench_prompt。
 
-            return {
-                "command": cmd_str,
-                "return_code": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "runtime": end_time - start_time
-            }
-
-        except subprocess.TimeoutExpired:
-            end_time = time.time()
-            self.logger.error(f"基准测试超时 (>{timeout}秒)")
-            return {
-                "command": cmd_str,
-                "return_code": -1,
-                "stdout": "",
-                "stderr": f"基准测试超时 (>{timeout}秒)",
-                "runtime": end_time - start_time
-            }
+        Returns:
+            (执行结果, 表头两行, 表格行)
+        """
+        if (self.backend is not None and not stream and not self.token_latency
+                and self.backend.supports(bench_params)):
+            backend_result = self.backend.run(config_path, output_path, bench_params, timeout,
+                                              taskset_cmd=taskset_cmd, telemetry_config=self.telemetry_config)
+            if backend_result is not None:
+                return backend_result
+
+        if not stream:
+            cmd = self.build_command(config_path, output_path, **bench_params)
+            execution_result = self.run_command(cmd, timeout, taskset_cmd=taskset_cmd)
+            if execution_result["return_code"] != 0 or not output_path.exists():
+                return execution_result, [], []
+            header_lines, table_rows = self.read_result_table(output_path)
+            return execution_result, header_lines, table_rows
+
+        cmd = self.build_command(config_path, None, **bench_params)
+        execution_result = self.run_command_streaming(cmd, timeout, taskset_cmd=taskset_cmd, on_event=on_event)
+        header_lines = execution_result.pop("header_lines")
+        table_rows = execution_result.pop("table_rows")
+        if persist_raw and table_rows:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(header_lines + [line for line, _ in table_rows]) + "\n")
+        return execution_result, header_lines, table_rows
 
     def process_benchmark_results(self, output_path: Path, model_alias: str, model_name: str,
                                  bench_params: Dict[str, Any], start_time: float, end_time: float) -> List[Dict[str, Any]]:
@@ -209,37 +458,9 @@ class BenchExecutor:
         self.logger.debug(f"处理结果: {output_path}")
 
         try:
-            with open(output_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                self.logger.debug(f"文件内容预览: {content[:200]}...")
-
-            # 处理Markdown表格格式（内联处理）
-            self.logger.debug("解析MNN LLM benchmark Markdown表格结果")
-            results = []
-            lines = [line.strip() for line in content.split('\n') if line.strip()]
-
-            if len(lines) >= 3:  # 标题行、分隔行、数据行
-                # 解析表头
-                headers = [h.strip() for h in lines[0].split('|')[1:-1]]
-                # 跳过分隔行（|---|---|...）
-                data_lines = lines[2:]
-
-                for row_index, line in enumerate(data_lines):
-                    if not line.startswith('|'):
-                        continue
-
-                    # 解析数据行
-                    values = [v.strip() for v in line.split('|')[1:-1]]
-
-                    if len(values) != len(headers):
-                        self.logger.warning(f"Markdown表格行{row_index}: 列数不匹配，期望{len(headers)}列，实际{len(values)}列")
-                        self.logger.debug(f"表头: {headers}")
-                        self.logger.debug(f"数据: {values}")
-                        continue
-
-                    # 构造字典并创建结果行
-                    row_dict = dict(zip(headers, values))
-                    results.append(self._create_result_row(row_dict, model_alias, model_name, bench_params, start_time, end_time))
+            _, table_rows = self.read_result_table(output_path)
+            results = self._create_result_rows(table_rows, model_alias, model_name,
+                                               bench_params, start_time, end_time)
 
             self.logger.info(f"成功处理 {len(results)} 条基准测试结果记录")
             return results
@@ -248,7 +469,60 @@ class BenchExecutor:
             self.logger.error(f"结果处理异常: {e}")
             return []
 
-    
+    def read_result_table(self, output_path: Path) -> tuple[List[str], List[tuple[str, Dict[str, str]]]]:
+        """
+        读取MNN LLM benchmark输出的Markdown表格
+
+        Args:
+            output_path: 结果文件路径
+
+        Returns:
+            (表头两行, [(原始行, 表头->值字典), ...])
+        """
+        with open(output_path, 'r', encoding='utf-8') as f:
+            content = f.read().strip()
+            self.logger.debug(f"文件内容预览: {content[:200]}...")
+
+        # 处理Markdown表格格式（内联处理）
+        self.logger.debug("解析MNN LLM benchmark Markdown表格结果")
+        table_rows = []
+        lines = [line.strip() for line in content.split('\n') if line.strip()]
+
+        if len(lines) < 3:  # 标题行、分隔行、数据行
+            return lines[:2], table_rows
+
+        # 解析表头
+        headers = [h.strip() for h in lines[0].split('|')[1:-1]]
+        # 跳过分隔行（|---|---|...）
+        data_lines = lines[2:]
+
+        for row_index, line in enumerate(data_lines):
+            if not line.startswith('|'):
+                # -tl 1时每个结果行之后输出该行的逐token延迟
+                attach_token_latency(table_rows, line)
+                continue
+
+            # 解析数据行
+            values = [v.strip() for v in line.split('|')[1:-1]]
+
+            if len(values) != len(headers):
+                self.logger.warning(f"Markdown表格行{row_index}: 列数不匹配，期望{len(headers)}列，实际{len(values)}列")
+                self.logger.debug(f"表头: {headers}")
+                self.logger.debug(f"数据: {values}")
+                continue
+
+            table_rows.append((line, dict(zip(headers, values))))
+
+        return lines[:2], table_rows
+
+    def _create_result_rows(self, table_rows: List[tuple[str, Dict[str, str]]], model_alias: str, model_name: str,
+                            bench_params: Dict[str, Any], start_time: float, end_time: float) -> List[Dict[str, Any]]:
+        """将表格行批量转换为标准化结果行"""
+        return [
+            self._create_result_row(row_dict, model_alias, model_name, bench_params, start_time, end_time)
+            for _, row_dict in table_rows
+        ]
+
     def _create_result_row(self, row_data: Dict[str, str], model_alias: str, model_name: str,
                           bench_params: Dict[str, Any], start_time: float, end_time: float) -> Dict[str, Any]:
         """创建标准化的结果行，支持两种格式"""
@@ -274,7 +548,8 @@ class BenchExecutor:
 
     
     def execute_bench(self, model_alias: str, timeout: int, taskset_cmd: Optional[str] = None,
-                      **bench_params) -> Dict[str, Any]:
+                      stream: bool = False, on_event: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+                      persist_raw: bool = True, **bench_params) -> Dict[str, Any]:
         """
         执行单次完整基准测试，返回JSON结构化结果
 
@@ -282,6 +557,9 @@ class BenchExecutor:
             model_alias: 模型别名
             timeout: 基准测试超时时间（秒）
             taskset_cmd: 可选的taskset命令前缀（例如"taskset -c 1"）
+            stream: 是否流式读取标准输出（逐行解析、支持提前终止）
+            on_event: 流式模式下的事件回调，见run_command_streaming
+            persist_raw: 流式模式下是否将结果表格写入临时文件
             **bench_params: 基准测试参数
 
         Returns:
@@ -301,17 +579,17 @@ class BenchExecutor:
 
             # 创建临时目录并生成临时文件
             temp_dir = self._create_temp_directory()
-            temp_filename = f"{model_alias}_{int(time.time())}_raw.txt"
+            temp_filename = f"{self._temp_stamp(model_alias)}_raw.txt"
             temp_file_path = temp_dir / temp_filename
 
             self.logger.debug(f"临时文件: {temp_file_path}")
 
-            # 构建命令（输出到临时文件）
-            cmd = self.build_command(config_path, temp_file_path, **bench_params)
-
-            # 执行命令
+            # 执行命令（非流式模式输出到临时文件）
             start_time = time.time()
-            execution_result = self.run_command(cmd, timeout, taskset_cmd=taskset_cmd)
+            execution_result, _, table_rows = self._run_and_read_table(
+                config_path, temp_file_path, bench_params, timeout,
+                taskset_cmd=taskset_cmd, stream=stream, on_event=on_event, persist_raw=persist_raw
+            )
             end_time = time.time()
 
             # 检查执行结果
@@ -329,11 +607,10 @@ class BenchExecutor:
                     "error": error_msg
                 }
 
-            # 处理临时文件中的结果
-            bench_results = self.process_benchmark_results(
-                temp_file_path, model_alias, model_name,
-                bench_params, start_time, end_time
-            )
+            # 处理结果表格
+            bench_results = self._create_result_rows(table_rows, model_alias, model_name,
+                                                     bench_params, start_time, end_time)
+            self.logger.info(f"成功处理 {len(bench_results)} 条基准测试结果记录")
 
             if not bench_results:
                 warning_msg = "基准测试未生成有效结果"
@@ -377,6 +654,174 @@ class BenchExecutor:
                 "error": str(e)
             }
 
+    def execute_bench_adaptive(self, model_alias: str, timeout: int, adaptive_config: Optional[Dict[str, Any]] = None,
+                               taskset_cmd: Optional[str] = None, **bench_params) -> Dict[str, Any]:
+        """
+        自适应重复执行基准测试：按批次调用llm_bench_prompt，置信区间足够窄时停止
+
+        每个批次是一次独立调用（-rep为批次大小），各批次的 "均值 ± 标准差" 合并为累计统计。
+
+        Args:
+            model_alias: 模型别名
+            timeout: 单个批次的超时时间（秒）
+            adaptive_config: 自适应配置（ci_width/confidence/min_repeat/max_repeat/chunk）
+            taskset_cmd: 可选的taskset命令前缀
+            **bench_params: 基准测试参数（n_repeat作为未配置max_repeat时的上限）
+
+        Returns:
+            格式同execute_bench，json_result中的均值/标准差为累计统计，
+            并在json_result["adaptive_repeat"]中记录停止统计
+        """
+        controller = AdaptiveRepeatController(adaptive_config, default_max_repeat=bench_params.get("n_repeat"))
+        exec_params = {k: v for k, v in bench_params.items() if k != "n_repeat"}
+        self.logger.info(f"开始自适应重复执行: {model_alias}, 配置: {controller.config}")
+
+        chunk_results = []
+        while True:
+            repeat = controller.next_chunk()
+            if not repeat:
+                break
+
+            result = self.execute_bench(model_alias, timeout, taskset_cmd=taskset_cmd, n_repeat=repeat, **exec_params)
+            if not result.get("success") or not result.get("json_result"):
+                # 任一批次失败即整体失败，不使用不完整的累计统计
+                return result
+
+            controller.add_chunk(result["json_result"]["results"], repeat)
+            chunk_results.append(result)
+
+        final_result = chunk_results[-1]
+        json_result = final_result["json_result"]
+        for metric, statistics in controller.statistics().items():
+            entry = json_result["results"][metric]
+            entry["tokens_per_sec"] = {
+                "mean": round(statistics["mean"], 4),
+                "std": round(statistics["std"], 4),
+                "formatted": f"{statistics['mean']:.2f} ± {statistics['std']:.2f}"
+            }
+            entry["samples"] = statistics["samples"]
+            width = statistics["ci_relative_width"]
+            entry["ci_relative_width"] = round(width, 6) if math.isfinite(width) else None
+
+        total_runtime = sum(r["execution_result"]["runtime"] for r in chunk_results)
+        json_result["execution"]["runtime_seconds"] = round(total_runtime, 3)
+        load_seconds = [r["json_result"]["execution"].get("model_load_seconds") for r in chunk_results]
+        json_result["execution"]["model_load_seconds"] = next((s for s in load_seconds if s is not None), None)
+        json_result["bench_parameters"]["n_repeat"] = controller.repeats
+        json_result["telemetry"] = merge_telemetry([r["json_result"].get("telemetry") for r in chunk_results])
+        if self.profile:
+            json_result["profile"] = merge_profiles([r["json_result"].get("profile") for r in chunk_results])
+        if self.token_latency:
+            json_result["token_latency"] = merge_token_latency(
+                [r["json_result"].get("token_latency") for r in chunk_results])
+        json_result["adaptive_repeat"] = {
+            **controller.summary(),
+            "chunk_files": [r["temp_file_path"] for r in chunk_results]
+        }
+        final_result["execution_result"]["runtime"] = total_runtime
+
+        status = "已收敛" if controller.converged() else "达到最大重复次数"
+        self.logger.info(f"自适应重复完成: {model_alias}, 共 {controller.repeats} 次 ({status})")
+        return final_result
+
+    def execute_bench_group(self, model_alias: str, timeout: int, cases_params: List[Dict[str, Any]],
+                            group_params: Dict[str, Any], splitter, taskset_cmd: Optional[str] = None,
+                            stream: bool = False, on_event: Optional[Callable[[Dict[str, Any]], Optional[str]]] = None,
+                            persist_raw: bool = True) -> Optional[List[Dict[str, Any]]]:
+        """
+        以一次llm_bench_prompt调用执行多个用例（列表参数），并将输出拆分回各用例
+
+        Args:
+            model_alias: 模型别名
+            timeout: 整组调用的超时时间（秒）
+            cases_params: 各用例的执行参数，顺序与返回结果一致
+            group_params: 合并后的调用参数（列表参数为逗号分隔字符串）
+            splitter: 行拆分函数，输入表格行字典列表，返回各用例的行下标列表或None
+            taskset_cmd: 可选的taskset命令前缀
+            stream: 是否流式读取标准输出
+            on_event: 流式模式下的事件回调
+            persist_raw: 流式模式下是否保存原始表格
+
+        Returns:
+            与cases_params一一对应的执行结果（格式同execute_bench）；
+            调用失败或输出无法拆分时返回None，由调用者回退到逐个执行
+        """
+        self.logger.info(f"开始合并执行基准测试: {model_alias} ({len(cases_params)}个用例)")
+
+        try:
+            config_path, model_name = self.validate_model(model_alias)
+
+            temp_dir = self._create_temp_directory()
+            group_stamp = self._temp_stamp(model_alias)
+            group_file_path = temp_dir / f"{group_stamp}_group_raw.txt"
+
+            start_time = time.time()
+            execution_result, header_lines, table_rows = self._run_and_read_table(
+                config_path, group_file_path, group_params, timeout,
+                taskset_cmd=taskset_cmd, stream=stream, on_event=on_event, persist_raw=persist_raw
+            )
+            end_time = time.time()
+
+            if execution_result["return_code"] != 0:
+                self.logger.error(f"合并执行失败 (代码 {execution_result['return_code']}): {execution_result['stderr']}")
+                return None
+
+            assignments = splitter([row_dict for _, row_dict in table_rows])
+            if assignments is None:
+                self.logger.warning(f"合并输出无法拆分: {group_file_path}")
+                return None
+
+            # 合并调用的耗时按用例数均摊，原始耗时另行记录
+            runtime_share = (end_time - start_time) / len(cases_params)
+            group_execution = {
+                **execution_result,
+                "coalesced_cases": len(cases_params),
+                "group_runtime": execution_result["runtime"],
+                "group_output_file": str(group_file_path),
+                "runtime": runtime_share
+            }
+
+            results = []
+            for case_index, (bench_params, row_indices) in enumerate(zip(cases_params, assignments)):
+                # 每个用例单独保存拆分后的表格，保持raw_outputs与单次执行一致
+                case_file_path = temp_dir / f"{group_stamp}_{case_index + 1}_raw.txt"
+                if persist_raw or not stream:
+                    case_lines = header_lines + [table_rows[i][0] for i in row_indices]
+                    with open(case_file_path, 'w', encoding='utf-8') as f:
+                        f.write("\n".join(case_lines) + "\n")
+
+                bench_results = [
+                    self._create_result_row(table_rows[i][1], model_alias, model_name,
+                                            bench_params, start_time, start_time + runtime_share)
+                    for i in row_indices
+                ]
+                json_result = self._create_json_result(bench_results, group_execution,
+                                                      model_name, model_alias, config_path,
+                                                      bench_params, start_time, start_time + runtime_share, timeout)
+                json_result["execution"]["group_runtime_seconds"] = round(end_time - start_time, 3)
+                json_result["execution"]["coalesced_cases"] = len(cases_params)
+                json_result["execution"]["group_id"] = group_stamp
+                if "profile" in json_result:
+                    # 合并执行的进程统计为整组调用的值；均摊耗时无法区分各用例的加载耗时
+                    json_result["profile"]["metrics"].pop("load_s", None)
+
+                results.append({
+                    "success": True,
+                    "execution_result": {
+                        **group_execution,
+                        "temp_output_file": str(case_file_path)
+                    },
+                    "json_result": json_result,
+                    "temp_file_path": str(case_file_path)
+                })
+
+            self.logger.info(f"合并执行完成: {len(cases_params)}个用例，耗时 {end_time - start_time:.2f}秒")
+            return results
+
+        except Exception as e:
+            self.logger.error(f"合并执行异常: {e}", exc_info=True)
+            return None
+
     def _create_temp_directory(self) -> Path:
         """创建临时目录"""
         temp_config = self.system_config.get_config('temp')
@@ -391,6 +836,10 @@ class BenchExecutor:
         temp_dir.mkdir(exist_ok=True)
         return temp_dir
 
+    def _temp_stamp(self, model_alias: str) -> str:
+        """生成临时文件名前缀：模型别名_时间戳_序号"""
+        return f"{model_alias}_{int(time.time())}_{next(self._temp_sequence)}"
+
     def _create_json_result(self, bench_results: List[Dict[str, Any]], execution_result: Dict[str, Any],
                            model_name: str, model_alias: str, config_path: Path,
                            bench_params: Dict[str, Any], start_time: float, end_time: float, timeout: int) -> Dict[str, Any]:
@@ -413,9 +862,12 @@ class BenchExecutor:
             "execution": {
                 "command": execution_result.get("command", ""),
                 "timeout_seconds": timeout,
-                "runtime_seconds": round(end_time - start_time, 3),
+                "runtime_seconds": round(end_time - start_time - (execution_result.get("model_load_seconds") or 0), 3),
                 "return_code": execution_result.get("return_code", 0),
-                "success": execution_result.get("return_code", 0) == 0
+                "success": execution_result.get("return_code", 0) == 0,
+                # 常驻工作进程执行时单独记录模型加载耗时（复用已加载模型时为None）
+                "backend": execution_result.get("backend", "subprocess"),
+                "model_load_seconds": execution_result.get("model_load_seconds")
             },
             "bench_parameters": {
                 "threads": bench_params.get("threads", "uses_default"),
@@ -432,7 +884,9 @@ class BenchExecutor:
             "system_info": {
                 "backend": bench_results[0].get("backend", "") if bench_results else "Unknown",
                 "hostname": socket.gethostname()
-            }
+            },
+            # 执行期间的设备状态采样（合并执行时为整组调用的采样）
+            "telemetry": execution_result.get("telemetry")
         }
 
         # 判断输出格式并处理
@@ -446,6 +900,18 @@ class BenchExecutor:
             # 未知格式
             self.logger.warning(f"未知的输出格式，结果: {bench_results[0] if bench_results else 'empty'}")
 
+        if self.token_latency:
+            json_result["token_latency"] = build_token_latency(
+                [json.loads(r["raw_data_json"]) for r in bench_results])
+
+        if self.profile:
+            json_result["profile"] = build_profile(
+                execution_result.get("profile"), execution_result.get("runtime", end_time - start_time),
+                json_result["results"], bench_params.get("n_repeat"),
+                model_load_seconds=execution_result.get("model_load_seconds"),
+                backend=execution_result.get("backend", "subprocess")
+            )
+
         return json_result
 
     def _process_kv_false_results(self, bench_results: List[Dict[str, Any]], json_result: Dict[str, Any]) -> None:
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内存与缺页剖析模块
+
+专门负责：
+- 子进程退出后（回收前）读取 /proc/<pid>/io，再以wait4回收并取得该进程的rusage
+- 汇总峰值常驻内存（VmHWM）、次/主缺页次数和实际读盘量
+- 按结果表格的吞吐量反推推理耗时，得到模型加载等非推理耗时
+- 生成可写入benchmark_results的剖析结果类型，供mmap/kv_cache的内存-速度权衡分析
+"""
+
+import math
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+
+# 剖析结果类型及单位（写入benchmark_results的result_type/unit）
+PROFILE_METRICS = {
+    "peak_rss_mb": "MB",      # 峰值常驻内存（VmHWM）
+    "minor_faults": "count",  # 次缺页（页已在页缓存中）
+    "major_faults": "count",  # 主缺页（需要读盘，mmap冷启动时显著）
+    "io_read_mb": "MB",       # 实际从存储读取的数据量（/proc/<pid>/io read_bytes）
+    "load_s": "s"             # 模型加载、预热等非推理耗时
+}
+
+# 等待子进程期间读取VmHWM的间隔（秒），单次读取为一次pread
+HWM_POLL_SECONDS = 0.02
+
+# 未指定-rep时llm_bench_prompt的默认重复次数
+DEFAULT_BENCH_REPEAT = 5
+
+_TOKEN_PATTERN = re.compile(r"\d+")
+
+
+def read_proc_io(pid: int, root: str = "/") -> Dict[str, int]:
+    """
+    读取进程的I/O统计
+
+    Args:
+        pid: 进程ID
+        root: 文件系统根目录（测试时指向模拟的/proc）
+
+    Returns:
+        {字段名: 字节数}，不可读时返回空字典
+    """
+    values = {}
+    try:
+        with open(os.path.join(root, "proc", str(pid), "io"), "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if value.strip().isdigit():
+                    values[key.strip()] = int(value)
+    except OSError:
+        pass
+    return values
+
+
+def _read_hwm_kb(fd: int) -> Optional[int]:
+    """从已打开的 /proc/<pid>/status 读取VmHWM（KB），进程已退出时返回None"""
+    try:
+        text = os.pread(fd, 65536, 0).decode("ascii", errors="ignore")
+    except OSError:
+        return None
+    for line in text.splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1])
+    return None
+
+
+def wait_and_profile(process, timeout: float) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    等待子进程退出并采集资源统计，超时则终止进程
+
+    先以WNOWAIT等待退出（进程保留为僵尸，/proc/<pid>/io仍可读），再以wait4回收并取得
+    该子进程自身的rusage。taskset/stdbuf以exec启动目标程序，统计即为llm_bench_prompt本身。
+
+    rusage的ru_maxrss包含exec之前fork出的框架进程镜像，会被抬高到框架自身的内存占用，
+    因此峰值内存取等待期间按HWM_POLL_SECONDS读取的VmHWM（exec后重新计数）。
+
+    Args:
+        process: subprocess.Popen实例，调用方不得再调用wait/poll/communicate回收
+        timeout: 超时时间（秒）
+
+    Returns:
+        (是否超时, 进程统计)；进程已被回收时统计为None
+    """
+    timed_out = threading.Event()
+    exited = threading.Event()
+    hwm = {"kb": None}
+    try:
+        status_fd = os.open(f"/proc/{process.pid}/status", os.O_RDONLY)
+    except OSError:
+        status_fd = None
+
+    def _watch():
+        # 监视线程：记录VmHWM，超时后终止进程
+        deadline = time.monotonic() + timeout
+        while True:
+            if status_fd is not None:
+                kb = _read_hwm_kb(status_fd)
+                if kb is not None:
+                    hwm["kb"] = max(hwm["kb"] or 0, kb)
+            if not timed_out.is_set() and time.monotonic() >= deadline:
+                timed_out.set()
+                process.kill()
+            if exited.wait(HWM_POLL_SECONDS):
+                break
+
+    watcher = threading.Thread(target=_watch, name=f"profile-{process.pid}", daemon=True)
+    watcher.start()
+    try:
+        os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+    except ChildProcessError:
+        process.wait()
+        return timed_out.is_set(), None
+    finally:
+        # 进程已退出但尚未回收，此后kill只会作用于僵尸进程
+        exited.set()
+        watcher.join()
+        if status_fd is not None:
+            os.close(status_fd)
+
+    io_stats = read_proc_io(process.pid)
+    _, status, rusage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    peak_kb = hwm["kb"] if hwm["kb"] is not None else rusage.ru_maxrss  # Linux下ru_maxrss单位为KB
+    return timed_out.is_set(), {
+        "peak_rss_mb": round(peak_kb / 1024, 1),
+        "ru_maxrss_mb": round(rusage.ru_maxrss / 1024, 1),
+        "minor_faults": rusage.ru_minflt,
+        "major_faults": rusage.ru_majflt,
+        "io_read_mb": round(io_stats["read_bytes"] / 1024 / 1024, 2) if "read_bytes" in io_stats else None,
+        "io_write_mb": round(io_stats["write_bytes"] / 1024 / 1024, 2) if "write_bytes" in io_stats else None,
+        "user_s": round(rusage.ru_utime, 3),
+        "system_s": round(rusage.ru_stime, 3)
+    }
+
+
+def compute_seconds(results: Dict[str, Dict[str, Any]], n_repeat: Any) -> Optional[float]:
+    """
+    按结果表格的吞吐量反推推理耗时
+
+    每个测试（pp512、tg128、pp32+tg64）耗时为 token数 / 平均吞吐量 × 重复次数。
+
+    Args:
+        results: json_result["results"]
+        n_repeat: 重复次数，未设置（"uses_default"或None）时使用llm_bench_prompt的默认值
+
+    Returns:
+        推理总耗时（秒），无法计算时返回None
+    """
+    try:
+        repeat = int(n_repeat)
+    except (TypeError, ValueError):
+        repeat = DEFAULT_BENCH_REPEAT
+
+    total = 0.0
+    for entry in results.values():
+        tokens = sum(int(n) for n in _TOKEN_PATTERN.findall(entry.get("test_name", "")))
+        mean = entry.get("tokens_per_sec", {}).get("mean") or 0.0
+        if tokens <= 0 or mean <= 0:
+            return None
+        total += tokens / mean * repeat
+    return total if results else None
+
+
+def build_profile(process_stats: Optional[Dict[str, Any]], runtime: float, results: Dict[str, Dict[str, Any]],
+                  n_repeat: Any, model_load_seconds: Optional[float] = None,
+                  backend: str = "subprocess") -> Dict[str, Any]:
+    """
+    生成单次执行的剖析结果
+
+    Args:
+        process_stats: wait_and_profile返回的进程统计（常驻工作进程执行时为None）
+        runtime: 执行耗时（秒）
+        results: json_result["results"]
+        n_repeat: 重复次数
+        model_load_seconds: 常驻工作进程首次加载模型的耗时
+        backend: 执行后端
+
+    Returns:
+        {"samples", "runtime_s", "compute_s", "metrics": {结果类型: {"mean", "std", "unit"}}, "process"}
+    """
+    compute_s = compute_seconds(results, n_repeat)
+    if backend == "warm":
+        # 常驻工作进程的执行耗时不含模型加载；复用已加载模型时没有加载耗时
+        load_s = model_load_seconds or 0.0
+    else:
+        load_s = max(runtime - compute_s, 0.0) if compute_s is not None else None
+
+    values = dict(process_stats or {})
+    values["load_s"] = round(load_s, 3) if load_s is not None else None
+    return {
+        "samples": 1,
+        "runtime_s": round(runtime, 3),
+        "compute_s": round(compute_s, 3) if compute_s is not None else None,
+        "metrics": {
+            name: {"mean": values[name], "std": None, "unit": unit}
+            for name, unit in PROFILE_METRICS.items() if values.get(name) is not None
+        },
+        "process": process_stats
+    }
+
+
+def merge_profiles(profiles: List[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """
+    合并多次执行的剖析结果（如自适应重复的各批次），各指标取均值和样本标准差
+
+    Args:
+        profiles: 剖析结果列表，元素可为None
+
+    Returns:
+        合并后的剖析结果，全部为None时返回None
+    """
+    profiles = [p for p in profiles if p]
+    if not profiles:
+        return None
+    if len(profiles) == 1:
+        return profiles[0]
+
+    metrics = {}
+    for name, unit in PROFILE_METRICS.items():
+        values = [p["metrics"][name]["mean"] for p in profiles if name in p.get("metrics", {})]
+        if not values:
+            continue
+        mean = sum(values) / len(values)
+        std = math.sqrt(sum((v - mean) ** 2 for v in values) / (len(values) - 1)) if len(values) > 1 else None
+        metrics[name] = {"mean": round(mean, 3), "std": round(std, 3) if std is not None else None, "unit": unit}
+
+    compute = [p["compute_s"] for p in profiles if p.get("compute_s") is not None]
+    return {
+        "samples": len(profiles),
+        "runtime_s": round(sum(p.get("runtime_s", 0.0) for p in profiles), 3),
+        "compute_s": round(sum(compute), 3) if compute else None,
+        "metrics": metrics,
+        "process": None
+    }
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+llm_bench_prompt 流式输出解析模块
+
+专门负责：
+- 通过管道逐行读取子进程的stdout/stderr
+- 在表格行输出时立即解析为行事件
+- 解析verbose模式下每轮的Performance行，报告逐轮耗时
+- 将逐token延迟行（-tl 1）附加到对应的表格行
+- 识别明显异常的结果（吞吐量为0、nan、inf），供执行器提前终止
+"""
+
+import math
+import re
+import threading
+from queue import Queue
+from typing import Dict, List, Any, Optional, IO
+
+from benchmark.core.token_latency import attach_token_latency
+
+
+# verbose模式下的逐轮输出
+ROUND_PATTERN = re.compile(r"\*+\s*Round\s+(\d+)\s*:")
+PERFORMANCE_PATTERN = re.compile(r"Performance:\s*(.*)")
+PHASE_PATTERN = re.compile(r"(Prefill|Decode)=([-\d.]+|nan|inf)\s*ms", re.IGNORECASE)
+
+# 表格中的吞吐量列
+THROUGHPUT_COLUMNS = ("t/s", "speed(tok/s)")
+
+
+def read_pipe_lines(pipe: IO[str], stream_name: str, lines: Queue) -> None:
+    """
+    逐行读取管道内容并放入队列，管道关闭时放入 (stream_name, None)
+
+    Args:
+        pipe: 子进程的stdout或stderr
+        stream_name: 流名称（"stdout"/"stderr"）
+        lines: 输出队列，元素为 (stream_name, line)
+    """
+    try:
+        for line in iter(pipe.readline, ''):
+            lines.put((stream_name, line))
+    finally:
+        pipe.close()
+        lines.put((stream_name, None))
+
+
+def start_pipe_readers(process, lines: Queue) -> List[threading.Thread]:
+    """
+    为子进程的stdout/stderr各启动一个读取线程
+
+    Args:
+        process: subprocess.Popen实例（text模式，stdout/stderr为PIPE）
+        lines: 输出队列
+
+    Returns:
+        读取线程列表
+    """
+    readers = [
+        threading.Thread(target=read_pipe_lines, args=(process.stdout, "stdout", lines), daemon=True),
+        threading.Thread(target=read_pipe_lines, args=(process.stderr, "stderr", lines), daemon=True)
+    ]
+    for reader in readers:
+        reader.start()
+    return readers
+
+
+class OutputStreamParser:
+    """llm_bench_prompt 标准输出的增量解析器"""
+
+    def __init__(self):
+        """初始化解析器"""
+        self.header_lines: List[str] = []
+        self.headers: List[str] = []
+        self.table_rows: List[tuple[str, Dict[str, str]]] = []
+        self.current_round: Optional[int] = None
+
+    def feed(self, line: str) -> Optional[Dict[str, Any]]:
+        """
+        解析一行输出
+
+        Args:
+            line: stdout中的一行
+
+        Returns:
+            事件字典，无需关注的行返回None：
+            - {"type": "header", "headers": [...]}
+            - {"type": "row", "index": n, "line": 原始行, "row": 表头->值字典}
+            - {"type": "round", "round": n, "prefill_ms": float|None, "decode_ms": float|None}
+        """
+        line = line.strip()
+        if not line:
+            return None
+
+        if line.startswith('|'):
+            return self._feed_table_line(line)
+
+        if attach_token_latency(self.table_rows, line):
+            return None
+
+        round_match = ROUND_PATTERN.search(line)
+        if round_match:
+            self.current_round = int(round_match.group(1))
+            return None
+
+        performance_match = PERFORMANCE_PATTERN.search(line)
+        if performance_match:
+            phases = {name.lower(): float(value) for name, value in PHASE_PATTERN.findall(performance_match.group(1))}
+            return {
+                "type": "round",
+                "round": self.current_round,
+                "prefill_ms": phases.get("prefill"),
+                "decode_ms": phases.get("decode")
+            }
+
+        return None
+
+    def abort_reason(self, event: Dict[str, Any]) -> Optional[str]:
+        """
+        判断事件是否表明本次运行已明显异常
+
+        Args:
+            event: feed返回的事件
+
+        Returns:
+            终止原因，正常时返回None
+        """
+        if event["type"] != "row":
+            return None
+
+        row = event["row"]
+        for column in THROUGHPUT_COLUMNS:
+            value = row.get(column, "").strip()
+            if not value:
+                continue
+            # kv=true模式下形如 "a ± b<br>c ± d"，逐段检查均值
+            for segment in value.split("<br>"):
+                mean_str = segment.split("±")[0].strip()
+                try:
+                    mean = float(mean_str)
+                except ValueError:
+                    return f"无法解析吞吐量: {value}"
+                if not math.isfinite(mean) or mean <= 0:
+                    return f"吞吐量异常: {row.get('test') or row.get('llm_demo')} = {value}"
+        return None
+
+    def _feed_table_line(self, line: str) -> Optional[Dict[str, Any]]:
+        """解析Markdown表格行：表头、分隔行或数据行"""
+        if not self.headers:
+            self.headers = [h.strip() for h in line.split('|')[1:-1]]
+            self.header_lines.append(line)
+            return {"type": "header", "headers": self.headers}
+
+        if len(self.header_lines) < 2:
+            # 分隔行（|---|---|...）
+            self.header_lines.append(line)
+            return None
+
+        values = [v.strip() for v in line.split('|')[1:-1]]
+        if len(values) != len(self.headers):
+            return None
+
+        row = dict(zip(self.headers, values))
+        self.table_rows.append((line, row))
+        return {"type": "row", "index": len(self.table_rows) - 1, "line": line, "row": row}
+
+    def __repr__(self):
+        return f"OutputStreamParser(headers={len(self.headers)}, rows={len(self.table_rows)})"
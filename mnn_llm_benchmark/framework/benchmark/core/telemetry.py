@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+系统遥测采样模块
+
+专门负责：
+- 基准测试子进程运行期间在后台线程中按固定间隔采样设备状态
+- 采样CPU频率（cpufreq）、温度（thermal_zone）、进程内存（VmRSS/VmHWM）、
+  系统与进程CPU占用（/proc/stat、/proc/<pid>/stat）和可用内存（/proc/meminfo）
+- 生成紧凑的列式时间序列和汇总值（峰值RSS、平均频率、最高温度），
+  用于将吞吐量异常与降频、过热或内存压力关联
+
+采样文件只打开一次，每次以pread从偏移0重新读取，单次采样不产生额外的进程或文件打开开销。
+"""
+
+import glob
+import os
+import threading
+import time
+from typing import Dict, List, Any, Optional
+
+from utils.logger import LoggerManager
+
+
+# 默认遥测配置
+DEFAULT_TELEMETRY = {
+    "enabled": True,       # 是否在执行用例时采样
+    "interval_ms": 250,    # 采样间隔（毫秒）
+    "max_samples": 600     # 单个用例保留的最大采样点数，超过后隔点抽稀并加倍采样间隔
+}
+
+# 时间序列的列及保留的小数位数
+SERIES_FIELDS = {
+    "t": 3,              # 相对采样开始的秒数
+    "freq_mhz": 0,       # 各CPU当前频率均值
+    "temp_c": 1,         # 各温区最高温度
+    "rss_mb": 1,         # 进程常驻内存
+    "cpu_pct": 1,        # 系统CPU占用率
+    "proc_cpu_pct": 1,   # 被采样进程的CPU占用率（与cpu_pct同为全部CPU的百分比）
+    "mem_avail_mb": 0    # 系统可用内存
+}
+
+# 汇总值，与case_definitions中的同名列对应
+SUMMARY_COLUMNS = ("peak_rss_mb", "mean_freq_mhz", "max_temp_c")
+
+
+def process_cpu_ticks(stat_text: Optional[str]) -> Optional[int]:
+    """
+    解析 /proc/<pid>/stat 中进程已使用的CPU时间（utime + stime，单位为时钟节拍）
+
+    Args:
+        stat_text: /proc/<pid>/stat 内容
+
+    Returns:
+        CPU节拍数，内容无效时返回None
+    """
+    if not stat_text:
+        return None
+    # 进程名可能包含空格和括号，从最后一个右括号之后按空格切分
+    fields = stat_text.rpartition(")")[2].split()
+    try:
+        return int(fields[11]) + int(fields[12])
+    except (IndexError, ValueError):
+        return None
+
+
+def _mean(values: List[float]) -> Optional[float]:
+    """忽略None求均值"""
+    values = [v for v in values if v is not None]
+    return sum(values) / len(values) if values else None
+
+
+def _extreme(values: List[float], func) -> Optional[float]:
+    """忽略None求最大/最小值"""
+    values = [v for v in values if v is not None]
+    return func(values) if values else None
+
+
+def summarize_series(series: Dict[str, List[Any]], peak_rss_mb: Optional[float] = None) -> Dict[str, Any]:
+    """
+    计算时间序列的汇总值
+
+    Args:
+        series: 列式时间序列
+        peak_rss_mb: 内核记录的进程峰值内存（VmHWM），与采样到的最大RSS取较大者
+
+    Returns:
+        汇总字典：peak_rss_mb、mean_freq_mhz、max_temp_c、mean_cpu_pct、mean_other_cpu_pct、
+        min_mem_avail_mb、samples（mean_other_cpu_pct为被采样进程以外的CPU占用，用于判断干扰）
+    """
+    sampled_peak = _extreme(series.get("rss_mb", []), max)
+    peaks = [v for v in (peak_rss_mb, sampled_peak) if v is not None]
+    other_cpu = [max(total - own, 0.0) for total, own in zip(series.get("cpu_pct", []), series.get("proc_cpu_pct", []))
+                 if total is not None and own is not None]
+    summary = {
+        "peak_rss_mb": max(peaks) if peaks else None,
+        "mean_freq_mhz": _mean(series.get("freq_mhz", [])),
+        "max_temp_c": _extreme(series.get("temp_c", []), max),
+        "mean_cpu_pct": _mean(series.get("cpu_pct", [])),
+        "mean_other_cpu_pct": _mean(other_cpu),
+        "min_mem_avail_mb": _extreme(series.get("mem_avail_mb", []), min),
+        "samples": len(series.get("t", []))
+    }
+    return {key: round(value, 1) if isinstance(value, float) else value for key, value in summary.items()}
+
+
+def merge_telemetry(items: List[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """
+    合并多次执行的遥测结果（如自适应重复的各批次），时间轴依次顺延
+
+    Args:
+        items: 遥测结果列表，元素可为None
+
+    Returns:
+        合并后的遥测结果，全部为None时返回None
+    """
+    items = [item for item in items if item]
+    if not items:
+        return None
+
+    series: Dict[str, List[Any]] = {}
+    offset = 0.0
+    for item in items:
+        item_series = item.get("series", {})
+        times = item_series.get("t", [])
+        for name in SERIES_FIELDS:
+            column = item_series.get(name)
+            if name == "t":
+                column = [round(t + offset, SERIES_FIELDS["t"]) for t in times]
+            elif column is None:
+                column = [None] * len(times)
+            series.setdefault(name, []).extend(column)
+        if times:
+            offset += times[-1] + item.get("interval_ms", 0) / 1000
+
+    series = {name: column for name, column in series.items()
+              if name == "t" or any(v is not None for v in column)}
+    peak = _extreme([item.get("summary", {}).get("peak_rss_mb") for item in items], max)
+    return {
+        "interval_ms": max(item.get("interval_ms", 0) for item in items),
+        "summary": summarize_series(series, peak),
+        "series": series
+    }
+
+
+class TelemetrySampler:
+    """基准测试进程的后台遥测采样器"""
+
+    def __init__(self, pid: int, interval_ms: float = 250, max_samples: int = 600,
+                 reset_peak: bool = False, root: str = "/"):
+        """
+        初始化采样器
+
+        Args:
+            pid: 被采样的进程ID（taskset/stdbuf以exec启动目标程序，进程ID不变）
+            interval_ms: 采样间隔（毫秒）
+            max_samples: 保留的最大采样点数
+            reset_peak: 开始前是否重置进程的VmHWM（常驻工作进程跨用例复用时使用）
+            root: 文件系统根目录（测试时指向模拟的/proc和/sys）
+        """
+        self.logger = LoggerManager.get_logger("TelemetrySampler")
+        self.pid = pid
+        self.interval = max(float(interval_ms), 10.0) / 1000
+        self.max_samples = max(int(max_samples), 2)
+        self.reset_peak = reset_peak
+        self.root = root
+
+        self.series: Dict[str, List[Any]] = {name: [] for name in SERIES_FIELDS}
+        self._peak_rss_mb: Optional[float] = None
+        self._prev_cpu: Optional[tuple[int, int, Optional[int]]] = None
+        self._start_time: Optional[float] = None
+        self._fds: Dict[str, int] = {}
+        self._freq_paths: List[str] = []
+        self._temp_paths: List[str] = []
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, pid: int, config: Optional[Dict[str, Any]] = None,
+                    reset_peak: bool = False) -> Optional["TelemetrySampler"]:
+        """
+        按[telemetry]配置创建采样器
+
+        Args:
+            pid: 被采样的进程ID
+            config: [telemetry]配置节，缺省项使用DEFAULT_TELEMETRY
+            reset_peak: 是否重置进程的VmHWM
+
+        Returns:
+            采样器，配置禁用时返回None
+        """
+        settings = {**DEFAULT_TELEMETRY, **(config or {})}
+        if not settings["enabled"]:
+            return None
+        return cls(pid, settings["interval_ms"], settings["max_samples"], reset_peak=reset_peak)
+
+    def _path(self, *parts: str) -> str:
+        """拼接根目录下的路径"""
+        return os.path.join(self.root, *parts)
+
+    def _open_sources(self) -> None:
+        """查找并打开采样文件"""
+        self._freq_paths = sorted(glob.glob(self._path("sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_cur_freq")))
+        self._temp_paths = sorted(glob.glob(self._path("sys/class/thermal/thermal_zone*/temp")))
+        paths = self._freq_paths + self._temp_paths + [
+            self._path("proc", str(self.pid), "status"),
+            self._path("proc", str(self.pid), "stat"),
+            self._path("proc/stat"),
+            self._path("proc/meminfo")
+        ]
+        for path in paths:
+            try:
+                self._fds[path] = os.open(path, os.O_RDONLY)
+            except OSError:
+                continue
+
+        if self.reset_peak:
+            try:
+                with open(self._path("proc", str(self.pid), "clear_refs"), "w") as f:
+                    f.write("5")
+            except OSError as e:
+                self.logger.debug(f"无法重置进程峰值内存: {e}")
+
+    def _read(self, path: str) -> Optional[str]:
+        """从偏移0重新读取已打开的文件"""
+        fd = self._fds.get(path)
+        if fd is None:
+            return None
+        try:
+            return os.pread(fd, 65536, 0).decode("ascii", errors="ignore")
+        except OSError:
+            # 进程已退出或传感器暂时不可读
+            return None
+
+    def _read_number(self, path: str) -> Optional[int]:
+        """读取只包含一个整数的sysfs文件"""
+        text = self._read(path)
+        try:
+            return int(text.strip()) if text else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _parse_kb(text: Optional[str], keys: tuple) -> Dict[str, int]:
+        """解析 "Key:   123 kB" 格式的行"""
+        values = {}
+        if not text:
+            return values
+        for line in text.splitlines():
+            key, _, rest = line.partition(":")
+            if key in keys:
+                fields = rest.split()
+                if fields and fields[0].isdigit():
+                    values[key] = int(fields[0])
+        return values
+
+    def sample(self) -> None:
+        """采集一个采样点"""
+        now = time.monotonic()
+        if self._start_time is None:
+            self._start_time = now
+
+        freqs = [v for v in (self._read_number(p) for p in self._freq_paths) if v is not None]
+        temps = [v for v in (self._read_number(p) for p in self._temp_paths) if v is not None]
+
+        status = self._parse_kb(self._read(self._path("proc", str(self.pid), "status")), ("VmRSS", "VmHWM"))
+        if "VmHWM" in status:
+            hwm_mb = status["VmHWM"] / 1024
+            self._peak_rss_mb = max(self._peak_rss_mb or 0.0, hwm_mb)
+
+        cpu_pct = proc_cpu_pct = None
+        stat = self._read(self._path("proc/stat"))
+        if stat and stat.startswith("cpu "):
+            ticks = [int(v) for v in stat.split("\n", 1)[0].split()[1:9]]
+            total, idle = sum(ticks), ticks[3] + ticks[4]
+            proc_ticks = process_cpu_ticks(self._read(self._path("proc", str(self.pid), "stat")))
+            if self._prev_cpu is not None and total > self._prev_cpu[0]:
+                elapsed = total - self._prev_cpu[0]
+                cpu_pct = 100.0 * (elapsed - (idle - self._prev_cpu[1])) / elapsed
+                if proc_ticks is not None and self._prev_cpu[2] is not None:
+                    proc_cpu_pct = min(100.0 * (proc_ticks - self._prev_cpu[2]) / elapsed, cpu_pct)
+            self._prev_cpu = (total, idle, proc_ticks)
+
+        meminfo = self._parse_kb(self._read(self._path("proc/meminfo")), ("MemAvailable",))
+
+        point = {
+            "t": now - self._start_time,
+            "freq_mhz": sum(freqs) / len(freqs) / 1000 if freqs else None,
+            "temp_c": max(temps) / 1000 if temps else None,
+            "rss_mb": status["VmRSS"] / 1024 if "VmRSS" in status else None,
+            "cpu_pct": cpu_pct,
+            "proc_cpu_pct": proc_cpu_pct,
+            "mem_avail_mb": meminfo["MemAvailable"] / 1024 if "MemAvailable" in meminfo else None
+        }
+        for name, digits in SERIES_FIELDS.items():
+            value = point[name]
+            self.series[name].append(round(value, digits) if value is not None else None)
+
+        # 超过最大点数时隔点抽稀，并加倍采样间隔
+        if len(self.series["t"]) > self.max_samples:
+            self.series = {name: column[::2] for name, column in self.series.items()}
+            self.interval *= 2
+
+    def _run(self) -> None:
+        """采样线程主循环"""
+        while not self._stop_event.wait(self.interval):
+            self.sample()
+
+    def start(self) -> "TelemetrySampler":
+        """打开采样文件，采集首个采样点并启动后台线程"""
+        self._open_sources()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name=f"telemetry-{self.pid}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Dict[str, Any]:
+        """
+        停止采样并关闭文件
+
+        Returns:
+            遥测结果：interval_ms、summary和series（全为空的列不保留）
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(self.interval * 2, 1.0))
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds = {}
+        return self.result()
+
+    def result(self) -> Dict[str, Any]:
+        """生成当前的遥测结果"""
+        series = {name: list(column) for name, column in self.series.items()
+                  if name == "t" or any(v is not None for v in column)}
+        return {
+            "interval_ms": round(self.interval * 1000),
+            "summary": summarize_series(series, self._peak_rss_mb),
+            "series": series
+        }
+
+    def __repr__(self):
+        return f"TelemetrySampler(pid={self.pid}, interval={self.interval:.3f}s, samples={len(self.series['t'])})"
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+逐token延迟统计模块
+
+专门负责：
+- 解析llm_bench_prompt（-tl 1）在每个结果行之后输出的token_latency行
+- 按prompt长度汇总首token延迟（TTFT），按生成长度汇总相邻token间隔（ITL）的分位数
+- 合并多次执行（自适应重复的各批次）的原始样本后重新统计，分位数不做近似
+
+每轮生成n个token时记录n-1个间隔；生成因停止token提前结束时，llm_bench_prompt
+去掉最后一个（停止token采样）间隔，ITL样本只包含相邻输出token之间的间隔。
+"""
+
+import math
+import re
+from typing import Dict, List, Any, Optional
+
+
+# llm_bench_prompt输出行前缀，格式: token_latency ttft_us=<us,...> itl_us=<us,...>
+TOKEN_LATENCY_PREFIX = "token_latency"
+
+# 结果表格行字典中保存对应token_latency行的键
+TOKEN_LATENCY_KEY = "token_latency"
+
+# 写入benchmark_results的token间隔分位数
+ITL_PERCENTILES = (50, 95, 99)
+
+_FIELD_PATTERN = re.compile(r"(ttft_us|itl_us)=([\d,]*)")
+_LENGTH_PATTERN = re.compile(r"(pp|tg|prompt=|decode=)(\d+)")
+
+
+def parse_token_latency_line(line: str) -> Optional[Dict[str, List[int]]]:
+    """
+    解析一行token_latency输出
+
+    Args:
+        line: 输出行
+
+    Returns:
+        {"ttft_us": [各轮首token延迟], "itl_us": [相邻token间隔]}，不是token_latency行时返回None
+    """
+    line = line.strip()
+    if not line.startswith(TOKEN_LATENCY_PREFIX + " "):
+        return None
+    samples = {"ttft_us": [], "itl_us": []}
+    for name, values in _FIELD_PATTERN.findall(line):
+        samples[name] = [int(v) for v in values.split(",") if v]
+    return samples
+
+
+def attach_token_latency(table_rows: List[tuple], line: str) -> bool:
+    """
+    将token_latency行附加到上一个表格行
+
+    原始行追加该行（保存的原始输出保持完整），行字典以TOKEN_LATENCY_KEY保存该行。
+
+    Args:
+        table_rows: [(原始行, 表头->值字典), ...]，原地修改最后一项
+        line: token_latency行
+
+    Returns:
+        是否已附加（不是token_latency行或前面没有表格行时返回False）
+    """
+    line = line.strip()
+    if not table_rows or parse_token_latency_line(line) is None:
+        return False
+    raw_line, row = table_rows[-1]
+    table_rows[-1] = (f"{raw_line}\n{line}", {**row, TOKEN_LATENCY_KEY: line})
+    return True
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """
+    线性插值分位数（与numpy.percentile默认方法一致）
+
+    Args:
+        values: 样本
+        q: 分位（0-100）
+
+    Returns:
+        分位数，样本为空时返回None
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize_samples(values_us: List[int]) -> Dict[str, Any]:
+    """
+    统计一组延迟样本（us），结果以毫秒表示
+
+    Args:
+        values_us: 原始样本
+
+    Returns:
+        {"samples", "mean_ms", "std_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", "values_us"}
+    """
+    values_ms = [v / 1000 for v in values_us]
+    count = len(values_ms)
+    mean = sum(values_ms) / count if count else None
+    std = math.sqrt(sum((v - mean) ** 2 for v in values_ms) / (count - 1)) if count > 1 else None
+    summary = {
+        "samples": count,
+        "mean_ms": round(mean, 4) if mean is not None else None,
+        "std_ms": round(std, 4) if std is not None else None
+    }
+    for q in ITL_PERCENTILES:
+        value = percentile(values_ms, q)
+        summary[f"p{q}_ms"] = round(value, 4) if value is not None else None
+    summary["max_ms"] = round(max(values_ms), 4) if values_ms else None
+    summary["values_us"] = list(values_us)
+    return summary
+
+
+def row_lengths(row: Dict[str, str]) -> tuple[Optional[int], Optional[int]]:
+    """
+    从结果表格行取得prompt长度和生成长度
+
+    kv=false模式的test列形如 pp512、tg128、pp32+tg64；kv=true模式的llm_demo列形如 prompt=64<br>decode=32。
+
+    Args:
+        row: 表头 -> 值字典
+
+    Returns:
+        (prompt长度, 生成长度)，不包含对应阶段时为None
+    """
+    text = row.get("llm_demo") or row.get("test") or ""
+    lengths = {}
+    for name, value in _LENGTH_PATTERN.findall(text):
+        lengths["prompt" if name in ("pp", "prompt=") else "gen"] = int(value)
+    return lengths.get("prompt"), lengths.get("gen")
+
+
+def build_token_latency(rows: List[Dict[str, str]]) -> Optional[Dict[str, Dict[str, Dict[str, Any]]]]:
+    """
+    汇总一个用例各结果行的逐token延迟
+
+    首token延迟按prompt长度分组，token间隔按生成长度分组；相同长度的样本合并统计
+    （如同一用例中的pp64与pp64+tg32）。
+
+    Args:
+        rows: 结果表格行字典列表（含TOKEN_LATENCY_KEY）
+
+    Returns:
+        {"ttft": {prompt长度: 统计}, "itl": {生成长度: 统计}}，没有token_latency行时返回None
+    """
+    groups = {"ttft": {}, "itl": {}}
+    found = False
+    for row in rows:
+        samples = parse_token_latency_line(row.get(TOKEN_LATENCY_KEY, ""))
+        if samples is None:
+            continue
+        found = True
+        prompt_length, gen_length = row_lengths(row)
+        if prompt_length is not None and samples["ttft_us"]:
+            groups["ttft"].setdefault(str(prompt_length), []).extend(samples["ttft_us"])
+        if gen_length is not None and samples["itl_us"]:
+            groups["itl"].setdefault(str(gen_length), []).extend(samples["itl_us"])
+    if not found:
+        return None
+    return {kind: {length: summarize_samples(values) for length, values in group.items()}
+            for kind, group in groups.items()}
+
+
+def merge_token_latency(latencies: List[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """
+    合并多次执行的逐token延迟：拼接原始样本后重新统计
+
+    Args:
+        latencies: build_token_latency结果列表，元素可为None
+
+    Returns:
+        合并后的逐token延迟，全部为None时返回None
+    """
+    latencies = [latency for latency in latencies if latency]
+    if not latencies:
+        return None
+    if len(latencies) == 1:
+        return latencies[0]
+
+    merged = {}
+    for kind in ("ttft", "itl"):
+        values: Dict[str, List[int]] = {}
+        for latency in latencies:
+            for length, summary in latency.get(kind, {}).items():
+                values.setdefault(length, []).extend(summary.get("values_us", []))
+        merged[kind] = {length: summarize_samples(samples) for length, samples in values.items()}
+    return merged
+
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+常驻工作进程执行后端
+
+专门负责：
+- 按(模型配置, 线程数, 精度, dynamicOption, mmap, taskset)维护常驻的warm_worker进程，
+  模型只加载一次，后续用例直接复用
+- 超过max_workers时淘汰最久未使用的空闲进程
+- 将工作进程返回的逐轮耗时转换为与llm_bench_prompt相同的Markdown表格，
+  后续结果处理流程无需区分执行方式
+- 模型加载耗时单独记录（model_load_seconds），不计入用例的执行耗时
+"""
+
+import itertools
+import json
+import shlex
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from queue import Queue, Empty
+from typing import Dict, List, Any, Optional, Tuple
+
+from benchmark.core.stream import start_pipe_readers
+from benchmark.core.telemetry import TelemetrySampler
+from utils.logger import LoggerManager
+
+
+# 工作进程脚本
+WORKER_SCRIPT = Path(__file__).with_name("warm_worker.py")
+
+# llm_bench_prompt 未指定参数时的默认值
+WORKER_DEFAULTS = {
+    "threads": 4,
+    "precision": 2,
+    "dynamicOption": 0,
+    "n_prompt": 512,
+    "n_gen": 128,
+    "n_repeat": 5
+}
+
+PRECISION_NAMES = {0: "Normal", 1: "High", 2: "Low"}
+
+# 只能由llm_bench_prompt执行的参数（提示词文件、可变提示词、pp+tg组合测试）
+UNSUPPORTED_PARAMS = ("prompt_file", "variable_prompt", "prompt_gen")
+
+
+def _is_true(value: Any) -> bool:
+    """解析 true/false/1/0 形式的开关参数"""
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes")
+    return bool(value)
+
+
+def _int_param(bench_params: Dict[str, Any], name: str) -> int:
+    """读取整数参数，未指定时使用llm_bench_prompt的默认值"""
+    value = bench_params.get(name)
+    if value is None or value == '':
+        return WORKER_DEFAULTS[name]
+    return int(value)
+
+
+def format_speed(samples: List[Dict[str, Any]]) -> str:
+    """
+    将逐轮耗时格式化为llm_bench_prompt的 "均值 ± 标准差" 吞吐量
+
+    Args:
+        samples: [{"tokens": token数, "us": 微秒}, ...]
+
+    Returns:
+        如 "262.15 ± 1.19"
+    """
+    speeds = [s["tokens"] * 1e6 / s["us"] for s in samples if s["us"] > 0]
+    if not speeds:
+        return "0.00 ± 0.00"
+    std = statistics.stdev(speeds) if len(speeds) > 1 else 0.0
+    return f"{statistics.mean(speeds):.2f} ± {std:.2f}"
+
+
+def format_model_size(config_path: Path) -> str:
+    """按llm_bench_prompt的方式读取权重文件大小"""
+    weight_name = "llm.mnn.weight"
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            weight_name = json.load(f).get("llm_weight", weight_name)
+    except (OSError, ValueError):
+        pass
+    weight_path = config_path.parent / weight_name
+    size = weight_path.stat().st_size if weight_path.exists() else 0
+    if size < 1024 ** 3:
+        return f"{size / 1024 ** 2:.2f} MiB"
+    return f"{size / 1024 ** 3:.2f} GiB"
+
+
+def build_table(config_path: Path, bench_params: Dict[str, Any],
+                response: Dict[str, Any]) -> Tuple[List[str], List[Tuple[str, Dict[str, str]]]]:
+    """
+    将工作进程的结果转换为llm_bench_prompt格式的Markdown表格
+
+    Args:
+        config_path: 模型配置文件路径
+        bench_params: 基准测试参数
+        response: 工作进程返回的result消息
+
+    Returns:
+        (表头两行, [(原始行, 表头->值字典), ...])
+    """
+    n_prompt = _int_param(bench_params, "n_prompt")
+    n_gen = _int_param(bench_params, "n_gen")
+    common = {
+        "model": config_path.parent.name,
+        "modelSize": format_model_size(config_path),
+        "backend": "CPU",
+        "threads": str(_int_param(bench_params, "threads")),
+        "precision": PRECISION_NAMES.get(_int_param(bench_params, "precision"), "High"),
+        "pType": "fix"
+    }
+
+    if _is_true(bench_params.get("kv_cache")):
+        rows = [{
+            **common,
+            "llm_demo": f"prompt={n_prompt}<br>decode={n_gen}",
+            "speed(tok/s)": f"{format_speed(response['prefill'])}<br>{format_speed(response['decode'])}"
+        }]
+    else:
+        rows = []
+        if n_prompt > 0:
+            rows.append({**common, "test": f"pp{n_prompt}", "t/s": format_speed(response["prefill"])})
+        if n_gen > 0:
+            rows.append({**common, "test": f"tg{n_gen}", "t/s": format_speed(response["decode"])})
+
+    headers = list(rows[0].keys()) if rows else list(common.keys())
+    header_lines = [
+        "| " + " | ".join(headers) + " |",
+        "|" + "|".join(" --- " for _ in headers) + "|"
+    ]
+    table_rows = [("| " + " | ".join(row[h] for h in headers) + " |", row) for row in rows]
+    return header_lines, table_rows
+
+
+class WarmWorker:
+    """单个常驻工作进程（一个已加载的模型）"""
+
+    def __init__(self, key: Tuple, command: List[str]):
+        """
+        启动工作进程（不等待模型加载完成）
+
+        Args:
+            key: 工作进程键
+            command: 启动命令
+        """
+        self.key = key
+        self.command = command
+        self.load_seconds: Optional[float] = None
+        self.requests = 0
+        self.active = 0  # 已获取但尚未完成的请求数，由后端在其锁内维护
+        self.last_used = time.time()
+        self.lock = threading.Lock()
+        self.stderr_lines: List[str] = []
+
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.PIPE, text=True, bufsize=1)
+        self._lines: Queue = Queue()
+        self._readers = start_pipe_readers(self.process, self._lines)
+
+    def alive(self) -> bool:
+        """进程是否仍在运行"""
+        return self.process.poll() is None
+
+    def read_message(self, deadline: float) -> Optional[Dict[str, Any]]:
+        """
+        读取下一条JSON消息，忽略MNN自身输出到stdout的日志行
+
+        Args:
+            deadline: 截止时间（time.time()）
+
+        Returns:
+            消息字典，超时或进程退出时返回None
+        """
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            try:
+                stream_name, line = self._lines.get(timeout=min(remaining, 0.5))
+            except Empty:
+                continue
+            if line is None:
+                if stream_name == "stdout":
+                    return None
+                continue
+            if stream_name == "stderr":
+                self.stderr_lines.append(line)
+                continue
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(message, dict) and "type" in message:
+                return message
+
+    def send(self, message: Dict[str, Any]) -> None:
+        """发送一条JSON请求"""
+        self.process.stdin.write(json.dumps(message) + "\n")
+        self.process.stdin.flush()
+
+    def stop(self) -> None:
+        """请求退出，未及时退出时强制结束"""
+        if self.alive():
+            try:
+                self.send({"type": "exit"})
+                self.process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+        for reader in self._readers:
+            reader.join(timeout=1)
+
+    def __repr__(self):
+        return f"WarmWorker(key={self.key}, pid={self.process.pid}, requests={self.requests})"
+
+
+class WarmWorkerBackend:
+    """常驻工作进程执行后端"""
+
+    def __init__(self, python: Optional[str] = None, max_workers: int = 1):
+        """
+        初始化后端
+
+        Args:
+            python: 运行工作进程的Python解释器（需安装MNN），为空时使用当前解释器
+            max_workers: 同时保留的工作进程（已加载模型）数量上限
+        """
+        self.logger = LoggerManager.get_logger("WarmWorkerBackend")
+        self.python = python or sys.executable
+        self.max_workers = max(1, int(max_workers))
+        self._workers: "OrderedDict[Tuple, WarmWorker]" = OrderedDict()
+        self._unavailable: Dict[Tuple, str] = {}
+        self._lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+
+    def supports(self, bench_params: Dict[str, Any]) -> bool:
+        """
+        判断用例能否由工作进程执行
+
+        Args:
+            bench_params: 基准测试参数
+
+        Returns:
+            不支持时由调用者回退到llm_bench_prompt
+        """
+        for name in UNSUPPORTED_PARAMS:
+            value = bench_params.get(name)
+            if value not in (None, '', 0, False) and not (isinstance(value, str) and value.lower() == "false"):
+                return False
+        # 合并执行的逗号分隔参数列表由llm_bench_prompt处理
+        return not any(isinstance(value, str) and ',' in value for value in bench_params.values())
+
+    def run(self, config_path: Path, output_path: Path, bench_params: Dict[str, Any], timeout: int,
+            taskset_cmd: Optional[str] = None, telemetry_config: Optional[Dict[str, Any]] = None) -> Optional[Tuple[Dict[str, Any], List[str], List[Tuple[str, Dict[str, str]]]]]:
+        """
+        在常驻工作进程中执行一次基准测试
+
+        Args:
+            config_path: 模型配置文件路径
+            output_path: 结果表格写入路径（与llm_bench_prompt的-fp一致）
+            bench_params: 基准测试参数
+            timeout: 超时时间（秒），首次使用时包含模型加载
+            taskset_cmd: 可选的taskset命令前缀
+            telemetry_config: [telemetry]遥测采样配置
+
+        Returns:
+            (执行结果, 表头两行, 表格行)；工作进程无法启动时返回None，由调用者回退到子进程执行
+        """
+        settings = {
+            "threads": _int_param(bench_params, "threads"),
+            "precision": _int_param(bench_params, "precision"),
+            "dynamicOption": _int_param(bench_params, "dynamicOption"),
+            "mmap": _is_true(bench_params.get("mmap"))
+        }
+        key = (str(config_path), settings["threads"], settings["precision"],
+               settings["dynamicOption"], settings["mmap"], taskset_cmd or "")
+        if key in self._unavailable:
+            return None
+
+        deadline = time.time() + timeout
+        worker, cold = self._acquire(key, config_path, settings, taskset_cmd)
+        try:
+            return self._run_on_worker(worker, cold, config_path, output_path, bench_params, timeout, deadline,
+                                       telemetry_config)
+        finally:
+            with self._lock:
+                worker.active -= 1
+
+    def _run_on_worker(self, worker: WarmWorker, cold: bool, config_path: Path, output_path: Path,
+                       bench_params: Dict[str, Any], timeout: int, deadline: float,
+                       telemetry_config: Optional[Dict[str, Any]] = None) -> Optional[Tuple[Dict[str, Any], List[str], List[Tuple[str, Dict[str, str]]]]]:
+        """在已获取的工作进程上执行请求（首次使用时等待模型加载）"""
+        with worker.lock:
+            if cold and not self._wait_ready(worker, deadline):
+                self._discard(worker)
+                self._unavailable[worker.key] = "".join(worker.stderr_lines[-5:])
+                self.logger.warning(f"常驻工作进程不可用，回退到llm_bench_prompt: {config_path}")
+                return None
+
+            # 工作进程跨用例复用，采样前重置峰值内存，使峰值只反映本次请求
+            sampler = TelemetrySampler.from_config(worker.process.pid, telemetry_config, reset_peak=True)
+            if sampler:
+                sampler.start()
+            bench_start = time.time()
+            request = {
+                "type": "bench",
+                "id": next(self._request_ids),
+                "n_prompt": _int_param(bench_params, "n_prompt"),
+                "n_gen": _int_param(bench_params, "n_gen"),
+                "n_repeat": _int_param(bench_params, "n_repeat"),
+                "kv_cache": _is_true(bench_params.get("kv_cache"))
+            }
+            try:
+                worker.send(request)
+                response = worker.read_message(deadline)
+            except OSError as e:
+                response = {"type": "error", "error": f"工作进程通信失败: {e}"}
+            worker.requests += 1
+            worker.last_used = time.time()
+            end_time = time.time()
+            telemetry = sampler.stop() if sampler else None
+
+        execution_result = {
+            "command": f"warm_worker {config_path} {json.dumps(request)}",
+            "stdout": "",
+            "runtime": end_time - bench_start,
+            "backend": "warm",
+            "model_load_seconds": round(worker.load_seconds, 3) if cold else None,
+            "warm_reused": not cold,
+            "telemetry": telemetry
+        }
+
+        if response is None or response.get("type") != "result":
+            error = f"基准测试超时 (>{timeout}秒)" if response is None else response.get("error", "未知错误")
+            self.logger.error(f"常驻工作进程执行失败: {error}")
+            # 超时或异常后进程状态未知，不再复用
+            self._discard(worker)
+            return {**execution_result, "return_code": -1, "stderr": error}, [], []
+
+        header_lines, table_rows = build_table(config_path, bench_params, response)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(header_lines + [line for line, _ in table_rows]) + "\n")
+
+        state = f"模型加载 {worker.load_seconds:.2f}秒" if cold else "复用已加载模型"
+        self.logger.info(f"常驻工作进程执行完成 - 耗时: {end_time - bench_start:.2f}秒 ({state})")
+        return {**execution_result, "return_code": 0, "stderr": ""}, header_lines, table_rows
+
+    def close(self) -> None:
+        """结束所有工作进程"""
+        with self._lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+        for worker in workers:
+            worker.stop()
+        if workers:
+            self.logger.info(f"已结束 {len(workers)} 个常驻工作进程")
+
+    def _acquire(self, key: Tuple, config_path: Path, settings: Dict[str, Any],
+                 taskset_cmd: Optional[str]) -> Tuple[WarmWorker, bool]:
+        """获取工作进程，不存在时启动，返回 (工作进程, 是否新启动)"""
+        evicted = []
+        with self._lock:
+            worker = self._workers.get(key)
+            if worker is not None and worker.alive():
+                self._workers.move_to_end(key)
+                worker.active += 1
+                return worker, False
+            if worker is not None:
+                evicted.append(self._workers.pop(key))
+
+            # 淘汰最久未使用的空闲进程（正在使用的进程不淘汰）
+            for other_key, other in list(self._workers.items()):
+                if len(self._workers) < self.max_workers:
+                    break
+                if other.active == 0:
+                    evicted.append(self._workers.pop(other_key))
+
+            command = [self.python, str(WORKER_SCRIPT), str(config_path), json.dumps(settings)]
+            if taskset_cmd:
+                command = shlex.split(taskset_cmd) + command
+            self.logger.info(f"启动常驻工作进程: {' '.join(command)}")
+            worker = WarmWorker(key, command)
+            worker.active += 1
+            self._workers[key] = worker
+
+        for old in evicted:
+            self.logger.info(f"淘汰常驻工作进程: {old.key[0]}")
+            old.stop()
+        return worker, True
+
+    def _wait_ready(self, worker: WarmWorker, deadline: float) -> bool:
+        """等待模型加载完成"""
+        message = worker.read_message(deadline)
+        if message is None or message.get("type") != "ready":
+            error = message.get("error") if message else "模型加载超时或进程退出"
+            self.logger.error(f"常驻工作进程启动失败: {error} {''.join(worker.stderr_lines[-5:])}")
+            return False
+        worker.load_seconds = float(message.get("load_seconds", 0.0))
+        return True
+
+    def _discard(self, worker: WarmWorker) -> None:
+        """移除并结束工作进程"""
+        with self._lock:
+            if self._workers.get(worker.key) is worker:
+                del self._workers[worker.key]
+        if worker.alive():
+            worker.process.kill()
+            worker.process.wait()
+
+    def __repr__(self):
+        return f"WarmWorkerBackend(python={self.python}, workers={len(self._workers)}/{self.max_workers})"
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+常驻基准测试工作进程
+
+由WarmWorkerBackend启动，通过pymnn（MNN.llm）加载一次模型，之后从标准输入逐行读取
+JSON请求并在标准输出逐行返回JSON结果，测试方法与llm_bench_prompt保持一致：
+- kv_cache=true：n_repeat+1轮 response(P个token, G)，丢弃第一轮，记录prefill_us/decode_us
+- kv_cache=false：pp测试为 response(P个token, 1) 取prefill_us，tg测试为 response([16], G) 取decode_us
+
+本脚本不依赖框架其余模块，可使用安装了MNN的任意Python解释器运行：
+    python warm_worker.py <config.json> '<settings JSON>'
+
+协议：
+    启动后输出 {"type": "ready", "load_seconds": 秒数} 或 {"type": "error", "error": 信息}
+    请求 {"type": "bench", "id": N, "n_prompt": P, "n_gen": G, "n_repeat": R, "kv_cache": bool}
+    响应 {"type": "result", "id": N, "load_seconds": ..., "prefill": [...], "decode": [...]}
+         每个元素为 {"tokens": token数, "us": 微秒}
+    请求 {"type": "exit"} 退出
+"""
+
+import json
+import sys
+import time
+
+# llm_bench_prompt 固定提示词使用的token
+BENCH_TOKEN = 16
+
+PRECISION_LEVELS = {0: "normal", 1: "high", 2: "low"}
+
+
+def emit(message):
+    """输出一行JSON响应"""
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+def load_model(config_path, settings):
+    """按llm_bench_prompt的buildLLM设置加载模型，返回底层LLM对象"""
+    import MNN.llm as mnn_llm
+
+    llm = mnn_llm.create(config_path)
+    llm.set_config({
+        "async": False,
+        "precision": PRECISION_LEVELS.get(int(settings.get("precision", 2)), "low"),
+        "memory": "low",
+        "power": "normal",
+        "backend_type": "cpu",
+        "thread_num": int(settings.get("threads", 4)),
+        "dynamic_option": int(settings.get("dynamicOption", 0)),
+        "use_mmap": bool(settings.get("mmap", False)),
+        "tmp_path": "tmp",
+        "prefer_decode": False
+    })
+    llm.load()
+    return llm._c_obj
+
+
+def respond(llm, input_ids, max_new_tokens):
+    """执行一次response并返回上下文中的计时"""
+    llm.generate_init()
+    llm.generate(input_ids, max_new_tokens)
+    return llm.get_context()
+
+
+def run_bench(llm, request):
+    """执行一次基准测试请求"""
+    n_prompt = int(request.get("n_prompt", 0))
+    n_gen = int(request.get("n_gen", 0))
+    n_repeat = int(request.get("n_repeat", 5))
+    prompt_ids = [BENCH_TOKEN] * n_prompt
+
+    prefill, decode = [], []
+    for round_index in range(n_repeat + 1):
+        if request.get("kv_cache"):
+            context = respond(llm, prompt_ids, n_gen)
+            samples = [(prefill, n_prompt, context["prefill_us"]), (decode, n_gen, context["decode_us"])]
+        else:
+            samples = []
+            if n_prompt > 0:
+                context = respond(llm, prompt_ids, 1)
+                samples.append((prefill, n_prompt, context["prefill_us"]))
+            if n_gen > 0:
+                context = respond(llm, [BENCH_TOKEN], n_gen)
+                samples.append((decode, n_gen, context["decode_us"]))
+
+        # 与llm_bench_prompt一致，第一轮作为预热不计入统计
+        if round_index > 0:
+            for target, tokens, us in samples:
+                target.append({"tokens": tokens, "us": us})
+        time.sleep(0.01)
+
+    return prefill, decode
+
+
+def main():
+    if len(sys.argv) < 2:
+        emit({"type": "error", "error": "用法: warm_worker.py <config.json> [settings JSON]"})
+        return 2
+
+    config_path = sys.argv[1]
+    settings = json.loads(sys.argv[2]) if len(sys.argv) > 2 else {}
+
+    start = time.time()
+    try:
+        llm = load_model(config_path, settings)
+    except Exception as e:
+        emit({"type": "error", "error": f"模型加载失败: {e}"})
+        return 1
+    load_seconds = time.time() - start
+    emit({"type": "ready", "load_seconds": load_seconds})
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            emit({"type": "error", "error": f"无效请求: {e}"})
+            continue
+
+        if request.get("type") == "exit":
+            break
+        if request.get("type") != "bench":
+            emit({"type": "error", "id": request.get("id"), "error": f"未知请求类型: {request.get('type')}"})
+            continue
+
+        try:
+            prefill, decode = run_bench(llm, request)
+            emit({"type": "result", "id": request.get("id"), "load_seconds": load_seconds,
+                  "prefill": prefill, "decode": decode})
+        except Exception as e:
+            emit({"type": "error", "id": request.get("id"), "error": f"基准测试失败: {e}"})
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -99,6 +99,13 @@ class SystemConfig:
         # 直接返回绝对路径：项目根目录 + 配置目录
         return self.project_root / out_dir
 
+    def get_export_dir(self) -> Path:
+        """获取Parquet分析数据集目录（绝对路径）"""
+        config = self.get_config("export")
+        dataset_dir = config.get("dataset_dir", "data/parquet")
+        # 直接返回绝对路径：项目根目录 + 配置目录
+        return self.project_root / dataset_dir
+
     def get_temp_dir(self) -> Path:
         """获取临时目录路径（绝对路径）"""
         config = self.get_config("temp")
@@ -31,7 +31,7 @@ class AnalysisManager:
     def _ensure_table(self):
         """确保分析历史表存在"""
         from .create_analysis_table import create_analysis_history_table
-        create_analysis_history_table()
+        create_analysis_history_table(self.db_path)
 
     def _get_connection(self) -> sqlite3.Connection:
         """获取数据库连接"""
@@ -224,6 +224,7 @@ class AnalysisManager:
                        ah.analysis_status, ah.created_at, ah.analysis_duration_ms
                 FROM analysis_history ah
                 JOIN suites s ON ah.suite_id = s.id
+                WHERE ah.analysis_type != 'batch_regression'
                 ORDER BY ah.created_at DESC
                 LIMIT ?
             ''', (limit,))
@@ -278,6 +279,84 @@ class AnalysisManager:
             if 'conn' in locals():
                 conn.close()
 
+    def get_batch_regressions(self, suite_ids: List[int]) -> Dict[Tuple[int, str, str, str], Dict[str, Any]]:
+        """
+        获取批量回归分析缓存
+
+        Args:
+            suite_ids: 套件ID列表
+
+        Returns:
+            {(suite_id, 目标变量, 固定参数JSON, 结果类型): 记录}，记录包含id和回归摘要
+        """
+        if not suite_ids:
+            return {}
+        try:
+            conn = self._get_connection()
+            placeholders = ','.join('?' for _ in suite_ids)
+            rows = conn.execute(f'''
+                SELECT id, suite_id, target_variable, fixed_params, result_types, regression_result_summary
+                FROM analysis_history
+                WHERE analysis_type = 'batch_regression' AND suite_id IN ({placeholders})
+            ''', list(suite_ids)).fetchall()
+
+            cached = {}
+            for row in rows:
+                result_type = (json.loads(row['result_types']) or [''])[0]
+                key = (row['suite_id'], row['target_variable'], row['fixed_params'] or '{}', result_type)
+                cached[key] = {'id': row['id'], 'summary': json.loads(row['regression_result_summary'])}
+            return cached
+
+        except sqlite3.Error as e:
+            print(f"✗ 查询批量回归缓存失败: {e}")
+            return {}
+        finally:
+            if 'conn' in locals():
+                conn.close()
+
+    def save_batch_regressions(self, records: List[Dict[str, Any]], replace_ids: List[int]) -> int:
+        """
+        批量写入回归分析结果（单个事务）
+
+        Args:
+            records: 结果列表，包含suite_id、target_variable、fixed_params、result_type、
+                     data_points、summary和duration_ms
+            replace_ids: 需要删除的旧缓存记录ID（数据已变化的组合）
+
+        Returns:
+            写入的记录数
+        """
+        try:
+            conn = self._get_connection()
+            with conn:
+                conn.executemany('DELETE FROM analysis_history WHERE id = ?', [(i,) for i in replace_ids])
+                now = datetime.now().isoformat(sep=' ')
+                conn.executemany('''
+                    INSERT INTO analysis_history (
+                        suite_id, analysis_type, target_variable, fixed_params, result_types,
+                        total_cases, successful_cases, regression_result_summary,
+                        analysis_dir, analysis_status, analysis_duration_ms, completed_at
+                    ) VALUES (?, 'batch_regression', ?, ?, ?, ?, ?, ?, '', 'completed', ?, ?)
+                ''', [(
+                    record['suite_id'],
+                    record['target_variable'],
+                    json.dumps(record['fixed_params'], sort_keys=True),
+                    json.dumps([record['result_type']]),
+                    record['data_points'],
+                    record['data_points'],
+                    json.dumps(record['summary'], ensure_ascii=False),
+                    record.get('duration_ms', 0),
+                    now
+                ) for record in records])
+            return len(records)
+
+        except sqlite3.Error as e:
+            print(f"✗ 写入批量回归结果失败: {e}")
+            return 0
+        finally:
+            if 'conn' in locals():
+                conn.close()
+
     def delete_analysis(self, analysis_id: int) -> bool:
         """
         删除分析记录
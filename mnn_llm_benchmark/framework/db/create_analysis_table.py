@@ -10,15 +10,17 @@ import sqlite3
 from pathlib import Path
 from datetime import datetime
 
-def create_analysis_history_table():
+def create_analysis_history_table(db_path=None):
     """创建分析历史记录表"""
 
     # 检测数据库路径
-    current_dir = Path(__file__).parent
-    if current_dir.name == "framework":
-        db_path = current_dir.parent / "data" / "benchmark_results.db"
-    else:
-        db_path = current_dir / "data" / "benchmark_results.db"
+    if db_path is None:
+        current_dir = Path(__file__).parent
+        if current_dir.name == "framework":
+            db_path = current_dir.parent / "data" / "benchmark_results.db"
+        else:
+            db_path = current_dir / "data" / "benchmark_results.db"
+    db_path = Path(db_path)
 
     # 确保数据库目录存在
     db_path.parent.mkdir(exist_ok=True)
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parquet分析数据集导出
+
+将benchmark_results/case_definitions/suites/tasks连接后的结果反规范化导出为
+按模型和套件分区的Parquet数据集，变量参数展开为带类型的列（来自
+case_variable_values.value_num），分析代码无需再逐行解析base_parameters。
+
+目录结构（hive分区）：
+    <dataset_dir>/model_name=<模型>/suite_name=<套件>/cases-<起始ID>-<结束ID>-<n>.parquet
+    <dataset_dir>/_export_state.json    记录已导出的最大用例ID，用于增量导出
+
+增量导出只包含ID大于上次导出最大ID的用例；续跑时复用旧用例ID的结果需使用--full重新导出。
+
+依赖pyarrow（可选依赖，未安装时导出和加载会给出安装提示）。
+
+命令行：
+    python db/parquet_export.py [--full] [--db 数据库路径] [--output 数据集目录]
+
+加载：
+    from db.parquet_export import load_dataframe
+    df = load_dataframe(models=["qwen3_06b"], columns=["n_prompt", "mean_value"])
+"""
+
+import argparse
+import json
+import shutil
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    from config.system import SystemConfig
+except ImportError:
+    # 作为脚本直接运行时添加framework目录到路径
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from config.system import SystemConfig
+
+from utils.db_manager import DatabaseManager
+from utils.logger import LoggerManager
+
+STATE_FILE = "_export_state.json"
+PARTITION_COLUMNS = ["model_name", "suite_name"]
+
+# 每行一个结果记录，用例和套件信息反规范化到同一行
+EXPORT_QUERY = """
+    SELECT
+        t.id AS task_id,
+        t.name AS task_name,
+        s.id AS suite_id,
+        s.name AS suite_name,
+        s.model_name,
+        cd.id AS case_id,
+        cd.name AS case_name,
+        cd.status,
+        cd.backend,
+        cd.model_size,
+        cd.execution_time_seconds,
+        cd.model_load_seconds,
+        br.result_type,
+        br.result_parameter,
+        br.mean_value,
+        br.std_value,
+        br.unit,
+        br.sample_count,
+        br.ci_relative_width,
+        br.created_at
+    FROM benchmark_results br
+    JOIN case_definitions cd ON br.case_id = cd.id
+    JOIN suites s ON cd.suite_id = s.id
+    JOIN tasks t ON s.task_id = t.id
+    WHERE cd.id > ?
+    ORDER BY cd.id, br.result_type, br.result_parameter
+"""
+
+# 结果列类型（全为NULL的列也保持固定类型，便于各次导出的文件合并）
+BASE_TYPES = {
+    "task_id": "int64", "task_name": "string", "suite_id": "int64", "suite_name": "string",
+    "model_name": "string", "case_id": "int64", "case_name": "string", "status": "string",
+    "backend": "string", "model_size": "string", "execution_time_seconds": "float64",
+    "model_load_seconds": "float64", "result_type": "string", "result_parameter": "string",
+    "mean_value": "float64", "std_value": "float64", "unit": "string", "sample_count": "int64",
+    "ci_relative_width": "float64", "created_at": "string"
+}
+
+VARIABLES_QUERY = """
+    SELECT case_id, variable_name, variable_value, value_num
+    FROM case_variable_values
+    WHERE case_id > ?
+      AND case_id IN (SELECT case_id FROM benchmark_results WHERE case_id > ?)
+"""
+
+
+def _require_pyarrow():
+    """导入pyarrow，未安装时给出提示"""
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.fs
+    except ImportError as e:
+        raise ImportError("Parquet导出需要pyarrow，请先安装: uv pip install pyarrow") from e
+    return pyarrow
+
+
+def _partitioning():
+    """模型/套件hive分区（分区值按字符串解析，避免套件名被推断为数字）"""
+    pa = _require_pyarrow()
+    return pa.dataset.partitioning(
+        pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]), flavor="hive")
+
+
+def default_dataset_dir() -> Path:
+    """获取配置中的数据集目录"""
+    return SystemConfig().get_export_dir()
+
+
+def _variable_column(values: List[Any], texts: List[Optional[str]]):
+    """
+    构造变量参数列：全部为数值时使用int64/float64，否则使用字符串
+
+    Args:
+        values: 每行的value_num（可能为None）
+        texts: 每行的variable_value（用例没有该变量时为None）
+
+    Returns:
+        pyarrow数组
+    """
+    pa = _require_pyarrow()
+    present = [(value, text) for value, text in zip(values, texts) if text is not None]
+    if present and all(value is not None for value, _ in present):
+        if all(float(value).is_integer() for value, _ in present):
+            return pa.array([None if v is None else int(v) for v in values], pa.int64())
+        return pa.array(values, pa.float64())
+    return pa.array(texts, pa.string())
+
+
+def _unify_schemas(schemas: List[Any]):
+    """
+    合并各文件的schema：int64与float64合并为float64，其他类型冲突合并为字符串
+
+    Args:
+        schemas: 各Parquet文件的schema
+
+    Returns:
+        合并后的schema
+    """
+    pa = _require_pyarrow()
+    fields: Dict[str, Any] = {}
+    for schema in schemas:
+        for field in schema:
+            current = fields.get(field.name)
+            if field.type == pa.null() and current is not None:
+                continue
+            if current is None or current == field.type or current == pa.null():
+                fields[field.name] = field.type
+            elif {current, field.type} <= {pa.int64(), pa.float64()}:
+                fields[field.name] = pa.float64()
+            else:
+                fields[field.name] = pa.string()
+    return pa.schema(list(fields.items()))
+
+
+class ParquetExporter:
+    """Parquet分析数据集导出器"""
+
+    def __init__(self, db_path: Optional[str] = None, dataset_dir: Optional[str] = None):
+        """
+        初始化导出器
+
+        Args:
+            db_path: 数据库路径，默认使用系统配置
+            dataset_dir: 数据集目录，默认使用系统配置[export].dataset_dir
+        """
+        self.logger = LoggerManager.get_logger("ParquetExporter")
+        system_config = SystemConfig()
+        self.db_path = Path(db_path) if db_path else system_config.get_database_path()
+        self.dataset_dir = Path(dataset_dir) if dataset_dir else system_config.get_export_dir()
+
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"数据库文件不存在: {self.db_path}")
+
+    def __repr__(self) -> str:
+        return f"ParquetExporter(db_path={self.db_path}, dataset_dir={self.dataset_dir})"
+
+    @property
+    def state_path(self) -> Path:
+        """增量导出状态文件路径"""
+        return self.dataset_dir / STATE_FILE
+
+    def _load_state(self) -> Dict[str, Any]:
+        """读取增量导出状态"""
+        if not self.state_path.exists():
+            return {"last_case_id": 0}
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"导出状态文件无效，将全量导出: {e}")
+            return {"last_case_id": 0}
+
+    def _reset_dataset(self):
+        """全量导出前清空数据集目录（只删除由导出器创建的目录）"""
+        if not self.dataset_dir.exists():
+            return
+        if not self.state_path.exists() and any(self.dataset_dir.iterdir()):
+            raise ValueError(f"目录不是导出数据集（缺少{STATE_FILE}），拒绝清空: {self.dataset_dir}")
+        shutil.rmtree(self.dataset_dir)
+
+    def _read_rows(self, last_case_id: int):
+        """
+        读取上次导出之后的结果行，并把变量参数展开为列
+
+        Args:
+            last_case_id: 上次导出的最大用例ID
+
+        Returns:
+            pyarrow Table，没有新数据时返回None
+        """
+        pa = _require_pyarrow()
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(EXPORT_QUERY, (last_case_id,))
+            base_columns = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+            if not rows:
+                return None
+
+            variables: Dict[str, Dict[int, Any]] = {}
+            for case_id, name, text, value_num in conn.execute(VARIABLES_QUERY, (last_case_id, last_case_id)):
+                variables.setdefault(name, {})[case_id] = (text, value_num)
+
+        columns = {name: [row[index] for row in rows] for index, name in enumerate(base_columns)}
+        table = pa.table({name: pa.array(values, BASE_TYPES.get(name, "string"))
+                          for name, values in columns.items()})
+
+        case_ids = columns["case_id"]
+        for name in sorted(variables):
+            by_case = variables[name]
+            texts = [by_case.get(case_id, (None, None))[0] for case_id in case_ids]
+            values = [by_case.get(case_id, (None, None))[1] for case_id in case_ids]
+            # 与结果列同名的变量加前缀，避免覆盖
+            column_name = f"param_{name}" if name in columns else name
+            table = table.append_column(column_name, _variable_column(values, texts))
+
+        return table
+
+    def export(self, full: bool = False) -> Dict[str, Any]:
+        """
+        导出数据集
+
+        Args:
+            full: 是否清空后全量导出
+
+        Returns:
+            导出统计：rows、cases、first_case_id、last_case_id、seconds、dataset_dir
+        """
+        pa = _require_pyarrow()
+        start = time.time()
+
+        # 确保数据库已迁移到最新模式（value_num等字段）
+        DatabaseManager(str(self.db_path))
+
+        if full:
+            self._reset_dataset()
+        state = self._load_state()
+        last_case_id = int(state.get("last_case_id", 0))
+
+        table = self._read_rows(last_case_id)
+        stats = {"rows": 0, "cases": 0, "first_case_id": None, "last_case_id": last_case_id,
+                 "seconds": 0.0, "dataset_dir": str(self.dataset_dir)}
+        if table is None:
+            self.logger.info(f"没有新的用例需要导出（最大用例ID: {last_case_id}）")
+            stats["seconds"] = time.time() - start
+            return stats
+
+        case_ids = table.column("case_id").to_pylist()
+        first_id, last_id = min(case_ids), max(case_ids)
+        self.dataset_dir.mkdir(parents=True, exist_ok=True)
+        pa.dataset.write_dataset(
+            table, str(self.dataset_dir), format="parquet",
+            partitioning=_partitioning(),
+            basename_template=f"cases-{first_id:08d}-{last_id:08d}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore"
+        )
+
+        state.update({
+            "last_case_id": last_id,
+            "exported_at": datetime.now().isoformat(timespec="seconds"),
+            "db_path": str(self.db_path)
+        })
+        self.state_path.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        stats.update({"rows": table.num_rows, "cases": len(set(case_ids)), "first_case_id": first_id,
+                      "last_case_id": last_id, "seconds": time.time() - start})
+        self.logger.info(f"导出Parquet数据集: {stats['cases']}个用例, {stats['rows']}行, "
+                         f"用例ID {first_id}-{last_id}, 目录 {self.dataset_dir}")
+        return stats
+
+
+def load_table(dataset_dir: Optional[str] = None, models: Optional[List[str]] = None,
+               suites: Optional[List[str]] = None, columns: Optional[List[str]] = None):
+    """
+    以内存映射方式加载Parquet数据集为Arrow Table
+
+    按模型/套件过滤时只读取对应分区目录下的文件。
+
+    Args:
+        dataset_dir: 数据集目录，默认使用系统配置
+        models: 模型名过滤列表
+        suites: 套件名过滤列表
+        columns: 需要的列，默认全部
+
+    Returns:
+        pyarrow Table
+    """
+    pa = _require_pyarrow()
+    dataset_dir = Path(dataset_dir) if dataset_dir else default_dataset_dir()
+    if not dataset_dir.exists():
+        raise FileNotFoundError(f"数据集目录不存在，请先导出: {dataset_dir}")
+
+    filesystem = pa.fs.LocalFileSystem(use_mmap=True)
+    partitioning = _partitioning()
+    dataset = pa.dataset.dataset(str(dataset_dir), format="parquet", partitioning=partitioning,
+                                 filesystem=filesystem)
+
+    expression = None
+    if models:
+        expression = pa.dataset.field("model_name").isin(models)
+    if suites:
+        suite_filter = pa.dataset.field("suite_name").isin(suites)
+        expression = suite_filter if expression is None else expression & suite_filter
+
+    # 各次导出的变量列可能不同（新变量或类型变化），按合并后的schema读取
+    fragments = list(dataset.get_fragments(filter=expression))
+    if not fragments:
+        empty = dataset.schema.empty_table()
+        return empty.select([name for name in columns if name in empty.column_names]) if columns else empty
+    schema = _unify_schemas([fragment.physical_schema for fragment in fragments] + [partitioning.schema])
+    dataset = pa.dataset.FileSystemDataset(fragments, schema, dataset.format, filesystem=filesystem)
+
+    return dataset.to_table(columns=columns)
+
+
+def load_dataframe(dataset_dir: Optional[str] = None, models: Optional[List[str]] = None,
+                   suites: Optional[List[str]] = None, columns: Optional[List[str]] = None):
+    """
+    加载Parquet数据集为pandas DataFrame
+
+    Args:
+        dataset_dir: 数据集目录，默认使用系统配置
+        models: 模型名过滤列表
+        suites: 套件名过滤列表
+        columns: 需要的列，默认全部
+
+    Returns:
+        pandas DataFrame
+    """
+    return load_table(dataset_dir, models, suites, columns).to_pandas()
+
+
+def main() -> int:
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="导出基准测试数据库为Parquet分析数据集")
+    parser.add_argument("--full", action="store_true", help="清空数据集后全量导出")
+    parser.add_argument("--db", type=str, help="数据库路径（默认使用系统配置）")
+    parser.add_argument("--output", type=str, help="数据集目录（默认使用[export].dataset_dir）")
+    args = parser.parse_args()
+
+    try:
+        exporter = ParquetExporter(args.db, args.output)
+        stats = exporter.export(full=args.full)
+    except (ImportError, FileNotFoundError, ValueError) as e:
+        print(f"✗ 导出失败: {e}")
+        return 1
+
+    if stats["rows"] == 0:
+        print(f"✓ 没有新的用例需要导出（最大用例ID: {stats['last_case_id']}）")
+    else:
+        print(f"✓ 已导出 {stats['cases']} 个用例 / {stats['rows']} 行"
+              f"（用例ID {stats['first_case_id']}-{stats['last_case_id']}，耗时 {stats['seconds']:.2f}s）")
+    print(f"  数据集目录: {stats['dataset_dir']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单元测试共享构造函数
+数据库相关测试共用的用例与执行结果构造
+"""
+
+
+def make_case(n_prompt, model="qwen3_06b", suit_name="pn_sweep"):
+    """构造CaseGenerator格式的用例"""
+    return {
+        'suit_name': suit_name,
+        'suit_description': '',
+        'params': {'threads': 4, 'n_prompt': n_prompt, 'n_gen': 32, 'timeout': 300},
+        'global_config': {'timeout': 300},
+        'model': model
+    }
+
+
+def make_result(n_prompt):
+    """构造执行器返回的成功结果"""
+    return {
+        'success': True,
+        'json_result': {
+            'execution': {'runtime_seconds': 1.0},
+            'results': {'prefill': {'test_name': f'pp{n_prompt}', 'tokens_per_sec': {'mean': 100.0, 'std': 1.0}}}
+        }
+    }
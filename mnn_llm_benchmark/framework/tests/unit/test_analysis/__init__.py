@@ -0,0 +1 @@
+# 数据分析模块测试
\ No newline at end of file
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量分析缓存单元测试
+测试suite数据版本、回归结果的序列化恢复，以及未变化结果类型的图表复用
+"""
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from analysis.chart_generator import ChartGenerator
+from analysis.data_extractor import DataExtractor
+from analysis.regression import RegressionAnalyzer
+from utils.db_manager import DatabaseManager
+from tests.unit.conftest import make_case, make_result
+
+
+class TestAnalysisCache:
+    """增量分析缓存测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_analysis_cache_"))
+        self.db = DatabaseManager(str(self.temp_dir / "test.db"))
+        self.task_id = self.db.create_or_update_task({'task_name': 'cache'})
+        self.suite_id = self.db.create_or_update_suite(self.task_id, make_case(64), {})
+
+    def teardown_method(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_data_version_changes_on_append(self):
+        """测试追加用例后数据版本变化，未变化时保持一致"""
+        for case_num, n_prompt in enumerate((64, 128), 1):
+            self.db.create_or_update_case_with_results(self.task_id, self.suite_id, case_num,
+                                                       make_case(n_prompt), make_result(n_prompt))
+        extractor = DataExtractor(self.db.db_path)
+        version = extractor.get_suite_data_version(self.suite_id)
+
+        assert extractor.get_suite_data_version(self.suite_id) == version
+
+        self.db.create_or_update_case_with_results(self.task_id, self.suite_id, 3,
+                                                   make_case(256), make_result(256))
+        assert extractor.get_suite_data_version(self.suite_id) != version
+
+    def test_serialized_nonlinear_result_restores(self):
+        """测试非线性回归结果经JSON保存后可恢复预测"""
+        analyzer = RegressionAnalyzer()
+        x = np.array([16.0, 32.0, 64.0, 128.0, 256.0, 512.0])
+        result = analyzer.analyze_regression(x, 500.0 * x ** -0.8)
+        assert result['regression']['method'] != 'linear'
+
+        restored = analyzer.restore_result(json.loads(json.dumps(analyzer.serialize_result(result))))
+
+        assert 'function' in result['regression']
+        assert np.allclose(analyzer.predict(restored, x), analyzer.predict(result, x))
+
+    def test_reuses_existing_charts(self):
+        """测试复用目录中图表齐全时直接复制，不完整时返回None重新绘制"""
+        source_dir, report_dir = self.temp_dir / "old", self.temp_dir / "new"
+        source_dir.mkdir()
+        report_dir.mkdir()
+        for name in ("pp_scatter.png", "pp_regression.png", "tg_scatter.png"):
+            (source_dir / name).write_bytes(b"png")
+        generator = ChartGenerator()
+
+        assert generator._copy_existing_charts(source_dir, report_dir, "pp", True) == {
+            'pp_scatter': 'pp_scatter.png', 'pp_regression': 'pp_regression.png'
+        }
+        assert (report_dir / "pp_regression.png").exists()
+        assert generator._copy_existing_charts(source_dir, report_dir, "tg", True) is None
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BatchRegressionAnalyzer单元测试
+测试批量最小二乘、与逐个回归分析结果的一致性，以及analysis_history缓存复用
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from analysis.batch_regression import BatchRegressionAnalyzer, batch_least_squares
+from analysis.regression import RegressionAnalyzer
+from db.analysis_manager import AnalysisManager
+from utils.db_manager import DatabaseManager
+
+
+class FakeExtractor:
+    """返回固定批量数据的提取器：n_prompt × n_gen 网格，tg为幂函数、pp为线性"""
+
+    def extract_batch_data(self, suite_ids, result_types=None):
+        variables, results = {}, []
+        case_id = 0
+        for n_gen in (32, 64):
+            for n_prompt in (16, 32, 64, 128, 256):
+                case_id += 1
+                variables[case_id] = {'n_prompt': n_prompt, 'n_gen': n_gen, 'threads': 4}
+                results.append((case_id, 'pp', 2.0 * n_prompt + n_gen))
+                results.append((case_id, 'tg', 500.0 * n_prompt ** -0.8))
+        return {suite_ids[0]: {'variables': variables, 'results': results}}
+
+
+class TestBatchRegression:
+    """批量回归测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_batch_"))
+        db = DatabaseManager(str(self.temp_dir / "test.db"))
+        self.analysis_manager = AnalysisManager(db.db_path)
+        self.analyzer = BatchRegressionAnalyzer(FakeExtractor(), self.analysis_manager, workers=1)
+
+    def teardown_method(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_batch_least_squares_matches_polyfit(self):
+        """测试补齐掩码后的批量拟合与逐组polyfit一致"""
+        x = np.array([[1.0, 2.0, 3.0, 4.0], [1.0, 3.0, 5.0, 1.0]])
+        y = np.array([[2.0, 4.1, 5.9, 8.2], [1.0, 2.0, 2.5, 0.0]])
+        mask = np.array([[True, True, True, True], [True, True, True, False]])
+
+        coef, r2 = batch_least_squares(np.stack([x, np.ones_like(x)], axis=-1), y, mask)
+
+        for index in range(2):
+            valid = mask[index]
+            expected = np.polyfit(x[index][valid], y[index][valid], 1)
+            assert np.allclose(coef[index], expected)
+        assert 0.99 < r2[0] <= 1.0
+
+    def test_matches_single_regression(self):
+        """测试每个组合的方法和R²与RegressionAnalyzer.analyze_regression一致"""
+        batch = self.analyzer.analyze([1])
+        reference = RegressionAnalyzer()
+        data = FakeExtractor().extract_batch_data([1])[1]
+
+        n_prompt_groups = [item for item in batch['results'] if item['target_variable'] == 'n_prompt']
+        assert len(n_prompt_groups) == 4  # 2个结果类型 × 2个n_gen切片
+        for item in n_prompt_groups:
+            points = [(data['variables'][case_id]['n_prompt'], value) for case_id, result_type, value in data['results']
+                      if result_type == item['result_type']
+                      and data['variables'][case_id]['n_gen'] == item['fixed_params']['n_gen']]
+            x, y = np.array(points, dtype=float).T
+            expected = reference.analyze_regression(x, y)['regression']
+            assert item['regression']['method'] == expected['method']
+            assert abs(item['regression']['r2'] - expected['r2']) < 1e-6
+
+    def test_results_cached_in_analysis_history(self):
+        """测试第二次运行复用analysis_history中的结果，refit时重新拟合并替换"""
+        first = self.analyzer.analyze([1])
+        second = self.analyzer.analyze([1])
+        refit = self.analyzer.analyze([1], force=True)
+
+        assert first['stats']['fitted'] == 4 and second['stats']['cached'] == 4
+        assert refit['stats']['fitted'] == 4
+        assert len(self.analysis_manager.get_batch_regressions([1])) == 4
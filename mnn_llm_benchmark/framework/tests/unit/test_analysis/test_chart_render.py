@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+图表渲染流水线单元测试
+测试字体查找缓存、预览图生成和按保存的渲染任务按需导出
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from analysis.chart_generator import ChartGenerator
+from analysis.charts.components import find_chinese_font_family, setup_chinese_font
+from analysis.charts.render import CHART_SPEC_FILE
+from analysis.regression import RegressionAnalyzer
+
+
+class TestChartRender:
+    """图表渲染测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_chart_render_"))
+        x_values = [16, 32, 64, 128, 256]
+        mean_values = [500.0 * x ** -0.8 for x in x_values]
+        self.analysis_data = {'data': {'tg': {
+            'x_values': x_values, 'mean_values': mean_values, 'std_values': [0.1] * 5
+        }}}
+        result = RegressionAnalyzer().analyze_regression(np.array(x_values, dtype=float), np.array(mean_values))
+        result['variance_data'] = {'x_values': x_values, 'y_values': mean_values, 'std_values': [0.1] * 5}
+        self.regression_results = {'tg': result}
+
+    def teardown_method(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_font_lookup_cached(self):
+        """测试字体查找只执行一次"""
+        setup_chinese_font()
+        hits = find_chinese_font_family.cache_info().hits
+        setup_chinese_font()
+        assert find_chinese_font_family.cache_info().hits == hits + 1
+
+    def test_preview_and_on_demand_export(self):
+        """测试报告生成预览图并保存渲染任务，之后按需导出其他格式"""
+        generator = ChartGenerator(workers=1, dpi=50, image_format="png", static_charts=True)
+
+        images_info = generator.generate_single_variable_charts(
+            self.temp_dir, self.analysis_data, self.regression_results, "n_prompt"
+        )
+
+        assert images_info == {'tg_scatter': 'tg_scatter.png', 'tg_regression': 'tg_regression.png'}
+        assert (self.temp_dir / CHART_SPEC_FILE).exists()
+
+        export_dir = generator.export_charts(self.temp_dir, dpi=72, image_format="svg")
+        assert sorted(p.name for p in export_dir.iterdir()) == ['tg_regression.svg', 'tg_scatter.svg']
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DataExtractor单元测试
+测试打开升级前（模式v1）的数据库时先迁移，再按suite_id/value_num读取变量
+"""
+
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from analysis.data_extractor import DataExtractor
+from utils.db_manager import DatabaseManager
+from tests.unit.conftest import make_case, make_result
+
+
+class TestDataExtractor:
+    """DataExtractor测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_data_extractor_"))
+        self.db_path = str(self.temp_dir / "test.db")
+
+    def teardown_method(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_migrates_v1_database_on_open(self):
+        """测试未经基准测试升级的v1数据库可直接分析"""
+        db = DatabaseManager(self.db_path)
+        task_id = db.create_or_update_task({'task_name': 'legacy'})
+        suite_id = db.create_or_update_suite(task_id, make_case(64), {})
+        for case_num, n_prompt in enumerate((64, 128, 256), 1):
+            db.create_or_update_case_with_results(task_id, suite_id, case_num, make_case(n_prompt), make_result(n_prompt))
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DROP INDEX idx_case_variables_suite_num")
+            conn.execute("ALTER TABLE case_variable_values DROP COLUMN suite_id")
+            conn.execute("ALTER TABLE case_variable_values DROP COLUMN value_num")
+            conn.execute("PRAGMA user_version = 1")
+
+        extractor = DataExtractor(self.db_path)
+
+        assert extractor.get_variable_median_values(suite_id)['n_prompt'] == 128
+        assert 'n_prompt' in extractor.get_suite_variables(suite_id)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTMLFormatter交互式图表单元测试
+测试紧凑图表数据块的构建和内嵌到单变量报告
+"""
+
+import json
+
+import numpy as np
+
+from analysis.regression import RegressionAnalyzer
+from analysis.reports.html_formatter import HTMLFormatter
+
+
+class TestHTMLFormatterCharts:
+    """交互式图表数据块测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        x_values = [16, 32, 64, 128, 256]
+        self.analysis_data = {
+            'data': {
+                'pp': {
+                    'case_names': [f'case_{x}' for x in x_values],
+                    'x_values': x_values,
+                    'mean_values': [2.0 * x + 1.0 / 3 for x in x_values],
+                    'std_values': [0.5, None, 0.5, 0.5, 0.5],
+                    'units': ['tokens/sec'] * 5
+                },
+                'tg': {'case_names': [], 'x_values': [], 'mean_values': [], 'std_values': [], 'units': []}
+            },
+            'result_types': ['pp', 'tg'],
+            'filtered_cases': 5,
+            'total_cases': 5
+        }
+        self.regression_results = {
+            'pp': RegressionAnalyzer().analyze_regression(
+                np.array(x_values, dtype=float), np.array(self.analysis_data['data']['pp']['mean_values'])
+            )
+        }
+        self.suite_info = {'id': 3, 'name': 'pn_sweep', 'model_name': 'qwen3_06b'}
+
+    def test_build_chart_data(self):
+        """测试数据块为列式结构，数值压缩精度，并携带拟合参数"""
+        chart_data = HTMLFormatter.build_chart_data(
+            self.analysis_data, self.regression_results, self.suite_info, 'n_prompt'
+        )
+
+        series = chart_data['series']
+        assert list(series) == ['pp']
+        assert series['pp']['y'][0] == 32.3333
+        assert series['pp']['std'][1] == 0.0
+        assert series['pp']['fit']['method'] == 'linear'
+        assert abs(series['pp']['fit']['slope'] - 2.0) < 1e-9
+        assert chart_data['suite'] == {'id': 3, 'name': 'pn_sweep', 'model': 'qwen3_06b'}
+
+    def test_build_chart_data_non_finite(self):
+        """测试NaN/inf转为null，数据块可被严格JSON解析"""
+        pp = self.analysis_data['data']['pp']
+        pp['mean_values'][2] = float('nan')
+        pp['std_values'][3] = float('inf')
+        regression = self.regression_results['pp']['regression']
+        regression['r2'] = float('nan')
+
+        chart_data = HTMLFormatter.build_chart_data(
+            self.analysis_data, self.regression_results, self.suite_info, 'n_prompt'
+        )
+
+        series = json.loads(json.dumps(chart_data, allow_nan=False))['series']['pp']
+        assert series['y'][2] is None
+        assert series['std'][3] is None
+        assert series['fit']['r2'] is None
+
+    def test_report_embeds_chart_data(self):
+        """测试单变量报告内嵌数据块和图表容器，无静态图时不引用图片"""
+        html = HTMLFormatter().build_single_variable_html(
+            self.analysis_data, self.regression_results, self.suite_info, 'n_prompt', None, {}
+        )
+
+        assert 'class="interactive-chart" data-result-type="pp"' in html
+        assert '<img' not in html
+        start = html.index('<script type="application/json" id="reportData">') + len(
+            '<script type="application/json" id="reportData">')
+        embedded = json.loads(html[start:html.index('</script>', start)])
+        assert embedded['target_variable'] == 'n_prompt'
+
+    def test_report_adds_tail_latency_section(self):
+        """测试存在多个token间隔分位数时添加尾延迟叠加图容器"""
+        for q, offset in (('50', 0.0), ('95', 4.0), ('99', 9.0)):
+            self.analysis_data['data'][f'itl_p{q}'] = {
+                'case_names': ['case_16', 'case_32'], 'x_values': [16, 32],
+                'mean_values': [30.0 + offset, 31.0 + offset], 'std_values': [None, None], 'units': ['ms', 'ms']
+            }
+        self.analysis_data['result_types'] += ['itl_p50', 'itl_p95', 'itl_p99']
+
+        html = HTMLFormatter().build_single_variable_html(
+            self.analysis_data, self.regression_results, self.suite_info, 'n_prompt', None, {}
+        )
+
+        assert 'data-result-types="itl_p50,itl_p95,itl_p99"' in html
+        assert 'data-y-label="ITL (ms)"' in html
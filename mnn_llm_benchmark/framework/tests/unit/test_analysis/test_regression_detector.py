@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能回退检测单元测试
+测试跨任务用例匹配、显著性判定、滚动基线和历史变点检测
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from analysis.data_extractor import DataExtractor
+from analysis.regression_detector import RegressionDetector, benjamini_hochberg, welch_test
+from utils.db_manager import DatabaseManager
+from tests.unit.conftest import make_case, make_result
+
+
+def make_run_result(n_prompt, mean, std=1.0):
+    """构造指定吞吐量的成功结果"""
+    result = make_result(n_prompt)
+    result['json_result']['results']['prefill']['tokens_per_sec'] = {'mean': mean, 'std': std}
+    return result
+
+
+class TestRegressionDetector:
+    """回退检测测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_regression_detector_"))
+        self.db = DatabaseManager(str(self.temp_dir / "test.db"))
+        self.extractor = DataExtractor(self.db.db_path)
+        self.detector = RegressionDetector(self.extractor, {'alpha': 0.05, 'min_change': 0.02,
+                                                            'baseline_runs': 3, 'min_segment': 2})
+
+    def teardown_method(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _run(self, means, status='completed'):
+        """写入一次任务运行，means为 {n_prompt: 吞吐量}"""
+        task_id = self.db.create_or_update_task({'task_name': 'nightly'}, status=status)
+        suite_id = self.db.create_or_update_suite(task_id, make_case(64), {})
+        for case_num, (n_prompt, mean) in enumerate(means.items(), 1):
+            self.db.create_or_update_case_with_results(task_id, suite_id, case_num, make_case(n_prompt),
+                                                       make_run_result(n_prompt, mean))
+        return task_id
+
+    def test_compare_flags_slowdown(self):
+        """测试按参数匹配用例，只把显著变差的吞吐量标记为回退"""
+        baseline = self._run({64: 100.0, 128: 80.0, 256: 60.0})
+        candidate = self._run({64: 90.0, 128: 80.5, 512: 40.0})
+
+        report = self.detector.compare(candidate, [baseline])
+
+        assert report['stats']['matched'] == 2
+        assert report['stats']['candidate_only'] == 1
+        assert report['stats']['baseline_only'] == 1
+        assert report['stats']['regressions'] == 1
+        finding = report['findings'][0]
+        assert finding['status'] == 'regression'
+        assert finding['params']['n_prompt'] == 64
+        assert abs(finding['relative_change'] + 0.1) < 1e-9
+        assert finding['baseline_n'] == 5
+
+    def test_rolling_baseline_and_history(self):
+        """测试滚动基线跳过未完成运行，变点检测定位变慢开始的任务"""
+        fast = [self._run({64: mean}) for mean in (100.0, 101.0, 99.5)]
+        self._run({64: 50.0}, status='pending')
+        slow = [self._run({64: mean}) for mean in (92.0, 91.5)]
+
+        assert self.detector.rolling_baseline(slow[0]) == fast
+        assert self.detector.compare(slow[0], self.detector.rolling_baseline(slow[0]))['stats']['regressions'] == 1
+
+        report = self.detector.detect_change_points(fast + slow)
+        assert report['findings'][0]['change_task'] == slow[0]
+        assert report['findings'][0]['history'] == [100.0, 101.0, 99.5, 92.0, 91.5]
+
+    def test_statistics_helpers(self):
+        """测试零方差检验、样本不足和BH校正的单调性"""
+        assert welch_test(10.0, 0.0, 5, 10.0, 0.0, 5) == 1.0
+        assert welch_test(10.0, 0.0, 5, 11.0, 0.0, 5) == 0.0
+        assert welch_test(10.0, 1.0, 1, 11.0, 1.0, 5) is None
+
+        q_values = benjamini_hochberg([0.01, None, 0.04, 0.03])
+        assert q_values[1] is None
+        assert q_values == [0.03, None, 0.04, 0.04]
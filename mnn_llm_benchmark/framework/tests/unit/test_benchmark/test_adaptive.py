@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AdaptiveRepeatController单元测试
+测试批次统计合并与停止条件
+"""
+
+import math
+import statistics
+
+import pytest
+
+from benchmark.core.adaptive import AdaptiveRepeatController, combine_samples, relative_ci_width
+
+
+def make_results(prefill_mean, prefill_std, decode_mean=None, decode_std=0.0):
+    """构造json_result["results"]格式的批次结果"""
+    results = {"prefill": {"test_name": "pp64", "tokens_per_sec": {"mean": prefill_mean, "std": prefill_std}}}
+    if decode_mean is not None:
+        results["decode"] = {"test_name": "tg32", "tokens_per_sec": {"mean": decode_mean, "std": decode_std}}
+    return results
+
+
+class TestAdaptiveStatistics:
+    """统计函数测试类"""
+
+    def test_combine_samples_matches_pooled_data(self):
+        """测试批次合并结果与直接计算全部样本一致"""
+        first, second = [10.0, 11.0, 12.0], [13.0, 15.0]
+        chunks = [(statistics.mean(c), statistics.stdev(c), len(c)) for c in (first, second)]
+
+        mean, std, count = combine_samples(chunks)
+
+        assert count == 5
+        assert mean == pytest.approx(statistics.mean(first + second))
+        assert std == pytest.approx(statistics.stdev(first + second))
+
+    def test_relative_ci_width(self):
+        """测试相对置信区间半宽"""
+        width = relative_ci_width(100.0, 1.0, 10, 0.95)
+
+        assert width == pytest.approx(2.262 * 1.0 / math.sqrt(10) / 100.0, rel=1e-3)
+        assert relative_ci_width(100.0, 1.0, 1, 0.95) == math.inf
+
+
+class TestAdaptiveRepeatController:
+    """AdaptiveRepeatController测试类"""
+
+    def test_stops_when_converged(self):
+        """测试置信区间达到目标后停止"""
+        controller = AdaptiveRepeatController({"ci_width": 0.01, "min_repeat": 3, "chunk": 3})
+
+        assert controller.next_chunk() == 3
+        controller.add_chunk(make_results(100.0, 0.1, 20.0, 0.02), 3)
+
+        assert controller.converged()
+        assert controller.next_chunk() == 0
+
+    def test_continues_until_max_repeat(self):
+        """测试方差较大时持续执行直到最大重复次数"""
+        controller = AdaptiveRepeatController({"ci_width": 0.001, "chunk": 4}, default_max_repeat=10)
+
+        chunks = []
+        while True:
+            repeat = controller.next_chunk()
+            if not repeat:
+                break
+            chunks.append(repeat)
+            controller.add_chunk(make_results(100.0, 5.0), repeat)
+
+        assert chunks == [4, 4, 2]
+        assert controller.summary()["repeats"] == 10
+        assert not controller.summary()["converged"]
+
+    def test_first_chunk_covers_min_repeat(self):
+        """测试首批次至少覆盖最小重复次数"""
+        controller = AdaptiveRepeatController({"min_repeat": 5, "chunk": 2})
+
+        assert controller.next_chunk() == 5
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CaseCoalescer单元测试
+测试用例合并规划与表格行拆分
+"""
+
+import itertools
+
+from benchmark.batch.coalescer import CaseCoalescer
+
+
+def make_case(suit_name="pn_sweep", model="qwen3_06b", **params):
+    """构造CaseGenerator格式的用例"""
+    return {
+        'suit_name': suit_name,
+        'suit_description': '',
+        'params': params,
+        'global_config': {'timeout': 300},
+        'model': model
+    }
+
+
+def make_row(test=None, threads="4", llm_demo=None):
+    """构造llm_bench_prompt表格行"""
+    row = {"threads": threads, "precision": "Low", "pType": "fix"}
+    if llm_demo:
+        row.update({"llm_demo": llm_demo, "speed(tok/s)": "1.00 ± 0.01<br>2.00 ± 0.02"})
+    else:
+        row.update({"test": test, "t/s": "1.00 ± 0.01"})
+    return row
+
+
+class TestCaseCoalescer:
+    """CaseCoalescer测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.coalescer = CaseCoalescer()
+
+    def test_plan_merges_pn_grid(self):
+        """测试p/n网格合并为一次调用"""
+        cases = [make_case(n_prompt=p, n_gen=n, kv_cache="false")
+                 for p, n in itertools.product([64, 128], [32, 64])]
+
+        assert self.coalescer.plan(cases) == [[0, 1, 2, 3]]
+
+    def test_plan_separates_models_and_fixed_params(self):
+        """测试不同模型或不同非列表参数不合并"""
+        cases = [
+            make_case(n_prompt=64, mmap="0"),
+            make_case(n_prompt=128, mmap="0"),
+            make_case(n_prompt=64, mmap="1"),
+            make_case(n_prompt=64, model="hunyuan_05b"),
+        ]
+
+        assert self.coalescer.plan(cases) == [[0, 1], [2], [3]]
+
+    def test_plan_skips_incomplete_product(self):
+        """测试非完整组合的用例逐个执行"""
+        cases = [
+            make_case(n_prompt=64, n_gen=32),
+            make_case(n_prompt=128, n_gen=64),
+        ]
+
+        assert self.coalescer.plan(cases) == [[0], [1]]
+
+    def test_plan_skips_duplicate_cases(self):
+        """测试重复用例不合并"""
+        cases = [make_case(n_prompt=64), make_case(n_prompt=64)]
+
+        assert self.coalescer.plan(cases) == [[0], [1]]
+
+    def test_build_group_params(self):
+        """测试列表参数转换为逗号分隔字符串"""
+        cases = [make_case(threads=t, n_prompt=64, timeout=600, kv_cache="false") for t in [1, 2, 4]]
+
+        params = self.coalescer.build_group_params(cases)
+
+        assert params == {"threads": "1,2,4", "n_prompt": "64", "kv_cache": "false"}
+
+    def test_split_rows_kv_false(self):
+        """测试kv=false输出拆分：每个用例对应一行pp和一行tg"""
+        cases = [make_case(n_prompt=p, n_gen=n) for p, n in itertools.product([64, 128], [32, 64])]
+        rows = [make_row("pp64"), make_row("pp128"), make_row("tg32"), make_row("tg64")]
+
+        assignments = self.coalescer.split_rows(cases, rows)
+
+        assert assignments == [[0, 2], [0, 3], [1, 2], [1, 3]]
+
+    def test_split_rows_threads_descending(self):
+        """测试线程数按llm_bench_prompt的降序输出拆分"""
+        cases = [make_case(threads=t, n_prompt=64, n_gen=32) for t in [1, 4]]
+        rows = [make_row("pp64", "4"), make_row("tg32", "4"), make_row("pp64", "1"), make_row("tg32", "1")]
+
+        assignments = self.coalescer.split_rows(cases, rows)
+
+        assert assignments == [[2, 3], [0, 1]]
+
+    def test_split_rows_kv_true(self):
+        """测试kv=true输出拆分：p与n的笛卡尔积逐行对应"""
+        cases = [make_case(n_prompt=p, n_gen=n, kv_cache="true") for p, n in itertools.product([64, 128], [32, 64])]
+        rows = [make_row(llm_demo=f"prompt={p}<br>decode={n}") for p, n in itertools.product([64, 128], [32, 64])]
+
+        assignments = self.coalescer.split_rows(cases, rows)
+
+        assert assignments == [[0], [1], [2], [3]]
+
+    def test_split_rows_with_prompt_gen(self):
+        """测试-pg参数产生的pp+tg行由同组用例共享"""
+        cases = [make_case(n_prompt=p, n_gen=32, prompt_gen="64,32") for p in [64, 128]]
+        rows = [make_row("pp64"), make_row("pp128"), make_row("tg32"), make_row("pp64+tg32")]
+
+        assignments = self.coalescer.split_rows(cases, rows)
+
+        assert assignments == [[0, 2, 3], [1, 2, 3]]
+
+    def test_split_rows_mismatch_returns_none(self):
+        """测试输出行数或线程数不符时返回None"""
+        cases = [make_case(threads=t, n_prompt=64, n_gen=32) for t in [1, 4]]
+
+        assert self.coalescer.split_rows(cases, [make_row("pp64")]) is None
+
+        rows = [make_row("pp64", "1"), make_row("tg32", "1"), make_row("pp64", "4"), make_row("tg32", "4")]
+        assert self.coalescer.split_rows(cases, rows) is None
+
+    def test_split_rows_checks_precision_and_dynamic_option(self):
+        """测试按precision/dynamicOption列核对各块，顺序不符时返回None"""
+        cases = [make_case(precision=p, dynamicOption=d, n_prompt=64, n_gen=32)
+                 for p, d in itertools.product([0, 2], [0, 8])]
+
+        def block(precision, dynamic_option):
+            return [dict(make_row(test), precision=precision, dynamicOption=dynamic_option) for test in ("pp64", "tg32")]
+
+        rows = block("Normal", "0") + block("Normal", "8") + block("Low", "0") + block("Low", "8")
+        assert self.coalescer.split_rows(cases, rows) == [[0, 1], [2, 3], [4, 5], [6, 7]]
+
+        rows = block("Low", "0") + block("Low", "8") + block("Normal", "0") + block("Normal", "8")
+        assert self.coalescer.split_rows(cases, rows) is None
+
+        rows = block("Normal", "8") + block("Normal", "0") + block("Low", "8") + block("Low", "0")
+        assert self.coalescer.split_rows(cases, rows) is None
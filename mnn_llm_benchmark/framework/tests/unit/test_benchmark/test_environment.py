@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EnvironmentGuard单元测试
+测试从模拟的/proc和/sys检查系统空闲、识别竞争进程，以及按遥测标记受干扰的用例
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from benchmark.core.environment import EnvironmentGuard
+
+
+def proc_stat(pid, name, ppid, utime, stime=0):
+    """构造 /proc/<pid>/stat 内容"""
+    return f"{pid} ({name}) R {ppid} 1 1 0 -1 0 0 0 0 0 {utime} {stime} 0 0 20 0 1 0 100\n"
+
+
+class TestEnvironmentGuard:
+    """环境防护测试类"""
+
+    def setup_method(self):
+        """测试前准备：构造两核设备的模拟/proc和/sys"""
+        self.root = Path(tempfile.mkdtemp(prefix="test_environment_"))
+        self._write("proc/stat", "cpu  100 0 100 800 0 0 0 0 0 0\ncpu0 50 0 50 400 0 0 0 0 0 0\n"
+                                 "cpu1 50 0 50 400 0 0 0 0 0 0\n")
+        self._write("proc/loadavg", "0.10 0.20 0.30 1/100 999\n")
+        self._write("sys/class/thermal/thermal_zone0/temp", "45000\n")
+        for cpu in (0, 1):
+            self._write(f"sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_governor", "schedutil\n")
+        self.guard = EnvironmentGuard({"sample_ms": 0, "poll_s": 0, "max_wait_s": 0}, root=str(self.root))
+
+    def teardown_method(self):
+        """测试后清理"""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _write(self, relative_path, content):
+        """写入模拟文件"""
+        path = self.root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+    def test_measure_finds_hog_and_skips_own_children(self):
+        """测试按节拍差计算其他进程占用，框架自身的子进程不计入"""
+        self.guard._own_pid = 10
+        self._write("proc/10/stat", proc_stat(10, "python", 1, 0))
+        self._write("proc/11/stat", proc_stat(11, "llm_bench_prompt", 10, 0))
+        self._write("proc/20/stat", proc_stat(20, "cc1 (build)", 1, 0))
+        before = self.guard.snapshot()
+
+        # 窗口内全部CPU共200节拍：编译进程90节拍（单核90%），基准测试进程100节拍
+        self._write("proc/stat", "cpu  300 0 100 800 0 0 0 0 0 0\ncpu0 150 0 50 400 0 0 0 0 0 0\n"
+                                 "cpu1 150 0 50 400 0 0 0 0 0 0\n")
+        self._write("proc/11/stat", proc_stat(11, "llm_bench_prompt", 10, 100))
+        self._write("proc/20/stat", proc_stat(20, "cc1 (build)", 1, 60, 30))
+        state = self.guard.measure(before, self.guard.snapshot())
+
+        assert state["other_cpu_pct"] == 45.0
+        assert state["hogs"] == [(20, "cc1 (build)", 90.0)]
+
+    def test_preflight_reports_governor_temperature_and_load(self):
+        """测试开始前检查调频策略告警、温度和负载均值，等待超时后返回未空闲"""
+        self._write("sys/devices/system/cpu/cpu1/cpufreq/scaling_governor", "powersave\n")
+        self._write("sys/class/thermal/thermal_zone1/temp", "71000\n")
+        self._write("proc/loadavg", "1.50 0.80 0.30 3/100 999\n")
+
+        waits = []
+        state = self.guard.preflight(on_wait=waits.append)
+
+        assert state["governors"] == {"schedutil": 1, "powersave": 1}
+        assert "powersave" in state["governor_warning"]
+        assert not state["quiet"]
+        assert state["issues"] == ["温度 71.0℃", "负载均值 0.75/CPU"]
+        # 告警只显示一次
+        assert self.guard.preflight()["governor_warning"] is None
+
+    def test_quiet_system_passes(self):
+        """测试空闲系统立即通过"""
+        state = self.guard.wait_until_quiet()
+
+        assert state["quiet"]
+        assert state["issues"] == []
+
+    def test_annotate_marks_interference(self):
+        """测试按遥测汇总标记干扰，并行执行时只判断温度"""
+        noisy = {"summary": {"mean_other_cpu_pct": 22.5, "max_temp_c": 83.0}}
+        results = [{"success": True, "json_result": {"telemetry": noisy}},
+                   {"success": True, "json_result": {"telemetry": {"summary": {"mean_other_cpu_pct": 1.0}}}},
+                   {"success": False, "json_result": None}]
+
+        reasons = self.guard.annotate(results, {"quiet": False, "issues": ["温度 70.0℃"], "waited_s": 0.0})
+
+        assert reasons == ["cpu_contention", "thermal", "busy_start"]
+        assert results[1]["interference"] == ["busy_start"]
+        assert results[0]["json_result"]["environment"]["start_issues"] == ["温度 70.0℃"]
+        assert "interference" not in results[2]
+        assert self.guard.assess(noisy, parallel=True) == ["thermal"]
+        assert EnvironmentGuard.from_config({"enabled": True}, task_option=False) is None
+        assert EnvironmentGuard.from_config({"enabled": False}, task_option={"max_wait_s": 10}).config["max_wait_s"] == 10
+
+    def test_disabled_by_default(self):
+        """测试默认关闭，任务设置environment_guard: true时开启"""
+        assert EnvironmentGuard.from_config() is None
+        assert EnvironmentGuard.from_config({}) is None
+        assert EnvironmentGuard.from_config({}, task_option=True) is not None
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SweepPlanner单元测试
+测试耗时模型拟合、超时设置与由粗到细的用例排序
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from analysis.data_extractor import DataExtractor
+from benchmark.batch.planner import RuntimeCostModel, SweepPlanner, case_features, coarse_levels, format_duration
+from utils.db_manager import DatabaseManager
+from tests.unit.conftest import make_result
+
+
+def make_case(n_prompt, threads=4, model="qwen3_06b", suit_name="pn_sweep"):
+    """构造CaseGenerator格式的用例"""
+    return {
+        'suit_name': suit_name,
+        'params': {'threads': threads, 'n_prompt': n_prompt, 'n_gen': 32, 'n_repeat': 3},
+        'model': model
+    }
+
+
+def synthetic_runtime(params):
+    """模拟耗时：加载2秒 + 每轮prefill按线程加速"""
+    rounds = params['n_repeat'] + 1
+    return 2.0 + rounds * params['n_prompt'] * 0.01 / params['threads'] + rounds * params['n_gen'] * 0.02
+
+
+class TestRuntimeCostModel:
+    """RuntimeCostModel测试类"""
+
+    def test_fit_recovers_runtime(self):
+        """测试由历史样本拟合后能预测新用例耗时"""
+        samples = [("qwen3_06b", make_case(p, t)['params'], synthetic_runtime(make_case(p, t)['params']))
+                   for p in (64, 128, 256, 512) for t in (1, 2, 4)]
+        model = RuntimeCostModel().fit(samples)
+
+        params = make_case(384, 3)['params']
+        assert model.predict("qwen3_06b", params) == pytest.approx(synthetic_runtime(params), rel=1e-3)
+
+    def test_unknown_model_uses_pooled_fit(self):
+        """测试样本不足的模型使用合并拟合，完全没有样本时返回None"""
+        samples = [("a", make_case(p)['params'], synthetic_runtime(make_case(p)['params'])) for p in (64, 128, 256, 512, 1024)]
+        model = RuntimeCostModel().fit(samples)
+
+        assert model.predict("b", make_case(64)['params']) is not None
+        assert RuntimeCostModel().fit([]).predict("a", make_case(64)['params']) is None
+
+    def test_fit_from_database_uses_invocation_runtime(self):
+        """测试合并执行的历史用例按整组调用的原始耗时拟合，单独执行的用例加回模型加载耗时"""
+        temp_dir = Path(tempfile.mkdtemp(prefix="test_planner_"))
+        try:
+            db = DatabaseManager(str(temp_dir / "test.db"))
+            task_id = db.create_or_update_task({'task_name': 'history'})
+            case_num = 0
+
+            def write(case, execution):
+                nonlocal case_num
+                case_num += 1
+                suite_id = db.create_or_update_suite(task_id, case, {})
+                result = make_result(case['params']['n_prompt'])
+                result['json_result']['execution'] = execution
+                db.create_or_update_case_with_results(task_id, suite_id, case_num, case, result)
+
+            for threads in (1, 2, 4):
+                # 常驻工作进程执行：runtime_seconds不含模型加载（2秒）
+                single = make_case(512, threads)
+                write(single, {'runtime_seconds': synthetic_runtime(single['params']) - 2.0,
+                               'model_load_seconds': 2.0})
+                # 合并执行：一次调用只加载一次模型，runtime_seconds为均摊值
+                group = [make_case(p, threads) for p in (64, 128, 256)]
+                group_seconds = 2.0 + sum(synthetic_runtime(c['params']) - 2.0 for c in group)
+                for case in group:
+                    write(case, {'runtime_seconds': group_seconds / len(group), 'group_id': f'g{threads}',
+                                 'group_runtime_seconds': group_seconds, 'coalesced_cases': len(group)})
+
+            model = RuntimeCostModel().fit_from_database(db.db_path)
+
+            params = make_case(384, 3)['params']
+            assert model.predict("qwen3_06b", params) == pytest.approx(synthetic_runtime(params), rel=1e-3)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_case_features_defaults(self):
+        """测试缺省参数使用llm_bench_prompt默认值"""
+        assert case_features({}) == [1.0, 6 * 512, 6 * 128, 6 * 512 / 4, 6 * 128 / 4]
+
+
+class TestSweepPlanner:
+    """SweepPlanner测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.planner = SweepPlanner()
+
+    def test_coarse_levels(self):
+        """测试网格细化层级"""
+        assert coarse_levels(5) == [0, 2, 1, 2, 0]
+        assert coarse_levels(1) == [0]
+
+    def test_order_coarse_first(self):
+        """测试同一模型内先执行端点，再插入中点"""
+        cases = [make_case(p) for p in (64, 128, 192, 256, 320)]
+        ordered = self.planner.order_coarse_first(cases)
+
+        assert [c['params']['n_prompt'] for c in ordered] == [64, 320, 192, 128, 256]
+
+    def test_planner_sets_timeouts(self):
+        """测试按预测耗时设置超时，保留显式指定的timeout"""
+        cases = [make_case(64), make_case(128)]
+        cases[0]['predicted_seconds'] = 100.0
+        cases[1]['predicted_seconds'] = 10.0
+        cases[1]['params']['timeout'] = 999
+
+        planned = self.planner.plan(cases, {'planner': {'order': 'declared', 'timeout_factor': 2}})
+
+        assert planned[0]['timeout'] == 200
+        assert 'timeout' not in planned[0]['params']
+        assert 'timeout' not in planned[1]
+        assert planned[1]['params']['timeout'] == 999
+
+    def test_planned_suite_variables_unchanged(self):
+        """测试计划器设置的超时不作为用例变量存储，套件变量与未规划时一致"""
+        temp_dir = Path(tempfile.mkdtemp(prefix="test_planner_"))
+        try:
+            db = DatabaseManager(str(temp_dir / "test.db"))
+            task_id = db.create_or_update_task({'task_name': 'planner'})
+            extractor = DataExtractor(db.db_path)
+
+            variables = {}
+            for suit_name, option in (("plain", {}), ("planned", {'planner': {'order': 'declared'}})):
+                cases = [make_case(p, suit_name=suit_name) for p in (64, 128, 256)]
+                for case, seconds in zip(cases, (10.0, 20.0, 40.0)):
+                    case['predicted_seconds'] = seconds
+                cases = self.planner.plan(cases, option)
+                suite_id = db.create_or_update_suite(task_id, cases[0], {})
+                for case_num, case in enumerate(cases, 1):
+                    db.create_or_update_case_with_results(task_id, suite_id, case_num, case,
+                                                          make_result(case['params']['n_prompt']))
+                variables[suit_name] = extractor.get_suite_variables(suite_id)
+
+            assert variables["planned"] == variables["plain"]
+            assert 'timeout' not in variables["planned"]
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_planner_disabled(self):
+        """测试未开启planner时不修改用例"""
+        cases = [make_case(p) for p in (64, 128, 192)]
+        assert self.planner.plan(cases, {}) == cases
+        assert all('timeout' not in c['params'] for c in cases)
+
+    def test_format_duration(self):
+        """测试耗时格式化"""
+        assert format_duration(3725) == "1小时2分"
+        assert format_duration(65) == "1分5秒"
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+剖析模式单元测试
+测试子进程rusage采集、超时终止、加载耗时反推和批次合并
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmark.core.executor import BenchExecutor
+from benchmark.core.profiling import wait_and_profile, compute_seconds, build_profile, merge_profiles
+
+# 分配并写入约64MB内存，保持数个VmHWM读取间隔后退出
+ALLOCATE_SCRIPT = ("import time; x = bytearray(64 * 1024 * 1024); x[::4096] = b'1' * len(x[::4096]); "
+                   "time.sleep(0.2); print('done')")
+
+
+class TestProfiling:
+    """剖析模式测试类"""
+
+    def test_wait_and_profile_collects_rusage(self):
+        """测试回收子进程后取得其自身的峰值内存和缺页次数"""
+        process = subprocess.Popen([sys.executable, "-c", ALLOCATE_SCRIPT], stdout=subprocess.DEVNULL)
+
+        timed_out, stats = wait_and_profile(process, 30)
+
+        assert not timed_out
+        assert process.returncode == 0
+        assert stats["peak_rss_mb"] > 60
+        assert stats["minor_faults"] > 16000
+
+    def test_wait_and_profile_timeout(self):
+        """测试超时时终止进程"""
+        process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+
+        timed_out, stats = wait_and_profile(process, 0.2)
+
+        assert timed_out
+        assert process.returncode < 0
+        assert stats is not None
+
+    def test_run_command_profile(self):
+        """测试剖析模式下run_command仍返回完整输出"""
+        executor = BenchExecutor(Path(sys.executable), {})
+        executor.profile = True
+
+        result = executor.run_command([sys.executable, "-c", ALLOCATE_SCRIPT], 30)
+
+        assert result["return_code"] == 0
+        assert result["stdout"] == "done\n"
+        assert result["profile"]["peak_rss_mb"] > 60
+
+    def test_load_seconds_from_throughput(self):
+        """测试按吞吐量反推推理耗时，剩余耗时记为load_s"""
+        results = {
+            "prefill": {"test_name": "pp512", "tokens_per_sec": {"mean": 256.0}},
+            "decode": {"test_name": "tg128", "tokens_per_sec": {"mean": 32.0}}
+        }
+        assert compute_seconds(results, 3) == 18.0
+        assert compute_seconds(results, "uses_default") == 30.0
+
+        profile = build_profile({"peak_rss_mb": 512.0, "major_faults": 10}, 20.0, results, 3)
+        assert profile["metrics"]["load_s"] == {"mean": 2.0, "std": None, "unit": "s"}
+        assert profile["metrics"]["peak_rss_mb"]["unit"] == "MB"
+        assert "io_read_mb" not in profile["metrics"]
+
+    def test_merge_profiles(self):
+        """测试合并批次时取均值和样本标准差"""
+        results = {"decode": {"test_name": "tg10", "tokens_per_sec": {"mean": 10.0}}}
+        first = build_profile({"peak_rss_mb": 100.0}, 3.0, results, 1)
+        second = build_profile({"peak_rss_mb": 120.0}, 4.0, results, 1)
+
+        merged = merge_profiles([first, None, second])
+
+        assert merged["samples"] == 2
+        assert merged["metrics"]["peak_rss_mb"]["mean"] == 110.0
+        assert merged["metrics"]["load_s"]["mean"] == 2.5
+        assert round(merged["metrics"]["peak_rss_mb"]["std"], 3) == 14.142
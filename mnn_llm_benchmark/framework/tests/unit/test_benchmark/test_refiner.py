@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AdaptiveRefiner单元测试
+测试adaptive变量的初始粗网格与按拟合误差追加测量点
+"""
+
+import math
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from benchmark.batch.cases import VariableRange, BenchSuit
+from benchmark.batch.planner import RuntimeCostModel, SweepPlanner
+from benchmark.batch.refiner import AdaptiveRefiner
+from utils.db_manager import DatabaseManager
+
+
+def make_cases(values, spec, threads=4):
+    """构造带adaptive配置的用例"""
+    return [{
+        'suit_name': 'pn_sweep',
+        'params': {'threads': threads, 'n_prompt': value, 'n_gen': 32},
+        'model': 'qwen3_06b',
+        'adaptive': spec
+    } for value in values]
+
+
+def make_result(speed):
+    """构造包含prefill吞吐量的执行结果"""
+    return {'success': True, 'json_result': {'results': {'prefill': {'tokens_per_sec': {'mean': speed, 'std': 0.1}}}}}
+
+
+def saturating(x):
+    """低端弯曲、高端平坦的吞吐量曲线"""
+    return 200.0 * x / (x + 64.0)
+
+
+class TestAdaptiveVariable:
+    """adaptive变量定义测试类"""
+
+    def test_initial_coarse_grid(self):
+        """测试初始粗网格包含两端并均匀分布"""
+        var = VariableRange("n_prompt", start=64, end=1024, step=64, mode="adaptive", initial=3, budget=6)
+
+        assert var.initial_values() == [64, 576, 1024]
+        assert var.adaptive_spec()['grid'] == var.values
+        assert var.adaptive_spec()['metric'] == "prefill"
+
+    def test_only_one_adaptive_variable(self):
+        """测试同一套件只允许一个adaptive变量"""
+        with pytest.raises(ValueError):
+            BenchSuit("s", variables=[
+                {'name': 'n_prompt', 'values': [1, 2, 3], 'mode': 'adaptive'},
+                {'name': 'n_gen', 'values': [1, 2, 3], 'mode': 'adaptive'}
+            ])
+
+
+class TestAdaptiveRefiner:
+    """AdaptiveRefiner测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.refiner = AdaptiveRefiner()
+        self.grid = list(range(16, 1025, 16))
+        self.spec = {'variable': 'n_prompt', 'grid': self.grid, 'budget': 8, 'batch': 2, 'metric': 'prefill'}
+
+    def test_refines_curved_region_first(self):
+        """测试优先在曲率最大的低端区间追加测量点"""
+        values = [16, 256, 512, 768, 1024]
+        cases = make_cases(values, self.spec)
+        results = {i: make_result(saturating(v)) for i, v in enumerate(values)}
+
+        new_cases = self.refiner.refine(cases, results)
+
+        assert len(new_cases) == 2
+        assert new_cases[0]['params']['n_prompt'] < 256
+        assert all(c['params']['n_prompt'] not in values for c in new_cases)
+
+    def test_budget_per_curve(self):
+        """测试每条曲线受budget限制，不同threads为不同曲线"""
+        values = [16, 256, 512, 768, 1024]
+        cases = make_cases(values, self.spec, threads=1) + make_cases(values + [128, 384, 640], self.spec, threads=2)
+        results = {i: make_result(saturating(c['params']['n_prompt'])) for i, c in enumerate(cases)}
+
+        new_cases = self.refiner.refine(cases, results)
+
+        assert {c['params']['threads'] for c in new_cases} == {1}
+        assert self.refiner.initial_budget(cases) == 3
+
+    def test_stored_results_without_json(self):
+        """测试续跑跳过和缓存复用的用例从数据库读取已存储的结果"""
+        temp_dir = Path(tempfile.mkdtemp(prefix="test_refiner_"))
+        try:
+            db = DatabaseManager(str(temp_dir / "test.db"))
+            task_id = db.create_or_update_task({'task_name': 'refine'})
+            values = [16, 256, 512, 768, 1024]
+            cases = make_cases(values, self.spec)
+            suite_id = db.create_or_update_suite(task_id, cases[0], {})
+            results = {}
+            for i, (case, value) in enumerate(zip(cases, values)):
+                stored = make_result(saturating(value))
+                stored['json_result']['results']['prefill'].update(test_name=f'pp{value}')
+                case_id = db.create_or_update_case_with_results(task_id, suite_id, i + 1, case, stored)
+                key = 'resumed_case_id' if i % 2 else 'cache_source_case_id'
+                results[i] = {'success': True, 'skipped': True, key: case_id}
+
+            expected = self.refiner.refine(cases, {i: make_result(saturating(v)) for i, v in enumerate(values)})
+
+            assert AdaptiveRefiner(db).refine(cases, results) == expected
+            assert self.refiner._metric_value(results[0], 'prefill') is None
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_refined_cases_replanned(self):
+        """测试追加用例不沿用模板用例的计划器超时，由计划器按自身参数重新预测"""
+        values = [16, 256, 512, 768, 1024]
+        cases = make_cases(values, self.spec)
+        for case in cases:
+            case['predicted_seconds'] = 10.0
+            case['timeout'] = 60
+        results = {i: make_result(saturating(v)) for i, v in enumerate(values)}
+
+        new_cases = self.refiner.refine(cases, results)
+        assert all('timeout' not in c and 'predicted_seconds' not in c for c in new_cases)
+
+        planner = SweepPlanner()
+        planner._cost_model = RuntimeCostModel().fit([(c['model'], c['params'], c['params']['n_prompt'] / 2.0)
+                                                      for c in cases])
+        planner.plan_added(new_cases, {'planner': {'min_timeout': 1, 'timeout_factor': 1}})
+        for case in new_cases:
+            assert case['predicted_seconds'] == pytest.approx(case['params']['n_prompt'] / 2.0, rel=1e-3)
+            assert case['timeout'] == math.ceil(case['predicted_seconds'])
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ParallelScheduler单元测试
+测试CPU列表解析、核心分配与并行调度
+"""
+
+import threading
+
+import pytest
+
+from benchmark.batch.scheduler import CoreAllocator, ParallelScheduler, parse_cpu_list, format_cpu_list
+
+
+@pytest.fixture(autouse=True)
+def fake_affinity(monkeypatch):
+    """固定进程可用核心为0-7，避免依赖测试机核心数"""
+    monkeypatch.setattr("benchmark.batch.scheduler.os.sched_getaffinity", lambda pid: set(range(8)))
+
+
+def make_case(threads=None):
+    """构造CaseGenerator格式的用例"""
+    params = {'n_prompt': 64}
+    if threads is not None:
+        params['threads'] = threads
+    return {'suit_name': 'thread_sweep', 'params': params, 'model': 'qwen3_06b'}
+
+
+class TestCoreAllocator:
+    """CoreAllocator测试类"""
+
+    def test_parse_and_format_cpu_list(self):
+        """测试CPU列表解析与格式化"""
+        assert parse_cpu_list("0-3,6, 8-9") == [0, 1, 2, 3, 6, 8, 9]
+        assert format_cpu_list([3, 1, 2]) == "1,2,3"
+
+    def test_from_taskset(self):
+        """测试从taskset命令解析核心池"""
+        allocator = CoreAllocator.from_taskset("taskset -c 2-5")
+
+        assert allocator.cores == [2, 3, 4, 5]
+
+    def test_ignores_unavailable_cores(self):
+        """测试忽略进程可用集合之外的核心"""
+        assert CoreAllocator([6, 7, 8, 9]).cores == [6, 7]
+
+    def test_acquire_and_release(self):
+        """测试核心申请与释放"""
+        allocator = CoreAllocator([0, 1, 2, 3])
+
+        first = allocator.acquire(3)
+        assert len(first) == 3
+        assert allocator.acquire(2) is None
+
+        allocator.release(first)
+        assert allocator.acquire(4) == [0, 1, 2, 3]
+
+    def test_acquire_prefers_single_domain(self):
+        """测试优先在同一拓扑域内分配核心"""
+        allocator = CoreAllocator([0, 1, 2, 3])
+        allocator.topology = {0: (0, 0), 1: (0, 0), 2: (0, 1), 3: (0, 1)}
+
+        assert allocator.acquire(1) == [0]
+        assert allocator.acquire(2) == [2, 3]
+
+
+class TestParallelScheduler:
+    """ParallelScheduler测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.scheduler = ParallelScheduler(CoreAllocator([0, 1, 2, 3]))
+
+    def test_required_cores(self):
+        """测试核心需求取单元内最大threads并受核心池限制"""
+        assert self.scheduler.required_cores([make_case(1), make_case(2)]) == 2
+        assert self.scheduler.required_cores([make_case()]) == 4
+        assert self.scheduler.required_cores([make_case(8)]) == 4
+
+    def test_run_disjoint_cores(self):
+        """测试并发单元使用互不重叠的核心且全部完成"""
+        cases = [make_case(2), make_case(2), make_case(1), make_case(4)]
+        active = {}
+        lock = threading.Lock()
+        overlaps = []
+        completed = []
+
+        def run_unit(unit, taskset_cmd):
+            cores = set(parse_cpu_list(taskset_cmd.split()[-1]))
+            with lock:
+                for other in active.values():
+                    if other & cores:
+                        overlaps.append((unit, cores))
+                active[unit[0]] = cores
+            with lock:
+                active.pop(unit[0])
+            return [{'success': True} for _ in unit]
+
+        def on_complete(unit, cores, results):
+            assert len(cores) == self.scheduler.required_cores([cases[i] for i in unit])
+            completed.extend(unit)
+
+        self.scheduler.run([[0], [1], [2], [3]], cases, run_unit, lambda unit, cores: None, on_complete)
+
+        assert sorted(completed) == [0, 1, 2, 3]
+        assert overlaps == []
+        assert self.scheduler.allocator.acquire(4) == [0, 1, 2, 3]
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OutputStreamParser单元测试
+测试llm_bench_prompt流式输出的逐行解析与异常检测
+"""
+
+import sys
+from pathlib import Path
+
+from benchmark.core.executor import BenchExecutor
+from benchmark.core.stream import OutputStreamParser
+
+
+HEADER = "| model | modelSize | backend | threads | precision | pType | test | t/s |"
+SEPARATOR = "| --- | --- | --- | --- | --- | --- | --- | --- |"
+
+
+class TestOutputStreamParser:
+    """OutputStreamParser测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.parser = OutputStreamParser()
+
+    def feed_table(self, *rows):
+        """输入表头和数据行，返回数据行事件"""
+        self.parser.feed(HEADER + "\n")
+        self.parser.feed(SEPARATOR + "\n")
+        return [self.parser.feed(row + "\n") for row in rows]
+
+    def test_table_rows(self):
+        """测试表格行逐行解析为行事件"""
+        events = self.feed_table(
+            "| qwen | 1 MiB | CPU | 4 | Low | fix | pp64 | 120.50 ± 1.20 |",
+            "| qwen | 1 MiB | CPU | 4 | Low | fix | tg32 | 30.10 ± 0.20 |"
+        )
+
+        assert [event["type"] for event in events] == ["row", "row"]
+        assert events[1]["index"] == 1
+        assert events[0]["row"]["test"] == "pp64"
+        assert events[1]["row"]["t/s"] == "30.10 ± 0.20"
+        assert self.parser.header_lines == [HEADER, SEPARATOR]
+        assert len(self.parser.table_rows) == 2
+
+    def test_round_performance(self):
+        """测试verbose模式下的逐轮Performance行"""
+        self.parser.feed("****** Round 2 : ******\n")
+        event = self.parser.feed("Performance: Prefill=12.50 ms, Decode=80.25 ms\n")
+
+        assert event == {"type": "round", "round": 2, "prefill_ms": 12.5, "decode_ms": 80.25}
+
+    def test_ignores_other_output(self):
+        """测试配置信息等其他输出被忽略"""
+        assert self.parser.feed("=== Test Configuration ===\n") is None
+        assert self.parser.feed("Threads: 4\n") is None
+        assert self.parser.feed("\n") is None
+
+    def test_abort_reason(self):
+        """测试吞吐量为0或非数值时给出终止原因"""
+        good, zero, nan = self.feed_table(
+            "| qwen | 1 MiB | CPU | 4 | Low | fix | pp64 | 120.50 ± 1.20 |",
+            "| qwen | 1 MiB | CPU | 4 | Low | fix | tg32 | 0.00 ± 0.00 |",
+            "| qwen | 1 MiB | CPU | 4 | Low | fix | tg64 | nan ± nan |"
+        )
+
+        assert self.parser.abort_reason(good) is None
+        assert "tg32" in self.parser.abort_reason(zero)
+        assert "tg64" in self.parser.abort_reason(nan)
+
+    def test_abort_reason_kv_true(self):
+        """测试kv=true模式下逐段检查prefill/decode速度"""
+        parser = OutputStreamParser()
+        parser.feed("| model | threads | llm_demo | speed(tok/s) |\n")
+        parser.feed("| --- | --- | --- | --- |\n")
+        event = parser.feed("| qwen | 4 | prompt=64<br>decode=32 | 300.00 ± 2.00<br>0.00 ± 0.00 |\n")
+
+        assert parser.abort_reason(event) is not None
+
+    def test_stream_command_without_file_output(self):
+        """测试流式执行的命令不传-fp，结果表格输出到标准输出"""
+        executor = BenchExecutor(Path(sys.executable), {})
+
+        assert "-fp" not in executor.build_command(Path("config.json"), None, n_prompt=64)
+        assert executor.build_command(Path("config.json"), Path("out.txt"))[-2:] == ["-fp", "out.txt"]
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TelemetrySampler单元测试
+测试从模拟的/proc和/sys采样、汇总、抽稀和批次合并
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from benchmark.core.telemetry import TelemetrySampler, merge_telemetry
+
+
+class TestTelemetrySampler:
+    """遥测采样器测试类"""
+
+    def setup_method(self):
+        """测试前准备：构造模拟的/proc和/sys"""
+        self.root = Path(tempfile.mkdtemp(prefix="test_telemetry_"))
+        for cpu, freq in ((0, 1800000), (1, 1200000)):
+            self._write(f"sys/devices/system/cpu/cpu{cpu}/cpufreq/scaling_cur_freq", f"{freq}\n")
+        self._write("sys/class/thermal/thermal_zone0/temp", "45000\n")
+        self._write("sys/class/thermal/thermal_zone1/temp", "52500\n")
+        self._write("proc/42/status", "Name:\tllm_bench\nVmHWM:\t  204800 kB\nVmRSS:\t  102400 kB\n")
+        self._write("proc/42/stat", "42 (llm bench) R 1 1 1 0 -1 0 0 0 0 0 10 10 0 0 20 0 1 0 100\n")
+        self._write("proc/stat", "cpu  100 0 100 800 0 0 0 0 0 0\ncpu0 50 0 50 400 0 0 0 0 0 0\n")
+        self._write("proc/meminfo", "MemTotal:  4096000 kB\nMemAvailable:  2048000 kB\n")
+
+    def teardown_method(self):
+        """测试后清理"""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _write(self, relative_path, content):
+        """写入模拟文件"""
+        path = self.root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+    def test_sample_and_summary(self):
+        """测试采样值换算，CPU占用按相邻采样的差值计算"""
+        sampler = TelemetrySampler(42, root=str(self.root))
+        sampler._open_sources()
+        sampler.sample()
+        # 同一文件描述符重读到更新后的内容
+        self._write("proc/stat", "cpu  250 0 250 900 0 0 0 0 0 0\n")
+        self._write("proc/42/stat", "42 (llm bench) R 1 1 1 0 -1 0 0 0 0 0 150 70 0 0 20 0 1 0 100\n")
+        sampler.sample()
+        result = sampler.stop()
+
+        series = result["series"]
+        assert series["freq_mhz"] == [1500, 1500]
+        assert series["temp_c"] == [52.5, 52.5]
+        assert series["rss_mb"] == [100.0, 100.0]
+        assert series["cpu_pct"] == [None, 75.0]
+        assert series["proc_cpu_pct"] == [None, 50.0]
+        assert result["summary"]["mean_other_cpu_pct"] == 25.0
+        assert result["summary"]["peak_rss_mb"] == 200.0
+        assert result["summary"]["max_temp_c"] == 52.5
+        assert result["summary"]["samples"] == 2
+
+    def test_missing_sources_dropped(self):
+        """测试不可读的数据源不产生列，进程不存在时仍可采样"""
+        shutil.rmtree(self.root / "sys")
+        sampler = TelemetrySampler(7, root=str(self.root))
+        sampler._open_sources()
+        sampler.sample()
+        result = sampler.stop()
+
+        assert set(result["series"]) == {"t", "mem_avail_mb"}
+        assert result["summary"]["peak_rss_mb"] is None
+
+    def test_downsample_when_full(self):
+        """测试超过最大点数时隔点抽稀并加倍间隔"""
+        sampler = TelemetrySampler(42, interval_ms=100, max_samples=4, root=str(self.root))
+        sampler._open_sources()
+        for _ in range(5):
+            sampler.sample()
+        sampler.stop()
+
+        assert len(sampler.series["t"]) == 3
+        assert sampler.interval == 0.2
+
+    def test_background_thread_on_real_process(self):
+        """测试后台线程采样当前进程"""
+        sampler = TelemetrySampler(os.getpid(), interval_ms=10).start()
+        time.sleep(0.05)
+        result = sampler.stop()
+
+        assert result["summary"]["samples"] >= 2
+        assert result["summary"]["peak_rss_mb"] > 0
+
+    def test_merge_offsets_time(self):
+        """测试合并批次时时间轴顺延，峰值取最大"""
+        first = {"interval_ms": 250, "summary": {"peak_rss_mb": 300.0},
+                 "series": {"t": [0.0, 0.25], "rss_mb": [100.0, 120.0]}}
+        second = {"interval_ms": 250, "summary": {"peak_rss_mb": 150.0},
+                  "series": {"t": [0.0, 0.25], "rss_mb": [110.0, 130.0], "temp_c": [40.0, 41.0]}}
+
+        merged = merge_telemetry([first, None, second])
+
+        assert merged["series"]["t"] == [0.0, 0.25, 0.5, 0.75]
+        assert merged["series"]["temp_c"] == [None, None, 40.0, 41.0]
+        assert merged["summary"]["peak_rss_mb"] == 300.0
+        assert merge_telemetry([None]) is None
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+逐token延迟单元测试
+测试token_latency行的解析与附加、按长度分组的TTFT/ITL统计、批次合并和结果类型写入
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmark.core.executor import BenchExecutor
+from benchmark.core.stream import OutputStreamParser
+from benchmark.core.token_latency import build_token_latency, merge_token_latency, percentile
+from utils.db_manager import DatabaseManager
+from tests.unit.conftest import make_case, make_result
+
+HEADER = "| model | modelSize | backend | threads | precision | pType | test | t/s |"
+SEPARATOR = "| --- | --- | --- | --- | --- | --- | --- | --- |"
+TABLE = "\n".join([
+    HEADER,
+    SEPARATOR,
+    "| qwen | 1 MiB | CPU | 4 | Low | fix | pp64 | 120.50 ± 1.20 |",
+    "token_latency ttft_us=100000,110000,120000 itl_us=",
+    "| qwen | 1 MiB | CPU | 4 | Low | fix | tg32 | 30.10 ± 0.20 |",
+    "token_latency ttft_us= itl_us=" + ",".join(["30000"] * 98 + ["50000", "90000"]),
+    "| qwen | 1 MiB | CPU | 4 | Low | fix | pp64+tg16 | 80.00 ± 0.50 |",
+    "token_latency ttft_us=130000 itl_us=",
+    ""
+])
+
+
+class TestTokenLatency:
+    """逐token延迟测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_token_latency_"))
+        self.executor = BenchExecutor(Path(sys.executable), {})
+        self.executor.token_latency = True
+
+    def teardown_method(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_read_table_attaches_latency_lines(self):
+        """测试文件与流式输出都将token_latency行附加到前一个表格行"""
+        output_path = self.temp_dir / "raw.txt"
+        output_path.write_text(TABLE, encoding="utf-8")
+
+        _, table_rows = self.executor.read_result_table(output_path)
+        parser = OutputStreamParser()
+        events = [parser.feed(line + "\n") for line in TABLE.splitlines()]
+
+        assert len(table_rows) == 3
+        assert table_rows[0][0].endswith("\ntoken_latency ttft_us=100000,110000,120000 itl_us=")
+        assert table_rows[1][1]["token_latency"].startswith("token_latency ttft_us= itl_us=30000")
+        assert parser.table_rows == table_rows
+        assert events[3] is None
+        assert "-tl" in self.executor.build_command(Path("config.json"), output_path, n_prompt=64)
+
+    def test_json_result_groups_by_length(self):
+        """测试TTFT按prompt长度、ITL按生成长度分组，分位数为线性插值"""
+        output_path = self.temp_dir / "raw.txt"
+        output_path.write_text(TABLE, encoding="utf-8")
+        _, table_rows = self.executor.read_result_table(output_path)
+        bench_results = self.executor._create_result_rows(table_rows, "qwen", "qwen", {}, 0.0, 1.0)
+
+        json_result = self.executor._create_json_result(bench_results, {}, "qwen", "qwen",
+                                                        Path("config.json"), {}, 0.0, 1.0, 60)
+
+        latency = json_result["token_latency"]
+        # pp64与pp64+tg16的首token延迟合并统计
+        assert latency["ttft"]["64"]["samples"] == 4
+        assert latency["ttft"]["64"]["mean_ms"] == 115.0
+        assert set(latency["itl"]) == {"32"}
+        assert latency["itl"]["32"]["p50_ms"] == 30.0
+        assert latency["itl"]["32"]["p99_ms"] == 50.4
+        assert latency["itl"]["32"]["max_ms"] == 90.0
+        assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+
+    def test_itl_sample_count_per_round(self):
+        """测试每轮生成gen个token时记录gen-1个间隔（不含停止token的采样间隔）"""
+        rounds, gen_length = 3, 32
+        intervals = ",".join(["25000"] * ((gen_length - 1) * rounds))
+        rows = [
+            {"test": f"tg{gen_length}", "token_latency": f"token_latency ttft_us= itl_us={intervals}"},
+            {"llm_demo": f"prompt=64<br>decode={gen_length}",
+             "token_latency": f"token_latency ttft_us=100000,100000,100000 itl_us={intervals}"}
+        ]
+
+        for row in rows:
+            latency = build_token_latency([row])
+            assert latency["itl"][str(gen_length)]["samples"] == (gen_length - 1) * rounds
+
+    def test_merge_and_write_result_types(self):
+        """测试合并批次后重新计算分位数，并写入ttft_ms/itl_p*结果类型"""
+        row = {"llm_demo": "prompt=64<br>decode=32"}
+        first = build_token_latency([{**row, "token_latency": "token_latency ttft_us=100000 itl_us=10000,20000"}])
+        second = build_token_latency([{**row, "token_latency": "token_latency ttft_us=140000 itl_us=30000,40000"}])
+        merged = merge_token_latency([first, None, second])
+
+        assert merged["ttft"]["64"]["values_us"] == [100000, 140000]
+        assert merged["itl"]["32"]["p50_ms"] == 25.0
+        assert build_token_latency([row]) is None
+
+        db = DatabaseManager(str(self.temp_dir / "test.db"))
+        task_id = db.create_or_update_task({'task_name': 'token_latency'})
+        suite_id = db.create_or_update_suite(task_id, make_case(64), {})
+        result = make_result(64)
+        result['json_result']['token_latency'] = merged
+        case_id = db.create_or_update_case_with_results(task_id, suite_id, 1, make_case(64), result)
+
+        with db._connection() as conn:
+            rows = conn.execute(
+                "SELECT result_type, result_parameter, mean_value, std_value, unit, sample_count "
+                "FROM benchmark_results WHERE case_id = ? AND unit = 'ms' ORDER BY result_type", (case_id,)
+            ).fetchall()
+        assert [tuple(r) for r in rows] == [
+            ('itl_p50', '32', 25.0, None, 'ms', 4),
+            ('itl_p95', '32', 38.5, None, 'ms', 4),
+            ('itl_p99', '32', 39.7, None, 'ms', 4),
+            ('ttft_ms', '64', 120.0, 28.2843, 'ms', 2)
+        ]
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WarmWorkerBackend单元测试
+测试结果表格生成、用例支持判断，以及使用模拟工作进程的模型复用与回退
+"""
+
+import json
+import textwrap
+
+from benchmark.core import warm
+from benchmark.core.warm import WarmWorkerBackend, build_table, format_speed
+
+
+# 模拟工作进程：不加载模型，按每个token 1毫秒返回耗时
+FAKE_WORKER = textwrap.dedent('''
+    import json, sys
+    print("MNN log line")
+    print(json.dumps({"type": "ready", "load_seconds": 1.5}), flush=True)
+    for line in sys.stdin:
+        request = json.loads(line)
+        if request["type"] == "exit":
+            break
+        rounds = request["n_repeat"]
+        prefill = [{"tokens": request["n_prompt"], "us": request["n_prompt"] * 1000}] * rounds
+        decode = [{"tokens": request["n_gen"], "us": request["n_gen"] * 1000}] * rounds
+        print(json.dumps({"type": "result", "id": request["id"], "prefill": prefill, "decode": decode}), flush=True)
+''')
+
+
+class TestBuildTable:
+    """结果表格生成测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.response = {
+            "prefill": [{"tokens": 100, "us": 1e6}, {"tokens": 100, "us": 0.5e6}],
+            "decode": [{"tokens": 32, "us": 1e6}, {"tokens": 32, "us": 1e6}]
+        }
+
+    def test_format_speed(self):
+        """测试吞吐量均值和样本标准差"""
+        assert format_speed(self.response["prefill"]) == "150.00 ± 70.71"
+        assert format_speed([]) == "0.00 ± 0.00"
+
+    def test_kv_false_rows(self, tmp_path):
+        """测试kv_cache=false时生成pp/tg两行"""
+        config_path = tmp_path / "qwen" / "config.json"
+        config_path.parent.mkdir()
+        config_path.write_text("{}")
+
+        _, rows = build_table(config_path, {"n_prompt": 100, "n_gen": 32, "threads": 2}, self.response)
+
+        assert [row["test"] for _, row in rows] == ["pp100", "tg32"]
+        assert rows[1][1]["t/s"] == "32.00 ± 0.00"
+        assert rows[0][1]["threads"] == "2" and rows[0][1]["precision"] == "Low"
+
+    def test_kv_true_row(self, tmp_path):
+        """测试kv_cache=true时生成llm_demo格式单行"""
+        config_path = tmp_path / "config.json"
+        config_path.write_text("{}")
+
+        header_lines, rows = build_table(config_path, {"n_prompt": 100, "n_gen": 32, "kv_cache": "true"}, self.response)
+
+        assert "speed(tok/s)" in header_lines[0]
+        assert rows[0][1]["llm_demo"] == "prompt=100<br>decode=32"
+        assert rows[0][1]["speed(tok/s)"] == "150.00 ± 70.71<br>32.00 ± 0.00"
+
+
+class TestWarmWorkerBackend:
+    """WarmWorkerBackend测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.backend = WarmWorkerBackend()
+
+    def teardown_method(self):
+        """测试后结束工作进程"""
+        self.backend.close()
+
+    def test_supports(self):
+        """测试提示词文件、组合测试和合并执行的列表参数回退到llm_bench_prompt"""
+        assert self.backend.supports({"n_prompt": 64, "kv_cache": "false", "variable_prompt": 0})
+        assert not self.backend.supports({"n_prompt": 64, "prompt_file": "p.txt"})
+        assert not self.backend.supports({"prompt_gen": "32,16"})
+        assert not self.backend.supports({"n_prompt": "64,128"})
+
+    def test_reuses_loaded_worker(self, tmp_path, monkeypatch):
+        """测试同一配置的第二个用例复用工作进程，加载耗时只记录一次"""
+        script = tmp_path / "fake_worker.py"
+        script.write_text(FAKE_WORKER)
+        monkeypatch.setattr(warm, "WORKER_SCRIPT", script)
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps({}))
+
+        first, _, rows = self.backend.run(config_path, tmp_path / "out1.txt", {"n_prompt": 64, "n_gen": 16, "n_repeat": 2}, 30)
+        second, _, _ = self.backend.run(config_path, tmp_path / "out2.txt", {"n_prompt": 128, "n_gen": 16, "n_repeat": 2}, 30)
+
+        assert first["return_code"] == 0 and first["model_load_seconds"] == 1.5
+        assert second["warm_reused"] and second["model_load_seconds"] is None
+        assert rows[0][1]["t/s"] == "1000.00 ± 0.00"
+        assert (tmp_path / "out2.txt").read_text().count("\n") == 4
+
+    def test_unavailable_worker_falls_back(self, tmp_path, monkeypatch):
+        """测试工作进程无法启动时返回None，之后不再重试"""
+        script = tmp_path / "broken_worker.py"
+        script.write_text('import json; print(json.dumps({"type": "error", "error": "no MNN"}))')
+        monkeypatch.setattr(warm, "WORKER_SCRIPT", script)
+        config_path = tmp_path / "config.json"
+        config_path.write_text("{}")
+
+        assert self.backend.run(config_path, tmp_path / "out.txt", {"n_prompt": 64}, 30) is None
+        assert len(self.backend._unavailable) == 1
+        assert self.backend.run(config_path, tmp_path / "out.txt", {"n_prompt": 64}, 30) is None
@@ -0,0 +1 @@
+# 数据库导出模块测试
\ No newline at end of file
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ParquetExporter单元测试
+测试按模型/套件分区导出、增量导出，以及变量列类型变化时的加载
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from db.parquet_export import ParquetExporter, load_table
+from utils.db_manager import DatabaseManager
+from tests.unit.conftest import make_case, make_result
+
+
+class TestParquetExporter:
+    """ParquetExporter测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_parquet_"))
+        self.db = DatabaseManager(str(self.temp_dir / "test.db"))
+        self.dataset_dir = self.temp_dir / "parquet"
+        self.exporter = ParquetExporter(self.db.db_path, self.dataset_dir)
+
+    def teardown_method(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def add_cases(self, model, n_prompts, **params):
+        """写入一个套件的用例和结果"""
+        task_id = self.db.create_or_update_task({'task_name': model})
+        suite_id = None
+        for case_num, n_prompt in enumerate(n_prompts, 1):
+            case = make_case(n_prompt, model=model)
+            case['params'].update(params)
+            suite_id = suite_id or self.db.create_or_update_suite(task_id, case, {})
+            self.db.create_or_update_case_with_results(task_id, suite_id, case_num, case, make_result(n_prompt))
+
+    def test_export_partitions_and_typed_params(self):
+        """测试按模型分区导出，数值变量导出为整数列"""
+        self.add_cases("qwen3_06b", [64, 128])
+        self.add_cases("llama_1b", [64])
+
+        stats = self.exporter.export()
+
+        assert stats["cases"] == 3 and stats["last_case_id"] == 3
+        assert (self.dataset_dir / "model_name=llama_1b" / "suite_name=pn_sweep").is_dir()
+        table = load_table(self.dataset_dir, models=["qwen3_06b"], columns=["n_prompt", "mean_value"])
+        assert table.schema.field("n_prompt").type == "int64"
+        assert sorted(table.column("n_prompt").to_pylist()) == [64, 128]
+
+    def test_incremental_export(self):
+        """测试增量导出只包含新用例，变量类型变化时按合并后的类型加载"""
+        self.add_cases("qwen3_06b", [64], mmap=0)
+        self.exporter.export()
+        assert self.exporter.export()["rows"] == 0
+
+        self.add_cases("qwen3_06b", [128], mmap="auto")
+        stats = self.exporter.export()
+
+        assert stats["first_case_id"] == 2 and stats["rows"] == 1
+        table = load_table(self.dataset_dir)
+        assert table.num_rows == 2
+        assert sorted(table.column("mmap").to_pylist()) == ["0", "auto"]
+
+    def test_full_export_refuses_foreign_directory(self):
+        """测试全量导出不清空非导出数据集目录"""
+        self.dataset_dir.mkdir()
+        (self.dataset_dir / "notes.txt").write_text("keep")
+
+        with pytest.raises(ValueError):
+            self.exporter.export(full=True)
+        assert (self.dataset_dir / "notes.txt").exists()
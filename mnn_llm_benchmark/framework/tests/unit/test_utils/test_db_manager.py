@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DatabaseManager单元测试
+测试用例参数指纹、断点续跑查询与跨任务结果缓存
+"""
+
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from utils.db_manager import DatabaseManager
+from tests.unit.conftest import make_case, make_result
+
+
+class TestDatabaseManager:
+    """DatabaseManager测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_db_"))
+        self.db = DatabaseManager(str(self.temp_dir / "test.db"))
+
+    def teardown_method(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_case_hash_normalization(self):
+        """测试参数指纹忽略timeout和空值，且与值的类型无关"""
+        base = DatabaseManager.compute_case_hash("m", {"threads": 4, "n_prompt": 64})
+
+        assert base == DatabaseManager.compute_case_hash("m", {"n_prompt": "64", "threads": "4", "timeout": 10})
+        assert base == DatabaseManager.compute_case_hash("m", {"threads": 4, "n_prompt": 64, "prompt_file": ""})
+        assert base != DatabaseManager.compute_case_hash("m2", {"threads": 4, "n_prompt": 64})
+        assert base != DatabaseManager.compute_case_hash("m", {"threads": 2, "n_prompt": 64})
+
+    def test_suite_description_backfill(self):
+        """测试套件描述在写入时提取，旧数据库升级时补齐"""
+        task_id = self.db._insert_task("t", "", "{}")
+        self.db._insert_suite(task_id, "s1", "m", "", '{"description": "线程扫描"}')
+        with sqlite3.connect(self.db.db_path) as conn:
+            conn.execute("INSERT INTO suites (task_id, name, model_name, model_path, suite_yaml) "
+                         "VALUES (?, 's2', 'm', '', 'not json')", (task_id,))
+
+        DatabaseManager(self.db.db_path)
+
+        with sqlite3.connect(self.db.db_path) as conn:
+            rows = conn.execute("SELECT name, description FROM suites ORDER BY id").fetchall()
+        assert rows == [("s1", "线程扫描"), ("s2", "s2")]
+
+    def test_variable_values_schema_v2_backfill(self):
+        """测试变量值写入数值列，旧数据库升级到v2时回填suite_id和value_num"""
+        task_id = self.db.create_or_update_task({'task_name': 'typed'})
+        case = make_case(64)
+        case['params']['mmap'] = 'false'
+        suite_id = self.db.create_or_update_suite(task_id, case, {})
+        self.db.create_or_update_case_with_results(task_id, suite_id, 1, case, make_result(64))
+        with sqlite3.connect(self.db.db_path) as conn:
+            conn.execute("UPDATE case_variable_values SET suite_id = NULL, value_num = NULL")
+            conn.execute("PRAGMA user_version = 1")
+
+        DatabaseManager(self.db.db_path)
+
+        with sqlite3.connect(self.db.db_path) as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == 2
+            rows = dict(conn.execute("SELECT variable_name, value_num FROM case_variable_values "
+                                     "WHERE suite_id = ?", (suite_id,)).fetchall())
+        assert rows['n_prompt'] == 64.0 and rows['mmap'] is None
+
+    def test_get_completed_cases(self):
+        """测试仅返回有结果的成功用例"""
+        task_id = self.db.create_or_update_task({'task_name': 'resume'})
+        case = make_case(64)
+        suite_id = self.db.create_or_update_suite(task_id, case, {})
+        self.db.create_or_update_case_with_results(task_id, suite_id, 1, case, make_result(64))
+        # 没有结果的用例不算完成
+        self.db._insert_case_definition(suite_id, "case_2", make_case(128)['params'])
+
+        completed = self.db.get_completed_cases(task_id)
+
+        case_hash = DatabaseManager.compute_case_hash(case['model'], case['params'])
+        assert completed == {("pn_sweep", case_hash): "case_1"}
+
+    def test_get_completed_cases_backfills_legacy_hash(self):
+        """测试旧数据没有case_hash时由变量值重新计算"""
+        task_id = self.db.create_or_update_task({'task_name': 'legacy'})
+        case = make_case(64)
+        suite_id = self.db.create_or_update_suite(task_id, case, {})
+        self.db.create_or_update_case_with_results(task_id, suite_id, 1, case, make_result(64))
+        with sqlite3.connect(self.db.db_path) as conn:
+            conn.execute("UPDATE case_definitions SET case_hash = NULL")
+
+        completed = self.db.get_completed_cases(task_id)
+
+        assert ("pn_sweep", DatabaseManager.compute_case_hash(case['model'], case['params'])) in completed
+
+    def _write_model(self):
+        """在临时目录中构造可执行文件和模型目录"""
+        binary = self.temp_dir / "llm_bench_prompt"
+        binary.write_bytes(b"binary-v1")
+        model_dir = self.temp_dir / "model"
+        model_dir.mkdir()
+        (model_dir / "config.json").write_text('{"llm_model": "llm.mnn"}')
+        (model_dir / "llm.mnn.weight").write_bytes(b"weights")
+        return binary, model_dir / "config.json"
+
+    def test_cache_key_fingerprint(self):
+        """测试缓存键随参数和可执行文件变化，忽略timeout"""
+        binary, config = self._write_model()
+        params = {"threads": 4, "n_prompt": 64}
+        base = DatabaseManager.compute_cache_key(binary, config, "m", params)
+
+        assert base == DatabaseManager.compute_cache_key(binary, config, "m", {**params, "timeout": 10})
+        assert base != DatabaseManager.compute_cache_key(binary, config, "m", {**params, "threads": 2})
+
+        binary.write_bytes(b"binary-v2-rebuilt")
+        assert base != DatabaseManager.compute_cache_key(binary, config, "m", params)
+
+    def test_find_and_reuse_cached_case(self):
+        """测试缓存命中后复制结果并标记复用来源"""
+        case = make_case(64)
+        task_id = self.db.create_or_update_task({'task_name': 'source'})
+        suite_id = self.db.create_or_update_suite(task_id, case, {})
+        result = {**make_result(64), 'cache_key': 'k1'}
+        self.db.create_or_update_case_with_results(task_id, suite_id, 1, case, result)
+
+        assert self.db.find_cached_case('other', 24) is None
+        source_case = self.db.find_cached_case('k1', 24)
+        assert source_case is not None
+
+        new_task_id = self.db.create_or_update_task({'task_name': 'reuse'})
+        new_suite_id = self.db.create_or_update_suite(new_task_id, case, {})
+        new_case_id = self.db.reuse_cached_case(new_task_id, new_suite_id, 1, case, source_case, 'k1')
+
+        with sqlite3.connect(self.db.db_path) as conn:
+            reused_from, status = conn.execute(
+                "SELECT reused_from_case_id, status FROM case_definitions WHERE id = ?", (new_case_id,)
+            ).fetchone()
+            result_count = conn.execute(
+                "SELECT COUNT(*) FROM benchmark_results WHERE case_id = ?", (new_case_id,)
+            ).fetchone()[0]
+        assert reused_from == source_case['id']
+        assert status == 'success'
+        assert result_count == 1
+        # 复用得到的用例不再作为缓存来源
+        assert self.db.find_cached_case('k1', 24)['id'] == source_case['id']
+
+    def test_case_telemetry_stored(self):
+        """测试遥测汇总写入用例列，时间序列写入case_telemetry"""
+        case = make_case(64)
+        task_id = self.db.create_or_update_task({'task_name': 'telemetry'})
+        suite_id = self.db.create_or_update_suite(task_id, case, {})
+        result = make_result(64)
+        telemetry = {
+            'interval_ms': 250,
+            'summary': {'peak_rss_mb': 812.5, 'mean_freq_mhz': 1800.0, 'max_temp_c': 61.0, 'samples': 2},
+            'series': {'t': [0.0, 0.25], 'freq_mhz': [1800, 1800], 'temp_c': [60.0, 61.0]}
+        }
+        result['json_result']['telemetry'] = telemetry
+        case_id = self.db.create_or_update_case_with_results(task_id, suite_id, 1, case, result)
+
+        with sqlite3.connect(self.db.db_path) as conn:
+            summary = conn.execute(
+                "SELECT peak_rss_mb, mean_freq_mhz, max_temp_c FROM case_definitions WHERE id = ?", (case_id,)
+            ).fetchone()
+        assert summary == (812.5, 1800.0, 61.0)
+        assert self.db.get_case_telemetry(case_id) == telemetry
+
+    def test_interfered_case_rerun_on_resume(self):
+        """测试受干扰的用例记录标记、续跑时视为未完成，重新执行后标记清除"""
+        task_id = self.db.create_or_update_task({'task_name': 'interference'})
+        suite_id = self.db.create_or_update_suite(task_id, make_case(64), {})
+        result = make_result(64)
+        result['interference'] = ['cpu_contention', 'thermal']
+        case_id = self.db.create_or_update_case_with_results(task_id, suite_id, 1, make_case(64), result)
+
+        with sqlite3.connect(self.db.db_path) as conn:
+            row = conn.execute("SELECT interference FROM case_definitions WHERE id = ?", (case_id,)).fetchone()
+        assert row == ('cpu_contention,thermal',)
+        assert self.db.get_completed_cases(task_id) == {}
+
+        self.db.create_or_update_case_with_results(task_id, suite_id, 1, make_case(64), make_result(64))
+        assert len(self.db.get_completed_cases(task_id)) == 1
+
+    def test_profile_metrics_stored_as_result_types(self):
+        """测试剖析指标作为额外结果类型写入benchmark_results"""
+        case = make_case(64)
+        task_id = self.db.create_or_update_task({'task_name': 'profile'})
+        suite_id = self.db.create_or_update_suite(task_id, case, {})
+        result = make_result(64)
+        result['json_result']['profile'] = {'samples': 1, 'metrics': {
+            'peak_rss_mb': {'mean': 812.5, 'std': None, 'unit': 'MB'},
+            'load_s': {'mean': 1.25, 'std': None, 'unit': 's'}
+        }}
+        case_id = self.db.create_or_update_case_with_results(task_id, suite_id, 1, case, result)
+
+        with sqlite3.connect(self.db.db_path) as conn:
+            rows = conn.execute(
+                "SELECT result_type, result_parameter, mean_value, unit FROM benchmark_results "
+                "WHERE case_id = ? ORDER BY result_type", (case_id,)
+            ).fetchall()
+        assert rows == [('load_s', 'process', 1.25, 's'), ('peak_rss_mb', 'process', 812.5, 'MB'),
+                        ('pp', '64', 100.0, 'tokens/sec')]
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BatchResultWriter单元测试
+测试后台批量写入、按批次提交以及单个用例失败时的回滚
+"""
+
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from utils.db_manager import DatabaseManager
+from utils.db_writer import BatchResultWriter
+from tests.unit.conftest import make_case, make_result
+
+
+class TestBatchResultWriter:
+    """BatchResultWriter测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_writer_"))
+        self.db = DatabaseManager(str(self.temp_dir / "test.db"))
+        self.task_id = self.db.create_or_update_task({'task_name': 'writer'})
+        self.suite_id = self.db.create_or_update_suite(self.task_id, make_case(1), {})
+
+    def teardown_method(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _count(self, table):
+        with sqlite3.connect(self.db.db_path) as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_wal_mode_enabled(self):
+        """测试数据库初始化为WAL模式"""
+        with sqlite3.connect(self.db.db_path) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_writes_all_cases(self):
+        """测试关闭写入器后所有用例均已提交"""
+        writer = BatchResultWriter(self.db, batch_size=3)
+        for n in range(1, 8):
+            writer.submit(self.task_id, self.suite_id, n, make_case(n), make_result(n))
+        writer.close()
+
+        assert writer.written == 7
+        assert writer.failed == 0
+        assert self._count("case_definitions") == 7
+        assert self._count("benchmark_results") == 7
+
+    def test_failed_case_rolled_back_alone(self):
+        """测试单个用例写入失败时只回滚该用例"""
+        bad_result = {'success': True, 'json_result': {'results': {'prefill': {'test_name': 'pp8'}}}}
+        writer = BatchResultWriter(self.db, batch_size=10)
+        writer.submit(self.task_id, self.suite_id, 1, make_case(1), make_result(1))
+        writer.submit(self.task_id, self.suite_id, 2, make_case(2), bad_result)
+        writer.submit(self.task_id, self.suite_id, 3, make_case(3), make_result(3))
+        writer.close()
+
+        assert (writer.written, writer.failed) == (2, 1)
+        with sqlite3.connect(self.db.db_path) as conn:
+            names = [row[0] for row in conn.execute("SELECT name FROM case_definitions ORDER BY id")]
+        assert names == ["case_1", "case_3"]
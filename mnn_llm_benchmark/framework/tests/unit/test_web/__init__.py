@@ -0,0 +1 @@
+# Web服务器测试
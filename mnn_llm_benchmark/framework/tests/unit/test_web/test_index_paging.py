@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Web首页键集分页单元测试
+测试分页游标解析，以及after/before/last翻页在首页和末页边界的结果
+"""
+
+import importlib.util
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from utils.db_manager import DatabaseManager
+
+APP_PATH = Path(__file__).resolve().parents[4] / "web_server" / "app.py"
+
+
+def load_app():
+    """按文件路径加载web_server/app.py（web_server不是包）"""
+    spec = importlib.util.spec_from_file_location("web_server_app", APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+app = load_app()
+
+
+class TestIndexPaging:
+    """首页分页测试类"""
+
+    def setup_method(self):
+        """测试前准备：7个任务，任务5和6的updated_at相同，按id区分先后"""
+        self.temp_dir = Path(tempfile.mkdtemp(prefix="test_index_paging_"))
+        self.db = DatabaseManager(str(self.temp_dir / "test.db"))
+        for i in range(1, 8):
+            task_id = self.db.create_or_update_task({'task_name': f'task_{i}'})
+            self.db._insert_suite(task_id, f"suite_{i}", "m", "", '{"description": "描述"}')
+        with sqlite3.connect(self.db.db_path) as conn:
+            conn.execute("UPDATE tasks SET updated_at = printf('2026-01-01 00:00:%02d', MIN(id, 5))")
+        self.conn = sqlite3.connect(self.db.db_path)
+        self.conn.row_factory = sqlite3.Row
+
+    def teardown_method(self):
+        """测试后清理"""
+        self.conn.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def page_ids(self, **kwargs):
+        """查询一页（每页3个任务），返回任务ID列表"""
+        return [task['id'] for task in app.query_index_page(self.conn, 3, **kwargs)]
+
+    def cursor_of(self, task_id):
+        """取得任务的分页游标"""
+        row = self.conn.execute("SELECT id, updated_at FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return app.parse_cursor(app.make_cursor(row))
+
+    def test_parse_cursor(self):
+        """测试游标解析，无效游标返回None"""
+        assert app.parse_cursor("2026-01-01 00:00:05|6") == ("2026-01-01 00:00:05", 6)
+        assert app.parse_cursor("a|b|7") == ("a|b", 7)
+        assert app.parse_cursor("2026-01-01|x") is None
+        assert app.parse_cursor("no-separator") is None
+        assert app.parse_cursor(None) is None
+
+    def test_first_page_and_after(self):
+        """测试首页按updated_at、id倒序，after逐页向后直到末页之后为空"""
+        assert self.page_ids() == [7, 6, 5]
+        assert self.page_ids(after=self.cursor_of(5)) == [4, 3, 2]
+        assert self.page_ids(after=self.cursor_of(2)) == [1]
+        assert self.page_ids(after=self.cursor_of(1)) == []
+
+    def test_before_returns_previous_page(self):
+        """测试before返回前一页（仍按倒序），首页之前为空"""
+        assert self.page_ids(before=self.cursor_of(4)) == [7, 6, 5]
+        assert self.page_ids(before=self.cursor_of(1)) == [4, 3, 2]
+        assert self.page_ids(before=self.cursor_of(7)) == []
+
+    def test_last_page_holds_remainder(self):
+        """测试最后一页只包含余数个任务，整除时为完整一页"""
+        assert self.page_ids(last=True) == [1]
+        self.conn.execute("DELETE FROM tasks WHERE id = 1")
+        assert self.page_ids(last=True) == [4, 3, 2]
+
+    def test_page_includes_suites(self):
+        """测试每个任务附带套件、描述和用例数"""
+        task = app.query_index_page(self.conn, 3)[0]
+
+        assert task['suite_count'] == 1
+        assert task['suites'][0]['name'] == "suite_7"
+        assert task['suites'][0]['description'] == "描述"
+        assert task['total_cases'] == 0
+
+    def test_migration_backfills_description(self):
+        """测试首次打开时由套件配置补齐缺失的描述"""
+        with sqlite3.connect(self.db.db_path) as conn:
+            conn.execute("UPDATE suites SET description = NULL")
+        original_path, app.DB_PATH = app.DB_PATH, self.db.db_path
+        try:
+            app.migrate_database()
+        finally:
+            app.DB_PATH = original_path
+
+        assert {row[0] for row in self.conn.execute("SELECT description FROM suites")} == {"描述"}
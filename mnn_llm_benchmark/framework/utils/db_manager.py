@@ -7,14 +7,76 @@
 import sqlite3
 import json
 import os
+import hashlib
+import platform
+import socket
+from contextlib import closing, contextmanager
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator
 import logging
 from config.system import SystemConfig
 
 logger = logging.getLogger(__name__)
 
+# 数据库模式版本（PRAGMA user_version），低于此版本的数据库在初始化时迁移
+# 2: case_variable_values增加suite_id和数值列value_num
+SCHEMA_VERSION = 2
+
+
+@lru_cache(maxsize=32)
+def _file_sha256(path: str, size: int, mtime_ns: int) -> str:
+    """计算文件SHA-256（按路径+大小+修改时间缓存，文件不变时不重复读取）"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_sha256(path: Path) -> str:
+    """计算文件SHA-256"""
+    stat = Path(path).stat()
+    return _file_sha256(str(path), stat.st_size, stat.st_mtime_ns)
+
+
+def model_fingerprint(config_path: Path) -> Dict[str, Any]:
+    """
+    计算模型指纹：config.json内容哈希 + 模型目录下各文件的大小和修改时间
+
+    权重文件通常为GB级，只记录大小和修改时间，不读取内容。
+    """
+    config_path = Path(config_path).expanduser()
+    files = {}
+    for item in sorted(config_path.parent.iterdir()):
+        if item.is_file():
+            stat = item.stat()
+            files[item.name] = [stat.st_size, stat.st_mtime_ns]
+    return {'config_sha256': file_sha256(config_path), 'files': files}
+
+
+@lru_cache(maxsize=1)
+def host_fingerprint() -> Dict[str, Any]:
+    """计算主机指纹：主机名、架构、内核版本、CPU型号和核心数"""
+    cpu_model = platform.processor()
+    try:
+        with open('/proc/cpuinfo', 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                key = line.split(':', 1)[0].strip()
+                if key in ('model name', 'Hardware', 'CPU part'):
+                    cpu_model = line.split(':', 1)[1].strip()
+                    break
+    except OSError:
+        pass
+    return {
+        'hostname': socket.gethostname(),
+        'machine': platform.machine(),
+        'kernel': platform.release(),
+        'cpu_model': cpu_model,
+        'cpu_count': os.cpu_count()
+    }
+
 class DatabaseManager:
     """数据库管理器"""
 
@@ -33,12 +95,33 @@ class DatabaseManager:
 
         self._init_database()
 
+    @contextmanager
+    def _connection(self, conn: Optional[sqlite3.Connection] = None) -> Iterator[sqlite3.Connection]:
+        """
+        获取数据库连接
+
+        Args:
+            conn: 调用方持有的连接（如批量写入器的持久连接），由调用方负责提交
+
+        Returns:
+            传入的连接，或新打开的连接（退出时提交并关闭）
+        """
+        if conn is not None:
+            yield conn
+            return
+        with closing(sqlite3.connect(self.db_path)) as new_conn:
+            with new_conn:
+                yield new_conn
+
     def _init_database(self):
         """初始化数据库表结构"""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
 
+                # WAL模式：写入结果时Web服务的并发读取不被阻塞（设置持久保存在数据库文件中）
+                cursor.execute('PRAGMA journal_mode=WAL')
+
                 # 创建tasks表
                 cursor.execute('''
                     CREATE TABLE IF NOT EXISTS tasks (
@@ -65,6 +148,7 @@ class DatabaseManager:
                         model_name TEXT NOT NULL,
                         model_path TEXT NOT NULL,
                         suite_yaml TEXT,
+                        description TEXT,
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         FOREIGN KEY (task_id) REFERENCES tasks(id) ON DELETE CASCADE,
                         UNIQUE(task_id, name, model_name)
@@ -95,8 +179,10 @@ class DatabaseManager:
                     CREATE TABLE IF NOT EXISTS case_variable_values (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         case_id INTEGER NOT NULL,
+                        suite_id INTEGER,
                         variable_name TEXT NOT NULL,
                         variable_value TEXT NOT NULL,
+                        value_num REAL,
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         FOREIGN KEY (case_id) REFERENCES case_definitions(id) ON DELETE CASCADE,
                         UNIQUE(case_id, variable_name)
@@ -120,6 +206,18 @@ class DatabaseManager:
                     )
                 ''')
 
+                # 创建case_telemetry表：用例执行期间的设备状态时间序列（列式JSON）
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS case_telemetry (
+                        case_id INTEGER PRIMARY KEY,
+                        interval_ms INTEGER,
+                        summary_json TEXT,
+                        series_json TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        FOREIGN KEY (case_id) REFERENCES case_definitions(id) ON DELETE CASCADE
+                    )
+                ''')
+
                 # 数据库迁移：添加新字段
                 cursor.execute('PRAGMA table_info(tasks)')
                 columns = [row[1] for row in cursor.fetchall()]
@@ -135,12 +233,63 @@ class DatabaseManager:
                 result_columns = [row[1] for row in cursor.fetchall()]
                 if 'ptypes' not in result_columns:
                     cursor.execute('ALTER TABLE benchmark_results ADD COLUMN ptypes TEXT')
+                # 自适应重复的停止统计
+                if 'sample_count' not in result_columns:
+                    cursor.execute('ALTER TABLE benchmark_results ADD COLUMN sample_count INTEGER')
+                if 'ci_relative_width' not in result_columns:
+                    cursor.execute('ALTER TABLE benchmark_results ADD COLUMN ci_relative_width REAL')
 
                 # 检查case_definitions表是否需要添加execution_time_seconds字段
                 cursor.execute('PRAGMA table_info(case_definitions)')
                 case_columns = [row[1] for row in cursor.fetchall()]
                 if 'execution_time_seconds' not in case_columns:
                     cursor.execute('ALTER TABLE case_definitions ADD COLUMN execution_time_seconds REAL')
+                # 并行调度时记录用例绑定的CPU核心
+                if 'cpu_cores' not in case_columns:
+                    cursor.execute('ALTER TABLE case_definitions ADD COLUMN cpu_cores TEXT')
+                # 用例参数指纹（模型+规范化参数），用于断点续跑
+                if 'case_hash' not in case_columns:
+                    cursor.execute('ALTER TABLE case_definitions ADD COLUMN case_hash TEXT')
+                # 跨任务结果缓存：内容寻址键及复用来源
+                if 'cache_key' not in case_columns:
+                    cursor.execute('ALTER TABLE case_definitions ADD COLUMN cache_key TEXT')
+                if 'reused_from_case_id' not in case_columns:
+                    cursor.execute('ALTER TABLE case_definitions ADD COLUMN reused_from_case_id INTEGER')
+                # 常驻工作进程执行时的模型加载耗时（不计入execution_time_seconds）
+                if 'model_load_seconds' not in case_columns:
+                    cursor.execute('ALTER TABLE case_definitions ADD COLUMN model_load_seconds REAL')
+                # 合并执行：同一次llm_bench_prompt调用的标识及该次调用的原始耗时（用于耗时模型拟合）
+                if 'group_id' not in case_columns:
+                    cursor.execute('ALTER TABLE case_definitions ADD COLUMN group_id TEXT')
+                if 'group_runtime_seconds' not in case_columns:
+                    cursor.execute('ALTER TABLE case_definitions ADD COLUMN group_runtime_seconds REAL')
+                # 遥测汇总：峰值RSS、平均CPU频率、最高温度
+                for column in ('peak_rss_mb', 'mean_freq_mhz', 'max_temp_c'):
+                    if column not in case_columns:
+                        cursor.execute(f'ALTER TABLE case_definitions ADD COLUMN {column} REAL')
+                # 环境干扰标记（逗号分隔，如cpu_contention,thermal），未受干扰为NULL
+                if 'interference' not in case_columns:
+                    cursor.execute('ALTER TABLE case_definitions ADD COLUMN interference TEXT')
+
+                # 模式版本迁移
+                cursor.execute('PRAGMA user_version')
+                schema_version = cursor.fetchone()[0]
+                if schema_version < 2:
+                    self._migrate_variable_values_v2(cursor)
+                if schema_version < SCHEMA_VERSION:
+                    cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+                    logger.info(f"数据库模式已升级: v{schema_version} -> v{SCHEMA_VERSION}")
+
+                # 套件描述在写入时从suite_yaml中提取，首页无需逐个解析
+                cursor.execute('PRAGMA table_info(suites)')
+                suite_columns = [row[1] for row in cursor.fetchall()]
+                if 'description' not in suite_columns:
+                    cursor.execute('ALTER TABLE suites ADD COLUMN description TEXT')
+                cursor.execute('SELECT id, name, suite_yaml FROM suites WHERE description IS NULL')
+                cursor.executemany('UPDATE suites SET description = ? WHERE id = ?', [
+                    (self.suite_description(suite_yaml, name), suite_id)
+                    for suite_id, name, suite_yaml in cursor.fetchall()
+                ])
 
                 # 迁移现有数据：解析原始名称到新字段
                 cursor.execute('SELECT id, name FROM tasks WHERE original_name IS NULL OR run_number IS NULL')
@@ -179,7 +328,13 @@ class DatabaseManager:
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_cases_suite_id ON case_definitions(suite_id)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_results_case_id ON benchmark_results(case_id)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_case_variables_case_id ON case_variable_values(case_id)')
+                # 按套件、变量和数值过滤/切片
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_case_variables_suite_num '
+                               'ON case_variable_values(suite_id, variable_name, value_num)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_original_name ON tasks(original_name)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_cases_cache_key ON case_definitions(cache_key)')
+                # 首页按updated_at倒序的键集分页
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_updated_at ON tasks(updated_at, id)')
                 
                 conn.commit()
                 logger.info("数据库初始化成功")
@@ -188,6 +343,50 @@ class DatabaseManager:
             logger.error(f"数据库初始化失败: {e}")
             raise
 
+    def _migrate_variable_values_v2(self, cursor: sqlite3.Cursor):
+        """
+        模式v2迁移：为case_variable_values添加suite_id和value_num并回填
+
+        Args:
+            cursor: 数据库游标
+        """
+        cursor.execute('PRAGMA table_info(case_variable_values)')
+        variable_columns = [row[1] for row in cursor.fetchall()]
+        if 'suite_id' not in variable_columns:
+            cursor.execute('ALTER TABLE case_variable_values ADD COLUMN suite_id INTEGER')
+        if 'value_num' not in variable_columns:
+            cursor.execute('ALTER TABLE case_variable_values ADD COLUMN value_num REAL')
+
+        cursor.execute('''
+            UPDATE case_variable_values SET suite_id =
+                (SELECT suite_id FROM case_definitions WHERE id = case_variable_values.case_id)
+            WHERE suite_id IS NULL
+        ''')
+        cursor.execute('SELECT id, variable_value FROM case_variable_values WHERE value_num IS NULL')
+        cursor.executemany('UPDATE case_variable_values SET value_num = ? WHERE id = ?', [
+            (value_num, row_id) for row_id, value in cursor.fetchall()
+            if (value_num := self.numeric_value(value)) is not None
+        ])
+
+    @staticmethod
+    def numeric_value(value: Any) -> Optional[float]:
+        """
+        将变量值转换为数值列value_num的取值
+
+        Args:
+            value: 变量值（通常为字符串）
+
+        Returns:
+            数值，非数值（含布尔、NaN和空值）时返回None
+        """
+        if value is None or isinstance(value, bool):
+            return None
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return None
+        return number if number == number and abs(number) != float('inf') else None
+
     def _insert_task(self, name: str, description: str, original_yaml: str, status: str = 'pending') -> int:
         """插入任务记录，每次运行都创建新任务"""
         try:
@@ -214,15 +413,34 @@ class DatabaseManager:
             logger.error(f"插入任务记录失败: {e}")
             raise
 
+    @staticmethod
+    def suite_description(suite_yaml: Optional[str], name: str) -> str:
+        """
+        从套件配置JSON中提取描述
+
+        Args:
+            suite_yaml: 套件配置（JSON字符串）
+            name: 套件名称，没有描述时使用
+
+        Returns:
+            套件描述
+        """
+        if not suite_yaml:
+            return name
+        try:
+            return json.loads(suite_yaml).get('description') or name
+        except (ValueError, AttributeError):
+            return name
+
     def _insert_suite(self, task_id: int, name: str, model_name: str, model_path: str, suite_yaml: str) -> int:
         """插入测试套件记录"""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
-                    INSERT INTO suites (task_id, name, model_name, model_path, suite_yaml)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (task_id, name, model_name, model_path, suite_yaml))
+                    INSERT INTO suites (task_id, name, model_name, model_path, suite_yaml, description)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (task_id, name, model_name, model_path, suite_yaml, self.suite_description(suite_yaml, name)))
                 suite_id = cursor.lastrowid
                 conn.commit()
                 logger.info(f"插入套件记录: {name} (ID: {suite_id})")
@@ -246,43 +464,44 @@ class DatabaseManager:
                 logger.error(f"唯一约束冲突 - 可能的原因: 相同任务中已有相同套件名和模型名的记录")
             raise
 
-    def _insert_case_definition(self, suite_id: int, name: str, base_parameters: Dict) -> int:
+    def _insert_case_definition(self, suite_id: int, name: str, base_parameters: Dict,
+                                case_hash: Optional[str] = None, conn: Optional[sqlite3.Connection] = None) -> int:
         """插入用例定义记录"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection(conn) as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
-                    INSERT INTO case_definitions (suite_id, name, base_parameters, status)
-                    VALUES (?, ?, ?, 'pending')
-                ''', (suite_id, name, json.dumps(base_parameters)))
+                    INSERT INTO case_definitions (suite_id, name, base_parameters, status, case_hash)
+                    VALUES (?, ?, ?, 'pending', ?)
+                ''', (suite_id, name, json.dumps(base_parameters), case_hash))
                 case_id = cursor.lastrowid
-                conn.commit()
                 logger.info(f"插入用例定义: {name} (ID: {case_id})")
                 return case_id
         except Exception as e:
             logger.error(f"插入用例定义失败: {e}")
             raise
 
-    def _insert_case_variable_values(self, case_id: int, variable_values: Dict[str, str]):
+    def _insert_case_variable_values(self, case_id: int, variable_values: Dict[str, str],
+                                     conn: Optional[sqlite3.Connection] = None):
         """插入用例变量值"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                for var_name, var_value in variable_values.items():
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO case_variable_values (case_id, variable_name, variable_value)
-                        VALUES (?, ?, ?)
-                    ''', (case_id, var_name, var_value))
-                conn.commit()
+            with self._connection(conn) as conn:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO case_variable_values
+                    (case_id, suite_id, variable_name, variable_value, value_num)
+                    VALUES (?, (SELECT suite_id FROM case_definitions WHERE id = ?), ?, ?, ?)
+                ''', [(case_id, case_id, var_name, var_value, self.numeric_value(var_value))
+                      for var_name, var_value in variable_values.items()])
                 logger.info(f"插入用例变量: case_id={case_id}, variables={list(variable_values.keys())}")
         except Exception as e:
             logger.error(f"插入用例变量失败: {e}")
             raise
 
-    def _update_case_results(self, case_id: int, case_info: Dict, execution_time: float = None):
+    def _update_case_results(self, case_id: int, case_info: Dict, execution_time: float = None,
+                             conn: Optional[sqlite3.Connection] = None):
         """更新用例运行结果信息"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection(conn) as conn:
                 cursor = conn.cursor()
 
                 # 构建动态SQL
@@ -299,42 +518,86 @@ class DatabaseManager:
                     update_fields.append("execution_time_seconds = ?")
                     params.append(execution_time)
 
+                # 干扰标记每次都写入，续跑重新执行后清除旧标记
+                update_fields.append("interference = ?")
+                params.append(case_info.get('interference'))
+
+                # 可选字段：并行调度分配的CPU核心、用例参数指纹、模型加载耗时、合并执行信息、遥测汇总
+                for field in ('cpu_cores', 'case_hash', 'cache_key', 'model_load_seconds',
+                              'group_id', 'group_runtime_seconds',
+                              'peak_rss_mb', 'mean_freq_mhz', 'max_temp_c'):
+                    if case_info.get(field) is not None:
+                        update_fields.append(f"{field} = ?")
+                        params.append(case_info[field])
+
                 params.append(case_id)
 
                 update_sql = f"UPDATE case_definitions SET {', '.join(update_fields)} WHERE id = ?"
                 cursor.execute(update_sql, params)
-                conn.commit()
                 logger.info(f"更新用例结果: case_id={case_id}, execution_time={execution_time}")
         except Exception as e:
             logger.error(f"更新用例结果失败: {e}")
             raise
 
-    def _insert_benchmark_results(self, case_id: int, results: List[Dict]):
+    def _insert_benchmark_results(self, case_id: int, results: List[Dict],
+                                  conn: Optional[sqlite3.Connection] = None):
         """插入基准测试结果"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                for result in results:
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO benchmark_results
-                        (case_id, result_type, result_parameter, mean_value, std_value, value_type, unit, ptypes)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        case_id,
-                        result['result_type'],
-                        result['result_parameter'],
-                        result['mean_value'],
-                        result.get('std_value'),
-                        result.get('value_type', 'single'),
-                        result.get('unit', 'tokens/sec'),
-                        result.get('ptypes', 'fix')  # 默认为fix模式
-                    ))
-                conn.commit()
+            with self._connection(conn) as conn:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO benchmark_results
+                    (case_id, result_type, result_parameter, mean_value, std_value, value_type, unit, ptypes,
+                     sample_count, ci_relative_width)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [(
+                    case_id,
+                    result['result_type'],
+                    result['result_parameter'],
+                    result['mean_value'],
+                    result.get('std_value'),
+                    result.get('value_type', 'single'),
+                    result.get('unit', 'tokens/sec'),
+                    result.get('ptypes', 'fix'),  # 默认为fix模式
+                    result.get('sample_count'),
+                    result.get('ci_relative_width')
+                ) for result in results])
                 logger.info(f"插入基准测试结果: case_id={case_id}, count={len(results)}")
         except Exception as e:
             logger.error(f"插入基准测试结果失败: {e}")
             raise
 
+    def _insert_case_telemetry(self, case_id: int, telemetry: Dict,
+                               conn: Optional[sqlite3.Connection] = None):
+        """写入用例遥测时间序列"""
+        with self._connection(conn) as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO case_telemetry (case_id, interval_ms, summary_json, series_json)
+                VALUES (?, ?, ?, ?)
+            ''', (
+                case_id,
+                telemetry.get('interval_ms'),
+                json.dumps(telemetry.get('summary', {}), separators=(',', ':')),
+                json.dumps(telemetry.get('series', {}), separators=(',', ':'))
+            ))
+
+    def get_case_telemetry(self, case_id: int) -> Optional[Dict]:
+        """
+        获取用例遥测数据
+
+        Args:
+            case_id: 用例ID
+
+        Returns:
+            遥测字典（interval_ms、summary、series），没有采样时返回None
+        """
+        with self._connection() as conn:
+            row = conn.execute(
+                'SELECT interval_ms, summary_json, series_json FROM case_telemetry WHERE case_id = ?', (case_id,)
+            ).fetchone()
+        if not row:
+            return None
+        return {'interval_ms': row[0], 'summary': json.loads(row[1]), 'series': json.loads(row[2])}
+
     def _update_task_status(self, task_id: int, status: str, summary_json: Optional[Dict] = None, execution_time: Optional[float] = None):
         """更新任务状态"""
         try:
@@ -404,12 +667,13 @@ class DatabaseManager:
             logger.error(f"获取套件失败: {e}")
             return None
 
-    def _get_case_by_suite_and_name(self, suite_id: int, case_name: str) -> Optional[Dict]:
+    def _get_case_by_suite_and_name(self, suite_id: int, case_name: str,
+                                    conn: Optional[sqlite3.Connection] = None) -> Optional[Dict]:
         """根据套件ID和用例名获取用例"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._connection(conn) as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
                 cursor.execute('SELECT * FROM case_definitions WHERE suite_id = ? AND name = ?', (suite_id, case_name))
                 row = cursor.fetchone()
                 return dict(row) if row else None
@@ -417,6 +681,247 @@ class DatabaseManager:
             logger.error(f"获取用例失败: {e}")
             return None
 
+    @staticmethod
+    def compute_case_hash(model_name: str, params: Dict) -> str:
+        """
+        计算用例参数指纹：模型名 + 规范化参数（值统一为字符串，忽略空值和调度参数timeout）
+
+        与case_variable_values的写入规则一致，因此也可由已存储的变量值重新计算。
+
+        Args:
+            model_name: 模型别名
+            params: 用例参数
+
+        Returns:
+            SHA-256十六进制字符串
+        """
+        normalized = {
+            key: str(value) for key, value in params.items()
+            if key not in ('timeout', 'model') and value is not None and value != ''
+        }
+        payload = json.dumps({'model': model_name, 'params': normalized}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get_task(self, task_id: int) -> Optional[Dict]:
+        """根据ID获取任务"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                cursor.execute('SELECT * FROM tasks WHERE id = ?', (task_id,))
+                row = cursor.fetchone()
+                return dict(row) if row else None
+        except Exception as e:
+            logger.error(f"获取任务失败: {e}")
+            return None
+
+    def get_completed_cases(self, task_id: int) -> Dict[tuple, str]:
+        """
+        获取任务中已成功完成（有基准测试结果且未受环境干扰）的用例，受干扰的用例续跑时重新执行
+
+        旧数据没有case_hash时由case_variable_values重新计算并回填。
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            {(套件名, 用例参数指纹): 用例名}
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT cd.id, cd.name, cd.case_hash, s.name, s.model_name
+                    FROM case_definitions cd
+                    JOIN suites s ON cd.suite_id = s.id
+                    WHERE s.task_id = ? AND cd.status = 'success' AND cd.interference IS NULL
+                      AND EXISTS (SELECT 1 FROM benchmark_results br WHERE br.case_id = cd.id)
+                ''', (task_id,))
+                rows = cursor.fetchall()
+
+                completed = {}
+                for case_id, case_name, case_hash, suite_name, model_name in rows:
+                    if not case_hash:
+                        cursor.execute('''
+                            SELECT variable_name, variable_value FROM case_variable_values WHERE case_id = ?
+                        ''', (case_id,))
+                        case_hash = self.compute_case_hash(model_name, dict(cursor.fetchall()))
+                        cursor.execute('UPDATE case_definitions SET case_hash = ? WHERE id = ?', (case_hash, case_id))
+                    completed[(suite_name, case_hash)] = case_name
+                conn.commit()
+
+                logger.info(f"任务 {task_id} 已完成用例: {len(completed)}")
+                return completed
+        except Exception as e:
+            logger.error(f"获取已完成用例失败: {e}")
+            raise
+
+    def get_case_id(self, task_id: int, suite_name: str, model_name: str, case_name: str) -> Optional[int]:
+        """根据任务ID、套件名、模型名和用例名获取用例ID"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute('''
+                    SELECT cd.id FROM case_definitions cd
+                    JOIN suites s ON cd.suite_id = s.id
+                    WHERE s.task_id = ? AND s.name = ? AND s.model_name = ? AND cd.name = ?
+                ''', (task_id, suite_name, model_name, case_name)).fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            logger.error(f"获取用例ID失败: {e}")
+            return None
+
+    def get_case_result_mean(self, case_id: int, result_type: str) -> Optional[float]:
+        """
+        获取用例已存储的测试结果均值
+
+        Args:
+            case_id: 用例ID
+            result_type: 结果类型（pp/tg等）
+
+        Returns:
+            均值，不存在时返回None
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute('''
+                    SELECT mean_value FROM benchmark_results
+                    WHERE case_id = ? AND result_type = ? ORDER BY id LIMIT 1
+                ''', (case_id, result_type)).fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            logger.error(f"获取用例结果失败: {e}")
+            return None
+
+    def resume_task(self, task_id: int) -> Dict:
+        """
+        标记任务为续跑状态
+
+        Args:
+            task_id: 任务ID
+
+        Returns:
+            任务记录
+
+        Raises:
+            ValueError: 任务不存在
+        """
+        task = self.get_task(task_id)
+        if not task:
+            raise ValueError(f"任务不存在: task_id={task_id}")
+        self._update_task_status(task_id, 'pending')
+        logger.info(f"续跑任务: {task['name']} (ID: {task_id})")
+        return task
+
+    @staticmethod
+    def compute_cache_key(binary_path: Path, config_path: Path, model_name: str, params: Dict) -> str:
+        """
+        计算跨任务结果缓存键：llm_bench可执行文件哈希 + 模型指纹 + 规范化参数 + 主机指纹
+
+        Args:
+            binary_path: llm_bench_prompt可执行文件路径
+            config_path: 模型config.json路径
+            model_name: 模型别名
+            params: 用例参数
+
+        Returns:
+            SHA-256十六进制字符串
+        """
+        payload = json.dumps({
+            'binary_sha256': file_sha256(Path(binary_path).expanduser()),
+            'model': model_fingerprint(config_path),
+            'case_hash': DatabaseManager.compute_case_hash(model_name, params),
+            'host': host_fingerprint()
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def find_cached_case(self, cache_key: str, ttl_hours: float) -> Optional[Dict]:
+        """
+        查找TTL内与缓存键匹配的实测用例（不包括复用得到的用例，避免TTL被复用链延长；不包括受环境干扰的用例）
+
+        Args:
+            cache_key: 缓存键
+            ttl_hours: 有效期（小时）
+
+        Returns:
+            用例记录，未命中时返回None
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT cd.* FROM case_definitions cd
+                    WHERE cd.cache_key = ? AND cd.status = 'success' AND cd.reused_from_case_id IS NULL
+                      AND cd.interference IS NULL
+                      AND cd.created_at >= datetime('now', ?)
+                      AND EXISTS (SELECT 1 FROM benchmark_results br WHERE br.case_id = cd.id)
+                    ORDER BY cd.id DESC LIMIT 1
+                ''', (cache_key, f"-{float(ttl_hours)} hours"))
+                row = cursor.fetchone()
+                return dict(row) if row else None
+        except Exception as e:
+            logger.error(f"查询结果缓存失败: {e}")
+            return None
+
+    def reuse_cached_case(self, task_id: int, suite_id: int, case_num: int, case_data: Dict,
+                          source_case: Dict, cache_key: str) -> int:
+        """
+        将缓存命中的实测结果复制为当前任务的用例，并标记复用来源
+
+        Args:
+            task_id: 任务ID
+            suite_id: 套件ID
+            case_num: 用例编号
+            case_data: 用例数据
+            source_case: find_cached_case返回的来源用例
+            cache_key: 缓存键
+
+        Returns:
+            新用例ID
+        """
+        try:
+            case_name = f"case_{case_num}"
+            params = case_data.get('params', {})
+            case_hash = self.compute_case_hash(case_data.get('model', 'default'), params)
+
+            existing_case = self._get_case_by_suite_and_name(suite_id, case_name)
+            if existing_case:
+                case_id = existing_case['id']
+            else:
+                case_id = self._insert_case_definition(suite_id, case_name, params, case_hash)
+
+            variable_values = {k: str(v) for k, v in params.items() if v is not None and v != ''}
+            if variable_values:
+                self._insert_case_variable_values(case_id, variable_values)
+
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    INSERT OR REPLACE INTO benchmark_results
+                    (case_id, result_type, result_parameter, mean_value, std_value, value_type, unit, ptypes,
+                     sample_count, ci_relative_width)
+                    SELECT ?, result_type, result_parameter, mean_value, std_value, value_type, unit, ptypes,
+                           sample_count, ci_relative_width
+                    FROM benchmark_results WHERE case_id = ?
+                ''', (case_id, source_case['id']))
+                cursor.execute('''
+                    UPDATE case_definitions SET
+                        model_size = ?, backend = ?, threads = ?, precision = ?,
+                        execution_time_seconds = ?, status = 'success',
+                        case_hash = ?, cache_key = ?, reused_from_case_id = ?, interference = NULL
+                    WHERE id = ?
+                ''', (source_case.get('model_size'), source_case.get('backend'), source_case.get('threads'),
+                      source_case.get('precision'), source_case.get('execution_time_seconds'),
+                      case_hash, cache_key, source_case['id'], case_id))
+                conn.commit()
+
+            logger.info(f"复用缓存结果: task_id={task_id}, {case_name} <- case_id={source_case['id']}")
+            return case_id
+
+        except Exception as e:
+            logger.error(f"复用缓存结果失败: {e}")
+            raise
+
     # ==================== 高级业务方法 ====================
 
     def create_or_update_task(self, task_config: Dict, status: str = 'pending') -> int:
@@ -484,7 +989,8 @@ class DatabaseManager:
             raise
 
     def create_or_update_case_with_results(self, task_id: int, suite_id: int, case_num: int,
-                                         case_data: Dict, bench_result: Dict) -> int:
+                                         case_data: Dict, bench_result: Dict,
+                                         conn: Optional[sqlite3.Connection] = None) -> int:
         """
         创建用例并写入完整测试结果的高级方法
 
@@ -494,136 +1000,207 @@ class DatabaseManager:
             case_num: 用例编号
             case_data: 用例数据
             bench_result: 基准测试结果
+            conn: 可选的持久连接（BatchResultWriter），未提供时在单个事务中写入并提交
 
         Returns:
             用例ID
         """
         try:
-            case_name = f"case_{case_num}"
-
-            # 检查用例是否已存在
-            existing_case = self._get_case_by_suite_and_name(suite_id, case_name)
-            if existing_case:
-                case_id = existing_case['id']
-            else:
-                # 创建新用例
-                base_parameters = case_data.get('params', {})
-                case_id = self._insert_case_definition(suite_id, case_name, base_parameters)
-
-            # 写入变量值
-            params = case_data.get('params', {})
-            variable_values = {}
-            for key, value in params.items():
-                if value is not None and value != '':
-                    variable_values[key] = str(value)
-
-            if variable_values:
-                self._insert_case_variable_values(case_id, variable_values)
-
-            # 写入基准测试结果
-            results = []
-
-            # 从JSON结果中提取性能数据和执行时间
-            json_result = bench_result.get('json_result', {})
-            execution_info = json_result.get('execution', {})
-            execution_time = execution_info.get('runtime_seconds')
-
-            # 获取pType信息
-            ptypes = bench_result.get('raw_data', {}).get('ptypes', 'fix')
-
-            if 'results' in json_result:
-                bench_data = json_result['results']
-
-                # PP结果
-                if 'prefill' in bench_data:
-                    pp_result = bench_data['prefill']
-                    # 从test_name解析prompt长度，如"pp512" -> 512
-                    test_name = pp_result.get('test_name', '')
-                    if test_name.startswith('pp'):
-                        try:
-                            prompt_length = int(test_name[2:])  # 提取"pp"后面的数字
-                        except (ValueError, IndexError):
-                            prompt_length = pp_result.get('prompt_length', 64)
-                    else:
-                        prompt_length = pp_result.get('prompt_length', 64)
-
-                    results.append({
-                        'result_type': 'pp',
-                        'result_parameter': str(prompt_length),
-                        'mean_value': pp_result['tokens_per_sec']['mean'],
-                        'std_value': pp_result['tokens_per_sec']['std'],
-                        'value_type': 'single',
-                        'unit': 'tokens/sec',
-                        'ptypes': ptypes
-                    })
-
-                # TG结果
-                if 'decode' in bench_data:
-                    tg_result = bench_data['decode']
-                    # 从test_name解析generate长度，如"tg128" -> 128
-                    test_name = tg_result.get('test_name', '')
-                    if test_name.startswith('tg'):
-                        try:
-                            generate_length = int(test_name[2:])  # 提取"tg"后面的数字
-                        except (ValueError, IndexError):
-                            generate_length = tg_result.get('generate_length', 32)
-                    else:
-                        generate_length = tg_result.get('generate_length', 32)
-
-                    results.append({
-                        'result_type': 'tg',
-                        'result_parameter': str(generate_length),
-                        'mean_value': tg_result['tokens_per_sec']['mean'],
-                        'std_value': tg_result['tokens_per_sec']['std'],
-                        'value_type': 'single',
-                        'unit': 'tokens/sec',
-                        'ptypes': ptypes
-                    })
-
-                # Combined结果 (pg参数生成的pp+tg组合)
-                if 'combined' in bench_data:
-                    combined_result = bench_data['combined']
-                    test_name = combined_result.get('test_name', 'pp32+tg64')
-                    if '+' in test_name:
-                        # 解析pp32+tg64为pp=32, tg=64
-                        parts = test_name.split('+')
-                        if len(parts) == 2:
-                            pp_val = parts[0].replace('pp', '')
-                            tg_val = parts[1].replace('tg', '')
-                            results.append({
-                                'result_type': 'pp+tg',
-                                'result_parameter': f"{pp_val},{tg_val}",
-                                'mean_value': combined_result['tokens_per_sec']['mean'],
-                                'std_value': combined_result['tokens_per_sec']['std'],
-                                'value_type': 'single',
-                                'unit': 'tokens/sec',
-                                'ptypes': ptypes
-                            })
-
-            # 批量写入结果
-            for result_item in results:
-                self._insert_benchmark_results(case_id, [result_item])
-
-            # 更新用例执行信息
-            model_info = json_result.get('model', {})
-            bench_parameters = json_result.get('bench_parameters', {})
-
-            case_info = {
-                'model_size': model_info.get('size_mb'),
-                'backend': json_result.get('system_info', {}).get('backend'),
-                'threads': bench_parameters.get('threads'),
-                'precision': bench_parameters.get('precision')
-            }
-
-            self._update_case_results(case_id, case_info, execution_time)
-
-            return case_id
-
+            with self._connection(conn) as conn:
+                return self._write_case_with_results(conn, suite_id, case_num, case_data, bench_result)
         except Exception as e:
             logger.error(f"创建或更新用例及结果失败: {e}")
             raise
 
-    def complete_task_with_summary(self, task_name: str, execution_time: float, results: List[Dict]):
+    def _write_case_with_results(self, conn: sqlite3.Connection, suite_id: int, case_num: int,
+                                 case_data: Dict, bench_result: Dict) -> int:
+        """在给定连接上写入用例定义、变量值和测试结果（不提交）"""
+        case_name = f"case_{case_num}"
+        case_hash = self.compute_case_hash(case_data.get('model', 'default'), case_data.get('params', {}))
+
+        # 检查用例是否已存在
+        existing_case = self._get_case_by_suite_and_name(suite_id, case_name, conn)
+        if existing_case:
+            case_id = existing_case['id']
+        else:
+            # 创建新用例
+            base_parameters = case_data.get('params', {})
+            case_id = self._insert_case_definition(suite_id, case_name, base_parameters, case_hash, conn)
+
+        # 写入变量值
+        params = case_data.get('params', {})
+        variable_values = {}
+        for key, value in params.items():
+            if value is not None and value != '':
+                variable_values[key] = str(value)
+
+        if variable_values:
+            self._insert_case_variable_values(case_id, variable_values, conn)
+
+        # 写入基准测试结果
+        results = []
+
+        # 从JSON结果中提取性能数据和执行时间
+        json_result = bench_result.get('json_result', {})
+        execution_info = json_result.get('execution', {})
+        execution_time = execution_info.get('runtime_seconds')
+
+        # 获取pType信息
+        ptypes = bench_result.get('raw_data', {}).get('ptypes', 'fix')
+
+        if 'results' in json_result:
+            bench_data = json_result['results']
+
+            # PP结果
+            if 'prefill' in bench_data:
+                pp_result = bench_data['prefill']
+                # 从test_name解析prompt长度，如"pp512" -> 512
+                test_name = pp_result.get('test_name', '')
+                if test_name.startswith('pp'):
+                    try:
+                        prompt_length = int(test_name[2:])  # 提取"pp"后面的数字
+                    except (ValueError, IndexError):
+                        prompt_length = pp_result.get('prompt_length', 64)
+                else:
+                    prompt_length = pp_result.get('prompt_length', 64)
+
+                results.append({
+                    'result_type': 'pp',
+                    'result_parameter': str(prompt_length),
+                    'mean_value': pp_result['tokens_per_sec']['mean'],
+                    'std_value': pp_result['tokens_per_sec']['std'],
+                    'value_type': 'single',
+                    'unit': 'tokens/sec',
+                    'ptypes': ptypes,
+                    'sample_count': pp_result.get('samples'),
+                    'ci_relative_width': pp_result.get('ci_relative_width')
+                })
+
+            # TG结果
+            if 'decode' in bench_data:
+                tg_result = bench_data['decode']
+                # 从test_name解析generate长度，如"tg128" -> 128
+                test_name = tg_result.get('test_name', '')
+                if test_name.startswith('tg'):
+                    try:
+                        generate_length = int(test_name[2:])  # 提取"tg"后面的数字
+                    except (ValueError, IndexError):
+                        generate_length = tg_result.get('generate_length', 32)
+                else:
+                    generate_length = tg_result.get('generate_length', 32)
+
+                results.append({
+                    'result_type': 'tg',
+                    'result_parameter': str(generate_length),
+                    'mean_value': tg_result['tokens_per_sec']['mean'],
+                    'std_value': tg_result['tokens_per_sec']['std'],
+                    'value_type': 'single',
+                    'unit': 'tokens/sec',
+                    'ptypes': ptypes,
+                    'sample_count': tg_result.get('samples'),
+                    'ci_relative_width': tg_result.get('ci_relative_width')
+                })
+
+            # Combined结果 (pg参数生成的pp+tg组合)
+            if 'combined' in bench_data:
+                combined_result = bench_data['combined']
+                test_name = combined_result.get('test_name', 'pp32+tg64')
+                if '+' in test_name:
+                    # 解析pp32+tg64为pp=32, tg=64
+                    parts = test_name.split('+')
+                    if len(parts) == 2:
+                        pp_val = parts[0].replace('pp', '')
+                        tg_val = parts[1].replace('tg', '')
+                        results.append({
+                            'result_type': 'pp+tg',
+                            'result_parameter': f"{pp_val},{tg_val}",
+                            'mean_value': combined_result['tokens_per_sec']['mean'],
+                            'std_value': combined_result['tokens_per_sec']['std'],
+                            'value_type': 'single',
+                            'unit': 'tokens/sec',
+                            'ptypes': ptypes,
+                            'sample_count': combined_result.get('samples'),
+                            'ci_relative_width': combined_result.get('ci_relative_width')
+                        })
+
+        # 剖析模式的结果类型（峰值内存、缺页次数、读盘量、加载耗时），每个用例一个整次调用的值
+        profile = json_result.get('profile') or {}
+        for result_type, metric in profile.get('metrics', {}).items():
+            results.append({
+                'result_type': result_type,
+                'result_parameter': 'process',  # 整次调用的统计，不对应具体的prompt/gen长度
+                'mean_value': metric['mean'],
+                'std_value': metric.get('std'),
+                'value_type': 'single',
+                'unit': metric.get('unit', ''),
+                'ptypes': ptypes,
+                'sample_count': profile.get('samples')
+            })
+
+        # 逐token延迟的结果类型：ttft_ms为各轮首token延迟的均值±标准差（result_parameter为prompt长度），
+        # itl_p50/itl_p95/itl_p99为全部token间隔的分位数（result_parameter为生成长度）
+        token_latency = json_result.get('token_latency') or {}
+        for prompt_length, summary in token_latency.get('ttft', {}).items():
+            if summary.get('mean_ms') is None:
+                continue
+            results.append({
+                'result_type': 'ttft_ms',
+                'result_parameter': str(prompt_length),
+                'mean_value': summary['mean_ms'],
+                'std_value': summary.get('std_ms'),
+                'value_type': 'single',
+                'unit': 'ms',
+                'ptypes': ptypes,
+                'sample_count': summary.get('samples')
+            })
+        for gen_length, summary in token_latency.get('itl', {}).items():
+            for quantile in ('p50', 'p95', 'p99'):
+                if summary.get(f'{quantile}_ms') is None:
+                    continue
+                results.append({
+                    'result_type': f'itl_{quantile}',
+                    'result_parameter': str(gen_length),
+                    'mean_value': summary[f'{quantile}_ms'],
+                    'std_value': None,
+                    'value_type': 'single',
+                    'unit': 'ms',
+                    'ptypes': ptypes,
+                    'sample_count': summary.get('samples')
+                })
+
+        # 批量写入结果
+        if results:
+            self._insert_benchmark_results(case_id, results, conn)
+
+        # 更新用例执行信息
+        model_info = json_result.get('model', {})
+        bench_parameters = json_result.get('bench_parameters', {})
+        telemetry = json_result.get('telemetry') or {}
+        telemetry_summary = telemetry.get('summary', {})
+
+        case_info = {
+            'model_size': model_info.get('size_mb'),
+            'backend': json_result.get('system_info', {}).get('backend'),
+            'threads': bench_parameters.get('threads'),
+            'precision': bench_parameters.get('precision'),
+            'cpu_cores': bench_result.get('cpu_cores'),
+            'case_hash': case_hash,
+            'cache_key': bench_result.get('cache_key'),
+            'model_load_seconds': execution_info.get('model_load_seconds'),
+            'group_id': execution_info.get('group_id'),
+            'group_runtime_seconds': execution_info.get('group_runtime_seconds'),
+            'interference': ','.join(bench_result['interference']) if bench_result.get('interference') else None,
+            **{column: telemetry_summary.get(column) for column in ('peak_rss_mb', 'mean_freq_mhz', 'max_temp_c')}
+        }
+
+        self._update_case_results(case_id, case_info, execution_time, conn)
+        if telemetry.get('series'):
+            self._insert_case_telemetry(case_id, telemetry, conn)
+
+        return case_id
+
+    def complete_task_with_summary(self, task_name: str, execution_time: float, results: List[Dict],
+                                   task_id: Optional[int] = None):
         """
         完成任务并更新摘要的高级方法
 
@@ -631,13 +1208,17 @@ class DatabaseManager:
             task_name: 任务名称（原始名称）
             execution_time: 执行时间
             results: 执行结果列表
+            task_id: 任务ID（续跑时指定，避免按名称匹配到其他运行）
         """
         try:
             # 查找最近创建的匹配任务（按创建时间排序，取最新的）
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
-                # 查找以task_name开头的最新任务记录
-                cursor.execute('SELECT id, name, status FROM tasks WHERE name LIKE ? ORDER BY created_at DESC LIMIT 1', (f"{task_name}_%",))
+                if task_id is not None:
+                    cursor.execute('SELECT id, name, status FROM tasks WHERE id = ?', (task_id,))
+                else:
+                    # 查找以task_name开头的最新任务记录
+                    cursor.execute('SELECT id, name, status FROM tasks WHERE name LIKE ? ORDER BY created_at DESC LIMIT 1', (f"{task_name}_%",))
                 matching_task = cursor.fetchone()
 
                 if not matching_task:
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量结果写入器
+
+专门负责：
+- 在后台线程中持有一个持久的WAL连接，复用预编译语句
+- 通过队列接收用例结果，每个用例使用独立保存点，失败时只回滚该用例
+- 每N个用例或队列空闲时提交一次事务，避免写锁长期占用
+"""
+
+import sqlite3
+import threading
+from queue import Queue
+from typing import Dict
+from utils.logger import LoggerManager
+
+
+class BatchResultWriter:
+    """后台批量写入用例结果"""
+
+    def __init__(self, db_manager, batch_size: int = 20):
+        """
+        初始化写入器并启动后台线程
+
+        Args:
+            db_manager: DatabaseManager实例（提供写入逻辑和数据库路径）
+            batch_size: 每个事务最多包含的用例数
+        """
+        self.logger = LoggerManager.get_logger("BatchResultWriter")
+        self.db_manager = db_manager
+        self.batch_size = max(1, int(batch_size))
+
+        self.written = 0
+        self.failed = 0
+        self.commits = 0
+
+        self._queue: Queue = Queue()
+        self._thread = threading.Thread(target=self._run, name="BatchResultWriter", daemon=True)
+        self._closed = False
+        self._thread.start()
+
+    def submit(self, task_id: int, suite_id: int, case_num: int, case_data: Dict, result: Dict) -> None:
+        """
+        提交一个用例结果，立即返回
+
+        Args:
+            task_id: 任务ID
+            suite_id: 套件ID
+            case_num: 用例编号
+            case_data: 用例数据
+            result: 执行结果
+        """
+        if self._closed:
+            raise RuntimeError("写入器已关闭")
+        self._queue.put((task_id, suite_id, case_num, case_data, result))
+
+    def flush(self) -> None:
+        """等待已提交的用例全部写入并提交"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """写入剩余用例并关闭连接"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self.logger.info(f"批量写入完成: 成功 {self.written} 个用例，失败 {self.failed} 个，提交 {self.commits} 次")
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """打开后台线程使用的持久连接（手动管理事务）"""
+        conn = sqlite3.connect(self.db_manager.db_path, timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        # WAL模式下NORMAL同步级别仍保证数据库一致性，仅在掉电时可能丢失最后的事务
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _run(self) -> None:
+        """后台线程：逐个写入用例，按批次提交"""
+        conn = self._open_connection()
+        pending = 0
+        try:
+            while True:
+                item = self._queue.get()
+                try:
+                    if item is None:
+                        break
+                    if not conn.in_transaction:
+                        conn.execute('BEGIN')
+                    if self._write_case(conn, *item):
+                        pending += 1
+                    if pending >= self.batch_size or self._queue.empty():
+                        conn.execute('COMMIT')
+                        self.commits += 1
+                        pending = 0
+                finally:
+                    self._queue.task_done()
+        finally:
+            if conn.in_transaction:
+                conn.execute('COMMIT')
+                self.commits += 1
+            conn.close()
+
+    def _write_case(self, conn: sqlite3.Connection, task_id: int, suite_id: int, case_num: int,
+                    case_data: Dict, result: Dict) -> bool:
+        """在保存点内写入单个用例，失败时回滚该用例并继续"""
+        conn.execute('SAVEPOINT case_write')
+        try:
+            case_id = self.db_manager.create_or_update_case_with_results(
+                task_id, suite_id, case_num, case_data, result, conn=conn
+            )
+            conn.execute('RELEASE case_write')
+            self.written += 1
+            self.logger.info(f"写入case {case_num} 成功 (case_id={case_id})")
+            return True
+        except Exception as e:
+            conn.execute('ROLLBACK TO case_write')
+            conn.execute('RELEASE case_write')
+            self.failed += 1
+            self.logger.error(f"写入case {case_num} 失败: {e}", exc_info=True)
+            return False
+
+    def __repr__(self):
+        return (f"BatchResultWriter(batch_size={self.batch_size}, written={self.written}, "
+                f"failed={self.failed}, commits={self.commits})")
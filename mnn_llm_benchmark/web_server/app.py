@@ -6,19 +6,130 @@ MNN LLM Bench Web服务器
 
 import sqlite3
 import os
-from flask import Flask, render_template, jsonify, request
-from datetime import datetime
+import sys
+import json
+import hashlib
+import threading
+import time
+from queue import Queue, Empty, Full
+from flask import Flask, render_template, jsonify, request, make_response, g, Response
+from datetime import datetime, timezone
+
+# 复用framework中的数据库工具（套件描述提取与写入时一致）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'framework'))
+from utils.db_manager import DatabaseManager
 
 app = Flask(__name__)
 
 # 数据库路径
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'benchmark_results.db')
 
+# 只读连接池：最多保留的空闲连接数和每个连接的内存映射大小
+READER_POOL_SIZE = 8
+READER_MMAP_SIZE = 256 * 1024 * 1024
+
+
+class PooledConnection(sqlite3.Connection):
+    """连接池中的只读连接，close()将连接归还连接池而不是关闭"""
+
+    pool = None
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            super().close()
+
+    def __repr__(self):
+        return f"PooledConnection(pool={self.pool!r})"
+
+
+class ReaderPool:
+    """
+    SQLite只读连接池
+
+    连接以 mode=ro 打开并设置 query_only，批量任务写入数据库（WAL模式）时读取不被阻塞；
+    每个连接同一时刻只由一个请求使用，用完归还，超出池大小的连接直接关闭。
+    """
+
+    def __init__(self, db_path, size=READER_POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self._idle = Queue(maxsize=size)
+
+    def acquire(self):
+        """取出空闲连接，没有时新建"""
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, timeout=10,
+                               check_same_thread=False, factory=PooledConnection)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA query_only = ON')
+        conn.execute(f'PRAGMA mmap_size = {READER_MMAP_SIZE}')
+        conn.pool = self
+        return conn
+
+    def release(self, conn):
+        """归还连接，池已满时关闭"""
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            self._idle.put_nowait(conn)
+        except Full:
+            conn.pool = None
+            conn.close()
+
+    def __repr__(self):
+        return f"ReaderPool(db_path={self.db_path}, idle={self._idle.qsize()}/{self.size})"
+
+
+_reader_pool = None
+_reader_pool_lock = threading.Lock()
+
+
 def get_db_connection():
-    """获取数据库连接"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """从只读连接池获取数据库连接，使用后调用close()归还"""
+    global _reader_pool
+    with _reader_pool_lock:
+        if _reader_pool is None or _reader_pool.db_path != DB_PATH:
+            _reader_pool = ReaderPool(DB_PATH)
+        pool = _reader_pool
+    return pool.acquire()
+
+
+# 请求耗时直方图（Prometheus文本格式，由 /metrics 输出）
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_latency_lock = threading.Lock()
+_latency_histograms = {}  # {route: {'buckets': [...], 'count': N, 'sum': 秒}}
+
+
+def observe_latency(route, seconds):
+    """记录一次请求耗时"""
+    with _latency_lock:
+        histogram = _latency_histograms.setdefault(
+            route, {'buckets': [0] * len(LATENCY_BUCKETS), 'count': 0, 'sum': 0.0}
+        )
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                histogram['buckets'][i] += 1
+        histogram['count'] += 1
+        histogram['sum'] += seconds
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request_latency(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        observe_latency(route, time.perf_counter() - start)
+    return response
 
 # 参数基本属性定义
 PARAM_METADATA = {
@@ -79,14 +190,29 @@ PARAM_METADATA = {
     }
 }
 
+_schema_checked_path = None
+_schema_lock = threading.Lock()
+
+
 def init_database():
-    """检查数据库是否存在，不存在则提示用户"""
+    """检查数据库是否存在，不存在则提示用户；首次调用时执行一次结构迁移"""
+    global _schema_checked_path
     if not os.path.exists(DB_PATH):
         return False
 
-    # 执行数据库迁移
+    if _schema_checked_path != DB_PATH:
+        with _schema_lock:
+            if _schema_checked_path != DB_PATH:
+                migrate_database()
+                _schema_checked_path = DB_PATH
+    return True
+
+
+def migrate_database():
+    """执行数据库结构迁移（读写连接），并切换到WAL模式使只读连接不阻塞写入"""
     with sqlite3.connect(DB_PATH) as conn:
         cursor = conn.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
 
         # 检查是否需要添加新字段
         cursor.execute('PRAGMA table_info(tasks)')
@@ -98,6 +224,17 @@ def init_database():
         if 'run_number' not in columns:
             cursor.execute('ALTER TABLE tasks ADD COLUMN run_number INTEGER')
 
+        # 套件描述预先从suite_yaml中提取，首页无需逐个解析
+        cursor.execute('PRAGMA table_info(suites)')
+        if 'description' not in [row[1] for row in cursor.fetchall()]:
+            cursor.execute('ALTER TABLE suites ADD COLUMN description TEXT')
+        cursor.execute('SELECT id, name, suite_yaml FROM suites WHERE description IS NULL')
+        cursor.executemany('UPDATE suites SET description = ? WHERE id = ?', [
+            (DatabaseManager.suite_description(suite_yaml, name), suite_id)
+            for suite_id, name, suite_yaml in cursor.fetchall()
+        ])
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_updated_at ON tasks(updated_at, id)')
+
         # 迁移现有数据
         cursor.execute('SELECT id, name FROM tasks WHERE original_name IS NULL OR run_number IS NULL')
         existing_tasks = cursor.fetchall()
@@ -129,15 +266,102 @@ def init_database():
             ''', (original_name, run_number, task_id))
 
         conn.commit()
-    return True
+
+# 首页查询：先按(updated_at, id)键集取一页任务，再在同一语句中关联套件和用例数
+INDEX_QUERY = """
+    WITH page AS (
+        SELECT t.id, t.name, t.original_name, t.run_number, t.description, t.status, t.created_at, t.updated_at
+        FROM tasks t
+        {where}
+        ORDER BY t.updated_at {order}, t.id {order}
+        LIMIT ?
+    )
+    SELECT page.*,
+           s.id AS suite_id, s.name AS suite_name, s.model_name AS suite_model_name,
+           COALESCE(s.description, s.name) AS suite_description, s.created_at AS suite_created_at,
+           (SELECT COUNT(*) FROM case_definitions cd WHERE cd.suite_id = s.id) AS suite_case_count
+    FROM page
+    LEFT JOIN suites s ON s.task_id = page.id
+    ORDER BY page.updated_at DESC, page.id DESC, s.created_at DESC, s.id DESC
+"""
+
+
+def parse_cursor(value):
+    """解析分页游标 "updated_at|id"，无效时返回None"""
+    if not value or '|' not in value:
+        return None
+    updated_at, _, task_id = value.rpartition('|')
+    try:
+        return updated_at, int(task_id)
+    except ValueError:
+        return None
+
+
+def make_cursor(task):
+    """生成任务的分页游标"""
+    return f"{task['updated_at']}|{task['id']}"
+
+
+def query_index_page(conn, per_page, after=None, before=None, last=False):
+    """
+    按键集分页查询一页任务及其套件
+
+    Args:
+        conn: 数据库连接
+        per_page: 每页任务数
+        after: 游标，返回排在其后（更早更新）的任务
+        before: 游标，返回排在其前（更晚更新）的任务
+        last: 是否查询最后一页
+
+    Returns:
+        任务列表（按updated_at倒序），每个任务包含suites/total_cases/suite_count
+    """
+    if after:
+        where, order, params = "WHERE (t.updated_at, t.id) < (?, ?)", "DESC", [*after]
+    elif before:
+        where, order, params = "WHERE (t.updated_at, t.id) > (?, ?)", "ASC", [*before]
+    elif last:
+        where, order, params = "", "ASC", []
+    else:
+        where, order, params = "", "DESC", []
+
+    if last:
+        # 最后一页只包含余数个任务，与按页码计算的分页保持一致
+        total_tasks = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        per_page = total_tasks % per_page or per_page
+
+    rows = conn.execute(INDEX_QUERY.format(where=where, order=order), (*params, per_page)).fetchall()
+
+    tasks = {}
+    for row in rows:
+        task = tasks.get(row['id'])
+        if task is None:
+            task = {key: row[key] for key in ('id', 'name', 'original_name', 'run_number', 'description',
+                                              'status', 'created_at', 'updated_at')}
+            task.update(suites=[], total_cases=0, suite_count=0)
+            tasks[row['id']] = task
+        if row['suite_id'] is None:
+            continue
+        task['suites'].append({
+            'id': row['suite_id'],
+            'name': row['suite_name'],
+            'model_name': row['suite_model_name'],
+            'description': row['suite_description'],
+            'created_at': row['suite_created_at'],
+            'case_count': row['suite_case_count']
+        })
+        task['total_cases'] += row['suite_case_count']
+        task['suite_count'] += 1
+    return list(tasks.values())
+
 
 @app.route('/')
 def index():
-    """首页：按任务分组显示套件，支持分页"""
+    """首页：按任务分组显示套件，按更新时间键集分页"""
     if not init_database():
         return render_template('error.html', message="数据库文件不存在，请先运行基准测试生成数据")
 
-    # 获取分页参数
+    # 获取分页参数：page仅用于显示页码，翻页由after/before游标决定
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
     # 限制每页任务的合理范围
@@ -145,70 +369,25 @@ def index():
         per_page = 5
     elif per_page > 100:
         per_page = 100
-
-    offset = (page - 1) * per_page
+    after = parse_cursor(request.args.get('after'))
+    before = parse_cursor(request.args.get('before'))
+    last = request.args.get('last', type=int) == 1
 
     conn = get_db_connection()
     try:
         # 获取任务总数用于分页
         total_tasks = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        total_pages = max(1, (total_tasks + per_page - 1) // per_page)
 
-        # 获取当前页的任务（按创建时间倒序）
-        task_rows = conn.execute("""
-            SELECT t.id, t.name, t.original_name, t.run_number, t.description, t.status, t.created_at, t.updated_at
-            FROM tasks t
-            ORDER BY t.updated_at DESC
-            LIMIT ? OFFSET ?
-        """, (per_page, offset)).fetchall()
-
-        tasks = []
-        for task_row in task_rows:
-            task = dict(task_row)
-
-            # 获取该任务下的所有套件
-            suite_rows = conn.execute("""
-                SELECT s.id, s.name, s.model_name, s.suite_yaml, s.created_at
-                FROM suites s
-                WHERE s.task_id = ?
-                ORDER BY s.created_at DESC
-            """, (task['id'],)).fetchall()
-
-            task_suites = []
-            total_cases = 0
-            for suite_row in suite_rows:
-                suite = dict(suite_row)
-
-                # 获取该套件的测试用例数量
-                case_count = conn.execute(
-                    "SELECT COUNT(*) FROM case_definitions WHERE suite_id = ?",
-                    (suite['id'],)
-                ).fetchone()[0]
-
-                suite['case_count'] = case_count
-                total_cases += case_count
-
-                # 从suite_yaml中提取描述信息
-                if suite.get('suite_yaml'):
-                    try:
-                        import json
-                        suite_config = json.loads(suite['suite_yaml'])
-                        suite['description'] = suite_config.get('description', suite['name'])
-                    except:
-                        suite['description'] = suite['name']
-                else:
-                    suite['description'] = suite['name']
+        tasks = query_index_page(conn, per_page, after=after, before=before, last=last)
+        if last:
+            page = total_pages
+        elif not after and not before:
+            page = 1
+        page = min(max(page, 1), total_pages)
 
-                task_suites.append(suite)
-
-            task['suites'] = task_suites
-            task['total_cases'] = total_cases
-            task['suite_count'] = len(task_suites)
-            tasks.append(task)
-
-        # 计算分页信息
-        total_pages = (total_tasks + per_page - 1) // per_page
-        has_prev = page > 1
-        has_next = page < total_pages
+        has_prev = page > 1 and bool(tasks)
+        has_next = page < total_pages and bool(tasks)
 
         return render_template('index.html',
                              tasks=tasks,
@@ -217,6 +396,8 @@ def index():
                              total_pages=total_pages,
                              has_prev=has_prev,
                              has_next=has_next,
+                             prev_cursor=make_cursor(tasks[0]) if tasks else None,
+                             next_cursor=make_cursor(tasks[-1]) if tasks else None,
                              total_tasks=total_tasks)
     finally:
         conn.close()
@@ -254,7 +435,7 @@ def get_suite_analysis_results(suite_id):
             SELECT id, analysis_type, target_variable, fixed_params, result_types,
                    analysis_duration_ms, completed_at, analysis_dir, web_url
             FROM analysis_history
-            WHERE suite_id = ? AND completed_at IS NOT NULL
+            WHERE suite_id = ? AND completed_at IS NOT NULL AND analysis_type != 'batch_regression'
             ORDER BY completed_at DESC
         """, (suite_id,)).fetchall()
 
@@ -432,119 +613,201 @@ def suite_detail(suite_id):
         if model_size:
             suite_dict['model_size'] = model_size[0]
 
+        suite_dict['case_count'] = conn.execute(
+            "SELECT COUNT(*) FROM case_definitions WHERE suite_id = ?", (suite_id,)
+        ).fetchone()[0]
+
         suite = type('Row', (), suite_dict)()  # 转换为Row对象
 
-        # 获取该套件的所有测试用例
-        cases = conn.execute("""
-            SELECT cd.*, cv.variable_name, cv.variable_value
-            FROM case_definitions cd
-            LEFT JOIN case_variable_values cv ON cd.id = cv.case_id
-            WHERE cd.suite_id = ?
-            ORDER BY cd.id, cv.id
-        """, (suite_id,)).fetchall()
+        # 测试用例由页面脚本从 /api/suite/<id>/matrix 加载
+        variable_columns = [
+            {'name': var['name'], 'label': var['param_meta']['name']}
+            for var in suite_dict['suite_variable_params']
+        ]
 
-        # 重组数据结构：按case分组
-        cases_dict = {}
-        for row in cases:
-            case_id = row['id']
-            if case_id not in cases_dict:
-                cases_dict[case_id] = {
-                    'id': row['id'],
-                    'name': row['name'],
-                    'base_parameters': row['base_parameters'],
-                    'model_size': row['model_size'],
-                    'backend': row['backend'],
-                    'threads': row['threads'],
-                    'precision': row['precision'],
-                    'execution_time_seconds': row['execution_time_seconds'],
-                    'status': row['status'],
-                    'created_at': row['created_at'],
-                    'variables': {},
-                    'variable_params': [],  # 新增：变量参数详细信息
-                    'results': []
-                }
+        # 获取分析结果
+        analysis_results = get_suite_analysis_results(suite_id)
 
-            # 添加变量信息
-            if row['variable_name']:
-                var_name = row['variable_name']
-                var_value = row['variable_value']
-                cases_dict[case_id]['variables'][var_name] = var_value
-
-                # 添加变量参数详细信息（仅在套件variables中定义的参数）
-                # 检查这个变量是否真的在套件的variables中定义
-                suite_variables = [var['name'] for var in suite_variable_params]
-                if var_name in PARAM_METADATA and var_name in suite_variables:
-                    cases_dict[case_id]['variable_params'].append({
-                        'name': var_name,
-                        'value': var_value,
-                        'param_meta': PARAM_METADATA[var_name]
-                    })
-
-        # 为每个case设置pType并获取测试结果
-        for case_id in cases_dict.keys():
-            # 计算case的pType - 基于base_parameters
-            base_params = cases_dict[case_id]['base_parameters']
-            case_ptype = 'fix'  # 默认值
-            if base_params:
-                try:
-                    import json
-                    params = json.loads(base_params) if isinstance(base_params, str) else base_params
-                    if 'prompt_file' in params:
-                        case_ptype = 'file'
-                    elif 'variable_prompt' in params and params['variable_prompt']:
-                        case_ptype = 'variable'
-                    else:
-                        case_ptype = 'fix'
-                except:
-                    case_ptype = 'fix'
-            # 将pType直接添加到case字典中，供模板使用
-            cases_dict[case_id]['ptypes'] = case_ptype
+        return render_template('suite_detail.html', suite=suite, variable_columns=variable_columns,
+                               analysis_results=analysis_results)
+    finally:
+        conn.close()
 
-            results = conn.execute("""
-                SELECT * FROM benchmark_results
-                WHERE case_id = ?
-                ORDER BY created_at ASC
-            """, (case_id,)).fetchall()
+# 套件数据版本：用例/结果的数量、最大ID和最近写入时间，任一变化即视为数据更新
+SUITE_VERSION_QUERY = """
+    SELECT COUNT(DISTINCT cd.id), COUNT(br.id), MAX(br.id), TOTAL(cd.execution_time_seconds),
+           GROUP_CONCAT(DISTINCT cd.status),
+           MAX(COALESCE(br.created_at, cd.created_at)) AS last_modified
+    FROM case_definitions cd
+    LEFT JOIN benchmark_results br ON br.case_id = cd.id
+    WHERE cd.suite_id = ?
+"""
 
-            # 转换为字典，提取实际运行参数，使用数据库中的ptypes（如果没有则使用计算的pType）
-            actual_pp_length = None
-            actual_tg_length = None
+# 一次查询取出套件的所有用例：变量值用相关子查询聚合为JSON对象，测试结果按用例GROUP BY聚合，
+# pType直接由base_parameters在SQL中计算
+SUITE_MATRIX_QUERY = """
+    SELECT cd.id, cd.name, cd.status, cd.execution_time_seconds, cd.created_at,
+           CASE
+               WHEN json_type(cd.base_parameters, '$.prompt_file') IS NOT NULL THEN 'file'
+               WHEN COALESCE(json_extract(cd.base_parameters, '$.variable_prompt'), 0) NOT IN (0, '') THEN 'variable'
+               ELSE 'fix'
+           END AS ptype,
+           (SELECT json_group_object(cv.variable_name, cv.variable_value)
+            FROM case_variable_values cv WHERE cv.case_id = cd.id) AS variables,
+           json_group_array(json_array(br.id, br.result_type, br.result_parameter, br.mean_value,
+                                       br.std_value, br.unit, br.ptypes))
+               FILTER (WHERE br.id IS NOT NULL) AS results
+    FROM case_definitions cd
+    LEFT JOIN benchmark_results br ON br.case_id = cd.id
+    WHERE cd.suite_id = ?
+    GROUP BY cd.id
+    ORDER BY cd.id
+"""
 
-            for i, result_row in enumerate(results):
-                result_dict = dict(result_row)
-                # 如果数据库结果中有ptypes就使用，否则使用计算的pType
-                if not result_dict.get('ptypes') or result_dict['ptypes'] == 'fix':
-                    result_dict['ptypes'] = case_ptype
 
-                # 提取实际运行参数从结果中
-                if result_dict['result_type'] == 'pp':
-                    actual_pp_length = result_dict.get('result_parameter')
-                elif result_dict['result_type'] == 'tg':
-                    actual_tg_length = result_dict.get('result_parameter')
+def build_suite_matrix(conn, suite_id):
+    """
+    构建列式的套件数据：cases中每个字段为一列，results中每行通过case_index引用用例
+
+    Args:
+        conn: 数据库连接
+        suite_id: 套件ID
+
+    Returns:
+        列式数据字典
+    """
+    cases = {'id': [], 'name': [], 'status': [], 'execution_time_seconds': [], 'created_at': [], 'ptype': []}
+    variables = {}
+    results = []
+
+    rows = conn.execute(SUITE_MATRIX_QUERY, (suite_id,)).fetchall()
+    for case_index, row in enumerate(rows):
+        for column in cases:
+            cases[column].append(row[column])
+        for name, value in json.loads(row['variables'] or '{}').items():
+            variables.setdefault(name, [None] * len(rows))[case_index] = value
+        # 与结果文件一致，数据库中没有pType（或为fix）时使用按参数计算的pType
+        results.extend(
+            (result_id, case_index, result_type, parameter, mean, std, unit,
+             ptypes if ptypes and ptypes != 'fix' else row['ptype'])
+            for result_id, result_type, parameter, mean, std, unit, ptypes in json.loads(row['results'] or '[]')
+        )
+
+    # json_group_array不保证组内顺序，按结果写入顺序排列
+    results.sort(key=lambda r: (r[1], r[0]))
+    result_columns = ['case_index', 'result_type', 'result_parameter', 'mean_value', 'std_value', 'unit', 'ptypes']
+    return {
+        'suite_id': suite_id,
+        'case_count': len(rows),
+        'cases': {**cases, 'variables': variables},
+        'results': {column: [r[i + 1] for r in results] for i, column in enumerate(result_columns)}
+    }
 
-                results[i] = result_dict
 
-            # 将实际运行参数添加到case中，供模板使用
-            cases_dict[case_id]['actual_pp'] = actual_pp_length
-            cases_dict[case_id]['actual_tg'] = actual_tg_length
+@app.route('/api/suite/<int:suite_id>/matrix')
+def api_suite_matrix(suite_id):
+    """API: 列式返回套件的用例、变量值和测试结果，支持ETag/Last-Modified条件请求"""
+    if not init_database():
+        return jsonify({"error": "数据库文件不存在"}), 404
 
-            cases_dict[case_id]['results'] = results
+    conn = get_db_connection()
+    try:
+        if not conn.execute("SELECT 1 FROM suites WHERE id = ?", (suite_id,)).fetchone():
+            return jsonify({"error": "套件不存在"}), 404
+
+        version = tuple(conn.execute(SUITE_VERSION_QUERY, (suite_id,)).fetchone())
+        etag = hashlib.sha1(f"{suite_id}:{version}".encode()).hexdigest()
+        # SQLite的CURRENT_TIMESTAMP为UTC时间
+        last_modified = (datetime.strptime(version[-1], "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+                         if version[-1] else None)
+
+        # 数据未变化时不再构建数据（优先使用ETag，未提供时比较Last-Modified）
+        if request.if_none_match:
+            not_modified = request.if_none_match.contains(etag)
+        else:
+            not_modified = bool(last_modified and request.if_modified_since
+                                and request.if_modified_since >= last_modified)
+        if not_modified:
+            response = make_response('', 304)
+        else:
+            response = make_response(jsonify(build_suite_matrix(conn, suite_id)))
+        response.set_etag(etag)
+        if last_modified:
+            response.last_modified = last_modified
+        response.cache_control.no_cache = True
+        return response
+    finally:
+        conn.close()
 
-        # 转换为列表
-        case_list = list(cases_dict.values())
+@app.route('/api/analysis/overlays')
+def api_analysis_overlays():
+    """API: 列出同一目标变量的单变量分析数据块，供报告交互式图表叠加对比"""
+    if not init_database():
+        return jsonify({"error": "数据库文件不存在"}), 404
 
-        # 获取分析结果
-        analysis_results = get_suite_analysis_results(suite_id)
+    target_variable = request.args.get('target_variable')
+    result_type = request.args.get('result_type')
+    if not target_variable:
+        return jsonify({"error": "缺少target_variable参数"}), 400
 
-        return render_template('suite_detail.html', suite=suite, cases=case_list, analysis_results=analysis_results)
+    conn = get_db_connection()
+    try:
+        rows = conn.execute("""
+            SELECT ah.id, ah.suite_id, ah.result_types, ah.analysis_dir, ah.web_url, ah.completed_at,
+                   s.name AS suite_name, s.model_name
+            FROM analysis_history ah
+            JOIN suites s ON s.id = ah.suite_id
+            WHERE ah.analysis_type = 'single_variable' AND ah.target_variable = ?
+                  AND ah.completed_at IS NOT NULL
+            ORDER BY ah.completed_at DESC
+            LIMIT 100
+        """, (target_variable,)).fetchall()
+    except sqlite3.OperationalError:
+        # 尚未进行过分析时analysis_history表不存在
+        return jsonify([])
     finally:
         conn.close()
 
+    overlays = []
+    for row in rows:
+        if result_type and result_type not in json.loads(row['result_types'] or '[]'):
+            continue
+        # 只返回已生成数据块的报告（早期报告只有静态图）
+        if not row['web_url'] or not os.path.exists(os.path.join(row['analysis_dir'], 'report_data.json')):
+            continue
+        overlays.append({
+            'id': row['id'],
+            'suite_id': row['suite_id'],
+            'suite_name': row['suite_name'],
+            'model_name': row['model_name'],
+            'completed_at': row['completed_at'],
+            'data_url': '/' + os.path.dirname(row['web_url']) + '/report_data.json'
+        })
+    return jsonify(overlays)
+
 @app.route('/health')
 def health_check():
     """健康检查端点"""
     return jsonify({"status": "healthy", "timestamp": datetime.now().isoformat()})
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus格式的指标：按路由统计的请求耗时直方图"""
+    lines = [
+        '# HELP dashboard_request_duration_seconds 请求处理耗时',
+        '# TYPE dashboard_request_duration_seconds histogram'
+    ]
+    with _latency_lock:
+        snapshot = {route: {**h, 'buckets': list(h['buckets'])} for route, h in _latency_histograms.items()}
+    for route, histogram in sorted(snapshot.items()):
+        label = route.replace('\\', '\\\\').replace('"', '\\"')
+        for bound, count in zip(LATENCY_BUCKETS, histogram['buckets']):
+            lines.append(f'dashboard_request_duration_seconds_bucket{{route="{label}",le="{bound}"}} {count}')
+        lines.append(f'dashboard_request_duration_seconds_bucket{{route="{label}",le="+Inf"}} {histogram["count"]}')
+        lines.append(f'dashboard_request_duration_seconds_sum{{route="{label}"}} {histogram["sum"]:.6f}')
+        lines.append(f'dashboard_request_duration_seconds_count{{route="{label}"}} {histogram["count"]}')
+    return Response("\n".join(lines) + "\n", mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     print("启动MNN LLM Bench Web服务器...")
     print(f"数据库路径: {DB_PATH}")
@@ -12,6 +12,7 @@
 #include <algorithm>
 #include <numeric>
 #include <random>
+#include <chrono>
 
 
 #define MNN_OPEN_TIME_TRACE
@@ -40,6 +41,7 @@ struct TestParameters {
     bool                             useVariablePrompt;  // 新增：可变提示词开关
 bool                             verbose;            // 新增：详细输出开关
     std::string                      promptFilePath;     // 新增：提示词文件路径
+    bool                             tokenLatency;       // 新增：逐token延迟记录开关
 };
 
 struct CommandParameters {
@@ -61,6 +63,7 @@ struct CommandParameters {
     bool                useVariablePrompt;  // 新增：可变提示词开关
     bool                verbose;            // 新增：详细输出开关
     std::string         promptFilePath;     // 新增：提示词文件路径
+    bool                tokenLatency;       // 新增：逐token延迟记录开关
 
 };
 
@@ -86,7 +89,8 @@ static const TestParameters testParamsDefaults = {
     /* loadingTime         */ {"false"},
     /* useVariablePrompt   */ false,  // 新增：默认使用固定提示词
     /* verbose             */ false,   // 新增：默认不显示详细输出
-    /* promptFilePath      */ ""      // 新增：默认为空，表示不使用文件输入
+    /* promptFilePath      */ "",     // 新增：默认为空，表示不使用文件输入
+    /* tokenLatency        */ false   // 新增：默认不记录逐token延迟
 };
 
 
@@ -113,6 +117,7 @@ struct commandParametersInstance {
         mCmdParam.useVariablePrompt = cmdParam.useVariablePrompt;  // 新增
         mCmdParam.verbose            = cmdParam.verbose;            // 新增
         mCmdParam.promptFilePath     = cmdParam.promptFilePath;     // 新增
+        mCmdParam.tokenLatency       = cmdParam.tokenLatency;       // 新增
     }
 
     CommandParameters get_cmd_parameters() const {
@@ -175,6 +180,8 @@ struct TestInstance {
     std::vector<int64_t>     decodeUs;
     std::vector<int64_t>     samplesUs;
     std::vector<double>      loadingS;
+    std::vector<int64_t>     ttftUs;             // 新增：每轮首token延迟（调用开始到第一个token输出）
+    std::vector<int64_t>     itlUs;              // 新增：每轮相邻token的输出间隔
     int                      backend;
     int                      precision;
     int                      power;
@@ -186,6 +193,7 @@ struct TestInstance {
     int                      originalNPrompt;    // 新增：原始prompt参数
     int                      actualNPrompt;      // 新增：实际使用的prompt长度
     std::string              pType;              // 新增：提示词类型 (fix/variable/file)
+    bool                     tokenLatency;       // 新增：逐token延迟记录标记
 
     TestInstance(const commandParametersInstance & instance) {
 
@@ -206,6 +214,7 @@ struct TestInstance {
         useVariablePrompt = instance.mCmdParam.useVariablePrompt;  // 新增
         verbose           = instance.mCmdParam.verbose;            // 新增
         promptFilePath    = instance.mCmdParam.promptFilePath;     // 新增
+        tokenLatency      = instance.mCmdParam.tokenLatency;       // 新增
         originalNPrompt   = instance.mCmdParam.nPrompt;           // 新增：保存原始值
         actualNPrompt     = instance.mCmdParam.nPrompt;           // 新增：默认等于原始值
 
@@ -427,6 +436,9 @@ struct markdownPrinter : public Printer {
             } else if (field == "threads") {
                 snprintf(buf, sizeof(buf), "%d", t.threads);
                 value = buf;
+            } else if (field == "dynamicOption") {
+                snprintf(buf, sizeof(buf), "%d", t.dynamicOption);
+                value = buf;
             } else if (field == "loadingTime(s)") {
                 snprintf(buf, sizeof(buf), "%.2f ± %.2f", t.getAvgUs(t.loadingS), t.getStdevUs(t.loadingS));
                 value = buf;
@@ -453,6 +465,71 @@ struct markdownPrinter : public Printer {
     }
 };
 
+// 新增：记录token输出时间的输出流
+// 生成过程每输出一个token（包括停止token）执行一次flush，sync()时记录时间戳，输出内容直接丢弃。
+// 停止token输出的是空结束符，其时间戳只用于首token延迟，不计入token间隔。
+class TokenTimingBuf : public std::streambuf {
+public:
+    void start() {
+        mStart = std::chrono::steady_clock::now();
+        mTokenTimes.clear();
+        mPendingChars = 0;
+        mEndedOnStop = false;
+    }
+    // 调用开始到第一个token输出的耗时（us），没有输出token时返回-1
+    int64_t firstTokenUs() const {
+        if (mTokenTimes.empty()) {
+            return -1;
+        }
+        return std::chrono::duration_cast<std::chrono::microseconds>(mTokenTimes[0] - mStart).count();
+    }
+    // 相邻token的输出间隔（us），生成因停止token结束时去掉最后一个（停止token采样）间隔
+    std::vector<int64_t> intervalsUs() const {
+        std::vector<int64_t> intervals;
+        size_t count = mEndedOnStop ? mTokenTimes.size() - 1 : mTokenTimes.size();
+        for (size_t i = 1; i < count; ++i) {
+            intervals.push_back(std::chrono::duration_cast<std::chrono::microseconds>(mTokenTimes[i] - mTokenTimes[i - 1]).count());
+        }
+        return intervals;
+    }
+
+protected:
+    int overflow(int c) override {
+        if (!traits_type::eq_int_type(c, traits_type::eof())) {
+            ++mPendingChars;
+        }
+        return traits_type::not_eof(c);
+    }
+    std::streamsize xsputn(const char* /* s */, std::streamsize n) override {
+        mPendingChars += n;
+        return n;
+    }
+    int sync() override {
+        mTokenTimes.push_back(std::chrono::steady_clock::now());
+        // 最后一次flush没有写入内容时视为停止token（结束符为空）
+        mEndedOnStop = mPendingChars == 0;
+        mPendingChars = 0;
+        return 0;
+    }
+
+private:
+    std::chrono::steady_clock::time_point mStart;
+    std::vector<std::chrono::steady_clock::time_point> mTokenTimes;
+    std::streamsize mPendingChars = 0;
+    bool mEndedOnStop = false;
+};
+
+struct TokenTimingStream : public std::ostream {
+    TokenTimingBuf buf;
+    TokenTimingStream() : std::ostream(&buf) {}
+};
+
+// 新增：在结果行之后输出逐token延迟，格式为
+// token_latency ttft_us=<各轮首token延迟> itl_us=<各轮相邻token间隔>（逗号分隔，单位us，不含预热轮）
+static void printTokenLatency(FILE* fout, const TestInstance& t) {
+    fprintf(fout, "token_latency ttft_us=%s itl_us=%s\n", join(t.ttftUs, ",").c_str(), join(t.itlUs, ",").c_str());
+}
+
 static FILE* openFile(const char* file, bool read) {
 #if defined(_MSC_VER)
     wchar_t wFilename[1024];
@@ -700,6 +777,7 @@ static std::vector<commandParametersInstance> get_cmd_params_instances(const Run
                     tmpParam.useVariablePrompt = tp.useVariablePrompt;  // 新增
                     tmpParam.verbose = tp.verbose;                    // 新增
                     tmpParam.promptFilePath = tp.promptFilePath;       // 新增 - 遗漏的关键参数
+                    tmpParam.tokenLatency = tp.tokenLatency;           // 新增
                     auto instance = commandParametersInstance(tmpParam);
                     instances.push_back(instance);
                 }
@@ -726,6 +804,7 @@ static std::vector<commandParametersInstance> get_cmd_params_instances(const Run
                 tmpParam.useVariablePrompt = tp.useVariablePrompt;  // 新增
                 tmpParam.verbose = tp.verbose;                    // 新增
                 tmpParam.promptFilePath = tp.promptFilePath;       // 新增 - 遗漏的关键参数
+                tmpParam.tokenLatency = tp.tokenLatency;           // 新增
                 auto instance = commandParametersInstance(tmpParam);
                 instances.push_back(instance);
             }
@@ -747,6 +826,7 @@ static std::vector<commandParametersInstance> get_cmd_params_instances(const Run
                 tmpParam.useVariablePrompt = tp.useVariablePrompt;  // 新增
                 tmpParam.verbose = tp.verbose;                    // 新增
                 tmpParam.promptFilePath = tp.promptFilePath;       // 新增 - 遗漏的关键参数
+                tmpParam.tokenLatency = tp.tokenLatency;           // 新增
                 auto instance = commandParametersInstance(tmpParam);
                 instances.push_back(instance);
             }
@@ -771,6 +851,7 @@ static std::vector<commandParametersInstance> get_cmd_params_instances(const Run
                 tmpParam.useVariablePrompt = tp.useVariablePrompt;  // 新增
                 tmpParam.verbose = tp.verbose;                    // 新增
                 tmpParam.promptFilePath = tp.promptFilePath;       // 新增 - 遗漏的关键参数
+                tmpParam.tokenLatency = tp.tokenLatency;           // 新增
                 auto instance = commandParametersInstance(tmpParam);
                 instances.push_back(instance);
             }
@@ -824,6 +905,7 @@ static void printUsage(int /* argc */, char ** argv) {
     printf("  -vp, --variable-prompt <0|1>              (default: 0) | Note: if 1, use variable prompt tokens instead of fixed token 16\n");
     printf("  -v, --verbose <0|1>                       (default: 0) | Note: if 1, display detailed test information including token vectors\n");
     printf("  -pf, --prompt-file <filename>             (default: none) | Note: if provided, use file content as prompt and override -p and -pg settings\n");
+    printf("  -tl, --token-latency <0|1>                (default: 0) | Note: if 1, print a 'token_latency' line with per-round TTFT and inter-token latencies (us, excluding the stop-token step) after each result row\n");
 }
 
 static bool parseCmdParams(int argc, char ** argv, RuntimeParameters & runtimeParams, TestParameters & testParams, FILE** outfile, bool& helpInfo) {
@@ -837,6 +919,7 @@ static bool parseCmdParams(int argc, char ** argv, RuntimeParameters & runtimePa
     testParams.loadTime = testParamsDefaults.loadTime;
     testParams.useVariablePrompt = testParamsDefaults.useVariablePrompt;  // 新增
     testParams.verbose = testParamsDefaults.verbose;                   // 新增
+    testParams.tokenLatency = testParamsDefaults.tokenLatency;         // 新增
 
     for (int i = 1; i < argc; i++) {
         arg = argv[i];
@@ -961,6 +1044,13 @@ static bool parseCmdParams(int argc, char ** argv, RuntimeParameters & runtimePa
             }
             auto p = splitString<bool>(argv[i], splitDelim);
             testParams.verbose = p[0];
+        } else if (arg == "-tl" || arg == "--token-latency") {  // 新增
+            if (++i >= argc) {
+                invalidParam = true;
+                break;
+            }
+            auto p = splitString<bool>(argv[i], splitDelim);
+            testParams.tokenLatency = p[0];
         } else if (arg == "-pf" || arg == "--prompt-file") {  // 新增
             if (++i >= argc) {
                 invalidParam = true;
@@ -1180,6 +1270,11 @@ int main(int argc, char ** argv) {
         auto prompt_tokens = t.nPrompt;
         auto decodeTokens = t.nGenerate;
 
+        // 开启逐token延迟时传入计时输出流（结束符为空，停止token只记录时间），否则不输出生成内容
+        TokenTimingStream timingStream;
+        std::ostream* tokenOs = t.tokenLatency ? &timingStream : nullptr;
+        const char* tokenEndWith = t.tokenLatency ? "" : nullptr;
+
         // llm_demo test
         if (t.kvCache == "true") {
             // 使用统一的token准备函数
@@ -1196,13 +1291,21 @@ int main(int argc, char ** argv) {
                     printf("\n****** Round %d : ******\n", i+1);
                     displayPrefillTokenVector(tokens);
                 }
-                llm->response(tokens, nullptr, nullptr, decodeTokens);
+                timingStream.buf.start();
+                llm->response(tokens, tokenOs, tokenEndWith, decodeTokens);
                 auto prefillTime = context->prefill_us;
                 auto decodeTime = context->decode_us;
 
                 if (i > 0) { // Exclude the first performance value.
                     t.prefillUs.push_back(prefillTime);
                     t.decodeUs.push_back(decodeTime);
+                    if (t.tokenLatency) {
+                        if (timingStream.buf.firstTokenUs() >= 0) {
+                            t.ttftUs.push_back(timingStream.buf.firstTokenUs());
+                        }
+                        auto intervals = timingStream.buf.intervalsUs();
+                        t.itlUs.insert(t.itlUs.end(), intervals.begin(), intervals.end());
+                    }
                 }
 
                 if (t.verbose) {
@@ -1226,6 +1329,9 @@ int main(int argc, char ** argv) {
                 printHeader = false;
             }
             printer_->printPerformance(t);
+            if (t.tokenLatency) {
+                printTokenLatency(printer_->fout, t);
+            }
             // Cool
             std::this_thread::sleep_for(std::chrono::milliseconds(5));
         }
@@ -1264,19 +1370,32 @@ int main(int argc, char ** argv) {
                         displayPrefillTokenVector(tokens);
                     }
                 }
+                int64_t firstTokenUs = -1;
+                std::vector<int64_t> intervals;
                 if (prompt_tokens > 0) {
-                    llm->response(tokens, nullptr, nullptr, 1);
+                    timingStream.buf.start();
+                    llm->response(tokens, tokenOs, tokenEndWith, 1);
                     prefillTime = context->prefill_us;
                     sampler_us += prefillTime;
+                    firstTokenUs = timingStream.buf.firstTokenUs();
                 }
                 if (decodeTokens > 0) {
-                    llm->response(decodeVectors, nullptr, nullptr, decodeTokens);
+                    // 解码调用先处理1个token，第一个token的耗时不计入间隔
+                    timingStream.buf.start();
+                    llm->response(decodeVectors, tokenOs, tokenEndWith, decodeTokens);
                     decodeTime = context->decode_us;
                     sampler_us += decodeTime;
+                    intervals = timingStream.buf.intervalsUs();
                 }
 
                 if (i > 0) {
                     t.samplesUs.push_back(sampler_us);
+                    if (t.tokenLatency) {
+                        if (firstTokenUs >= 0) {
+                            t.ttftUs.push_back(firstTokenUs);
+                        }
+                        t.itlUs.insert(t.itlUs.end(), intervals.begin(), intervals.end());
+                    }
                 }
 
                 if (t.verbose) {
@@ -1308,6 +1427,9 @@ int main(int argc, char ** argv) {
                 printHeader = false;
             }
             printer_->printPerformance(t);
+            if (t.tokenLatency) {
+                printTokenLatency(printer_->fout, t);
+            }
             // Cool
             std::this_thread::sleep_for(std::chrono::milliseconds(5));
         }